@@ -205,6 +205,39 @@ else:
         }
     }
 
+# Classifier verdicts by content hash (user_system/classifiers/verdict_cache.py),
+# so repeated text and re-uploaded images skip the paid cascade. Must be shared
+# by every process (the RQ worker runs each job in a fresh work horse) and
+# bounded in size, since unique captions and comments never stop coming. Not
+# on the REDIS_URL instance: the RQ queue there needs `noeviction`, and
+# verdicts filling it would make enqueues fail. So Redis only when
+# CLASSIFICATION_VERDICT_REDIS_URL names a dedicated instance configured with
+# `maxmemory` and `maxmemory-policy allkeys-lru` (the README's deployment
+# section); otherwise its own table (createcachetable), where MAX_ENTRIES culls
+# only verdicts — which also lets tests roll it back with the rest of the
+# database.
+CLASSIFICATION_VERDICT_CACHE = 'classification_verdicts'
+if os.environ.get('CLASSIFICATION_VERDICT_REDIS_URL'):
+    CACHES[CLASSIFICATION_VERDICT_CACHE] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['CLASSIFICATION_VERDICT_REDIS_URL'],
+        'KEY_PREFIX': 'classification_verdicts',
+        'TIMEOUT': 24 * 60 * 60,
+    }
+else:
+    CACHES[CLASSIFICATION_VERDICT_CACHE] = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'classification_verdict_cache',
+        'TIMEOUT': 24 * 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    }
+
+# Rolling error rate, latency and circuit-breaker state of each classifier
+# cascade tier (user_system/classifiers/tier_health.py). Must be shared by every
+# worker process, so an incident seen by one worker trips the breaker for all
+# of them: the default cache (Redis, or the database cache without it).
+CLASSIFICATION_TIER_HEALTH_CACHE = 'default'
+
 
 
 # Async post classification (issue #282). Jobs go to an RQ queue on the same
@@ -3,6 +3,8 @@ from django.contrib.auth.admin import UserAdmin
 from django.db.models import Prefetch
 from django.utils import timezone
 
+from .auth_principals import forget_sessions
+from .ban_sets import invalidate_ban_sets
 from .constants import BAN_TYPE_OUTRIGHT, BAN_TYPE_SHADOW, APPEAL_STATUS_PENDING
 from .models import Appeal, LoginCookie, PositiveOnlySocialUser, Session, UserBan, notify_user_of_outright_ban
 
@@ -96,12 +98,15 @@ class PositiveOnlySocialUserAdmin(UserAdmin):
                 for user in valid_users
             ]
             UserBan.objects.bulk_create(new_bans)
-            # bulk_create bypasses UserBan.save(), so the session/login-cookie
-            # teardown and ban-notification email that an outright ban normally
-            # triggers must be done here. These freshly created bans have no
-            # expiry, so they are in effect.
+            # bulk_create bypasses UserBan.save(), so the ban-set invalidation,
+            # session/login-cookie teardown and ban-notification email that an
+            # outright ban normally triggers must be done here. These freshly
+            # created bans have no expiry, so they are in effect.
+            invalidate_ban_sets()
             if ban_type == BAN_TYPE_OUTRIGHT:
-                Session.objects.filter(management_user__in=valid_users).delete()
+                sessions = Session.objects.filter(management_user__in=valid_users)
+                forget_sessions(sessions)
+                sessions.delete()
                 LoginCookie.objects.filter(cookie_user__in=valid_users).delete()
                 for ban in new_bans:
                     notify_user_of_outright_ban(ban)
@@ -128,6 +133,7 @@ class PositiveOnlySocialUserAdmin(UserAdmin):
         # Expire the bans instead of deleting them so the audit trail (and a
         # future appeals system) keeps the record.
         count = UserBan.objects.active().filter(user__in=queryset).update(expires=timezone.now())
+        invalidate_ban_sets()
         self.message_user(request, f"Lifted {count} ban(s).")
 
 
@@ -0,0 +1,184 @@
+"""Many classification jobs in flight on one event loop.
+
+The stock RQ worker runs one job at a time per process, in a forked work
+horse, although a classification job spends nearly all of its time waiting on
+OpenRouter and S3. `classification_worker --async --concurrency N` instead
+runs N job slots as coroutines on one asyncio event loop:
+
+- each slot is registered with RQ as a worker of its own on the same queue, so
+  dequeueing, the started/finished/failed registries and RQ's retries behave
+  exactly as under the stock worker. RQ's Redis client is blocking, so this
+  bookkeeping is handed to the loop's executor, one call at a time per slot;
+- a job runs as its coroutine counterpart (tasks.ASYNC_JOBS: aclassify_post,
+  aclassify_profile_photo, acategorize_post, ...). Those keep the jobs'
+  idempotent claim and attempt counting, being the same ORM steps run through
+  sync_to_async, and await everything between them: the S3 fetch (a presigned
+  GET) and the OpenRouter calls go over async httpx clients, so a slot waiting
+  on a provider costs the process nothing but the open request;
+- a job over its timeout is cancelled and failed like one RQ timed out;
+- SIGTERM/SIGINT (and `rq shutdown`) let every slot finish its current job and
+  stop; a second signal exits at once. The loop logs the provider clients'
+  stats (client_pool.stats) as it goes.
+
+The slots share the loop's pooled provider connections, sized to the slot
+count, and their concurrent captions share batched calls (text_batcher).
+"""
+import asyncio
+import logging
+import os
+import signal
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from rq import SimpleWorker
+from rq.exceptions import StopRequested
+from rq.job import JobStatus
+from rq.timeouts import JobTimeoutException, TimerDeathPenalty
+from rq.utils import now
+from rq.worker import WorkerStatus
+
+from . import client_pool, tasks
+from .constants import CLASSIFICATION_THREADS
+
+logger = logging.getLogger(__name__)
+
+# Each job runs at most two cascades at once (text and image).
+_CONNECTIONS_PER_SLOT = 2
+# How long an idle slot blocks on the queue before it checks for a stop.
+_DEQUEUE_TIMEOUT_SECONDS = 5
+_STATS_INTERVAL_SECONDS = 300
+
+
+class SlotWorker(SimpleWorker):
+    """One slot's registration with RQ. The slot dequeues and runs its jobs
+    itself (_work), using this worker for RQ's bookkeeping only."""
+
+    # Callbacks run on the executor's threads, where SIGALRM cannot reach.
+    death_penalty_class = TimerDeathPenalty
+
+
+def pool_size(concurrency):
+    """The provider connection pool size for `concurrency` job slots: enough
+    for every slot's cascades at once, never below the default."""
+    return max(CLASSIFICATION_THREADS, _CONNECTIONS_PER_SLOT * concurrency)
+
+
+def run(queues, connection, concurrency, burst=False):
+    """Work `queues` with `concurrency` job slots until stopped (or, with
+    `burst`, until they are empty). Must be called on the main thread."""
+    client_pool.set_pool_size(pool_size(concurrency))
+    workers = [SlotWorker(queues, connection=connection) for _ in range(concurrency)]
+    worked = asyncio.run(_run_slots(workers, burst))
+    logger.info("All %d slots stopped (%d did work). Provider clients: %s",
+                len(workers), worked, client_pool.stats())
+
+
+async def _run_slots(workers, burst):
+    loop = asyncio.get_running_loop()
+    # Room for each slot's RQ call (an idle slot's blocks on the queue) plus
+    # the image decoding and encoding the jobs hand off.
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=len(workers) + CLASSIFICATION_THREADS,
+                                                 thread_name_prefix="async-worker"))
+    stopping = asyncio.Event()
+
+    def stop(signum):
+        if stopping.is_set():
+            logger.warning("Second %s; exiting without waiting for running jobs.", signal.Signals(signum).name)
+            os._exit(1)
+        logger.info("Stopping %d slots after their current jobs...", len(workers))
+        stopping.set()
+
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop, signum)
+    try:
+        running = {asyncio.create_task(_work(worker, stopping, burst)) for worker in workers}
+        worked = 0
+        while running:
+            done, running = await asyncio.wait(running, timeout=_STATS_INTERVAL_SECONDS)
+            worked += sum(task.result() for task in done)
+            if not done:
+                logger.info("Provider clients: %s", client_pool.stats())
+        return worked
+    finally:
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(signum)
+
+
+async def _work(worker, stopping, burst):
+    """The stock worker's loop for one slot: True if it ran any job."""
+    await asyncio.to_thread(worker.bootstrap)
+    worked = False
+    try:
+        while not stopping.is_set():
+            await asyncio.to_thread(worker.check_for_suspension, burst)
+            timeout = None if burst else _DEQUEUE_TIMEOUT_SECONDS
+            result = await asyncio.to_thread(worker.dequeue_job_and_maintain_ttl, timeout, timeout)
+            if result is None:
+                if burst:
+                    break
+                continue
+            job, queue = result
+            await _perform(worker, job, queue)
+            worked = True
+    except StopRequested:
+        pass
+    finally:
+        await asyncio.to_thread(worker.teardown)
+    return worked
+
+
+async def _perform(worker, job, queue):
+    """RQ's execute_job and perform_job for a job run as a coroutine: the
+    same registries, result, callbacks and failure handling (which schedules
+    RQ's retries)."""
+    started_job_registry = queue.started_job_registry
+    await asyncio.to_thread(worker.prepare_execution, job)
+    # Like a request, a job starts and ends with no stale database connection.
+    await sync_to_async(close_old_connections)()
+    try:
+        await asyncio.to_thread(worker.prepare_job_execution, job, len(worker.queues) == 1)
+        job.started_at = now()
+        return_value = await _execute(job, job.timeout or worker.queue_class.DEFAULT_TIMEOUT)
+        await asyncio.to_thread(worker.handle_execution_ended, job, queue, job.success_callback_timeout)
+        job._result = return_value
+        job._status = JobStatus.FINISHED
+        await asyncio.to_thread(job.execute_success_callback, worker.death_penalty_class, return_value)
+        await asyncio.to_thread(worker.handle_job_success, job=job, queue=queue,
+                                started_job_registry=started_job_registry)
+        logger.info("Slot %s: %s: Job OK (%s)", worker.name, job.origin, job.id)
+    except Exception:
+        exc_info = sys.exc_info()
+        exc_string = ''.join(traceback.format_exception(*exc_info))
+        job._status = JobStatus.FAILED
+        await asyncio.to_thread(worker.handle_execution_ended, job, queue, job.failure_callback_timeout)
+        try:
+            await asyncio.to_thread(job.execute_failure_callback, worker.death_penalty_class, *exc_info)
+        except Exception:
+            exc_info = sys.exc_info()
+            exc_string = ''.join(traceback.format_exception(*exc_info))
+        await asyncio.to_thread(worker.handle_exception, job, *exc_info)
+        await asyncio.to_thread(worker.handle_job_failure, job=job, exc_string=exc_string, queue=queue,
+                                started_job_registry=started_job_registry)
+    finally:
+        await sync_to_async(close_old_connections)()
+        await asyncio.to_thread(worker.set_state, WorkerStatus.IDLE)
+
+
+async def _execute(job, timeout):
+    """The job's result, from its coroutine counterpart within `timeout`
+    seconds (-1: none). A job without one, which no classification job is,
+    runs on the executor, where the timeout can only stop the wait for it."""
+    job_coroutine = tasks.ASYNC_JOBS.get(job.func_name)
+    if job_coroutine is None:
+        logger.warning("No coroutine for %s; running job %s on a thread.", job.func_name, job.id)
+        work = asyncio.to_thread(job.perform)
+    else:
+        await asyncio.to_thread(job.connection.persist, job.key)
+        work = job_coroutine(*job.args, **job.kwargs)
+    try:
+        return await asyncio.wait_for(work, None if timeout < 0 else timeout)
+    except TimeoutError:
+        raise JobTimeoutException(f"Task exceeded maximum timeout value ({timeout} seconds)") from None
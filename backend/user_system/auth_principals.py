@@ -0,0 +1,79 @@
+"""Short-lived cache of who a session token belongs to.
+
+api_login_required runs on every authenticated request. Resolving the Bearer
+token used to cost a Session lookup by the raw token text, a second query for
+the user, and the ban check on top. Now:
+
+- sessions are looked up by Session.token_hash, a unique index, joined to the
+  user in the same query;
+- the resolved principal (user id and email_verified) is cached under the
+  token hash for AUTH_PRINCIPAL_TTL_SECONDS in the default cache, so a repeat
+  request only loads the user row by primary key;
+- the outright-ban check reads the cached ban sets (see ban_sets.py).
+
+A banned or unverified caller with a cached principal is therefore turned
+away without touching the database, and an admitted one costs one query.
+
+Whatever deletes sessions or flips email_verified must forget the affected
+principals first (forget_sessions / forget_user): logout, account deletion,
+password reset and change, outright bans and email verification. The TTL
+bounds the damage from any path that doesn't. A cache error is logged and
+treated as a miss.
+"""
+import logging
+
+from django.core.cache import cache
+
+from .constants import AUTH_PRINCIPAL_TTL_SECONDS
+from .models import Session
+from .utils import hash_string_sha256
+
+logger = logging.getLogger(__name__)
+
+
+def _principal_key(token_hash):
+    return f'auth_principal:{token_hash}'
+
+
+def resolve(token):
+    """The principal behind session token `token`, or None when no session
+    has it. A dict with `user_id` and `email_verified`; it also carries the
+    loaded `user` when the database had to be read to resolve it, so the
+    caller only loads the user itself on a cache hit."""
+    token_hash = hash_string_sha256(token)
+    try:
+        principal = cache.get(_principal_key(token_hash))
+    except Exception:
+        logger.warning("Could not read the cached session principal; resolving it from the database.",
+                       exc_info=True)
+        principal = None
+    if principal is not None:
+        return principal
+
+    session = Session.objects.select_related('management_user').filter(token_hash=token_hash).first()
+    if session is None:
+        return None
+    user = session.management_user
+    principal = {'user_id': user.pk, 'email_verified': user.email_verified}
+    try:
+        cache.set(_principal_key(token_hash), principal, AUTH_PRINCIPAL_TTL_SECONDS)
+    except Exception:
+        logger.warning("Could not cache the session principal for user_id: %s.", user.pk, exc_info=True)
+    return {**principal, 'user': user}
+
+
+def forget_sessions(sessions):
+    """Drop the cached principals of every session in the `sessions`
+    queryset. Call before deleting them."""
+    token_hashes = [token_hash for token_hash in sessions.values_list('token_hash', flat=True) if token_hash]
+    if not token_hashes:
+        return
+    try:
+        cache.delete_many([_principal_key(token_hash) for token_hash in token_hashes])
+    except Exception:
+        logger.warning("Could not drop %d cached session principal(s).", len(token_hashes), exc_info=True)
+
+
+def forget_user(user):
+    """Drop the cached principals of all of `user`'s sessions."""
+    forget_sessions(Session.objects.filter(management_user=user))
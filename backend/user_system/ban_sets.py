@@ -0,0 +1,113 @@
+"""Cached sets of the user ids with an active shadow or outright ban.
+
+Every authenticated request used to ask the database whether the caller has
+an active outright ban, and every visibility-filtered query embedded a
+subquery over the active shadow bans. Bans are rare and change slowly, so the
+active ones are instead kept as two sets of user ids:
+
+- in the default cache (settings.CACHES: Redis in production, the database
+  cache elsewhere), as a payload stored under the random generation token
+  that `ban_sets:generation` holds, so every process sees the same sets;
+- in process, alongside the generation it was loaded under, so a lookup
+  costs one small cache read of the generation token and no query.
+
+The sets are rebuilt from UserBan when the current generation has no payload:
+on first use, after BAN_SET_TTL_SECONDS, and after invalidate_ban_sets starts
+a new generation. That happens on UserBan.save/delete and wherever bans are
+written in bulk (the admin actions). A rebuild stores its payload under the
+generation it read before querying the bans, so one that raced a ban change
+lands under a generation nobody reads any more instead of outliving the
+change. A payload also records the earliest expiry among the bans in it and
+is rebuilt once that moment passes, so a ban that runs out stops applying on
+time rather than when the cache next happens to turn over.
+
+The cache is an optimization only. Any cache error is logged and the sets
+are built straight from the database for that lookup.
+"""
+import logging
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .constants import BAN_SET_TTL_SECONDS, BAN_TYPE_OUTRIGHT, BAN_TYPE_SHADOW
+
+logger = logging.getLogger(__name__)
+
+_GENERATION_KEY = 'ban_sets:generation'
+
+# This process's copy: {'generation': ..., 'sets': ..., 'valid_until': ...}.
+_local = {}
+
+
+def _payload_key(generation):
+    return f'ban_sets:{generation}'
+
+
+def _build():
+    from .models import UserBan
+    sets = {BAN_TYPE_SHADOW: set(), BAN_TYPE_OUTRIGHT: set()}
+    valid_until = None
+    for user_id, ban_type, expires in UserBan.objects.active().values_list('user_id', 'ban_type', 'expires'):
+        sets.setdefault(ban_type, set()).add(user_id)
+        if expires is not None and (valid_until is None or expires < valid_until):
+            valid_until = expires
+    return {'sets': {ban_type: frozenset(ids) for ban_type, ids in sets.items()}, 'valid_until': valid_until}
+
+
+def _fresh(payload):
+    return payload['valid_until'] is None or payload['valid_until'] > timezone.now()
+
+
+def _current_generation():
+    generation = cache.get(_GENERATION_KEY)
+    if generation is None:
+        # The first process to get here picks it; the others read it back.
+        cache.add(_GENERATION_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(_GENERATION_KEY)
+    return generation
+
+
+def _current_sets():
+    try:
+        generation = _current_generation()
+        local = _local.get('state')
+        if local is not None and local['generation'] == generation and _fresh(local):
+            return local['sets']
+        payload = cache.get(_payload_key(generation))
+        if payload is None or not _fresh(payload):
+            payload = _build()
+            cache.set(_payload_key(generation), payload, BAN_SET_TTL_SECONDS)
+        _local['state'] = {'generation': generation, **payload}
+        return payload['sets']
+    except Exception:
+        logger.warning("Could not read the cached ban sets; querying bans directly.", exc_info=True)
+        return _build()['sets']
+
+
+def banned_user_ids(ban_type):
+    """Ids of the users with an active ban of `ban_type`, as a frozenset."""
+    return _current_sets().get(ban_type, frozenset())
+
+
+def is_banned(user_id, ban_type):
+    """Whether the user with id `user_id` has an active ban of `ban_type`."""
+    return user_id in banned_user_ids(ban_type)
+
+
+def _new_generation():
+    _local.pop('state', None)
+    try:
+        cache.set(_GENERATION_KEY, uuid.uuid4().hex, None)
+    except Exception:
+        logger.warning("Could not invalidate the cached ban sets.", exc_info=True)
+
+
+def invalidate_ban_sets():
+    """Discard the cached sets after bans changed, so the next lookup
+    rebuilds them. A new generation starts immediately (for this process and
+    this transaction) and again once the surrounding transaction commits, so a
+    rebuild that read the rows before the commit is never served."""
+    _new_generation()
+    transaction.on_commit(_new_generation)
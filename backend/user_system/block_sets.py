@@ -0,0 +1,98 @@
+"""Cached block relationships of one user, shared by the listing endpoints.
+
+The feed, followed feed, tag, saved-posts and search listings all drop
+content by users on either side of a block. Each used to splice
+`user.blocked.all()` and `user.blocked_by.all()` into its main query as two
+NOT IN subqueries, even though most users have blocked nobody and nobody has
+blocked them.
+
+Instead a user's two block sets (ids they blocked, ids that blocked them) are
+read in one query and cached under `block_sets:{user_id}` in the default cache
+for BLOCK_SET_TTL_SECONDS. exclude_blocked applies them to a queryset as a
+literal id list, and skips the exclusion entirely when both sets are empty,
+which is the common case.
+
+toggle_block is the only place blocks are written, and it drops both users'
+sets (forget_blocks). A cache error is logged and the sets are read straight
+from the database for that lookup.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from .constants import BLOCK_SET_TTL_SECONDS
+from .models import UserBlock
+
+logger = logging.getLogger(__name__)
+
+
+def _block_key(user_id):
+    return f'block_sets:{user_id}'
+
+
+def _build(user_id):
+    blocked, blocked_by = set(), set()
+    for blocker_id, blocked_id in UserBlock.objects.filter(
+            Q(user_blocker_id=user_id) | Q(user_blocked_id=user_id)).values_list('user_blocker_id', 'user_blocked_id'):
+        if blocker_id == user_id:
+            blocked.add(blocked_id)
+        else:
+            blocked_by.add(blocker_id)
+    return {'blocked': frozenset(blocked), 'blocked_by': frozenset(blocked_by)}
+
+
+def _block_sets(user):
+    try:
+        sets = cache.get(_block_key(user.pk))
+        if sets is None:
+            sets = _build(user.pk)
+            cache.set(_block_key(user.pk), sets, BLOCK_SET_TTL_SECONDS)
+        return sets
+    except Exception:
+        logger.warning("Could not read the cached block sets for user_id: %s; querying blocks directly.",
+                       user.pk, exc_info=True)
+        return _build(user.pk)
+
+
+def blocked_ids(user):
+    """Ids of the users `user` blocked, as a frozenset."""
+    return _block_sets(user)['blocked']
+
+
+def blocker_ids(user):
+    """Ids of the users who blocked `user`, as a frozenset."""
+    return _block_sets(user)['blocked_by']
+
+
+def blocked_either_way_ids(user):
+    """Ids of the users `user` blocked or was blocked by, as a frozenset."""
+    sets = _block_sets(user)
+    return sets['blocked'] | sets['blocked_by']
+
+
+def exclude_blocked(queryset, user, field='author'):
+    """`queryset` without rows whose `field` is a user on either side of a
+    block with `user`. Unchanged when there are no such users."""
+    ids = blocked_either_way_ids(user)
+    if not ids:
+        return queryset
+    return queryset.exclude(**{f'{field}__in': ids})
+
+
+def _drop(user_ids):
+    try:
+        cache.delete_many([_block_key(user_id) for user_id in user_ids])
+    except Exception:
+        logger.warning("Could not drop the cached block sets for user_ids: %s.", user_ids, exc_info=True)
+
+
+def forget_blocks(*users):
+    """Discard the cached block sets of `users` after a block between them
+    was added or removed. Dropped immediately and again once the surrounding
+    transaction commits, so a concurrent rebuild that read the old rows does
+    not stick."""
+    user_ids = [user.pk for user in users]
+    _drop(user_ids)
+    transaction.on_commit(lambda: _drop(user_ids))
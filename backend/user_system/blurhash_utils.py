@@ -12,12 +12,12 @@ logged and swallowed and the function returns None — in which case the clients
 simply keep their existing plain placeholder.
 """
 import logging
-from io import BytesIO
 
 import blurhash
 from django.conf import settings
-from PIL import Image, ImageOps
 
+from . import client_pool
+from .classifiers.image_context import ImageContext
 from .s3 import _s3_client, image_url_to_key, is_source_bucket_url
 
 logger = logging.getLogger(__name__)
@@ -46,43 +46,55 @@ def _image_to_pixel_rows(image):
     ]
 
 
-def compute_blurhash_for_image_url(image_url):
-    """Return a BlurHash string for the image at ``image_url``, or None on any failure.
+class _NoSourceObject(Exception):
+    """The URL is not an object this module may fetch (see _fetch_source_object)."""
 
-    Fetches the object from the source S3 bucket, downscales it, and encodes a
-    4x3 BlurHash. Never raises: a missing object, unreadable bytes, absent AWS
+
+def _fetch_source_object(image_url):
+    client = _s3_client()
+    if client is None:
+        raise _NoSourceObject("S3 is not configured")
+    key = image_url_to_key(image_url)
+    if not key:
+        raise _NoSourceObject("Could not derive an S3 key")
+    with client_pool.timed('s3'):
+        response = client.get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+        return response['Body'].read()
+
+
+def compute_blurhash_for_image_url(image):
+    """Return a BlurHash string for ``image``, or None on any failure.
+
+    ``image`` is an image URL, fetched here from the source S3 bucket, or the
+    classification worker's ImageContext, whose already fetched image (and
+    thumbnail) is reused. The image is downscaled and encoded as a 4x3
+    BlurHash. Never raises: a missing object, unreadable bytes, absent AWS
     credentials, or an encode error all just yield None so the caller records no
     placeholder and the clients fall back to a plain tile.
     """
-    if not image_url:
+    if not image:
         return None
+    context = ImageContext.of(image, fetch=_fetch_source_object)
     try:
-        client = _s3_client()
-        if client is None:
-            return None
-        # Only ever fetch from our own source bucket. is_source_bucket_url rejects
-        # any URL whose bucket isn't derivable from the host or doesn't match the
-        # configured source bucket (the same SSRF guard make_post applies), so a
-        # look-alike or non-S3 URL can never be coerced into a bucket+key here.
-        if not is_source_bucket_url(image_url):
+        # Only ever encode images from our own source bucket. is_source_bucket_url
+        # rejects any URL whose bucket isn't derivable from the host or doesn't
+        # match the configured source bucket (the same SSRF guard make_post
+        # applies), so a look-alike or non-S3 URL can never be coerced into a
+        # bucket+key here.
+        if not is_source_bucket_url(context.image_url):
             logger.warning("Image URL is not in the source bucket; skipping BlurHash.")
             return None
-        bucket = settings.AWS_STORAGE_BUCKET_NAME
-        key = image_url_to_key(image_url)
-        if not key:
-            logger.warning("Could not derive an S3 key for BlurHash; skipping.")
-            return None
-        response = client.get_object(Bucket=bucket, Key=key)
-        image = Image.open(BytesIO(response['Body'].read()))
         # exif_transpose so the blur matches the orientation the clients render;
-        # convert to RGB so the encoder always sees three 0-255 channels.
-        image = ImageOps.exif_transpose(image).convert('RGB')
-        image.thumbnail((_ENCODE_MAX_DIMENSION, _ENCODE_MAX_DIMENSION))
+        # RGB so the encoder always sees three 0-255 channels.
+        thumbnail = context.thumbnail(_ENCODE_MAX_DIMENSION)
         return blurhash.encode(
-            _image_to_pixel_rows(image),
+            _image_to_pixel_rows(thumbnail),
             BLURHASH_X_COMPONENTS,
             BLURHASH_Y_COMPONENTS,
         )
+    except _NoSourceObject as e:
+        logger.warning("%s for BlurHash; skipping.", e)
+        return None
     except Exception:
         logger.exception("Failed to compute BlurHash for a post image; leaving it unset.")
         return None
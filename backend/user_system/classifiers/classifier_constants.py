@@ -55,6 +55,63 @@ ENV_NUDENET_MODEL_PATH = 'LOCAL_NUDENET_MODEL_PATH'
 # treated like any other failed provider and skipped by the cascade.
 LLM_TIMEOUT_SECONDS = 15
 
+# Per-tier circuit breaker (classifiers/tier_health.py). Each tier's calls are
+# counted in TIER_HEALTH_BUCKET_SECONDS buckets over a rolling
+# TIER_HEALTH_WINDOW_SECONDS window. Once the window holds at least
+# TIER_BREAKER_MIN_CALLS calls and either TIER_BREAKER_ERROR_RATE of them gave
+# no usable score or they averaged TIER_BREAKER_SLOW_SECONDS or more, the
+# tier's breaker opens: the cascade skips it for TIER_BREAKER_COOLDOWN_SECONDS,
+# then lets a single probe call through, which closes the breaker again if it
+# succeeds in time and re-opens it otherwise.
+TIER_HEALTH_WINDOW_SECONDS = 60
+TIER_HEALTH_BUCKET_SECONDS = 10
+TIER_BREAKER_MIN_CALLS = 5
+TIER_BREAKER_ERROR_RATE = 0.5
+TIER_BREAKER_SLOW_SECONDS = 10
+TIER_BREAKER_COOLDOWN_SECONDS = 30
+
+# Hedged cascade calls (classify_with_thresholds). With hedging on, a tier
+# that has not answered within its observed p90 latency gets the next tier's
+# call fired alongside it, and the first usable answer counts. The p90 comes
+# from the tier's usable calls over the last HEDGE_LATENCY_WINDOW_SECONDS,
+# counted into the HEDGE_LATENCY_BOUNDS_MS histogram; until a tier has
+# HEDGE_MIN_SAMPLES of them it is hedged after HEDGE_DEFAULT_DELAY_SECONDS.
+# Every hedge is an extra paid call, so all workers together fire at most
+# CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE of them per minute. The env var of the
+# same name sets the budget; 0, the default, turns hedging off.
+CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE = 0
+HEDGE_LATENCY_WINDOW_SECONDS = 30 * 60
+HEDGE_LATENCY_BUCKET_SECONDS = 5 * 60
+HEDGE_LATENCY_BOUNDS_MS = (250, 500, 1000, 2000, 3000, 5000, 8000, 12000)
+HEDGE_MIN_SAMPLES = 20
+HEDGE_DEFAULT_DELAY_SECONDS = 5
+
+# Batched text classification (classifiers/text_batcher.py). Texts classified
+# at the same time in one worker process share a single call to the cheapest
+# tier: the first text opens a batch, which is sent once it holds
+# TEXT_BATCH_SIZE texts or TEXT_BATCH_WAIT_MS after it opened, whichever comes
+# first. The reply is read as one "probability,rule" pair per text; texts it
+# settles skip their own call to that tier, and the rest (ambiguous scores,
+# missing answers) continue through the cascade one by one. The env vars
+# CLASSIFICATION_TEXT_BATCH_SIZE and CLASSIFICATION_TEXT_BATCH_WAIT_MS override
+# these; a size of 1, the default, turns batching off.
+TEXT_BATCH_SIZE = 1
+TEXT_BATCH_WAIT_MS = 50
+# Reply budget per text in a batch: "12: 0.95,0" plus the newline.
+TEXT_BATCH_MAX_TOKENS_PER_ITEM = 12
+
+# How an image is sent to the vision models. The full-resolution upload used to
+# go out as a lossless PNG, several megabytes of base64 per tier, although the
+# models downscale to roughly a megapixel on their side anyway. It is now
+# downscaled to VISION_IMAGE_MAX_DIMENSION on its longest side and encoded once
+# as a VISION_IMAGE_FORMAT ('jpeg' or 'webp') at VISION_IMAGE_QUALITY, then
+# reused by every tier and the categorizer. Each can be overridden by the env
+# var of the same name.
+VISION_IMAGE_MAX_DIMENSION = 1024
+VISION_IMAGE_FORMAT = 'jpeg'
+VISION_IMAGE_QUALITY = 85
+VISION_IMAGE_FORMATS = frozenset({'jpeg', 'webp'})
+
 _CONTENT_RULES = (
     "1. No swear words\n"
     "2. No nudity\n"
@@ -122,6 +179,24 @@ TEXT_CLASSIFIER_PROMPT = (
     + "\nText: \"{text}\""
 )
 
+# The batched form of TEXT_CLASSIFIER_PROMPT. Each text goes in as a JSON
+# string on its own numbered line, so a caption can't add lines (or answers)
+# of its own.
+TEXT_BATCH_CLASSIFIER_PROMPT = (
+    "For each of the numbered texts below, how likely is it to be positive, "
+    "neutral, or otherwise acceptable? Judge every text on its own. "
+    "Text is acceptable if it follows these rules:\n"
+    + _CONTENT_RULES
+    + _CONTENT_ALLOWANCES
+    + "Answer with one line per text, in order, and nothing else. Each line is the "
+    "text's number, a colon, and then two numbers separated by a comma. The first "
+    "is a number between 0.00 and 1.00 representing the probability that the text "
+    "is acceptable, where 1.00 means clearly acceptable and 0.00 means clearly "
+    "unacceptable. The second is the number of the single rule above that the text "
+    "most risks violating, or 0 if none. For example: 1: 0.95,0\n"
+    "\nTexts:\n{texts}"
+)
+
 IMAGE_CLASSIFIER_PROMPT = (
     "How likely is this image to be positive, neutral, or otherwise acceptable? "
     "An image is acceptable if it follows these rules:\n"
@@ -1,16 +1,30 @@
 import os
 import re
+import time
+import asyncio
 import logging
 import base64
-from collections import Counter
+import json
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import aclosing
 from io import BytesIO
 from dataclasses import dataclass, field
+import httpx
+from asgiref.sync import sync_to_async
 import openai as openai_lib
+from PIL import Image, ImageOps
 from .classifier_constants import (
     OPENROUTER_BASE_URL,
     REJECT_THRESHOLD, ALLOW_THRESHOLD, LLM_TIMEOUT_SECONDS,
     RULE_REASON_CODES, GENERIC_REASON_CODE, REASON_PHRASES,
+    VISION_IMAGE_MAX_DIMENSION, VISION_IMAGE_FORMAT, VISION_IMAGE_QUALITY,
+    VISION_IMAGE_FORMATS, CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE,
+    TEXT_BATCH_MAX_TOKENS_PER_ITEM,
 )
+from . import tier_health
+from .. import client_pool
+from ..constants import CLASSIFICATION_THREADS
 
 logger = logging.getLogger(__name__)
 
@@ -145,6 +159,27 @@ def parse_probability_and_rule(text):
     return parse_probability(text), None
 
 
+_BATCH_ANSWER_RE = re.compile(r'^\s*(\d+)\s*[:.)]\s*(\d+(?:\.\d+)?|\.\d+)\s*,\s*(\d+)', re.MULTILINE)
+
+
+def parse_probability_and_rule_batch(text, count):
+    """Batch counterpart to parse_probability_and_rule: reads a reply with one
+    "n: probability,rule" line per item and returns a list of `count` entries,
+    each a (probability, rule_number) pair or None for an item the reply gave
+    no well-formed, in-range answer for. As with the single parser, the last
+    answer per item wins, so an echoed example doesn't shadow the real one.
+    """
+    answers = [None] * count
+    for index_str, prob_str, rule_str in _BATCH_ANSWER_RE.findall(str(text)):
+        index, prob = int(index_str), float(prob_str)
+        if 1 <= index <= count and prob <= 1.0:
+            answers[index - 1] = (prob, int(rule_str) or None)
+    missing = answers.count(None)
+    if missing:
+        logger.warning("Batch reply had no usable answer for %d of %d items: %r", missing, count, text)
+    return answers
+
+
 def _normalize_call_result(value):
     """Maps a call_fn result to (score, reason_code).
 
@@ -174,6 +209,49 @@ def _pick_rejection_reason(scores, cited_codes):
     return next(code for code in reversed(cited) if counts[code] == best)
 
 
+class _Cascade:
+    """The zones of classify_with_thresholds, applied to one usable score at a
+    time."""
+
+    def __init__(self):
+        self.scores = []
+        self.cited_codes = []
+
+    def _rejection(self, appealable):
+        return ClassificationResult(
+            allowed=False, appealable=appealable, scores=self.scores,
+            reason_code=_pick_rejection_reason(self.scores, self.cited_codes))
+
+    def add(self, api_name, score, reason_code):
+        """The result once this score decides it, else None (ask the next AI)."""
+        self.scores.append(score)
+        self.cited_codes.append(reason_code)
+        zone = get_zone(score)
+        stage = len(self.scores)
+        logger.info("AI #%d (%s) scored %.2f (cited rule: %s) -> %s zone",
+                    stage, api_name, score, reason_code, zone)
+
+        if zone == ZONE_ALLOW:
+            return ClassificationResult(allowed=True, scores=self.scores)
+        if stage == 1 and zone == ZONE_REJECT:
+            return self._rejection(appealable=False)
+        if stage == 3:
+            return self._rejection(appealable=(zone == ZONE_MIDDLE))
+        # Middle zone (or reject zone at stage 2): escalate to the next AI.
+        return None
+
+    def exhausted(self):
+        """The result when no AI is left to ask."""
+        if not self.scores:
+            logger.warning("No AI produced a usable score; flagging a provider failure "
+                           "(not a content verdict) so the caller can retry.")
+            return ClassificationResult(allowed=False, provider_failure=True)
+
+        appealable = get_zone(self.scores[-1]) == ZONE_MIDDLE
+        logger.info("Cascade exhausted available AIs. Rejecting (appealable=%s).", appealable)
+        return self._rejection(appealable=appealable)
+
+
 def classify_with_thresholds(available_apis, call_fn):
     """
     Cascades through up to 3 AIs using probability zones.
@@ -189,70 +267,290 @@ def classify_with_thresholds(available_apis, call_fn):
     APIs are consulted in the given priority order (cheapest models first, Claude
     last — issue #393), so clear content is usually settled by the cheap tier
     and only ambiguous content escalates to the pricier ones. An API that
-    errors or returns an unparseable score is skipped as if unavailable. With
-    no usable scores at all the content is rejected and not appealable.
+    errors or returns an unparseable score is skipped as if unavailable, and so
+    is one whose circuit breaker is open (see tier_health). With no usable
+    scores at all the result is a provider failure, for the caller to retry.
+
+    With hedging on (hedge_budget() > 0) a tier that is slower than its p90
+    gets the next tier called alongside it, and usable scores count in the
+    order they arrive; the zones above apply to them unchanged.
     """
     if not available_apis:
         return ClassificationResult(allowed=False, provider_failure=True)
 
     order = list(available_apis)
-    scores = []
-    cited_codes = []
-
-    def rejection(appealable):
-        return ClassificationResult(
-            allowed=False, appealable=appealable, scores=scores,
-            reason_code=_pick_rejection_reason(scores, cited_codes))
+    cascade = _Cascade()
+    budget = hedge_budget()
+    usable_scores = _hedged_scores(order, call_fn, budget) if budget else _sequential_scores(order, call_fn)
+    for api_name, score, reason_code in usable_scores:
+        result = cascade.add(api_name, score, reason_code)
+        if result is not None:
+            return result
+    return cascade.exhausted()
+
+
+async def aclassify_with_thresholds(available_apis, acall_fn):
+    """classify_with_thresholds on the running event loop, for an `acall_fn`
+    that returns a coroutine: the zones, circuit breakers and hedging are the
+    same, but the tiers' calls are awaited (and a hedge runs as another task)
+    rather than made on threads. The async classification worker uses this."""
+    if not available_apis:
+        return ClassificationResult(allowed=False, provider_failure=True)
 
+    order = list(available_apis)
+    cascade = _Cascade()
+    budget = hedge_budget()
+    usable_scores = _ahedged_scores(order, acall_fn, budget) if budget else _asequential_scores(order, acall_fn)
+    async with aclosing(usable_scores):
+        async for api_name, score, reason_code in usable_scores:
+            result = cascade.add(api_name, score, reason_code)
+            if result is not None:
+                return result
+    return cascade.exhausted()
+
+
+# Runs the calls of a hedged cascade. Kept apart from the task executor that
+# runs the cascades themselves: a cascade waits on these calls, and waiting on
+# work queued behind it in the same bounded pool could deadlock.
+_HEDGE_EXECUTOR = ThreadPoolExecutor(max_workers=CLASSIFICATION_THREADS, thread_name_prefix="hedge")
+
+
+def hedge_budget():
+    """Hedged calls allowed per minute across all workers; 0 (the default)
+    turns hedging off. CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE overrides it."""
+    try:
+        return max(0, int(os.environ.get('CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE',
+                                         CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE)))
+    except ValueError:
+        logger.warning("Ignoring invalid CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE; not hedging.")
+        return 0
+
+
+def _call_tier(api_name, call_fn, permit):
+    """(score, reason_code) from one tier, recorded in its health under
+    `permit` (tier_health.allow_call's answer)."""
+    started = time.monotonic()
+    score, reason_code = _normalize_call_result(call_fn(api_name))
+    tier_health.record(api_name, score is not None, time.monotonic() - started, permit)
+    if score is None:
+        logger.warning("API %s returned no usable score; skipping it.", api_name)
+    return score, reason_code
+
+
+def _sequential_scores(order, call_fn):
+    """(api_name, score, reason_code) for each usable score, calling the
+    tiers one at a time in `order`."""
     for api_name in order:
-        score, reason_code = _normalize_call_result(call_fn(api_name))
-        if score is None:
-            logger.warning("API %s returned no usable score; skipping it.", api_name)
+        permit = tier_health.allow_call(api_name)
+        if not permit:
+            logger.info("Circuit breaker for API %s is open; skipping it.", api_name)
             continue
+        score, reason_code = _call_tier(api_name, call_fn, permit)
+        if score is not None:
+            yield api_name, score, reason_code
+
+
+def _hedged_scores(order, call_fn, budget):
+    """Like _sequential_scores, but when the latest tier called has not
+    answered within its p90 the next tier is called too (one hedge from the
+    shared per-minute `budget`), and usable scores are yielded as they arrive.
+    Each time the cascade asks for another score the next tier is called at
+    once, as in the sequential cascade, whatever is still in flight; only the
+    speculative calls made on a p90 timeout spend the budget. Calls still
+    running when the cascade decides are left to finish on their own; their
+    outcome only feeds the tiers' health."""
+    pending = deque(order)
+    in_flight = {}
+    # The calls started for the score the cascade is waiting on now.
+    current = set()
+    latest = None
+    hedging = True
+
+    def launch():
+        nonlocal latest
+        while pending:
+            api_name = pending.popleft()
+            permit = tier_health.allow_call(api_name)
+            if permit:
+                future = _HEDGE_EXECUTOR.submit(_call_tier, api_name, call_fn, permit)
+                in_flight[future] = api_name
+                current.add(future)
+                latest = (api_name, time.monotonic() + tier_health.latency_p90(api_name))
+                return
+            logger.info("Circuit breaker for API %s is open; skipping it.", api_name)
+
+    launch()
+    while in_flight:
+        timeout = max(0.0, latest[1] - time.monotonic()) if hedging and pending and current else None
+        done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            if tier_health.try_hedge(budget):
+                logger.info("API %s has not answered within its p90; hedging with the next tier.", latest[0])
+                launch()
+            else:
+                logger.info("Hedge budget of %d/min spent; waiting on API %s.", budget, latest[0])
+                hedging = False
+            continue
+        for future in done:
+            api_name = in_flight.pop(future)
+            current.discard(future)
+            score, reason_code = future.result()
+            if score is not None:
+                yield api_name, score, reason_code
+                # The cascade wants another score: the calls already in flight
+                # were started for an earlier one.
+                current.clear()
+        if not current:
+            launch()
+
+
+async def _acall_tier(api_name, acall_fn, permit):
+    """_call_tier for a coroutine `acall_fn`; the health bookkeeping (a cache
+    write) runs off the loop."""
+    started = time.monotonic()
+    score, reason_code = _normalize_call_result(await acall_fn(api_name))
+    await sync_to_async(tier_health.record)(api_name, score is not None, time.monotonic() - started, permit)
+    if score is None:
+        logger.warning("API %s returned no usable score; skipping it.", api_name)
+    return score, reason_code
+
+
+async def _asequential_scores(order, acall_fn):
+    """_sequential_scores, awaiting each tier's call in turn."""
+    for api_name in order:
+        permit = await sync_to_async(tier_health.allow_call)(api_name)
+        if not permit:
+            logger.info("Circuit breaker for API %s is open; skipping it.", api_name)
+            continue
+        score, reason_code = await _acall_tier(api_name, acall_fn, permit)
+        if score is not None:
+            yield api_name, score, reason_code
+
+
+# Hedged calls still running when their cascade decided. The loop only keeps
+# weak references to its tasks, so they are held here until they finish.
+_STRAGGLERS = set()
+
+
+async def _ahedged_scores(order, acall_fn, budget):
+    """_hedged_scores with each call a task on the running loop. A call still
+    running when the cascade decides is left to finish on its own, as there;
+    its outcome only feeds the tier's health."""
+    pending = deque(order)
+    in_flight = {}
+    # The calls started for the score the cascade is waiting on now.
+    current = set()
+    latest = None
+    hedging = True
+
+    async def launch():
+        nonlocal latest
+        while pending:
+            api_name = pending.popleft()
+            permit = await sync_to_async(tier_health.allow_call)(api_name)
+            if permit:
+                task = asyncio.ensure_future(_acall_tier(api_name, acall_fn, permit))
+                in_flight[task] = api_name
+                current.add(task)
+                p90 = await sync_to_async(tier_health.latency_p90)(api_name)
+                latest = (api_name, time.monotonic() + p90)
+                return
+            logger.info("Circuit breaker for API %s is open; skipping it.", api_name)
+
+    await launch()
+    try:
+        while in_flight:
+            timeout = max(0.0, latest[1] - time.monotonic()) if hedging and pending and current else None
+            done, _ = await asyncio.wait(set(in_flight), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                if await sync_to_async(tier_health.try_hedge)(budget):
+                    logger.info("API %s has not answered within its p90; hedging with the next tier.", latest[0])
+                    await launch()
+                else:
+                    logger.info("Hedge budget of %d/min spent; waiting on API %s.", budget, latest[0])
+                    hedging = False
+                continue
+            for task in done:
+                api_name = in_flight.pop(task)
+                current.discard(task)
+                score, reason_code = task.result()
+                if score is not None:
+                    yield api_name, score, reason_code
+                    # The cascade wants another score: the calls already in
+                    # flight were started for an earlier one.
+                    current.clear()
+            if not current:
+                await launch()
+    finally:
+        for task in in_flight:
+            _STRAGGLERS.add(task)
+            task.add_done_callback(_STRAGGLERS.discard)
+
+
+def _build_openrouter_client(api_key):
+    # OpenRouter is OpenAI-compatible, so the openai SDK talks to it by simply
+    # pointing base_url at the gateway. One key covers every model. The HTTP
+    # pool keeps a connection alive per classification thread.
+    limits = httpx.Limits(max_connections=client_pool.POOL_SIZE,
+                          max_keepalive_connections=client_pool.POOL_SIZE)
+    return openai_lib.OpenAI(api_key=api_key, base_url=OPENROUTER_BASE_URL, timeout=LLM_TIMEOUT_SECONDS,
+                             http_client=httpx.Client(limits=limits, timeout=LLM_TIMEOUT_SECONDS))
 
-        scores.append(score)
-        cited_codes.append(reason_code)
-        zone = get_zone(score)
-        stage = len(scores)
-        logger.info("AI #%d (%s) scored %.2f (cited rule: %s) -> %s zone",
-                    stage, api_name, score, reason_code, zone)
 
-        if zone == ZONE_ALLOW:
-            return ClassificationResult(allowed=True, scores=scores)
-        if stage == 1 and zone == ZONE_REJECT:
-            return rejection(appealable=False)
-        if stage == 3:
-            return rejection(appealable=(zone == ZONE_MIDDLE))
-        # Middle zone (or reject zone at stage 2): escalate to the next AI.
+def _openrouter_client():
+    """The process's pooled OpenRouter client (see client_pool)."""
+    return client_pool.get_client('openrouter', _build_openrouter_client, os.environ.get('OPENROUTER_API_KEY'))
 
-    if not scores:
-        logger.warning("No AI produced a usable score; flagging a provider failure "
-                       "(not a content verdict) so the caller can retry.")
-        return ClassificationResult(allowed=False, provider_failure=True)
 
-    appealable = get_zone(scores[-1]) == ZONE_MIDDLE
-    logger.info("Cascade exhausted available AIs. Rejecting (appealable=%s).", appealable)
-    return rejection(appealable=appealable)
+def _build_async_openrouter_client(api_key, loop):
+    # `loop` only keys the pool: an async connection pool belongs to the event
+    # loop it was opened on, so each loop gets a client of its own.
+    limits = httpx.Limits(max_connections=client_pool.POOL_SIZE,
+                          max_keepalive_connections=client_pool.POOL_SIZE)
+    return openai_lib.AsyncOpenAI(api_key=api_key, base_url=OPENROUTER_BASE_URL, timeout=LLM_TIMEOUT_SECONDS,
+                                  http_client=httpx.AsyncClient(limits=limits, timeout=LLM_TIMEOUT_SECONDS))
 
 
-def _openrouter_client():
-    # OpenRouter is OpenAI-compatible, so the openai SDK talks to it by simply
-    # pointing base_url at the gateway. One key covers every model.
-    api_key = os.environ.get('OPENROUTER_API_KEY')
-    return openai_lib.OpenAI(api_key=api_key, base_url=OPENROUTER_BASE_URL, timeout=LLM_TIMEOUT_SECONDS)
+def _async_openrouter_client():
+    """The running event loop's pooled async OpenRouter client."""
+    return client_pool.get_client('openrouter_async', _build_async_openrouter_client,
+                                  os.environ.get('OPENROUTER_API_KEY'), asyncio.get_running_loop())
+
+
+def _text_messages(prompt):
+    return [{"role": "user", "content": prompt}]
+
+
+def _batch_prompt(texts, prompt_template):
+    numbered = '\n'.join(f'{n}: {json.dumps(text, ensure_ascii=False)}' for n, text in enumerate(texts, 1))
+    return prompt_template.format(texts=numbered)
 
 
 def call_text_openrouter(text, prompt_template, model):
     client = _openrouter_client()
     prompt = prompt_template.format(text=text)
-    response = client.chat.completions.create(
-        model=model,
-        max_tokens=16,
-        messages=[{"role": "user", "content": prompt}]
-    )
+    with client_pool.timed('openrouter'):
+        response = client.chat.completions.create(
+            model=model,
+            max_tokens=16,
+            messages=_text_messages(prompt)
+        )
     return parse_probability_and_rule(response.choices[0].message.content)
 
 
+def call_text_openrouter_batch(texts, prompt_template, model):
+    """Scores several texts with one call; returns one (probability, rule)
+    pair or None per text, in order (see parse_probability_and_rule_batch)."""
+    client = _openrouter_client()
+    with client_pool.timed('openrouter'):
+        response = client.chat.completions.create(
+            model=model,
+            max_tokens=TEXT_BATCH_MAX_TOKENS_PER_ITEM * len(texts),
+            messages=_text_messages(_batch_prompt(texts, prompt_template))
+        )
+    return parse_probability_and_rule_batch(response.choices[0].message.content, len(texts))
+
+
 def call_text_openrouter_raw(prompt, model, max_tokens=64):
     """Send a fully-formed text prompt and return the raw model reply string.
 
@@ -262,58 +560,159 @@ def call_text_openrouter_raw(prompt, model, max_tokens=64):
     short comma-separated list.
     """
     client = _openrouter_client()
-    response = client.chat.completions.create(
-        model=model,
-        max_tokens=max_tokens,
-        messages=[{"role": "user", "content": prompt}]
-    )
+    with client_pool.timed('openrouter'):
+        response = client.chat.completions.create(
+            model=model,
+            max_tokens=max_tokens,
+            messages=_text_messages(prompt)
+        )
+    return response.choices[0].message.content
+
+
+# The coroutine counterparts of the calls above, for the async classification
+# worker: the same requests, sent over the loop's async client.
+async def acall_text_openrouter(text, prompt_template, model):
+    client = _async_openrouter_client()
+    with client_pool.timed('openrouter'):
+        response = await client.chat.completions.create(
+            model=model,
+            max_tokens=16,
+            messages=_text_messages(prompt_template.format(text=text))
+        )
+    return parse_probability_and_rule(response.choices[0].message.content)
+
+
+async def acall_text_openrouter_batch(texts, prompt_template, model):
+    client = _async_openrouter_client()
+    with client_pool.timed('openrouter'):
+        response = await client.chat.completions.create(
+            model=model,
+            max_tokens=TEXT_BATCH_MAX_TOKENS_PER_ITEM * len(texts),
+            messages=_text_messages(_batch_prompt(texts, prompt_template))
+        )
+    return parse_probability_and_rule_batch(response.choices[0].message.content, len(texts))
+
+
+async def acall_text_openrouter_raw(prompt, model, max_tokens=64):
+    client = _async_openrouter_client()
+    with client_pool.timed('openrouter'):
+        response = await client.chat.completions.create(
+            model=model,
+            max_tokens=max_tokens,
+            messages=_text_messages(prompt)
+        )
     return response.choices[0].message.content
 
 
-def _image_to_base64_png(image):
+def vision_image_settings():
+    """(max_dimension, format, quality) for vision payloads: the
+    VISION_IMAGE_* defaults, honoring an env override of each."""
+    def _int(name, default):
+        try:
+            return max(1, int(os.environ.get(name, default)))
+        except ValueError:
+            logger.warning("Ignoring invalid %s; using %s.", name, default)
+            return default
+
+    image_format = os.environ.get('VISION_IMAGE_FORMAT', VISION_IMAGE_FORMAT).lower()
+    if image_format not in VISION_IMAGE_FORMATS:
+        logger.warning("Ignoring unsupported VISION_IMAGE_FORMAT %r; using %s.", image_format, VISION_IMAGE_FORMAT)
+        image_format = VISION_IMAGE_FORMAT
+    return (_int('VISION_IMAGE_MAX_DIMENSION', VISION_IMAGE_MAX_DIMENSION), image_format,
+            min(100, _int('VISION_IMAGE_QUALITY', VISION_IMAGE_QUALITY)))
+
+
+def encode_vision_image(image, settings=None):
+    """The data URL a vision model is sent for the PIL `image`: rotated upright
+    (EXIF orientation), transparency flattened onto white, downscaled to fit
+    the max dimension and encoded in the configured lossy format."""
+    max_dimension, image_format, quality = settings or vision_image_settings()
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        rgba = image.convert('RGBA')
+        flattened = Image.new('RGB', rgba.size, 'white')
+        flattened.paste(rgba, mask=rgba.getchannel('A'))
+        image = flattened
+    else:
+        image = image.convert('RGB')
+    image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
     buffer = BytesIO()
-    image.save(buffer, format='PNG')
-    return base64.standard_b64encode(buffer.getvalue()).decode('utf-8')
+    image.save(buffer, format=image_format.upper(), quality=quality)
+    encoded = base64.standard_b64encode(buffer.getvalue()).decode('utf-8')
+    return f"data:image/{image_format};base64,{encoded}"
+
+
+def _vision_data_url(image):
+    # The worker passes the data URL its ImageContext already encoded, so every
+    # tier reuses one encoding; direct callers may still pass a PIL image.
+    return image if isinstance(image, str) else encode_vision_image(image)
+
+
+def _vision_messages(image, prompt):
+    return [{
+        "role": "user",
+        "content": [
+            {"type": "image_url", "image_url": {"url": _vision_data_url(image)}},
+            {"type": "text", "text": prompt}
+        ]
+    }]
 
 
 def call_image_openrouter(image, prompt, model):
     client = _openrouter_client()
-    image_data = _image_to_base64_png(image)
-    response = client.chat.completions.create(
-        model=model,
-        max_tokens=16,
-        messages=[{
-            "role": "user",
-            "content": [
-                {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_data}"}},
-                {"type": "text", "text": prompt}
-            ]
-        }]
-    )
+    messages = _vision_messages(image, prompt)
+    with client_pool.timed('openrouter'):
+        response = client.chat.completions.create(
+            model=model,
+            max_tokens=16,
+            messages=messages
+        )
     return parse_probability_and_rule(response.choices[0].message.content)
 
 
 def call_image_openrouter_raw(image, prompt, model, max_tokens=64):
     """Image counterpart to call_text_openrouter_raw: returns the raw reply."""
     client = _openrouter_client()
-    image_data = _image_to_base64_png(image)
-    response = client.chat.completions.create(
-        model=model,
-        max_tokens=max_tokens,
-        messages=[{
-            "role": "user",
-            "content": [
-                {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_data}"}},
-                {"type": "text", "text": prompt}
-            ]
-        }]
-    )
+    messages = _vision_messages(image, prompt)
+    with client_pool.timed('openrouter'):
+        response = client.chat.completions.create(
+            model=model,
+            max_tokens=max_tokens,
+            messages=messages
+        )
+    return response.choices[0].message.content
+
+
+# The async worker always passes the data URL its ImageContext encoded off the
+# loop, so building these messages never encodes an image on it.
+async def acall_image_openrouter(image, prompt, model):
+    client = _async_openrouter_client()
+    messages = _vision_messages(image, prompt)
+    with client_pool.timed('openrouter'):
+        response = await client.chat.completions.create(
+            model=model,
+            max_tokens=16,
+            messages=messages
+        )
+    return parse_probability_and_rule(response.choices[0].message.content)
+
+
+async def acall_image_openrouter_raw(image, prompt, model, max_tokens=64):
+    client = _async_openrouter_client()
+    messages = _vision_messages(image, prompt)
+    with client_pool.timed('openrouter'):
+        response = await client.chat.completions.create(
+            model=model,
+            max_tokens=max_tokens,
+            messages=messages
+        )
     return response.choices[0].message.content
 
 
 # One entry per cascade tier. Each binds its tier's OpenRouter model (resolved
 # at call time so an env override takes effect without reimport) and keeps the
-# (content, prompt) signature the classifiers call with.
+# (content, prompt) signature the classifiers call with. The A* tables return
+# coroutines, for the async classification worker.
 def _text_caller(api_name):
     return lambda text, prompt: call_text_openrouter(text, prompt, model_for(api_name))
 
@@ -322,6 +721,18 @@ def _image_caller(api_name):
     return lambda image, prompt: call_image_openrouter(image, prompt, model_for(api_name))
 
 
+def _atext_caller(api_name):
+    return lambda text, prompt: acall_text_openrouter(text, prompt, model_for(api_name))
+
+
+def _aimage_caller(api_name):
+    return lambda image, prompt: acall_image_openrouter(image, prompt, model_for(api_name))
+
+
 TEXT_API_DISPATCH = {api: _text_caller(api) for api in CASCADE_ORDER}
 
 IMAGE_API_DISPATCH = {api: _image_caller(api) for api in CASCADE_ORDER}
+
+ATEXT_API_DISPATCH = {api: _atext_caller(api) for api in CASCADE_ORDER}
+
+AIMAGE_API_DISPATCH = {api: _aimage_caller(api) for api in CASCADE_ORDER}
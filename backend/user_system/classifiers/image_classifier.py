@@ -1,50 +1,45 @@
 import os
+import asyncio
 import boto3
 import logging
-from botocore.config import Config
 from PIL import Image
 from io import BytesIO
 from urllib.parse import urlparse
+from asgiref.sync import sync_to_async
 from .classifier_constants import POSITIVE_IMAGE_FILENAME, IMAGE_CLASSIFIER_PROMPT
 from .classifier_utils import (
-    get_available_apis, classify_with_thresholds, ClassificationResult,
-    IMAGE_API_DISPATCH,
+    get_available_apis, classify_with_thresholds, aclassify_with_thresholds, ClassificationResult,
+    IMAGE_API_DISPATCH, AIMAGE_API_DISPATCH,
 )
-from . import image_prefilter
+from . import image_prefilter, verdict_cache
+from .image_context import ImageContext
+from .. import client_pool
+from ..s3 import pooled_async_http_client, pooled_s3_client
 from ..utils import convert_to_bool
 
 logger = logging.getLogger(__name__)
 
+# The async fetch's presigned GET is used at once, so it need only outlive
+# one request.
+_PRESIGNED_FETCH_EXPIRES_SECONDS = 60
+
 
 def _testing_mode():
     testing = os.environ.get("TESTING", False)
     return testing if isinstance(testing, bool) else convert_to_bool(testing)
 
 
-def load_image_from_url(image_url):
-    """Fetch an S3-backed image URL and return it as a PIL Image.
-
-    Extracted from is_image_positive so the same S3-URL parsing + fetch serves
-    both the moderation cascade and the interest categorizer. Raises on any
-    problem (missing AWS credentials, an undeterminable bucket, a failed fetch,
-    unreadable bytes) — callers treat that as infrastructure failure, never a
-    content verdict. Contains no probability/verdict logic of its own.
-    """
+def _s3_object(image_url):
+    """(pooled S3 client, bucket, key) for an S3-backed image URL. Raises on
+    missing AWS credentials or an undeterminable bucket."""
     aws_access_key = os.environ.get("AWS_ACCESS_KEY_ID")
     aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
     if not aws_access_key or not aws_secret_key:
         raise ValueError("Missing AWS credentials for image fetch")
 
     region = os.environ.get("AWS_REGION", "us-east-1")
-    logger.debug("Creating S3 client in region: %s", region)
-    # Bound the S3 fetch so a slow/unreachable bucket can't hang the caller.
-    s3 = boto3.client(
-        's3',
-        aws_access_key_id=aws_access_key,
-        aws_secret_access_key=aws_secret_key,
-        region_name=region,
-        config=Config(connect_timeout=5, read_timeout=10, retries={'max_attempts': 2})
-    )
+    # The same pooled, timeout-bounded client the rest of the backend uses.
+    s3 = pooled_s3_client(aws_access_key, aws_secret_key, region, factory=boto3.client)
 
     bucket_name = os.environ.get("AWS_STORAGE_BUCKET_NAME")
     key = image_url
@@ -97,26 +92,68 @@ def load_image_from_url(image_url):
         raise ValueError(
             f"Could not determine S3 bucket name from URL={image_url} and AWS_STORAGE_BUCKET_NAME is unset")
 
+    return s3, bucket_name, key
+
+
+def load_image_bytes_from_url(image_url):
+    """Fetch an S3-backed image URL and return its raw bytes.
+
+    Extracted from is_image_positive so the same S3-URL parsing + fetch serves
+    both the moderation cascade and the interest categorizer. Raises on any
+    problem (missing AWS credentials, an undeterminable bucket, a failed fetch)
+    — callers treat that as infrastructure failure, never a content verdict.
+    Contains no probability/verdict logic of its own.
+    """
+    s3, bucket_name, key = _s3_object(image_url)
     logger.info("Fetching image from S3 — bucket=%s key=%s", bucket_name, key)
-    response = s3.get_object(Bucket=bucket_name, Key=key)
+    with client_pool.timed('s3'):
+        response = s3.get_object(Bucket=bucket_name, Key=key)
+        data = response['Body'].read()
     content_length = response.get('ContentLength', 'unknown')
     content_type = response.get('ContentType', 'unknown')
     logger.debug("S3 object fetched — ContentLength=%s ContentType=%s", content_length, content_type)
-    image_data = response['Body'].read()
+    return data
+
+
+async def aload_image_bytes_from_url(image_url):
+    """load_image_bytes_from_url on the running event loop: the same object,
+    fetched with a short-lived presigned GET over the loop's async HTTP client
+    (signing the URL is local, so boto3 never touches the network here).
+    Raises as load_image_bytes_from_url does, and on an error status."""
+    s3, bucket_name, key = _s3_object(image_url)
+    url = s3.generate_presigned_url('get_object', Params={'Bucket': bucket_name, 'Key': key},
+                                    ExpiresIn=_PRESIGNED_FETCH_EXPIRES_SECONDS)
+    logger.info("Fetching image from S3 (async) — bucket=%s key=%s", bucket_name, key)
+    with client_pool.timed('s3'):
+        response = await pooled_async_http_client().get(url)
+        response.raise_for_status()
+    logger.debug("S3 object fetched — ContentLength=%s ContentType=%s",
+                 response.headers.get('Content-Length', 'unknown'), response.headers.get('Content-Type', 'unknown'))
+    return response.content
+
+
+def open_image(image_data):
+    """Open fetched image bytes as a PIL Image; raises on unreadable bytes."""
     image = Image.open(BytesIO(image_data))
     logger.debug("PIL image opened — size=%s mode=%s", image.size, image.mode)
     return image
 
 
-def is_image_positive(image_url):
-    _p = urlparse(image_url)
-    logger.debug("is_image_positive called with URL: %s", _p._replace(query='', fragment='').geturl())
+def load_image_from_url(image_url):
+    """Fetch an S3-backed image URL and return it as a PIL Image (see
+    load_image_bytes_from_url)."""
+    return open_image(load_image_bytes_from_url(image_url))
 
+
+def _settle_without_cascade(context):
+    """(result, available_apis), where `result` is already the answer for the
+    image when no cascade runs: in testing mode, or with no API to ask."""
+    image_url = context.image_url
     if _testing_mode():
         parsed_url = urlparse(image_url)
         allowed = parsed_url.path.endswith(POSITIVE_IMAGE_FILENAME)
         logger.debug("Testing mode - path=%s endswith %s -> %s", parsed_url.path, POSITIVE_IMAGE_FILENAME, allowed)
-        return ClassificationResult(allowed=allowed)
+        return ClassificationResult(allowed=allowed), []
 
     logger.debug("Checking available AI APIs for image classification")
     available_apis = get_available_apis()
@@ -124,10 +161,40 @@ def is_image_positive(image_url):
 
     if not available_apis:
         logger.error("No AI API keys available.")
-        return ClassificationResult(allowed=False, provider_failure=True)
+        return ClassificationResult(allowed=False, provider_failure=True), []
+    return None, available_apis
+
+
+def _screen(context):
+    """(rejection, payload) for the decoded image: the local pre-filter's
+    rejection, or else the vision payload to send the cascade."""
+    # Blunt, zero-API local pre-filter (issue #393) runs before the paid
+    # cascade: a confident nudity/gore hit is a final rejection, exactly
+    # like the text pre-filter. It fails open (allows) when its optional
+    # models are absent, so this can only ever add a rejection the cascade
+    # might also have made — never fail the image on infrastructure.
+    prefilter_result = image_prefilter.prefilter_image(context.image)
+    if not prefilter_result:
+        logger.info("Image rejected by local pre-filter (reason=%s); skipping AI cascade.",
+                    prefilter_result.public_reason_code())
+        return prefilter_result, None
+    # Downscaled and encoded once, then sent to every tier the cascade asks.
+    return None, context.vision_payload()
+
+
+def is_image_positive(image):
+    """Moderate `image`: an S3 image URL, or the worker's ImageContext for it
+    (whose fetch and decode are then shared with the job's other consumers)."""
+    context = ImageContext.of(image)
+    image_url = context.image_url
+    _p = urlparse(image_url)
+    logger.debug("is_image_positive called with URL: %s", _p._replace(query='', fragment='').geturl())
+    settled, available_apis = _settle_without_cascade(context)
+    if settled is not None:
+        return settled
 
     try:
-        image = load_image_from_url(image_url)
+        image_digest = context.digest
     except Exception:
         # The image could not even be fetched/opened (missing creds, bad URL,
         # S3 fetch failed, unreadable bytes). Infrastructure, not content: mark
@@ -136,17 +203,27 @@ def is_image_positive(image_url):
         logger.exception("Error fetching image for classification: %s", image_url)
         return ClassificationResult(allowed=False, provider_failure=True)
 
+    # A re-upload of bytes already classified under this prompt and model set
+    # reuses that verdict, before even decoding the image.
+    key = verdict_cache.verdict_key('image', image_digest, IMAGE_CLASSIFIER_PROMPT, available_apis)
+    cached = verdict_cache.lookup_result(key)
+    if cached is not None:
+        logger.info("Image classification result (cached): %s", cached)
+        return cached
+
+    try:
+        # Decoded here, so an unreadable file is told apart from a failure
+        # further on.
+        context.image
+    except Exception:
+        logger.exception("Error opening image for classification: %s", image_url)
+        return ClassificationResult(allowed=False, provider_failure=True)
+
     try:
-        # Blunt, zero-API local pre-filter (issue #393) runs before the paid
-        # cascade: a confident nudity/gore hit is a final rejection, exactly
-        # like the text pre-filter. It fails open (allows) when its optional
-        # models are absent, so this can only ever add a rejection the cascade
-        # might also have made — never fail the image on infrastructure.
-        prefilter_result = image_prefilter.prefilter_image(image)
-        if not prefilter_result:
-            logger.info("Image rejected by local pre-filter (reason=%s); skipping AI cascade.",
-                        prefilter_result.public_reason_code())
-            return prefilter_result
+        rejection, payload = _screen(context)
+        if rejection is not None:
+            verdict_cache.store_result(key, rejection)
+            return rejection
 
         def call_api(api_name):
             try:
@@ -155,7 +232,7 @@ def is_image_positive(image_url):
                     logger.error("Unsupported API name: %s", api_name)
                     return None
                 logger.debug("Calling %s API for image classification", api_name)
-                score = api_func(image, IMAGE_CLASSIFIER_PROMPT)
+                score = api_func(payload, IMAGE_CLASSIFIER_PROMPT)
                 logger.debug("%s API returned: %s", api_name, score)
                 return score
             except Exception:
@@ -165,6 +242,69 @@ def is_image_positive(image_url):
         logger.info("Starting image classification cascade with APIs: %s", available_apis)
         result = classify_with_thresholds(available_apis, call_api)
         logger.info("Image classification result: %s", result)
+        verdict_cache.store_result(key, result)
+        return result
+
+    except Exception:
+        logger.exception("Error in image classifier for URL: %s", image_url)
+        return ClassificationResult(allowed=False, provider_failure=True)
+
+
+async def ais_image_positive(image):
+    """is_image_positive on the running event loop (the async classification
+    worker's): the image is fetched asynchronously (ImageContext.aload),
+    decoded, pre-filtered and encoded on a worker thread, and the cascade's
+    provider calls are awaited."""
+    context = ImageContext.of(image)
+    image_url = context.image_url
+    logger.debug("ais_image_positive called with URL: %s", urlparse(image_url)._replace(query='', fragment='').geturl())
+    settled, available_apis = _settle_without_cascade(context)
+    if settled is not None:
+        return settled
+
+    await context.aload()
+    try:
+        image_digest = context.digest
+    except Exception:
+        logger.exception("Error fetching image for classification: %s", image_url)
+        return ClassificationResult(allowed=False, provider_failure=True)
+
+    key = verdict_cache.verdict_key('image', image_digest, IMAGE_CLASSIFIER_PROMPT, available_apis)
+    cached = await sync_to_async(verdict_cache.lookup_result)(key)
+    if cached is not None:
+        logger.info("Image classification result (cached): %s", cached)
+        return cached
+
+    try:
+        await asyncio.to_thread(lambda: context.image)
+    except Exception:
+        logger.exception("Error opening image for classification: %s", image_url)
+        return ClassificationResult(allowed=False, provider_failure=True)
+
+    try:
+        rejection, payload = await asyncio.to_thread(_screen, context)
+        if rejection is not None:
+            await sync_to_async(verdict_cache.store_result)(key, rejection)
+            return rejection
+
+        async def call_api(api_name):
+            try:
+                api_func = AIMAGE_API_DISPATCH.get(api_name)
+                if not api_func:
+                    logger.error("Unsupported API name: %s", api_name)
+                    return None
+                logger.debug("Calling %s API for image classification", api_name)
+                score = await api_func(payload, IMAGE_CLASSIFIER_PROMPT)
+                logger.debug("%s API returned: %s", api_name, score)
+                return score
+            except Exception:
+                logger.exception("Error calling %s API for image classification", api_name)
+                return None
+
+        logger.info("Starting image classification cascade with APIs: %s", available_apis)
+        result = await aclassify_with_thresholds(available_apis, call_api)
+        logger.info("Image classification result: %s", result)
+        await sync_to_async(verdict_cache.store_result)(key, result)
         return result
 
     except Exception:
@@ -0,0 +1,141 @@
+"""One image, fetched and decoded once per worker job.
+
+Approving an image post used to download the same S3 object three times —
+once for moderation (is_image_positive), once for the BlurHash placeholder and
+once more for the interest categorizer — each time with a freshly built boto3
+client, and then decode it again for every consumer. The worker now wraps the
+image in an ImageContext and hands that to each of them instead of the URL:
+the bytes are fetched on first use, the PIL image is decoded once, and the
+derived forms (the BlurHash thumbnail, the compact payload sent to the vision
+models) are computed once and kept for whoever asks next.
+
+Every consumer still accepts a plain URL too (ImageContext.of wraps it), so
+the management commands and direct callers are unchanged. A failed fetch is
+remembered and re-raised to later consumers rather than retried, so one job
+never pays for the same unreachable object twice. The async worker awaits
+aload() first, so the bytes are fetched without blocking its event loop.
+"""
+import asyncio
+import logging
+import threading
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+from .classifier_utils import encode_vision_image, vision_image_settings
+from .verdict_cache import bytes_digest
+
+logger = logging.getLogger(__name__)
+
+
+class ImageContext:
+    """The image at `image_url`, fetched lazily with `fetch(image_url) -> bytes`
+    (by default the classifier's S3 fetch) and shared between consumers.
+
+    Safe to share across the classification thread pool: the fetch and the
+    decode each run at most once, under a lock.
+    """
+
+    def __init__(self, image_url, fetch=None):
+        self.image_url = image_url
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._data = None
+        self._error = None
+        self._image = None
+        self._digest = None
+        self._thumbnails = {}
+        self._vision_payloads = {}
+
+    @classmethod
+    def of(cls, image, fetch=None):
+        """`image` itself if it is already an ImageContext, else a new context
+        for the URL `image`."""
+        return image if isinstance(image, ImageContext) else cls(image, fetch=fetch)
+
+    @property
+    def data(self):
+        """The raw image bytes. Raises if they cannot be fetched."""
+        with self._lock:
+            if self._data is None and self._error is None:
+                fetch = self._fetch
+                if fetch is None:
+                    # Imported here: image_classifier itself builds contexts.
+                    from .image_classifier import load_image_bytes_from_url
+                    fetch = load_image_bytes_from_url
+                try:
+                    self._data = fetch(self.image_url)
+                except Exception as e:
+                    self._error = e
+            if self._error is not None:
+                raise self._error
+            return self._data
+
+    async def aload(self):
+        """Fetch the bytes without blocking the running event loop, so the
+        accessors find them in hand: with the async S3 fetch, or on a worker
+        thread when the context has a `fetch` of its own. A failure is
+        remembered, as by `data`, and raised by the accessors."""
+        if self._fetch is not None:
+            await asyncio.to_thread(self._load_quietly)
+            return
+        if self._data is not None or self._error is not None:
+            return
+        from .image_classifier import aload_image_bytes_from_url
+        try:
+            data, error = await aload_image_bytes_from_url(self.image_url), None
+        except Exception as e:
+            data, error = None, e
+        with self._lock:
+            if self._data is None and self._error is None:
+                self._data, self._error = data, error
+
+    def _load_quietly(self):
+        try:
+            self.data
+        except Exception:
+            pass
+
+    @property
+    def digest(self):
+        """The verdict-cache digest of the raw bytes."""
+        if self._digest is None:
+            self._digest = bytes_digest(self.data)
+        return self._digest
+
+    @property
+    def image(self):
+        """The decoded PIL image, as uploaded. Raises on unreadable bytes.
+
+        Consumers must not modify it in place; derive a copy instead.
+        """
+        data = self.data
+        with self._lock:
+            if self._image is None:
+                image = Image.open(BytesIO(data))
+                image.load()
+                logger.debug("PIL image opened — size=%s mode=%s", image.size, image.mode)
+                self._image = image
+            return self._image
+
+    def thumbnail(self, max_dimension):
+        """An RGB copy no larger than `max_dimension` on either side, rotated
+        the way the clients render it (EXIF orientation applied)."""
+        image = self.image
+        with self._lock:
+            if max_dimension not in self._thumbnails:
+                thumbnail = ImageOps.exif_transpose(image).convert('RGB')
+                thumbnail.thumbnail((max_dimension, max_dimension))
+                self._thumbnails[max_dimension] = thumbnail
+            return self._thumbnails[max_dimension]
+
+    def vision_payload(self):
+        """The data URL sent to the vision models (see
+        classifier_utils.encode_vision_image), encoded once for every cascade
+        tier and the categorizer."""
+        settings = vision_image_settings()
+        image = self.image
+        with self._lock:
+            if settings not in self._vision_payloads:
+                self._vision_payloads[settings] = encode_vision_image(image, settings)
+            return self._vision_payloads[settings]
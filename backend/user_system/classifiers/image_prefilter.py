@@ -157,6 +157,17 @@ def _detect_gore(image):
     return float(np.max(outputs[0]))
 
 
+def warm_models():
+    """Load the local detectors now rather than on the first image.
+
+    The classification worker calls this before it forks (its per-job work
+    horses, or with --processes its children), so the loaded models are
+    inherited and shared copy-on-write instead of each process loading its
+    own. Returns which detectors are available.
+    """
+    return {'nudity': _get_nudenet() is not None, 'gore': _get_gore_session() is not None}
+
+
 def prefilter_image(image):
     """Local heuristic check for blatant nudity/gore; never calls an LLM.
 
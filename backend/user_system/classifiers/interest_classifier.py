@@ -14,20 +14,26 @@ Both entry points are **best-effort**: categorization runs on content that has
 already passed moderation, so a provider failure must never block anything — it
 just yields no buckets. A deterministic TESTING short-circuit (keyword match)
 lets the whole feature be tested without a live API, mirroring
-is_text_positive / is_image_positive.
+is_text_positive / is_image_positive. The a* variants are the same
+categorizers for the async classification worker's event loop.
 """
 import os
 import re
+import asyncio
 import logging
 
+from asgiref.sync import sync_to_async
+
 from .classifier_constants import (
     INTEREST_CATEGORIZATION_TEXT_PROMPT, INTEREST_CATEGORIZATION_IMAGE_PROMPT,
 )
 from .classifier_utils import (
     get_available_apis, model_for,
     call_text_openrouter_raw, call_image_openrouter_raw,
+    acall_text_openrouter_raw, acall_image_openrouter_raw,
 )
-from .image_classifier import load_image_from_url
+from . import verdict_cache
+from .image_context import ImageContext
 from ..constants import INTEREST_CATEGORY_SLUGS, MAX_INTEREST_TAGS_PER_POST
 from ..utils import convert_to_bool
 
@@ -82,6 +88,32 @@ def _render_options(allowed_slugs):
     return ", ".join(sorted(allowed_slugs))
 
 
+def _text_request(text, allowed_slugs, max_tags):
+    """(prompt, cache key, model) for categorizing `text`, or None when no
+    provider is available."""
+    available = get_available_apis()
+    if not available:
+        logger.info("categorize_text_interests: no provider available; skipping.")
+        return None
+    prompt = (INTEREST_CATEGORIZATION_TEXT_PROMPT
+              .replace("{options}", _render_options(allowed_slugs))
+              .replace("{max}", str(max_tags)))
+    # Only the first tier is asked, so only its model versions the entry.
+    key = verdict_cache.verdict_key('interest_text', verdict_cache.text_digest(text), prompt, available[:1])
+    return prompt.replace("{text}", text), key, model_for(available[0])
+
+
+def _image_request(image_digest, allowed_slugs, max_tags):
+    """(prompt, cache key, model) for categorizing the image with
+    `image_digest`; the caller has checked a provider is available."""
+    available = get_available_apis()
+    prompt = (INTEREST_CATEGORIZATION_IMAGE_PROMPT
+              .replace("{options}", _render_options(allowed_slugs))
+              .replace("{max}", str(max_tags)))
+    key = verdict_cache.verdict_key('interest_image', image_digest, prompt, available[:1])
+    return prompt, key, model_for(available[0])
+
+
 def categorize_text_interests(text, allowed_slugs=INTEREST_CATEGORY_SLUGS,
                               max_tags=MAX_INTEREST_TAGS_PER_POST):
     """Best-effort: the interest buckets a piece of text is about (<= max_tags).
@@ -97,55 +129,125 @@ def categorize_text_interests(text, allowed_slugs=INTEREST_CATEGORY_SLUGS,
     if _testing_mode():
         return _keyword_match(text, allowed_slugs, max_tags)
 
-    available = get_available_apis()
-    if not available:
-        logger.info("categorize_text_interests: no provider available; skipping.")
+    request = _text_request(text, allowed_slugs, max_tags)
+    if request is None:
+        return []
+    prompt, key, model = request
+    cached = verdict_cache.lookup(key)
+    if cached is not None:
+        return cached
+    try:
+        reply = call_text_openrouter_raw(prompt, model)
+    except Exception:
+        logger.exception("categorize_text_interests: provider call failed; returning no buckets.")
         return []
+    buckets = _parse_reply(reply, allowed_slugs, max_tags)
+    verdict_cache.store(key, buckets)
+    return buckets
 
-    prompt = (INTEREST_CATEGORIZATION_TEXT_PROMPT
-              .replace("{options}", _render_options(allowed_slugs))
-              .replace("{max}", str(max_tags))
-              .replace("{text}", text))
+
+async def acategorize_text_interests(text, allowed_slugs=INTEREST_CATEGORY_SLUGS,
+                                     max_tags=MAX_INTEREST_TAGS_PER_POST):
+    """categorize_text_interests with the provider call awaited."""
+    text = (text or "").strip()
+    if not text:
+        return []
+    allowed_slugs = frozenset(allowed_slugs)
+
+    if _testing_mode():
+        return _keyword_match(text, allowed_slugs, max_tags)
+
+    request = _text_request(text, allowed_slugs, max_tags)
+    if request is None:
+        return []
+    prompt, key, model = request
+    cached = await sync_to_async(verdict_cache.lookup)(key)
+    if cached is not None:
+        return cached
     try:
-        reply = call_text_openrouter_raw(prompt, model_for(available[0]))
+        reply = await acall_text_openrouter_raw(prompt, model)
     except Exception:
         logger.exception("categorize_text_interests: provider call failed; returning no buckets.")
         return []
-    return _parse_reply(reply, allowed_slugs, max_tags)
+    buckets = _parse_reply(reply, allowed_slugs, max_tags)
+    await sync_to_async(verdict_cache.store)(key, buckets)
+    return buckets
 
 
-def categorize_image_interests(image_url, allowed_slugs=INTEREST_CATEGORY_SLUGS,
+def categorize_image_interests(image, allowed_slugs=INTEREST_CATEGORY_SLUGS,
                                max_tags=MAX_INTEREST_TAGS_PER_POST):
-    """Best-effort: the interest buckets an S3-backed image is about.
+    """Best-effort: the interest buckets an S3-backed image is about. `image`
+    is its URL or the worker's ImageContext for it.
 
     Never raises; returns [] when there is no image, no provider (or TESTING,
     where there is no real image to inspect), or on any fetch/provider error.
     """
-    if not image_url:
+    if not image:
         return []
+    context = ImageContext.of(image)
     allowed_slugs = frozenset(allowed_slugs)
 
     if _testing_mode():
         # No real image bytes to inspect in tests; text drives categorization.
         return []
 
-    available = get_available_apis()
-    if not available:
+    if not get_available_apis():
         logger.info("categorize_image_interests: no provider available; skipping.")
         return []
 
     try:
-        image = load_image_from_url(image_url)
+        image_digest = context.digest
     except Exception:
-        logger.exception("categorize_image_interests: could not fetch image %s; skipping.", image_url)
+        logger.exception("categorize_image_interests: could not fetch image %s; skipping.", context.image_url)
         return []
 
-    prompt = (INTEREST_CATEGORIZATION_IMAGE_PROMPT
-              .replace("{options}", _render_options(allowed_slugs))
-              .replace("{max}", str(max_tags)))
+    prompt, key, model = _image_request(image_digest, allowed_slugs, max_tags)
+    cached = verdict_cache.lookup(key)
+    if cached is not None:
+        return cached
+    try:
+        reply = call_image_openrouter_raw(context.vision_payload(), prompt, model)
+    except Exception:
+        logger.exception("categorize_image_interests: provider call failed; returning no buckets.")
+        return []
+    buckets = _parse_reply(reply, allowed_slugs, max_tags)
+    verdict_cache.store(key, buckets)
+    return buckets
+
+
+async def acategorize_image_interests(image, allowed_slugs=INTEREST_CATEGORY_SLUGS,
+                                      max_tags=MAX_INTEREST_TAGS_PER_POST):
+    """categorize_image_interests with the image fetched asynchronously, its
+    payload encoded on a worker thread and the provider call awaited."""
+    if not image:
+        return []
+    context = ImageContext.of(image)
+    allowed_slugs = frozenset(allowed_slugs)
+
+    if _testing_mode():
+        return []
+
+    if not get_available_apis():
+        logger.info("categorize_image_interests: no provider available; skipping.")
+        return []
+
+    await context.aload()
+    try:
+        image_digest = context.digest
+    except Exception:
+        logger.exception("categorize_image_interests: could not fetch image %s; skipping.", context.image_url)
+        return []
+
+    prompt, key, model = _image_request(image_digest, allowed_slugs, max_tags)
+    cached = await sync_to_async(verdict_cache.lookup)(key)
+    if cached is not None:
+        return cached
     try:
-        reply = call_image_openrouter_raw(image, prompt, model_for(available[0]))
+        payload = await asyncio.to_thread(context.vision_payload)
+        reply = await acall_image_openrouter_raw(payload, prompt, model)
     except Exception:
         logger.exception("categorize_image_interests: provider call failed; returning no buckets.")
         return []
-    return _parse_reply(reply, allowed_slugs, max_tags)
+    buckets = _parse_reply(reply, allowed_slugs, max_tags)
+    await sync_to_async(verdict_cache.store)(key, buckets)
+    return buckets
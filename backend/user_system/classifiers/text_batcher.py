@@ -0,0 +1,186 @@
+"""Batched calls to the cheapest text tier.
+
+Each caption, comment and bio used to get its own chat completion of a few
+tokens, so at peak the text cascade's cost was round trips and provider
+queueing rather than tokens. With batching on (see TEXT_BATCH_SIZE), texts
+that reach the first tier at the same time in one process share one call:
+
+- the first text to arrive opens a batch and waits up to the batch wait for
+  company; the batch is sent as soon as it is full, or when the wait is over;
+- the reply is parsed into one (probability, rule) pair per text, which the
+  cascade then uses as that text's first-tier score, so the zones decide
+  exactly as before: clear texts are settled by the batch, and only the
+  ambiguous ones go on to the pricier tiers one by one;
+- a text the batch gave no usable answer for (and a batch of one) makes the
+  usual single call instead.
+
+Batches form between classifications running concurrently in one process
+(the post classifier's thread pool, or the jobs on the event loop of a worker
+run with --async, which batch through abatched_score); a process that runs
+one job at a time gains nothing and should leave batching off.
+"""
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future
+
+from .classifier_constants import TEXT_BATCH_CLASSIFIER_PROMPT, TEXT_BATCH_SIZE, TEXT_BATCH_WAIT_MS
+from .classifier_utils import acall_text_openrouter_batch, call_text_openrouter_batch, model_for
+
+logger = logging.getLogger(__name__)
+
+
+def batch_settings():
+    """(max_items, max_wait_seconds), honoring the env overrides. A max of 1
+    means batching is off."""
+    def _int(name, default):
+        try:
+            return max(1, int(os.environ.get(name, default)))
+        except ValueError:
+            logger.warning("Ignoring invalid %s; using %s.", name, default)
+            return default
+
+    return (_int('CLASSIFICATION_TEXT_BATCH_SIZE', TEXT_BATCH_SIZE),
+            _int('CLASSIFICATION_TEXT_BATCH_WAIT_MS', TEXT_BATCH_WAIT_MS) / 1000)
+
+
+class _Batch:
+
+    def __init__(self, closed):
+        self.items = []
+        self.closed = closed
+
+
+def _checked_answers(answers, texts, api_name):
+    answers = list(answers)
+    if len(answers) != len(texts):
+        raise ValueError(f"{len(answers)} answers for {len(texts)} texts")
+    logger.info("Scored a batch of %d texts with one %s call.", len(texts), api_name)
+    return answers
+
+
+class TextBatcher:
+    """Collects texts per tier and scores each batch with one
+    `call_batch(texts, api_name)` call, which returns one (probability, rule)
+    pair or None per text."""
+
+    def __init__(self, call_batch):
+        self._call_batch = call_batch
+        self._lock = threading.Lock()
+        self._open = {}
+
+    def score(self, text, api_name, max_items, max_wait_seconds):
+        """`text`'s (probability, rule) from a batched call to `api_name`, or
+        None if the batch had no answer for it and it needs its own call."""
+        future = Future()
+        with self._lock:
+            batch = self._open.get(api_name)
+            leader = batch is None
+            if leader:
+                batch = self._open[api_name] = _Batch(threading.Event())
+            batch.items.append((text, future))
+            if len(batch.items) >= max_items:
+                self._close(api_name, batch)
+        if leader:
+            # The text that opened the batch sends it, once full or timed out.
+            batch.closed.wait(max_wait_seconds)
+            with self._lock:
+                self._close(api_name, batch)
+            self._send(api_name, batch)
+        return future.result()
+
+    def _close(self, api_name, batch):
+        # Under the lock. Texts arriving from now on open the next batch.
+        if self._open.get(api_name) is batch:
+            del self._open[api_name]
+        batch.closed.set()
+
+    def _send(self, api_name, batch):
+        texts = [text for text, _ in batch.items]
+        answers = [None] * len(texts)
+        if len(texts) > 1:
+            try:
+                answers = _checked_answers(self._call_batch(texts, api_name), texts, api_name)
+            except Exception:
+                logger.exception("Error calling %s API for a batch of %d texts; scoring them one by one.",
+                                 api_name, len(texts))
+                answers = [None] * len(texts)
+        for (_, future), answer in zip(batch.items, answers):
+            future.set_result(answer)
+
+
+class AsyncTextBatcher:
+    """TextBatcher for coroutines on one event loop, with an `acall_batch`
+    that returns a coroutine. A batch is sent by a task of its own, so a text
+    whose job is cancelled while it waits never strands the rest."""
+
+    def __init__(self, acall_batch):
+        self._acall_batch = acall_batch
+        self._open = {}
+        self._sending = set()
+
+    async def score(self, text, api_name, max_items, max_wait_seconds):
+        """As TextBatcher.score."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._open.get(api_name)
+        if batch is None:
+            batch = self._open[api_name] = _Batch(asyncio.Event())
+            task = loop.create_task(self._send_when_closed(api_name, batch, max_wait_seconds))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+        batch.items.append((text, future))
+        if len(batch.items) >= max_items:
+            self._close(api_name, batch)
+        return await future
+
+    def _close(self, api_name, batch):
+        if self._open.get(api_name) is batch:
+            del self._open[api_name]
+        batch.closed.set()
+
+    async def _send_when_closed(self, api_name, batch, max_wait_seconds):
+        try:
+            await asyncio.wait_for(batch.closed.wait(), max_wait_seconds)
+        except TimeoutError:
+            pass
+        self._close(api_name, batch)
+        texts = [text for text, _ in batch.items]
+        answers = [None] * len(texts)
+        if len(texts) > 1:
+            try:
+                answers = _checked_answers(await self._acall_batch(texts, api_name), texts, api_name)
+            except Exception:
+                logger.exception("Error calling %s API for a batch of %d texts; scoring them one by one.",
+                                 api_name, len(texts))
+                answers = [None] * len(texts)
+        for (_, future), answer in zip(batch.items, answers):
+            if not future.done():
+                future.set_result(answer)
+
+
+_BATCHER = TextBatcher(
+    lambda texts, api_name: call_text_openrouter_batch(texts, TEXT_BATCH_CLASSIFIER_PROMPT, model_for(api_name)))
+
+
+def batched_score(text, api_name):
+    """`text`'s score from a batched call to `api_name`, or None when batching
+    is off or the batch could not score it."""
+    max_items, max_wait_seconds = batch_settings()
+    if max_items <= 1:
+        return None
+    return _BATCHER.score(text, api_name, max_items, max_wait_seconds)
+
+
+_ABATCHER = AsyncTextBatcher(
+    lambda texts, api_name: acall_text_openrouter_batch(texts, TEXT_BATCH_CLASSIFIER_PROMPT, model_for(api_name)))
+
+
+async def abatched_score(text, api_name):
+    """batched_score on the running event loop, batching with the other
+    texts awaiting it there."""
+    max_items, max_wait_seconds = batch_settings()
+    if max_items <= 1:
+        return None
+    return await _ABATCHER.score(text, api_name, max_items, max_wait_seconds)
@@ -1,26 +1,27 @@
 import os
 import logging
+from asgiref.sync import sync_to_async
 from .classifier_constants import TEXT_CLASSIFIER_PROMPT
 from .classifier_utils import (
-    get_available_apis, classify_with_thresholds, ClassificationResult,
-    TEXT_API_DISPATCH,
+    get_available_apis, classify_with_thresholds, aclassify_with_thresholds, ClassificationResult,
+    TEXT_API_DISPATCH, ATEXT_API_DISPATCH,
 )
+from . import text_batcher, verdict_cache
 from ..utils import convert_to_bool
 
 logger = logging.getLogger(__name__)
 
 
-def is_text_positive(text):
-    """Returns a ClassificationResult (truthy when the text is allowed)."""
-    text = str(text)
-    logger.debug("is_text_positive called — text length=%d", len(text))
+def _settle_without_cascade(text):
+    """(result, available_apis), where `result` is already the answer for
+    `text` when no cascade runs: in testing mode, or with no API to ask."""
     testing = os.environ.get("TESTING", False)
     testing = testing if isinstance(testing, bool) else convert_to_bool(testing)
 
     if testing:
         allowed = "negative" not in text.lower()
         logger.debug("Testing mode — allowed=%s", allowed)
-        return ClassificationResult(allowed=allowed)
+        return ClassificationResult(allowed=allowed), []
 
     logger.debug("Checking available AI APIs for text classification")
     available_apis = get_available_apis()
@@ -28,10 +29,26 @@ def is_text_positive(text):
 
     if not available_apis:
         logger.error("No AI API keys available.")
-        return ClassificationResult(allowed=False, provider_failure=True)
+        return ClassificationResult(allowed=False, provider_failure=True), []
+    return None, available_apis
+
+
+def is_text_positive(text):
+    """Returns a ClassificationResult (truthy when the text is allowed)."""
+    text = str(text)
+    logger.debug("is_text_positive called — text length=%d", len(text))
+    settled, available_apis = _settle_without_cascade(text)
+    if settled is not None:
+        return settled
 
     def call_api(api_name):
         try:
+            if api_name == available_apis[0]:
+                # The cheapest tier may score this text in a batch with others.
+                batched = text_batcher.batched_score(text, api_name)
+                if batched is not None:
+                    logger.debug("%s API returned (batched): %s", api_name, batched)
+                    return batched
             api_func = TEXT_API_DISPATCH.get(api_name)
             if not api_func:
                 logger.error("Unsupported API name: %s", api_name)
@@ -44,7 +61,55 @@ def is_text_positive(text):
             logger.exception("Error calling %s API for text classification", api_name)
             return None
 
+    key = verdict_cache.verdict_key('text', verdict_cache.text_digest(text), TEXT_CLASSIFIER_PROMPT, available_apis)
+    cached = verdict_cache.lookup_result(key)
+    if cached is not None:
+        logger.info("Text classification result (cached): %s", cached)
+        return cached
+
     logger.info("Starting text classification cascade with APIs: %s", available_apis)
     result = classify_with_thresholds(available_apis, call_api)
     logger.info("Text classification result: %s", result)
+    verdict_cache.store_result(key, result)
+    return result
+
+
+async def ais_text_positive(text):
+    """is_text_positive on the running event loop (the async classification
+    worker's): the same cache and cascade, with the provider calls awaited."""
+    text = str(text)
+    logger.debug("ais_text_positive called — text length=%d", len(text))
+    settled, available_apis = _settle_without_cascade(text)
+    if settled is not None:
+        return settled
+
+    async def call_api(api_name):
+        try:
+            if api_name == available_apis[0]:
+                batched = await text_batcher.abatched_score(text, api_name)
+                if batched is not None:
+                    logger.debug("%s API returned (batched): %s", api_name, batched)
+                    return batched
+            api_func = ATEXT_API_DISPATCH.get(api_name)
+            if not api_func:
+                logger.error("Unsupported API name: %s", api_name)
+                return None
+            logger.debug("Calling %s API for text classification", api_name)
+            score = await api_func(text, TEXT_CLASSIFIER_PROMPT)
+            logger.debug("%s API returned: %s", api_name, score)
+            return score
+        except Exception:
+            logger.exception("Error calling %s API for text classification", api_name)
+            return None
+
+    key = verdict_cache.verdict_key('text', verdict_cache.text_digest(text), TEXT_CLASSIFIER_PROMPT, available_apis)
+    cached = await sync_to_async(verdict_cache.lookup_result)(key)
+    if cached is not None:
+        logger.info("Text classification result (cached): %s", cached)
+        return cached
+
+    logger.info("Starting text classification cascade with APIs: %s", available_apis)
+    result = await aclassify_with_thresholds(available_apis, call_api)
+    logger.info("Text classification result: %s", result)
+    await sync_to_async(verdict_cache.store_result)(key, result)
     return result
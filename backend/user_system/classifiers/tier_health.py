@@ -0,0 +1,235 @@
+"""Rolling health of each cascade tier, and a circuit breaker per tier.
+
+When a tier's provider was degraded, every classification still called it
+first, waited up to LLM_TIMEOUT_SECONDS, logged "no usable score" and fell
+through to the next tier, so an outage at one provider added its timeout to
+every job and stalled the queue. classify_with_thresholds now reports each
+call here (whether it produced a usable score, and how long it took) and asks
+before calling a tier.
+
+Counts live in `settings.CLASSIFICATION_TIER_HEALTH_CACHE`, in short time
+buckets that expire on their own, so every thread and worker process sees the
+same rolling window. When a tier's window crosses the thresholds in
+classifier_constants its breaker opens and the cascade skips the tier. After
+the cool-down a single caller, across all processes, is let through as a
+probe, holding a token that its record() must present: a timely usable score
+closes the breaker and starts a fresh window, anything else re-opens it for
+another cool-down. Calls that were already in flight when the breaker opened
+are only counted. Cascade latency during an
+outage is then bounded by the healthy tiers.
+
+The same counts feed the hedged cascade: each tier's latency histogram gives
+the p90 after which classify_with_thresholds hedges it with the next tier,
+and a shared per-minute counter caps how many hedges all workers fire.
+
+Like the other caches this is an optimization only: a cache error is logged
+and the tier is called as before.
+"""
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .classifier_constants import (
+    HEDGE_DEFAULT_DELAY_SECONDS, HEDGE_LATENCY_BOUNDS_MS,
+    HEDGE_LATENCY_BUCKET_SECONDS, HEDGE_LATENCY_WINDOW_SECONDS, HEDGE_MIN_SAMPLES,
+    LLM_TIMEOUT_SECONDS,
+    TIER_BREAKER_COOLDOWN_SECONDS, TIER_BREAKER_ERROR_RATE,
+    TIER_BREAKER_MIN_CALLS, TIER_BREAKER_SLOW_SECONDS,
+    TIER_HEALTH_BUCKET_SECONDS, TIER_HEALTH_WINDOW_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+_COUNTERS = ('calls', 'failures', 'latency_ms')
+# A bucket outlives every window it belongs to by one bucket.
+_BUCKET_TIMEOUT = TIER_HEALTH_WINDOW_SECONDS + TIER_HEALTH_BUCKET_SECONDS
+# A probe that never reports (its worker died) frees the slot after this.
+_PROBE_TIMEOUT = 2 * LLM_TIMEOUT_SECONDS
+
+
+def _cache():
+    return caches[settings.CLASSIFICATION_TIER_HEALTH_CACHE]
+
+
+def _breaker_key(api_name):
+    return f'tier_breaker:{api_name}'
+
+
+def _probe_key(api_name):
+    return f'tier_probe:{api_name}'
+
+
+def _counter_keys(api_name, now):
+    """{key: counter} for every bucket in the window ending at `now`."""
+    last = int(now // TIER_HEALTH_BUCKET_SECONDS)
+    first = last - TIER_HEALTH_WINDOW_SECONDS // TIER_HEALTH_BUCKET_SECONDS + 1
+    return {f'tier_health:{api_name}:{bucket}:{counter}': counter
+            for bucket in range(first, last + 1) for counter in _COUNTERS}
+
+
+def _latency_key(api_name, bucket, bound):
+    return f'tier_latency:{api_name}:{bucket}:{bound}'
+
+
+def _latency_keys(api_name, now):
+    """{key: upper bound in ms (None past the last)} for every latency
+    histogram bucket in the window ending at `now`."""
+    last = int(now // HEDGE_LATENCY_BUCKET_SECONDS)
+    first = last - HEDGE_LATENCY_WINDOW_SECONDS // HEDGE_LATENCY_BUCKET_SECONDS + 1
+    return {_latency_key(api_name, bucket, bound): bound
+            for bucket in range(first, last + 1) for bound in (*HEDGE_LATENCY_BOUNDS_MS, None)}
+
+
+def _increment(cache, key, delta, timeout=_BUCKET_TIMEOUT):
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # First count in this bucket. Another worker may create it meanwhile.
+        if not cache.add(key, delta, timeout=timeout):
+            return cache.incr(key, delta)
+        return delta
+
+
+def _window(cache, api_name, now):
+    keys = _counter_keys(api_name, now)
+    totals = dict.fromkeys(_COUNTERS, 0)
+    for key, value in cache.get_many(list(keys)).items():
+        totals[keys[key]] += value
+    return totals
+
+
+def _unhealthy(totals):
+    calls = totals['calls']
+    return calls >= TIER_BREAKER_MIN_CALLS and (
+        totals['failures'] / calls >= TIER_BREAKER_ERROR_RATE
+        or totals['latency_ms'] / calls >= TIER_BREAKER_SLOW_SECONDS * 1000)
+
+
+def _state(opened_at, now):
+    if opened_at is None:
+        return STATE_CLOSED
+    return STATE_OPEN if now - opened_at < TIER_BREAKER_COOLDOWN_SECONDS else STATE_HALF_OPEN
+
+
+def allow_call(api_name):
+    """Whether the cascade should call `api_name` now: always while its
+    breaker is closed, never while it is open, and once it is half-open only
+    for the one caller that claims the probe. That caller gets the probe's
+    token (a true value) in place of True, to pass on to record()."""
+    try:
+        cache = _cache()
+        state = _state(cache.get(_breaker_key(api_name)), time.time())
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_OPEN:
+            return False
+        probe = uuid.uuid4().hex
+        return probe if cache.add(_probe_key(api_name), probe, timeout=_PROBE_TIMEOUT) else False
+    except Exception:
+        logger.warning("Could not read the health of tier %s; calling it.", api_name, exc_info=True)
+        return True
+
+
+def record(api_name, usable, latency_seconds, permit=None):
+    """Count one call to `api_name`: whether it returned a usable score and
+    how long it took. `permit` is what allow_call returned for the call.
+    Opens, closes or re-opens the tier's breaker as due."""
+    try:
+        cache = _cache()
+        now = time.time()
+        keys = {counter: key for key, counter in _counter_keys(api_name, now).items()}
+        _increment(cache, keys['calls'], 1)
+        if not usable:
+            _increment(cache, keys['failures'], 1)
+        _increment(cache, keys['latency_ms'], int(latency_seconds * 1000))
+        if usable:
+            bound = next((bound for bound in HEDGE_LATENCY_BOUNDS_MS if latency_seconds * 1000 <= bound), None)
+            _increment(cache, _latency_key(api_name, int(now // HEDGE_LATENCY_BUCKET_SECONDS), bound), 1,
+                       timeout=HEDGE_LATENCY_WINDOW_SECONDS + HEDGE_LATENCY_BUCKET_SECONDS)
+
+        if cache.get(_breaker_key(api_name)) is not None:
+            # Only the probe decides a tripped breaker; calls that were already
+            # in flight when it opened are merely counted.
+            if permit is not None and cache.get(_probe_key(api_name)) == permit:
+                _finish_probe(cache, api_name, usable and latency_seconds < TIER_BREAKER_SLOW_SECONDS, now)
+            return
+
+        totals = _window(cache, api_name, now)
+        if _unhealthy(totals):
+            cache.set(_breaker_key(api_name), now, timeout=None)
+            logger.warning("Opening the circuit breaker for tier %s (%d of %d calls failed, %d ms mean); "
+                           "skipping it for %ds.", api_name, totals['failures'], totals['calls'],
+                           totals['latency_ms'] // totals['calls'], TIER_BREAKER_COOLDOWN_SECONDS)
+    except Exception:
+        logger.warning("Could not record the health of tier %s.", api_name, exc_info=True)
+
+
+def _finish_probe(cache, api_name, healthy, now):
+    if healthy:
+        # A fresh window, so the failures that tripped it don't re-trip it.
+        cache.delete_many([_breaker_key(api_name), _probe_key(api_name), *_counter_keys(api_name, now)])
+        logger.info("Probe of tier %s succeeded; closing its circuit breaker.", api_name)
+    else:
+        cache.set(_breaker_key(api_name), now, timeout=None)
+        cache.delete(_probe_key(api_name))
+        logger.warning("Probe of tier %s failed; its circuit breaker stays open for another %ds.",
+                       api_name, TIER_BREAKER_COOLDOWN_SECONDS)
+
+
+def latency_p90(api_name):
+    """Seconds within which `api_name` gave 90% of its recent usable scores,
+    as the upper bound of the histogram bucket holding the 90th percentile.
+    HEDGE_DEFAULT_DELAY_SECONDS while there are too few samples to tell."""
+    try:
+        keys = _latency_keys(api_name, time.time())
+        counts = {}
+        for key, value in _cache().get_many(list(keys)).items():
+            counts[keys[key]] = counts.get(keys[key], 0) + value
+    except Exception:
+        logger.warning("Could not read the latency of tier %s.", api_name, exc_info=True)
+        return HEDGE_DEFAULT_DELAY_SECONDS
+    total = sum(counts.values())
+    if total < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY_SECONDS
+    seen = 0
+    for bound in HEDGE_LATENCY_BOUNDS_MS:
+        seen += counts.get(bound, 0)
+        if seen >= 0.9 * total:
+            return bound / 1000
+    return LLM_TIMEOUT_SECONDS
+
+
+def try_hedge(budget_per_minute):
+    """Claim one hedge from this minute's budget, shared by every worker.
+    False once `budget_per_minute` hedges have been fired this minute."""
+    try:
+        key = f'tier_hedges:{int(time.time() // 60)}'
+        return _increment(_cache(), key, 1, timeout=120) <= budget_per_minute
+    except Exception:
+        logger.warning("Could not read the hedge budget; not hedging.", exc_info=True)
+        return False
+
+
+def snapshot(apis):
+    """{tier: {'state', 'calls', 'error_rate', 'mean_latency_ms'}} over the
+    current window, for each of `apis`."""
+    cache = _cache()
+    now = time.time()
+    result = {}
+    for api_name in apis:
+        totals = _window(cache, api_name, now)
+        calls = totals['calls']
+        result[api_name] = {
+            'state': _state(cache.get(_breaker_key(api_name)), now),
+            'calls': calls,
+            'error_rate': round(totals['failures'] / calls, 2) if calls else None,
+            'mean_latency_ms': totals['latency_ms'] // calls if calls else None,
+        }
+    return result
@@ -0,0 +1,86 @@
+"""Classifier results remembered by content hash.
+
+The same text ("congrats!!") and the same image bytes (a re-upload) used to go
+through the full paid cascade every time. is_text_positive, is_image_positive
+and the interest categorizers now look their result up here first, keyed by:
+
+- a hash of the content: the text after normalize_text (case and runs of
+  whitespace do not change a verdict), or the raw image bytes;
+- a version hash of the prompt and the models the cascade would consult, so a
+  prompt edit or an OPENROUTER_MODEL_* override starts from an empty cache
+  rather than serving verdicts another configuration reached.
+
+Entries live in the `settings.CLASSIFICATION_VERDICT_CACHE` cache, shared by
+every process, whose TIMEOUT bounds how long they are kept and MAX_ENTRIES (or,
+on a dedicated Redis, its maxmemory) how many. A provider
+failure is never stored, since it says nothing about the content. Like the
+other caches this is an optimization only: a cache error is logged and the
+classifier simply runs.
+"""
+import dataclasses
+import hashlib
+import logging
+import re
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .classifier_utils import ClassificationResult, model_for
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    """The form of `text` its verdict is cached under: casefolded, with runs of
+    whitespace collapsed and the ends stripped."""
+    return _WHITESPACE_RE.sub(' ', str(text)).strip().casefold()
+
+
+def text_digest(text):
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def bytes_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def verdict_key(kind, digest, prompt, apis):
+    """Cache key for the result of classifier `kind` on content `digest` with
+    `prompt` and the cascade tiers `apis` (resolved to their models)."""
+    models = ','.join(model_for(api) for api in apis)
+    version = hashlib.sha256(f'{prompt}\0{models}'.encode('utf-8')).hexdigest()[:16]
+    return f'verdict:{kind}:{digest}:{version}'
+
+
+def _cache():
+    return caches[settings.CLASSIFICATION_VERDICT_CACHE]
+
+
+def lookup(key):
+    """The value stored under `key`, or None on a miss or a cache error."""
+    try:
+        return _cache().get(key)
+    except Exception:
+        logger.warning("Could not read the verdict cache for %s; classifying afresh.", key, exc_info=True)
+        return None
+
+
+def store(key, value):
+    try:
+        _cache().set(key, value)
+    except Exception:
+        logger.warning("Could not write the verdict cache for %s.", key, exc_info=True)
+
+
+def lookup_result(key):
+    """The ClassificationResult stored under `key`, or None."""
+    fields = lookup(key)
+    return ClassificationResult(**fields) if fields is not None else None
+
+
+def store_result(key, result):
+    """Remember `result` under `key`, unless it is a provider failure."""
+    if not result.provider_failure:
+        store(key, dataclasses.asdict(result))
@@ -0,0 +1,105 @@
+"""Process-wide pooled clients for the outbound providers (OpenRouter, S3).
+
+Every cascade step used to build a fresh openai.OpenAI client, and every S3
+fetch a fresh boto3 client, so each call paid for a new connection pool, a
+TCP connect and a TLS handshake. Callers now ask this registry instead: a
+client is built lazily on first use, under a lock, and then shared by every
+thread of the process. Its connection pool keeps CLASSIFICATION_THREADS
+connections alive, one per thread of the classification pool.
+
+The registry is emptied in a forked child (os.register_at_fork), since sockets
+inherited from the parent must never be shared with it. The child builds its
+own clients on first use.
+
+stats() reports, per client, how many times it was built (each build is a
+fresh pool, so fresh connection setups) and the count and mean latency of the
+calls timed with timed().
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .constants import CLASSIFICATION_THREADS
+
+logger = logging.getLogger(__name__)
+
+# Connections each client keeps alive. set_pool_size() changes it for a
+# worker that runs more classification threads than the default.
+POOL_SIZE = CLASSIFICATION_THREADS
+
+_lock = threading.Lock()
+_clients = {}
+_builds = {}
+_calls = {}
+
+
+def get_client(name, factory, *args, **kwargs):
+    """The shared client `name`, built as `factory(*args, **kwargs)` on first
+    use and reused for as long as it is asked for with the same factory and
+    (hashable) arguments. Changed credentials build a new client, and so does
+    a swapped factory, so a replaced boto3 never serves a client the old one
+    built."""
+    key = (name, factory, args, tuple(sorted(kwargs.items())))
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = factory(*args, **kwargs)
+            _clients[key] = client
+            _builds[name] = _builds.get(name, 0) + 1
+            logger.info("Built pooled %s client (%d built in this process).", name, _builds[name])
+        return client
+
+
+@contextmanager
+def timed(name):
+    """Time the call in the with-block towards `name`'s latency in stats()."""
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        elapsed = time.monotonic() - start
+        with _lock:
+            count, total = _calls.get(name, (0, 0.0))
+            _calls[name] = (count + 1, total + elapsed)
+
+
+def stats():
+    """{name: {'clients_built', 'calls', 'mean_latency_ms'}} for this process."""
+    with _lock:
+        names = set(_builds) | set(_calls)
+        result = {}
+        for name in sorted(names):
+            count, total = _calls.get(name, (0, 0.0))
+            result[name] = {
+                'clients_built': _builds.get(name, 0),
+                'calls': count,
+                'mean_latency_ms': round(total / count * 1000, 1) if count else None,
+            }
+        return result
+
+
+def reset():
+    """Forget every client and counter (run in a forked child)."""
+    global _lock
+    # A fresh lock too: the parent may have held it at the moment of the fork.
+    _lock = threading.Lock()
+    _clients.clear()
+    _builds.clear()
+    _calls.clear()
+
+
+def set_pool_size(size):
+    """Keep `size` connections alive per client from now on. Forgets the
+    clients built so far, which are sized for the old value."""
+    global POOL_SIZE
+    POOL_SIZE = size
+    reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset)
@@ -95,6 +95,10 @@ AUDIENCE_ALLOWED_CATEGORIES = {
 # longer re-enqueued by the sweep; it stays hidden (fail closed) and the sweep
 # logs an error so an operator is alerted.
 CLASSIFICATION_MAX_ATTEMPTS = 5
+# Threads in the worker's shared classification pool (tasks._CLASSIFICATION_EXECUTOR),
+# and so the most provider calls one process makes at once; the pooled
+# provider clients (client_pool.py) keep this many connections alive.
+CLASSIFICATION_THREADS = 8
 
 # Classification lifecycle of a user's profile photo (issue #7). A photo is
 # uploaded to S3, stored on the user as pending, and classified off the request
@@ -110,6 +114,16 @@ PROFILE_IMAGE_STATUS_PENDING = "pending"
 PROFILE_IMAGE_STATUS_APPROVED = "approved"
 PROFILE_IMAGE_STATUS_REJECTED = "rejected"
 
+# Classification lifecycle of a user's bio (issue #380). Same shape as the
+# profile photo's: a new bio is stored as pending_bio, reviewed by the async
+# text pipeline, and either promoted into the live bio or dropped, with the
+# owner told why via bio_status/bio_reason_code. Like a photo it is not
+# appealable — the fix is to write a different bio.
+BIO_STATUS_NONE = PROFILE_IMAGE_STATUS_NONE
+BIO_STATUS_PENDING = PROFILE_IMAGE_STATUS_PENDING
+BIO_STATUS_APPROVED = PROFILE_IMAGE_STATUS_APPROVED
+BIO_STATUS_REJECTED = PROFILE_IMAGE_STATUS_REJECTED
+
 # Native push notifications (issues #342/#343). A DeviceToken row is one device
 # a user has registered to receive pop-up notifications on. The platform picks
 # the delivery provider: iOS goes through APNs directly, Android and web through
@@ -296,6 +310,10 @@ class Fields:
     pending_profile_image_url = "pending_profile_image_url"
     profile_image_status = "profile_image_status"
     profile_image_reason_code = "profile_image_reason_code"
+    # For the owner, a bio still under async review and its moderation state.
+    pending_bio = "pending_bio"
+    bio_status = "bio_status"
+    bio_reason_code = "bio_reason_code"
     # An author's approved profile photo, threaded through every list/detail
     # payload next to author_username (compressed variant + full-res fallback,
     # mirroring image_url/original_image_url for posts).
@@ -383,6 +401,12 @@ class Fields:
     enabled = "enabled"
     label = "label"
     preferences = "preferences"
+    # Keyset pagination for the post listings: `cursor` is the query parameter
+    # a client sends (present, even empty, to opt in), and a cursor-mode
+    # response wraps the page as {posts: [...], next_cursor: "..."|null}.
+    cursor = "cursor"
+    posts = "posts"
+    next_cursor = "next_cursor"
 
 # Lengths of things
 LEN_LOGIN_COOKIE_TOKEN = 32
@@ -455,6 +479,11 @@ INTEREST_CATEGORY_CHOICES = [
 # Frozenset of the valid slugs, for cheap membership checks when validating an
 # incoming payload or a model's raw output.
 INTEREST_CATEGORY_SLUGS = frozenset(slug for slug, _ in INTEREST_CATEGORY_CHOICES)
+# Bit assigned to each bucket in the Post/User interest_mask columns, by its
+# position in INTEREST_CATEGORY_CHOICES, so the feed can intersect a viewer's
+# interests with a post's using a bitwise AND instead of a join. Only ever
+# append new buckets: reordering the list would remap every stored mask.
+INTEREST_CATEGORY_BITS = {slug: 1 << position for position, (slug, _) in enumerate(INTEREST_CATEGORY_CHOICES)}
 
 # A user keeps at most this many freeform interest terms (each a short phrase
 # they typed that passed the positivity check). Bounds the synchronous
@@ -478,6 +507,61 @@ MAX_INTEREST_TAGS_PER_POST = 3
 # value surfaces on-interest posts more aggressively. Tunable.
 INTEREST_BOOST = 0.5
 
+# Materialized hot rank for the home feed. Every post stores its base hot score
+# (likes + 1) / (age_in_hours + 2)^HOT_RANK_GRAVITY in Post.hot_score; a like or
+# unlike rescores that one post and the refresh_hot_scores command (cron) is the
+# decay tick that re-ages every post still above HOT_SCORE_REFRESH_FLOOR. The
+# feed reads its top FEED_CANDIDATE_LIMIT posts from that index, plus the
+# FEED_RECENT_CANDIDATE_LIMIT newest posts, and only scores those per viewer
+# (in Python, see feed_algorithm.score_candidates), so feed latency no longer
+# grows with the total post count — at the cost of a bounded feed depth.
+HOT_RANK_GRAVITY = 1.8
+# What a brand new post (no likes, zero hours old) scores; the column default,
+# so a post is ranked from the moment it is created without a second write.
+FRESH_POST_HOT_SCORE = 1.0 / (2.0 ** HOT_RANK_GRAVITY)
+FEED_CANDIDATE_LIMIT = 500
+FEED_RECENT_CANDIDATE_LIMIT = 200
+# Candidates are drawn only from posts created in the last
+# FEED_RECENCY_WINDOW_HOURS: at HOT_RANK_GRAVITY an unliked two-week-old post
+# scores ~1/10000 of a fresh one, so older posts could only surface in a feed
+# with nothing newer. When the window holds fewer than
+# FEED_MIN_WINDOW_CANDIDATES posts it widens back to the post that many places
+# from the newest, so a quiet install still fills its feed.
+FEED_RECENCY_WINDOW_HOURS = 14 * 24
+FEED_MIN_WINDOW_CANDIDATES = 100
+# A post whose stored score has already decayed below this can only go lower
+# until it is liked again (which rescores it directly), so the decay tick skips
+# it. Roughly an unliked post a month old.
+HOT_SCORE_REFRESH_FLOOR = 1e-6
+
+# Per-viewer feed snapshot (see feed_snapshot.py): the first page of a scroll
+# ranks up to FEED_SNAPSHOT_SIZE posts once and later pages slice that list.
+# The TTL bounds how stale a long scroll's ordering can get; a pull to refresh
+# (batch 0, or a fresh cursor) always re-ranks.
+FEED_SNAPSHOT_SIZE = 300
+FEED_SNAPSHOT_TTL_SECONDS = 300
+
+# How long a resolved session principal (token hash -> user id, email_verified)
+# stays cached, see auth_principals.py. Session deletions and email-verification
+# changes drop it at once; this bounds staleness for any path that doesn't.
+AUTH_PRINCIPAL_TTL_SECONDS = 30
+
+# Cached active-ban sets (see ban_sets.py). Every ban write invalidates them
+# at once; the TTL only bounds how long an orphaned payload lingers in the
+# cache.
+BAN_SET_TTL_SECONDS = 3600
+
+# Cached per-user block sets (see block_sets.py). toggle_block drops both
+# sides' sets at once; the TTL bounds staleness for any write that doesn't.
+BLOCK_SET_TTL_SECONDS = 3600
+
+# Followed-users timelines (see timeline.py): following someone copies at most
+# this many of their most recent visible posts into the follower's timeline;
+# everything they post after that arrives by fan-out as it is approved.
+TIMELINE_BACKFILL_LIMIT = 500
+# Rows per INSERT when fanning a post out to its author's followers.
+TIMELINE_FANOUT_BATCH_SIZE = 1000
+
 # Number of reports before hiding
 MAX_BEFORE_HIDING_POST = 10
 MAX_BEFORE_HIDING_COMMENT = 5
@@ -0,0 +1,59 @@
+"""Repair for the denormalized engagement counters.
+
+Post.like_count, Post.comment_count, Comment.like_count and
+CommentThread.total_comment_likes are kept current by the save()/delete()
+hooks on PostLike, CommentLike and Comment. Bulk queryset deletes — most
+notably the cascade when an account is deleted — bypass those hooks, so the
+counters can drift. reconcile_counters recomputes them from the underlying
+rows and rewrites only the ones that disagree.
+"""
+import logging
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Comment, CommentLike, CommentThread, Post, PostLike
+
+logger = logging.getLogger(__name__)
+
+
+def _count_of(model, fk):
+    rows = model.objects.filter(**{fk: OuterRef('pk')}).order_by().values(fk).annotate(
+        c=Count('*')).values('c')[:1]
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def _repair(queryset, field, actual):
+    """Rewrite `field` from `actual` on the rows of `queryset` where they
+    disagree. Returns the number of rows repaired."""
+    drifted = queryset.annotate(actual=actual).exclude(**{field: F('actual')}).values('pk')
+    return queryset.model.objects.filter(pk__in=drifted).update(**{field: actual})
+
+
+def reconcile_counters(posts=None, comments=None, comment_threads=None):
+    """Recompute the counters for the given querysets (every row when None).
+
+    Comments are repaired before threads, since a thread's total is the sum of
+    its comments' counters. Returns a dict of rows repaired per counter.
+    """
+    posts = Post.objects.all() if posts is None else posts
+    comments = Comment.objects.all() if comments is None else comments
+    comment_threads = CommentThread.objects.all() if comment_threads is None else comment_threads
+
+    thread_likes = Comment.objects.filter(comment_thread=OuterRef('pk')).order_by().values(
+        'comment_thread').annotate(total=Sum('like_count')).values('total')[:1]
+    post_comments = Comment.objects.filter(comment_thread__post=OuterRef('pk')).order_by().values(
+        'comment_thread__post').annotate(c=Count('*')).values('c')[:1]
+
+    repaired = {
+        'post_like_count': _repair(posts, 'like_count', _count_of(PostLike, 'post')),
+        'post_comment_count': _repair(
+            posts, 'comment_count', Coalesce(Subquery(post_comments, output_field=IntegerField()), 0)),
+        'comment_like_count': _repair(comments, 'like_count', _count_of(CommentLike, 'comment')),
+    }
+    repaired['thread_total_comment_likes'] = _repair(
+        comment_threads, 'total_comment_likes',
+        Coalesce(Subquery(thread_likes, output_field=IntegerField()), 0))
+    if any(repaired.values()):
+        logger.warning(f"reconcile_counters repaired drifted counters: {repaired}")
+    return repaired
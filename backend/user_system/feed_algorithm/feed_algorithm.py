@@ -1,12 +1,19 @@
 from django.db.models import (
-    Q, Count, F, ExpressionWrapper, FloatField, DurationField,
-    IntegerField, OuterRef, Subquery,
+    Q, F, ExpressionWrapper, FloatField, DurationField,
+    Value, DateTimeField,
 )
 from django.db.models.functions import Power, Now, Coalesce
 from django.db.models import Func
+from django.utils import timezone
+from datetime import timedelta
 import logging
 
-from ..constants import INTEREST_BOOST
+import numpy as np
+
+from ..constants import (
+    INTEREST_BOOST, HOT_RANK_GRAVITY, FEED_CANDIDATE_LIMIT, FEED_RECENT_CANDIDATE_LIMIT,
+    FEED_RECENCY_WINDOW_HOURS, FEED_MIN_WINDOW_CANDIDATES,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,77 +43,40 @@ class DurationToSeconds(Func):
         )
 
 
-def calculate_weights(qs, like_field, G=1.8, user=None, interest_category_ids=None):
-    logger.debug(f"Calculating feed weights with gravity G={G}")
-    # 1. Annotate the like count for each post.
-    #    distinct=True is load-bearing, not decoration: the caller layers
-    #    visible_posts() on top of this queryset, whose audience filter LEFT
-    #    JOINs the author's following_set (see visibility._audience_q, which
-    #    documents that it fans out). Without distinct, a plain COUNT counts
-    #    each like once per follow edge the author has — a post with one like
-    #    from an author following 200 people scored as if it had 200 — so
-    #    ranking quietly favored authors who follow a lot of people. The
-    #    .distinct() visible_posts applies collapses duplicate *rows*; it does
-    #    not undo an aggregate computed over them.
-    qs = qs.annotate(
-        like_count=Count(like_field, distinct=True)
+def _age_in_hours(as_of=None):
+    """Hours since creation_time as a float expression (see step 2 below),
+    measured to `as_of` when given and to the database's NOW() otherwise."""
+    reference = Now() if as_of is None else Value(as_of, output_field=DateTimeField())
+    return ExpressionWrapper(
+        DurationToSeconds(
+            ExpressionWrapper(reference - F('creation_time'), output_field=DurationField())
+        ) / 3600.0,
+        output_field=FloatField()
     )
 
-    # 2. Annotate the age of the post in hours as a pure float.
+
+def calculate_weights(qs, like_count_field, G=1.8, user=None, as_of=None):
+    logger.debug(f"Calculating feed weights with gravity G={G}")
+    # 1. The like count is read from a denormalized counter column
+    #    (Comment.like_count, CommentThread.total_comment_likes) rather than a
+    #    Count over the like rows, so the score is a per-row expression that
+    #    no join layered on top can multiply.
+
+    # 2. Annotate the age of the row in hours as a pure float.
     #    DurationToSeconds handles the DB difference: PostgreSQL keeps interval
     #    arithmetic as interval, so EXTRACT(EPOCH FROM ...) is required; SQLite
     #    stores durations as microseconds integers, so dividing by 1e6 suffices.
-    qs = qs.annotate(
-        age_in_hours=ExpressionWrapper(
-            DurationToSeconds(
-                ExpressionWrapper(Now() - F('creation_time'), output_field=DurationField())
-            ) / 3600.0,
-            output_field=FloatField()
-        )
-    )
+    #    `as_of` pins the reference instant instead of the database's NOW().
+    qs = qs.annotate(age_in_hours=_age_in_hours(as_of))
 
-    # 3. The base "hot" score.
-    base_score = ExpressionWrapper(
-        (F('like_count') + 1) / Power(F('age_in_hours') + 2.0, G),
+    # 3. The "hot" score. (The home feed scores its posts in Python instead,
+    #    see score_candidates, which also applies the interest boost.)
+    score = ExpressionWrapper(
+        (F(like_count_field) + 1) / Power(F('age_in_hours') + 2.0, G),
         output_field=FloatField()
     )
 
-    # 3b. Personalization (issues #446/#35): boost posts that share interest
-    #     buckets with the viewer. The hot score is multiplied by
-    #     (1 + INTEREST_BOOST * overlap), linear in the number of shared buckets
-    #     (NOT (1 + INTEREST_BOOST) per bucket — no exponential compounding), so
-    #     a fresh, liked, on-topic post rises while an ancient on-topic post
-    #     still decays — the boost scales the rank, it doesn't replace it. When
-    #     the viewer has no interests this branch is skipped entirely, so no
-    #     boost is applied and the score is the plain hot rank. (Not identical
-    #     to what shipped before this feature, though: the distinct fix above
-    #     corrects like counts the audience join used to inflate, so scores can
-    #     move for posts by authors who follow a lot of people.)
-    #
-    #     The match count comes from a correlated Subquery over the M2M through
-    #     table rather than a second Count annotation: two Counts over different
-    #     multi-valued relations would multiply each other's join rows and
-    #     corrupt like_count. The subquery counts join rows for this post whose
-    #     category is one the viewer wants, coalesced to 0.
-    if interest_category_ids:
-        through = qs.model.interest_categories.through
-        matched = through.objects.filter(
-            post_id=OuterRef('pk'),
-            interestcategory_id__in=list(interest_category_ids),
-        ).order_by().values('post_id').annotate(c=Count('*')).values('c')[:1]
-        qs = qs.annotate(
-            interest_matches=Coalesce(
-                Subquery(matched, output_field=IntegerField()), 0
-            )
-        )
-        score = ExpressionWrapper(
-            base_score * (1.0 + INTEREST_BOOST * F('interest_matches')),
-            output_field=FloatField()
-        )
-    else:
-        score = base_score
-
-    # 4. Annotate the final score, filter out the user's own posts, and order.
+    # 4. Annotate the final score, filter out the user's own rows, and order.
     qs = qs.annotate(score=score)
     if user:
         return qs.filter(~Q(author=user)).order_by('-score')
@@ -115,20 +85,122 @@ def calculate_weights(qs, like_field, G=1.8, user=None, interest_category_ids=No
         return qs.order_by('-score')
 
 
-def get_posts_weighted(user, posts_model):
+def refresh_post_hot_scores(posts):
     """
-    Gets all posts NOT by the user, ordered by a "hot" ranking algorithm.
-    Algorithm: Score = (Likes + 1) / (Age_in_Hours + 2)^G
+    Recomputes the materialized Post.hot_score for every post in `posts` in a
+    single UPDATE: (Likes + 1) / (Age_in_Hours + 2)^HOT_RANK_GRAVITY, the same
+    base score calculate_weights ranks by.
+
+    Called with a single post on every like/unlike, and over every post still
+    worth re-aging by the refresh_hot_scores decay tick. Reads the
+    denormalized Post.like_count, so it must run after the like row (and its
+    counter bump) is written. Returns the number of rows updated.
     """
-    # Gravity constant. Higher value = time matters more.
-    G = 1.8
-    logger.debug("Ranking all posts for feed via hot algorithm")
-    # The viewer's interest buckets personalize the ranking (issues #446/#35).
-    # Anonymous or interest-less viewers get None -> the plain hot rank.
-    interest_category_ids = None
+    return posts.update(hot_score=Coalesce(
+        ExpressionWrapper(
+            (F('like_count') + 1) / Power(_age_in_hours() + 2.0, HOT_RANK_GRAVITY),
+            output_field=FloatField()
+        ),
+        0.0,
+        output_field=FloatField()
+    ))
+
+
+def _recency_cutoff(candidates):
+    """The oldest creation_time the feed considers: FEED_RECENCY_WINDOW_HOURS
+    ago, widened back to the FEED_MIN_WINDOW_CANDIDATES-th newest candidate
+    when the window holds fewer posts than that (a quiet stretch, or a small
+    install), and None — no window at all — when there aren't that many
+    candidates in total. Both lookups walk the (hidden, creation_time) index."""
+    cutoff = timezone.now() - timedelta(hours=FEED_RECENCY_WINDOW_HOURS)
+    nth_newest = list(candidates.order_by('-creation_time').values_list('creation_time', flat=True)[
+        FEED_MIN_WINDOW_CANDIDATES - 1:FEED_MIN_WINDOW_CANDIDATES])
+    if not nth_newest or nth_newest[0] is None:
+        return None
+    return min(cutoff, nth_newest[0])
+
+
+def get_feed_candidates(user, posts_model):
+    """
+    Stage one of the home feed: the bounded set of posts worth scoring for
+    `user`, as a queryset the caller narrows further (blocks, visible_posts).
+
+    Only posts inside the recency window are considered (see
+    _recency_cutoff): under the hot formula's gravity a post a few weeks old
+    can't outrank fresh content, so the query cost tracks recent activity
+    rather than all-time history. Within it, two cheap index walks make up the
+    set: the top FEED_CANDIDATE_LIMIT posts by the materialized hot_score
+    (already popular) and the newest FEED_RECENT_CANDIDATE_LIMIT posts (so a
+    post that has not been rescored yet still gets a chance). Hidden posts
+    never reach another user's feed and the viewer's own posts are not in it,
+    so both are left out here rather than let them crowd out posts that could
+    be shown.
+    """
+    candidates = posts_model.objects.filter(hidden=False)
+    if user is not None:
+        candidates = candidates.exclude(author=user)
+    cutoff = _recency_cutoff(candidates)
+    if cutoff is not None:
+        candidates = candidates.filter(creation_time__gte=cutoff)
+    popular_ids = candidates.order_by('-hot_score').values('pk')[:FEED_CANDIDATE_LIMIT]
+    recent_ids = candidates.order_by('-creation_time').values('pk')[:FEED_RECENT_CANDIDATE_LIMIT]
+    return posts_model.objects.filter(Q(pk__in=popular_ids) | Q(pk__in=recent_ids))
+
+
+def _interest_bits(interest_mask):
+    return [position for position in range(interest_mask.bit_length()) if interest_mask >> position & 1]
+
+
+def _score_vectorized(likes, ages, masks, viewer_bits, gravity, interest_boost):
+    likes = np.asarray(likes, dtype=np.float64)
+    ages = np.asarray(ages, dtype=np.float64)
+    scores = (likes + 1.0) / np.power(ages + 2.0, gravity)
+    if viewer_bits:
+        masks = np.asarray(masks, dtype=np.int64)
+        matches = sum((masks >> position) & 1 for position in viewer_bits)
+        scores = scores * (1.0 + interest_boost * matches)
+    return scores.tolist()
+
+
+def score_candidates(candidates, user=None, as_of=None, gravity=HOT_RANK_GRAVITY, interest_boost=INTEREST_BOOST):
+    """
+    Stage two of the home feed: score `candidates` (a Post queryset, normally
+    get_feed_candidates narrowed by visibility) for `user` and return
+    (post_identifier, score) pairs, best first, ties broken by the higher
+    identifier — the ('-score', '-post_identifier') order feed cursors seek on.
+
+    Score = (Likes + 1) / (Age_in_Hours + 2)^gravity * (1 + interest_boost * overlap)
+
+    The database only reads the raw features (one row per candidate, no
+    per-row arithmetic); the formula runs here, over the whole candidate set
+    at once, with NumPy. Ages are measured to `as_of`
+    (now when omitted) and clamped at zero, so a post newer than a pinned
+    ranking instant scores as brand new. `gravity` and `interest_boost`
+    default to the tuned constants; an experiment can pass its own.
+
+    Overlap is the number of interest buckets (issues #446/#35) the post
+    shares with the viewer: a linear boost, so a fresh, liked, on-topic post
+    rises while an ancient on-topic post still decays. A viewer with no
+    interests gets the plain hot rank.
+    """
+    as_of = as_of or timezone.now()
+    viewer_bits = []
     if user is not None and getattr(user, 'is_authenticated', False):
-        interest_category_ids = list(user.interest_categories.values_list('id', flat=True))
-    return calculate_weights(posts_model.objects.all(), 'postlike', G, user, interest_category_ids)
+        viewer_bits = _interest_bits(user.interest_mask)
+    features = {
+        pk: (like_count, creation_time, mask)
+        for pk, like_count, creation_time, mask in candidates.values_list(
+            'pk', 'like_count', 'creation_time', 'interest_mask')
+    }
+    if not features:
+        return []
+    ids = list(features)
+    likes = [features[pk][0] for pk in ids]
+    ages = [max((as_of - (features[pk][1] or as_of)).total_seconds(), 0.0) / 3600.0 for pk in ids]
+    masks = [features[pk][2] for pk in ids]
+    logger.debug("Scoring %d feed candidates with gravity %s", len(ids), gravity)
+    scores = _score_vectorized(likes, ages, masks, viewer_bits, gravity, interest_boost)
+    return sorted(zip(ids, scores), key=lambda entry: (entry[1], entry[0]), reverse=True)
 
 
 def get_posts_weighted_for_user(user, posts_model):
@@ -151,7 +223,7 @@ def get_comment_threads_weighted_for_post(comment_threads):
     # Gravity constant. Higher value = time matters more.
     G = 1.8
     logger.debug("Ranking comment threads for post via hot algorithm")
-    return calculate_weights(comment_threads, 'comment__commentlike', G)
+    return calculate_weights(comment_threads, 'total_comment_likes', G)
 
 def get_comments_weighted_for_thread(comments):
     """
@@ -166,4 +238,4 @@ def get_comments_weighted_for_thread(comments):
     """
     G = 1.8
     logger.debug("Ranking single comments within thread via hot algorithm")
-    return calculate_weights(comments, 'commentlike', G)
\ No newline at end of file
+    return calculate_weights(comments, 'like_count', G)
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""Per-viewer snapshots of the ranked home feed.
+
+Ranking the feed (feed_algorithm.get_feed_candidates narrowed by the block
+exclusions and visible_posts, then score_candidates) is by far the most
+expensive step a scroll makes, and without a snapshot every batch of
+POST_BATCH_SIZE re-ran it only to throw all but ten rows away. Instead, the
+first page of a scroll ranks once and stores the ordered (post id, score)
+list — up to FEED_SNAPSHOT_SIZE entries — in the default cache
+(settings.CACHES: Redis in production, the database cache elsewhere) for
+FEED_SNAPSHOT_TTL_SECONDS. Later pages just hydrate the next slice of ids.
+
+A snapshot is identified by the instant it was ranked at (`as_of`), which is
+also the instant a cursor-paged feed pins its scores to, so a feed cursor
+doubles as the snapshot token: a cursor whose as_of matches the cached
+snapshot is served from it, and one that doesn't (expired, or superseded by a
+newer first page) falls back to ranking live with identical scores and
+seeking past the cursor's (score, id) in that ranking.
+
+The cache is an optimization only. Any cache error is logged and treated as a
+miss, so the feed degrades to ranking live rather than failing.
+"""
+import logging
+
+from django.core.cache import cache
+
+from .constants import FEED_SNAPSHOT_SIZE, FEED_SNAPSHOT_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def _snapshot_key(user):
+    return f'feed_snapshot:{user.pk}'
+
+
+def take_snapshot(user, ranked, as_of):
+    """Cache a ranking as `user`'s current feed snapshot.
+
+    `ranked` is score_candidates' (post id, score) list for the fully filtered
+    feed, scored as of `as_of`. Returns the snapshot dict: `as_of` (ISO
+    string), `entries` ([id, score] pairs, best first) and `complete` (False
+    when the feed had more posts than FEED_SNAPSHOT_SIZE, so pages past the
+    end must be ranked live).
+    """
+    entries = [[str(post_identifier), score] for post_identifier, score in ranked[:FEED_SNAPSHOT_SIZE + 1]]
+    snapshot = {
+        'as_of': as_of.isoformat(),
+        'entries': entries[:FEED_SNAPSHOT_SIZE],
+        'complete': len(entries) <= FEED_SNAPSHOT_SIZE,
+    }
+    try:
+        cache.set(_snapshot_key(user), snapshot, FEED_SNAPSHOT_TTL_SECONDS)
+    except Exception:
+        logger.warning("Could not store feed snapshot for user_id: %s; serving it uncached.",
+                       user.pk, exc_info=True)
+    return snapshot
+
+
+def load_snapshot(user, as_of=None):
+    """`user`'s cached feed snapshot, or None when there is none (or it was
+    ranked at a different instant than the `as_of` ISO string given)."""
+    try:
+        snapshot = cache.get(_snapshot_key(user))
+    except Exception:
+        logger.warning("Could not read feed snapshot for user_id: %s; ranking live.",
+                       user.pk, exc_info=True)
+        return None
+    if snapshot is None or (as_of is not None and snapshot['as_of'] != as_of):
+        return None
+    return snapshot
+
+
+def position_after(snapshot, post_identifier):
+    """Index of the entry following `post_identifier` in the snapshot, or None
+    when the id isn't in it."""
+    post_identifier = str(post_identifier)
+    for index, (entry_id, _score) in enumerate(snapshot['entries']):
+        if entry_id == post_identifier:
+            return index + 1
+    return None
+
+
+def position_after_key(entries, score, post_identifier):
+    """Index of the first [id, score] entry that sorts after (`score`,
+    `post_identifier`) in the feed's ('-score', '-post_identifier') order: the
+    keyset seek for a live ranking, which still works when the cursor's own
+    post has since dropped out of the feed."""
+    post_identifier = str(post_identifier)
+    for index, (entry_id, entry_score) in enumerate(entries):
+        if entry_score < score or (entry_score == score and entry_id < post_identifier):
+            return index
+    return len(entries)
+
+
+def covers(snapshot, start):
+    """Whether a page starting at `start` can be served from the snapshot: it
+    can if it starts inside the snapshot, or if the snapshot holds the whole
+    feed (so anything past its end is genuinely empty)."""
+    return start < len(snapshot['entries']) or snapshot['complete']
@@ -0,0 +1,130 @@
+"""Perceptual-hash index of already-classified images.
+
+The verdict cache (classifiers/verdict_cache.py) only recognizes a re-upload
+of the exact same bytes; a screenshot, a re-encode or a resize of an image we
+already judged went through the whole paid cascade again. The classification
+worker now fingerprints each post image and profile photo with a 64-bit dHash
+(a 9x8 grayscale thumbnail, one bit per horizontal brightness gradient), which
+survives those transformations, and records the image's own verdict here as an
+ImageVerdict row.
+
+Before running the image cascade the worker looks for an indexed image within
+IMAGE_HASH_MAX_DISTANCE bits of the new one:
+
+- a match against a final rejection (the blocklist) final-rejects the upload
+  at once, without consulting any provider — not even for the caption;
+- any other match reuses that image's verdict instead of the image cascade.
+
+Near neighbors are found through the pigeonhole principle: the hash is split
+into IMAGE_HASH_BANDS bands, each stored in an indexed column, and two hashes
+within IMAGE_HASH_BANDS - 1 bits of each other agree exactly on at least one
+band. So the lookup is an indexed OR over the bands followed by an exact
+Hamming check on the few candidates.
+
+Like the other caches this is an optimization only: failing to fetch, hash or
+index an image is logged and the worker classifies it as before.
+"""
+import logging
+
+from django.db.models import Q
+from PIL import Image, ImageOps
+
+from .classifiers.classifier_utils import ClassificationResult
+from .classifiers.image_context import ImageContext
+from .models import ImageVerdict
+
+logger = logging.getLogger(__name__)
+
+# An 8x8 grid of gradient bits, read from a 9x8 thumbnail.
+_HASH_SIZE = 8
+IMAGE_HASH_BANDS = 4
+_BAND_BITS = _HASH_SIZE * _HASH_SIZE // IMAGE_HASH_BANDS
+# The largest distance the band lookup is guaranteed to find. Deliberately
+# tight: a reused approval skips the image cascade, so a near match must be
+# the same picture, not merely a similar one.
+IMAGE_HASH_MAX_DISTANCE = IMAGE_HASH_BANDS - 1
+# Bound on the candidates checked per lookup, in case one band value turns out
+# to be very common.
+_MAX_CANDIDATES = 200
+
+
+def compute_dhash(image):
+    """The dHash of a PIL image as 16 hex digits, or None for an image with no
+    gradients at all (a flat color), which would match every other flat image."""
+    image = ImageOps.exif_transpose(image).convert('L')
+    thumbnail = image.resize((_HASH_SIZE + 1, _HASH_SIZE), Image.Resampling.LANCZOS)
+    pixels = list(thumbnail.getdata())
+    value = 0
+    for row in range(_HASH_SIZE):
+        for col in range(_HASH_SIZE):
+            left = pixels[row * (_HASH_SIZE + 1) + col]
+            right = pixels[row * (_HASH_SIZE + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return f'{value:016x}' if value else None
+
+
+def fingerprint_image_url(image):
+    """The dHash of `image` (a URL or the worker's ImageContext), or None on
+    any failure. Never raises: an image that cannot be fingerprinted is simply
+    classified."""
+    context = ImageContext.of(image)
+    try:
+        return compute_dhash(context.image)
+    except Exception:
+        logger.warning("Could not fingerprint image %s; classifying it without the index.",
+                       context.image_url, exc_info=True)
+        return None
+
+
+def hash_bands(dhash):
+    value = int(dhash, 16)
+    mask = (1 << _BAND_BITS) - 1
+    return [(value >> (_BAND_BITS * band)) & mask for band in range(IMAGE_HASH_BANDS)]
+
+
+def hamming_distance(first, second):
+    return bin(int(first, 16) ^ int(second, 16)).count('1')
+
+
+def find_known_verdict(dhash):
+    """The recorded verdict for an indexed image near `dhash`, or None.
+
+    A final rejection among the matches wins over any closer approval (an
+    image that near-matches blocklisted content is not let through on the
+    strength of another near match); otherwise the closest match decides.
+    """
+    try:
+        band_match = Q()
+        for band, value in enumerate(hash_bands(dhash)):
+            band_match |= Q(**{f'band_{band}': value})
+        matches = [
+            (distance, candidate)
+            for candidate in ImageVerdict.objects.filter(band_match)[:_MAX_CANDIDATES]
+            if (distance := hamming_distance(dhash, candidate.dhash)) <= IMAGE_HASH_MAX_DISTANCE
+        ]
+    except Exception:
+        logger.warning("Could not read the image index for %s; classifying afresh.", dhash, exc_info=True)
+        return None
+    if not matches:
+        return None
+    blocklisted = [match for match in matches if match[1].final]
+    _, best = min(blocklisted or matches, key=lambda match: match[0])
+    return ClassificationResult(allowed=best.allowed, appealable=best.appealable,
+                                reason_code=best.reason_code)
+
+
+def remember_verdict(dhash, result):
+    """Index the image cascade's `result` for the image hashed to `dhash`.
+    Provider failures say nothing about the image and are never indexed; an
+    already indexed hash keeps its first verdict."""
+    if dhash is None or result.provider_failure:
+        return
+    try:
+        ImageVerdict.objects.get_or_create(dhash=dhash, defaults={
+            **{f'band_{band}': value for band, value in enumerate(hash_bands(dhash))},
+            'allowed': result.allowed,
+            'appealable': result.appealable,
+            'reason_code': result.reason_code,
+        })
+    except Exception:
+        logger.warning("Could not index the verdict for image %s.", dhash, exc_info=True)
@@ -0,0 +1,158 @@
+import json
+import logging
+import statistics
+import subprocess
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from user_system.models import CommentThread, PositiveOnlySocialUser, Post
+from user_system.utils import generate_management_token
+from user_system.visibility import searchable_users, visible_comment_threads, visible_posts
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(samples, percent):
+    if len(samples) < 2:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method='inclusive')[percent - 1]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the feed and listing endpoints against whatever the configured "
+        "database holds (seed one with seed_synthetic_data): the ranked feed, "
+        "the followed feed, the busiest comment thread and the most-followed "
+        "profile, each requested --iterations times through the Django test "
+        "client as --viewer. Reports p50/p95/mean latency and the per-request "
+        "query count, optionally writes them as JSON (--output), and with "
+        "--compare prints the change against an earlier JSON report so a "
+        "regression shows up before it ships. Rate limiting is disabled for "
+        "the run; a throwaway session is opened for the viewer and removed "
+        "afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--viewer', help="Username to request as (default: the unbanned account following the most people).")
+        parser.add_argument('--iterations', type=int, default=20, help="Timed requests per endpoint (default 20).")
+        parser.add_argument('--warmup', type=int, default=2,
+                            help="Untimed requests per endpoint first, to warm caches (default 2).")
+        parser.add_argument('--output', help="Write the report as JSON to this path.")
+        parser.add_argument('--compare', help="A JSON report from an earlier run to diff against.")
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError("--iterations must be positive.")
+        if options['warmup'] < 0:
+            raise CommandError("--warmup must be non-negative.")
+        baseline = self._load_baseline(options['compare']) if options['compare'] else None
+        viewer = self._viewer(options['viewer'])
+
+        session = viewer.session_set.create(management_token=generate_management_token(), ip='127.0.0.1')
+        try:
+            with override_settings(RATELIMIT_ENABLE=False, ALLOWED_HOSTS=['*']):
+                client = Client(HTTP_AUTHORIZATION=f'Bearer {session.management_token}')
+                results = {name: self._measure(client, url, options['iterations'], options['warmup'])
+                           for name, url in self._endpoints(viewer)}
+        finally:
+            session.delete()
+
+        report = {
+            'metadata': {
+                'timestamp': timezone.now().isoformat(),
+                'git_commit': _git_commit(),
+                'database': connection.vendor,
+                'posts': Post.objects.count(),
+                'users': PositiveOnlySocialUser.objects.count(),
+                'viewer': viewer.username,
+                'iterations': options['iterations'],
+            },
+            'endpoints': results,
+        }
+        for name, result in results.items():
+            line = (f"{name}: p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, "
+                    f"mean {result['mean_ms']:.1f} ms, {result['queries']} queries")
+            if baseline and name in baseline.get('endpoints', {}):
+                before = baseline['endpoints'][name]
+                line += (f" (p50 {result['p50_ms'] - before['p50_ms']:+.1f} ms, "
+                         f"queries {result['queries'] - before['queries']:+d} vs baseline)")
+            self.stdout.write(line)
+            logger.info("benchmark_listings: %s", line)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"benchmark_listings: report written to {options['output']}.")
+
+    def _load_baseline(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read baseline report {path}: {e}")
+
+    def _viewer(self, username):
+        if username:
+            viewer = PositiveOnlySocialUser.objects.filter(username=username).first()
+            if viewer is None:
+                raise CommandError(f"No user named '{username}'.")
+            return viewer
+        # Skip banned accounts: an outright ban cannot authenticate at all.
+        viewer = (PositiveOnlySocialUser.objects.filter(bans__isnull=True).annotate(n=Count('following_set'))
+                  .order_by('-n', 'pk').first())
+        if viewer is None:
+            raise CommandError("The database has no users; seed it with seed_synthetic_data first.")
+        return viewer
+
+    def _endpoints(self, viewer):
+        endpoints = [
+            ('feed', reverse('get_posts_in_feed', kwargs={'batch': 0})),
+            ('followed_feed', reverse('get_posts_for_followed_users', kwargs={'batch': 0})),
+        ]
+        # The thread endpoint also checks the post, so pick among threads on
+        # posts the viewer can see.
+        threads = CommentThread.objects.filter(post__in=visible_posts(Post.objects.all(), viewer))
+        thread = (visible_comment_threads(threads, viewer).annotate(n=Count('comment'))
+                  .order_by('-n', 'pk').first())
+        if thread is not None:
+            endpoints.append(('comment_thread', reverse('get_comments_for_thread', kwargs={
+                'comment_thread_identifier': thread.pk, 'batch': 0})))
+        profile = (searchable_users(PositiveOnlySocialUser.objects.exclude(pk=viewer.pk), viewer)
+                   .annotate(n=Count('followers_set')).order_by('-n', 'pk').first())
+        if profile is not None:
+            endpoints.append(('profile', reverse('get_profile_details', kwargs={'username': profile.username})))
+        return endpoints
+
+    def _measure(self, client, url, iterations, warmup):
+        for _ in range(warmup):
+            client.get(url, secure=True)
+        timings = []
+        status = None
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = client.get(url, secure=True)
+                timings.append((time.perf_counter() - start) * 1000)
+            status = response.status_code
+        return {
+            'url': url,
+            'status': status,
+            'p50_ms': statistics.median(timings),
+            'p95_ms': _percentile(timings, 95),
+            'mean_ms': statistics.fmean(timings),
+            'queries': len(queries.captured_queries),
+        }
@@ -1,6 +1,12 @@
+import gc
 import os
 
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+# Jobs in flight per process with --async. Nearly all of a job is network
+# wait, so this can go well past the number of cores.
+DEFAULT_CONCURRENCY = 16
 
 
 class Command(BaseCommand):
@@ -9,7 +15,10 @@ class Command(BaseCommand):
         "(issue #282). Requires REDIS_URL; run one (or more) of these as a "
         "long-lived service next to gunicorn. Without a running worker, posts "
         "created while REDIS_URL is set stay pending until the "
-        "sweep_classifications command re-enqueues them."
+        "sweep_classifications command re-enqueues them. With --async one "
+        "process runs --concurrency jobs at once on an event loop (see user_system/async_worker.py); "
+        "with --processes a supervising parent forks that many workers, which "
+        "share the local image pre-filter models it loaded."
     )
 
     def add_arguments(self, parser):
@@ -17,8 +26,28 @@ class Command(BaseCommand):
             '--burst', action='store_true',
             help="Process the jobs currently queued, then exit (useful for cron/testing).",
         )
+        parser.add_argument(
+            '--async', action='store_true', dest='use_async',
+            help="Run many jobs at once in this process, on an event loop, instead of one at a time.",
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+            help=f"With --async, how many jobs to run at once (default {DEFAULT_CONCURRENCY}).",
+        )
+        parser.add_argument(
+            '--processes', type=int, default=None,
+            help=("Fork this many workers from one parent, which restarts any that die "
+                  "and stops them all gracefully on SIGTERM/SIGINT."),
+        )
 
     def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+        if options['processes'] is not None:
+            if options['processes'] < 1:
+                raise CommandError("--processes must be at least 1.")
+            if options['use_async']:
+                raise CommandError("--processes and --async can't be combined.")
         redis_url = os.environ.get('REDIS_URL')
         if not redis_url:
             raise CommandError(
@@ -29,11 +58,35 @@ class Command(BaseCommand):
         # collection) even where rq is not installed.
         from redis import Redis
         from rq import Queue, Worker
+        from rq.worker_pool import WorkerPool
 
         from django.conf import settings
 
+        # Load the job code and the local pre-filter models once, here, so
+        # every process forked from this one (the per-job work horses, or the
+        # --processes children) inherits them instead of loading its own.
+        from user_system import tasks  # noqa: F401
+        from user_system.classifiers.image_prefilter import warm_models
+        self.stdout.write(f"Local image pre-filter models available: {warm_models()}")
+
         connection = Redis.from_url(redis_url)
         queue = Queue(settings.CLASSIFICATION_QUEUE_NAME, connection=connection)
+        if options['use_async']:
+            from user_system import async_worker
+            self.stdout.write(f"Starting classification worker on queue '{queue.name}' "
+                              f"with {options['concurrency']} async job slots...")
+            async_worker.run([queue], connection, options['concurrency'], burst=options['burst'])
+            return
+        if options['processes'] is not None:
+            # The children must not share this process's database socket, and
+            # objects the garbage collector never touches again stay shared.
+            connections.close_all()
+            gc.freeze()
+            self.stdout.write(f"Starting {options['processes']} classification workers "
+                              f"on queue '{queue.name}'...")
+            WorkerPool([queue], connection=connection, num_workers=options['processes'],
+                       worker_class=Worker).start(burst=options['burst'])
+            return
         worker = Worker([queue], connection=connection)
         self.stdout.write(f"Starting classification worker on queue '{queue.name}'...")
         worker.work(burst=options['burst'])
@@ -0,0 +1,30 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from user_system.classifiers import tier_health
+from user_system.classifiers.classifier_utils import CASCADE_ORDER
+
+
+class Command(BaseCommand):
+    help = (
+        "Show each classifier cascade tier's circuit-breaker state and its "
+        "rolling call count, error rate and mean latency, as every worker "
+        "currently sees them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json', action='store_true',
+            help="Print the snapshot as JSON (for monitoring) instead of a table.",
+        )
+
+    def handle(self, *args, **options):
+        snapshot = tier_health.snapshot(CASCADE_ORDER)
+        if options['json']:
+            self.stdout.write(json.dumps(snapshot))
+            return
+        for api_name, health in snapshot.items():
+            self.stdout.write(
+                f"{api_name:<8} {health['state']:<10} calls={health['calls']} "
+                f"error_rate={health['error_rate']} mean_latency_ms={health['mean_latency_ms']}")
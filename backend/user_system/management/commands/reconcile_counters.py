@@ -0,0 +1,27 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from user_system.counters import reconcile_counters
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the denormalized engagement counters (Post.like_count, "
+        "Post.comment_count, Comment.like_count and "
+        "CommentThread.total_comment_likes) from the underlying like and "
+        "comment rows, rewriting only the ones that have drifted. Likes, "
+        "unlikes, comments and account deletions keep them current on their "
+        "own; run this from cron (e.g. nightly) to repair anything a bulk "
+        "delete or a manual data fix left behind."
+    )
+
+    def handle(self, *args, **options):
+        repaired = reconcile_counters()
+
+        details = ", ".join(f"{name}={count}" for name, count in repaired.items())
+        summary = f"reconcile_counters: repaired {sum(repaired.values())} counter(s) ({details})."
+        self.stdout.write(summary)
+        logger.info(summary)
@@ -0,0 +1,42 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from user_system.constants import HOT_SCORE_REFRESH_FLOOR
+from user_system.feed_algorithm import feed_algorithm
+from user_system.models import Post
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Decay tick for the materialized feed hot rank: re-age Post.hot_score "
+        "for every post still above the refresh floor, in one UPDATE. Likes "
+        "and unlikes rescore their post immediately; this only accounts for "
+        "time passing. Run from cron every few minutes — between runs a "
+        "post's stored score merely overstates its age by the interval, which "
+        "only affects which posts make the feed's candidate window, never the "
+        "per-viewer score the feed actually orders by."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--floor', type=float, default=HOT_SCORE_REFRESH_FLOOR,
+            help=("Skip posts whose stored score is already below this "
+                  f"(default {HOT_SCORE_REFRESH_FLOOR}). 0 rescores every post."),
+        )
+
+    def handle(self, *args, **options):
+        floor = options['floor']
+        if floor < 0:
+            raise CommandError("--floor must be non-negative.")
+
+        # A stored score only ever overstates the true one (scores fall with
+        # age, and a like rescores its post on the spot), so a post already
+        # below the floor cannot climb back into the candidate window unaided.
+        refreshed = feed_algorithm.refresh_post_hot_scores(Post.objects.filter(hot_score__gte=floor))
+
+        summary = f"refresh_hot_scores: rescored {refreshed} post(s)."
+        self.stdout.write(summary)
+        logger.info(summary)
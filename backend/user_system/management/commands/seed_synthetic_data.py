@@ -0,0 +1,248 @@
+import logging
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from user_system import timeline
+from user_system.ban_sets import invalidate_ban_sets
+from user_system.constants import (
+    BAN_TYPE_OUTRIGHT, BAN_TYPE_SHADOW, FOLLOW_CATEGORY_CHOICES, HIDDEN_REASON_NONE,
+    MAX_INTEREST_TAGS_PER_POST, POST_AUDIENCE_CHOICES,
+    POST_AUDIENCE_PUBLIC,
+)
+from user_system.counters import reconcile_counters
+from user_system.feed_algorithm import feed_algorithm
+from user_system.models import (
+    Comment, CommentLike, CommentThread, InterestCategory, PositiveOnlySocialUser, Post, PostLike,
+    Tag, UserBan, UserFollow, interest_mask,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+# Most posts are public; the rest spread over the narrower audiences so the
+# audience filter has real work to do.
+PUBLIC_POST_WEIGHT = 7
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with a synthetic population for benchmarking the "
+        "feed and listing endpoints (see benchmark_listings): users in both "
+        "age bands with interests, a follow graph with relationship "
+        "categories, posts with hashtags and interest buckets spread over the "
+        "last --days, likes, comment threads with comment likes, and shadow and "
+        "outright bans. Rows are written with bulk_create in --batch-size "
+        "chunks, so the save() hooks do not run; the denormalized counters, hot "
+        "scores and followed-feed timelines are rebuilt once at the end. "
+        "Deterministic for a given --seed. Never run against production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help="Accounts to create (default 1000).")
+        parser.add_argument('--posts', type=int, default=1000, help="Posts to create (default 1000).")
+        parser.add_argument('--follows-per-user', type=int, default=20,
+                            help="Accounts each user follows (default 20).")
+        parser.add_argument('--likes-per-post', type=int, default=5,
+                            help="Average likes per post (default 5).")
+        parser.add_argument('--comments-per-post', type=int, default=2,
+                            help="Average comments per post, one thread each (default 2).")
+        parser.add_argument('--likes-per-comment', type=int, default=1,
+                            help="Average likes per comment (default 1).")
+        parser.add_argument('--tags', type=int, default=200,
+                            help="Size of the hashtag vocabulary posts draw from (default 200).")
+        parser.add_argument('--days', type=int, default=30,
+                            help="Spread post creation times over this many days (default 30).")
+        parser.add_argument('--minor-fraction', type=float, default=0.05,
+                            help="Fraction of accounts that are verified minors (default 0.05).")
+        parser.add_argument('--shadow-ban-fraction', type=float, default=0.01,
+                            help="Fraction of accounts with an active shadow ban (default 0.01).")
+        parser.add_argument('--outright-ban-fraction', type=float, default=0.005,
+                            help="Fraction of accounts with an active outright ban (default 0.005).")
+        parser.add_argument('--prefix', default='synth',
+                            help="Alphanumeric username prefix for the seeded accounts (default 'synth').")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed (default 0).")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f"Rows per bulk INSERT (default {DEFAULT_BATCH_SIZE}).")
+
+    def handle(self, *args, **options):
+        self._validate(options)
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+
+        users = self._seed_users(options)
+        tags = self._seed_tags(options['tags'])
+        follow_count = self._seed_follows(users, options['follows_per_user'])
+        totals = {'users': len(users), 'follows': follow_count, 'posts': 0, 'likes': 0,
+                  'comments': 0, 'comment_likes': 0}
+        now = timezone.now()
+        remaining = options['posts']
+        while remaining > 0:
+            chunk_size = min(remaining, self.batch_size)
+            with transaction.atomic():
+                posts = self._seed_posts(users, tags, chunk_size, now, options['days'])
+                totals['likes'] += self._seed_likes(posts, users, options['likes_per_post'])
+                comments, comment_likes = self._seed_comments(
+                    posts, users, options['comments_per_post'], options['likes_per_comment'])
+            totals['posts'] += len(posts)
+            totals['comments'] += comments
+            totals['comment_likes'] += comment_likes
+            remaining -= chunk_size
+            self.stdout.write(f"seed_synthetic_data: {totals['posts']}/{options['posts']} posts written.")
+        totals['bans'] = self._seed_bans(users, options)
+
+        self._rebuild_derived_state(users)
+
+        summary = "seed_synthetic_data: created " + ", ".join(f"{count} {name}" for name, count in totals.items()) + "."
+        self.stdout.write(summary)
+        logger.info(summary)
+
+    def _validate(self, options):
+        for name in ('users', 'posts', 'follows_per_user', 'likes_per_post', 'comments_per_post',
+                     'likes_per_comment', 'tags', 'days'):
+            if options[name] < 0:
+                raise CommandError(f"--{name.replace('_', '-')} must be non-negative.")
+        if options['users'] < 2:
+            raise CommandError("--users must be at least 2.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive.")
+        for name in ('minor_fraction', 'shadow_ban_fraction', 'outright_ban_fraction'):
+            if not 0 <= options[name] <= 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be between 0 and 1.")
+        if not options['prefix'].isalnum():
+            raise CommandError("--prefix must be alphanumeric.")
+        if PositiveOnlySocialUser.objects.filter(username__startswith=options['prefix']).exists():
+            raise CommandError(f"Accounts with the prefix '{options['prefix']}' already exist; "
+                               "pick another --prefix or start from an empty database.")
+
+    def _sample_interests(self, categories, upper):
+        return self.rng.sample(categories, self.rng.randint(0, min(upper, len(categories))))
+
+    def _seed_users(self, options):
+        # One shared unusable-for-login hash: hashing per account would dominate
+        # the run, and nobody signs in as a synthetic user (the benchmark opens
+        # sessions directly).
+        password = make_password(None)
+        categories = list(InterestCategory.objects.all())
+        users, interests = [], []
+        for i in range(options['users']):
+            picked = self._sample_interests(categories, 5)
+            user = PositiveOnlySocialUser(
+                username=f"{options['prefix']}{i}", email=f"{options['prefix']}{i}@synthetic.invalid",
+                password=password, email_verified=True,
+                identity_is_verified=True, is_adult=self.rng.random() >= options['minor_fraction'],
+                interest_mask=interest_mask(c.slug for c in picked))
+            users.append(user)
+            interests.append(picked)
+        PositiveOnlySocialUser.objects.bulk_create(users, batch_size=self.batch_size)
+        through = PositiveOnlySocialUser.interest_categories.through
+        through.objects.bulk_create(
+            [through(positiveonlysocialuser_id=user.pk, interestcategory_id=c.pk)
+             for user, picked in zip(users, interests) for c in picked],
+            batch_size=self.batch_size)
+        return users
+
+    def _seed_tags(self, count):
+        names = [f"synthtag{i}" for i in range(count)]
+        Tag.objects.bulk_create([Tag(name=name) for name in names], batch_size=self.batch_size,
+                                ignore_conflicts=True)
+        return list(Tag.objects.filter(name__in=names))
+
+    def _seed_follows(self, users, per_user):
+        categories = [value for value, _ in FOLLOW_CATEGORY_CHOICES]
+        follows = []
+        for user in users:
+            followees = [other for other in self.rng.sample(users, min(per_user + 1, len(users)))
+                         if other is not user][:per_user]
+            follows.extend(UserFollow(user_from=user, user_to=followee, category=self.rng.choice(categories))
+                           for followee in followees)
+        UserFollow.objects.bulk_create(follows, batch_size=self.batch_size)
+        return len(follows)
+
+    def _seed_posts(self, users, tags, count, now, days):
+        audiences = [value for value, _ in POST_AUDIENCE_CHOICES]
+        weights = [PUBLIC_POST_WEIGHT if value == POST_AUDIENCE_PUBLIC else 1 for value in audiences]
+        categories = list(InterestCategory.objects.all())
+        posts, creation_times, post_tags, post_interests = [], [], [], []
+        for _ in range(count):
+            picked_tags = self.rng.sample(tags, min(len(tags), self.rng.randint(0, 3)))
+            picked_interests = self._sample_interests(categories, MAX_INTEREST_TAGS_PER_POST)
+            posts.append(Post(
+                author=self.rng.choice(users),
+                caption="A synthetic post " + " ".join(f"#{tag.name}" for tag in picked_tags),
+                audience=self.rng.choices(audiences, weights)[0],
+                hidden=False, hidden_reason=HIDDEN_REASON_NONE,
+                interest_mask=interest_mask(c.slug for c in picked_interests)))
+            creation_times.append(now - timedelta(seconds=self.rng.uniform(0, days * 86400)))
+            post_tags.append(picked_tags)
+            post_interests.append(picked_interests)
+        Post.objects.bulk_create(posts, batch_size=self.batch_size)
+        # creation_time is auto_now_add, which bulk_create overwrites with now;
+        # bulk_update writes the spread-out times as given.
+        for post, creation_time in zip(posts, creation_times):
+            post.creation_time = creation_time
+        Post.objects.bulk_update(posts, ['creation_time'], batch_size=self.batch_size)
+
+        tag_through = Post.tags.through
+        tag_through.objects.bulk_create(
+            [tag_through(post_id=post.pk, tag_id=tag.pk) for post, picked in zip(posts, post_tags) for tag in picked],
+            batch_size=self.batch_size)
+        interest_through = Post.interest_categories.through
+        interest_through.objects.bulk_create(
+            [interest_through(post_id=post.pk, interestcategory_id=c.pk)
+             for post, picked in zip(posts, post_interests) for c in picked],
+            batch_size=self.batch_size)
+        return posts
+
+    def _likers(self, users, author, average):
+        count = min(len(users) - 1, self.rng.randint(0, 2 * average)) if average else 0
+        return [user for user in self.rng.sample(users, min(count + 1, len(users))) if user != author][:count]
+
+    def _seed_likes(self, posts, users, average):
+        likes = [PostLike(user=user, post=post) for post in posts for user in self._likers(users, post.author, average)]
+        PostLike.objects.bulk_create(likes, batch_size=self.batch_size, ignore_conflicts=True)
+        return len(likes)
+
+    def _seed_comments(self, posts, users, average, likes_average):
+        threads, comments = [], []
+        for post in posts:
+            for _ in range(self.rng.randint(0, 2 * average) if average else 0):
+                thread = CommentThread(post=post)
+                threads.append(thread)
+                comments.append(Comment(comment_thread=thread, author=self.rng.choice(users),
+                                        body="A synthetic comment", hidden=False,
+                                        hidden_reason=HIDDEN_REASON_NONE))
+        CommentThread.objects.bulk_create(threads, batch_size=self.batch_size)
+        Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+        comment_likes = [CommentLike(user=user, comment=comment) for comment in comments
+                         for user in self._likers(users, comment.author, likes_average)]
+        CommentLike.objects.bulk_create(comment_likes, batch_size=self.batch_size, ignore_conflicts=True)
+        return len(comments), len(comment_likes)
+
+    def _seed_bans(self, users, options):
+        bans = []
+        for user in users:
+            roll = self.rng.random()
+            if roll < options['outright_ban_fraction']:
+                bans.append(UserBan(user=user, ban_type=BAN_TYPE_OUTRIGHT, reason="synthetic"))
+            elif roll < options['outright_ban_fraction'] + options['shadow_ban_fraction']:
+                bans.append(UserBan(user=user, ban_type=BAN_TYPE_SHADOW, reason="synthetic"))
+        # bulk_create skips UserBan.save, so no session purge or email fires;
+        # the cached ban sets still have to learn about the new bans.
+        UserBan.objects.bulk_create(bans, batch_size=self.batch_size)
+        invalidate_ban_sets()
+        return len(bans)
+
+    def _rebuild_derived_state(self, users):
+        seeded_posts = Post.objects.filter(author__in=[user.pk for user in users])
+        reconcile_counters(
+            posts=seeded_posts,
+            comments=Comment.objects.filter(comment_thread__post__in=seeded_posts),
+            comment_threads=CommentThread.objects.filter(post__in=seeded_posts))
+        feed_algorithm.refresh_post_hot_scores(seeded_posts)
+        for follow in UserFollow.objects.filter(user_from__in=[user.pk for user in users]).iterator():
+            timeline.backfill_follow(follow)
@@ -6,12 +6,14 @@ from django.utils import timezone
 
 from user_system import tasks
 from user_system.constants import (
+    BIO_STATUS_PENDING,
     CLASSIFICATION_MAX_ATTEMPTS,
     HIDDEN_REASON_CLASSIFIER_FINAL,
     HIDDEN_REASON_PENDING_CLASSIFICATION,
     PROFILE_IMAGE_STATUS_PENDING,
 )
-from user_system.models import Post, PositiveOnlySocialUser
+from user_system.counters import reconcile_counters
+from user_system.models import Comment, CommentThread, Post, PositiveOnlySocialUser
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +33,7 @@ DEFAULT_TOMBSTONE_DAYS = 7
 class Command(BaseCommand):
     help = (
         "Reconcile async post classification (issue #282): re-enqueue posts "
+        "(and comments, bios and profile photos) "
         "stuck in pending_classification past a threshold (alerting instead "
         "once their retry budget is exhausted — they stay hidden, fail "
         "closed), and purge final-rejection tombstone rows old enough that "
@@ -139,6 +142,66 @@ class Command(BaseCommand):
             else:
                 tasks.enqueue_profile_photo_classification(user.id)
 
+        # --- Stuck pending comments: re-enqueue or alert. ---
+        # Exactly the post reconciliation above; classify_comment bumps the
+        # comment's updated_time on every attempt the same way.
+        stuck_comments = Comment.objects.filter(
+            hidden_reason=HIDDEN_REASON_PENDING_CLASSIFICATION,
+            updated_time__lte=stuck_cutoff,
+        ).only('comment_identifier', 'classification_attempts', 'classification_alerted')
+        comments_requeued = comments_exhausted = comments_newly_alerted = 0
+        for comment in stuck_comments.iterator():
+            if comment.classification_attempts >= CLASSIFICATION_MAX_ATTEMPTS:
+                comments_exhausted += 1
+                if not comment.classification_alerted:
+                    comments_newly_alerted += 1
+                    if dry_run:
+                        self.stdout.write(f"[dry-run] would alert on exhausted comment {comment.comment_identifier}")
+                    else:
+                        logger.error(
+                            "sweep_classifications: comment %s has exhausted its %d classification "
+                            "attempts and needs operator attention.",
+                            comment.comment_identifier, comment.classification_attempts)
+                        Comment.objects.filter(pk=comment.pk).update(classification_alerted=True)
+                continue
+            comments_requeued += 1
+            if dry_run:
+                self.stdout.write(f"[dry-run] would re-enqueue comment {comment.comment_identifier} "
+                                  f"(attempts={comment.classification_attempts})")
+            else:
+                tasks.enqueue_comment_classification(comment.comment_identifier)
+
+        # --- Stuck pending bios: re-enqueue or alert. ---
+        # The profile-photo reconciliation above, keyed on the bio's own
+        # classification_time and requiring an actual pending bio.
+        stuck_bios = PositiveOnlySocialUser.objects.filter(
+            bio_status=BIO_STATUS_PENDING,
+            bio_classification_time__lte=stuck_cutoff,
+            pending_bio__isnull=False,
+        ).only('id', 'bio_classification_attempts', 'bio_classification_alerted')
+        bios_requeued = bios_exhausted = bios_newly_alerted = 0
+        for user in stuck_bios.iterator():
+            if user.bio_classification_attempts >= CLASSIFICATION_MAX_ATTEMPTS:
+                bios_exhausted += 1
+                if not user.bio_classification_alerted:
+                    bios_newly_alerted += 1
+                    if dry_run:
+                        self.stdout.write(f"[dry-run] would alert on exhausted bio for user {user.id}")
+                    else:
+                        logger.error(
+                            "sweep_classifications: user %s bio has exhausted its %d "
+                            "classification attempts and needs operator attention.",
+                            user.id, user.bio_classification_attempts)
+                        PositiveOnlySocialUser.objects.filter(pk=user.pk).update(
+                            bio_classification_alerted=True)
+                continue
+            bios_requeued += 1
+            if dry_run:
+                self.stdout.write(f"[dry-run] would re-enqueue bio for user {user.id} "
+                                  f"(attempts={user.bio_classification_attempts})")
+            else:
+                tasks.enqueue_bio_classification(user.id)
+
         # --- Old final-rejection tombstones: purge. ---
         tombstone_cutoff = now - timedelta(days=tombstone_days)
         tombstones = Post.objects.filter(
@@ -155,12 +218,35 @@ class Command(BaseCommand):
             # cleanup is owed here (cleanup_orphan_images backstops any miss).
             tombstones.delete()
 
+        comment_tombstones = Comment.objects.filter(
+            hidden_reason=HIDDEN_REASON_CLASSIFIER_FINAL,
+            creation_time__lte=tombstone_cutoff,
+        )
+        comments_purged = comment_tombstones.count()
+        if dry_run:
+            for comment in comment_tombstones.only('comment_identifier').iterator():
+                self.stdout.write(f"[dry-run] would purge comment tombstone {comment.comment_identifier}")
+        elif comments_purged:
+            thread_ids = set(comment_tombstones.values_list('comment_thread_id', flat=True))
+            comment_tombstones.delete()
+            # The bulk delete skips Comment.delete, so repair the affected posts'
+            # comment counts, and drop threads the purge left with no comments.
+            threads = CommentThread.objects.filter(pk__in=thread_ids)
+            reconcile_counters(posts=Post.objects.filter(commentthread__in=threads).distinct(),
+                               comments=Comment.objects.none(), comment_threads=threads)
+            threads.filter(comment__isnull=True).delete()
+
         verb = "Would re-enqueue" if dry_run else "Re-enqueued"
         purge_verb = "would purge" if dry_run else "purged"
         summary = (f"{verb} {requeued} stuck pending post(s); {exhausted} exhausted "
                    f"(fail-closed, {newly_alerted} newly alerted); "
                    f"{photos_requeued} stuck pending profile photo(s); {photos_exhausted} "
                    f"photo(s) exhausted (fail-closed, {photos_newly_alerted} newly alerted); "
-                   f"{purge_verb} {purged} tombstone(s) older than {tombstone_days}d.")
+                   f"{comments_requeued} stuck pending comment(s); {comments_exhausted} "
+                   f"comment(s) exhausted (fail-closed, {comments_newly_alerted} newly alerted); "
+                   f"{bios_requeued} stuck pending bio(s); {bios_exhausted} "
+                   f"bio(s) exhausted (fail-closed, {bios_newly_alerted} newly alerted); "
+                   f"{purge_verb} {purged} tombstone(s) and {comments_purged} comment tombstone(s) "
+                   f"older than {tombstone_days}d.")
         self.stdout.write(summary)
         logger.info("sweep_classifications: %s", summary)
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:30
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+# Must match constants.HOT_RANK_GRAVITY at the time of writing; frozen here so
+# the migration keeps its meaning if the constant is later retuned (the decay
+# tick rescores everything with the live value on its next run anyway).
+HOT_RANK_GRAVITY = 1.8
+BATCH_SIZE = 500
+
+
+def backfill_hot_scores(apps, schema_editor):
+    # Existing posts would otherwise all start at the fresh-post default and
+    # crowd the feed's candidate window until the first refresh_hot_scores run.
+    Post = apps.get_model('user_system', 'Post')
+    now = timezone.now()
+    last_pk = None
+    while True:
+        chunk = Post.objects.order_by('pk')
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        chunk = list(chunk.annotate(likes=Count('postlike'))[:BATCH_SIZE])
+        if not chunk:
+            break
+        for post in chunk:
+            age_hours = 0.0
+            if post.creation_time is not None:
+                age_hours = max((now - post.creation_time).total_seconds() / 3600.0, 0.0)
+            post.hot_score = (post.likes + 1) / ((age_hours + 2.0) ** HOT_RANK_GRAVITY)
+        Post.objects.bulk_update(chunk, ['hot_score'])
+        last_pk = chunk[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_system', '0032_merge_20260731_1310'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='hot_score',
+            field=models.FloatField(default=0.2871745887492588),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['hidden', '-hot_score'], name='post_hidden_hot_score_idx'),
+        ),
+        migrations.RunPython(backfill_hot_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:10
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def _subquery_total(queryset):
+    return Coalesce(Subquery(queryset, output_field=IntegerField()), 0)
+
+
+def backfill_counters(apps, schema_editor):
+    # One correlated UPDATE per counter; comments go before threads because a
+    # thread's total is the sum of its comments' like_count.
+    Post = apps.get_model('user_system', 'Post')
+    PostLike = apps.get_model('user_system', 'PostLike')
+    Comment = apps.get_model('user_system', 'Comment')
+    CommentLike = apps.get_model('user_system', 'CommentLike')
+    CommentThread = apps.get_model('user_system', 'CommentThread')
+
+    post_likes = PostLike.objects.filter(post=OuterRef('pk')).order_by().values(
+        'post').annotate(c=Count('*')).values('c')[:1]
+    post_comments = Comment.objects.filter(comment_thread__post=OuterRef('pk')).order_by().values(
+        'comment_thread__post').annotate(c=Count('*')).values('c')[:1]
+    Post.objects.update(like_count=_subquery_total(post_likes),
+                        comment_count=_subquery_total(post_comments))
+
+    comment_likes = CommentLike.objects.filter(comment=OuterRef('pk')).order_by().values(
+        'comment').annotate(c=Count('*')).values('c')[:1]
+    Comment.objects.update(like_count=_subquery_total(comment_likes))
+
+    thread_likes = Comment.objects.filter(comment_thread=OuterRef('pk')).order_by().values(
+        'comment_thread').annotate(total=Sum('like_count')).values('total')[:1]
+    CommentThread.objects.update(total_comment_likes=_subquery_total(thread_likes))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_system', '0033_post_hot_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='commentthread',
+            name='total_comment_likes',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
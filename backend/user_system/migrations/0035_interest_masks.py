@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:40
+
+from django.db import migrations, models
+
+# Frozen copy of the slug order in constants.INTEREST_CATEGORY_CHOICES at the
+# time of writing; a bucket's bit is its position in this list.
+INTEREST_SLUG_ORDER = [
+    "nature", "animals", "sports", "art", "music", "food", "travel", "science",
+    "technology", "fitness", "family", "friends", "humor", "gratitude",
+    "kindness", "community", "learning", "achievement", "faith", "wellness",
+    "outdoors", "books", "gaming", "photography",
+]
+BATCH_SIZE = 500
+
+
+def backfill_interest_masks(apps, schema_editor):
+    bits = {slug: 1 << position for position, slug in enumerate(INTEREST_SLUG_ORDER)}
+    for model_name in ('Post', 'PositiveOnlySocialUser'):
+        model = apps.get_model('user_system', model_name)
+        masks = {}
+        rows = model.interest_categories.through.objects.values_list(
+            f'{model_name.lower()}_id', 'interestcategory__slug')
+        for owner_id, slug in rows.iterator():
+            masks[owner_id] = masks.get(owner_id, 0) | bits.get(slug, 0)
+        owners = [model(pk=owner_id, interest_mask=mask) for owner_id, mask in masks.items()]
+        model.objects.bulk_update(owners, ['interest_mask'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_system', '0034_engagement_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='positiveonlysocialuser',
+            name='interest_mask',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='interest_mask',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_interest_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copy of constants.TIMELINE_BACKFILL_LIMIT at the time of writing.
+TIMELINE_BACKFILL_LIMIT = 500
+BATCH_SIZE = 1000
+
+
+def backfill_timelines(apps, schema_editor):
+    # Seed every existing follow edge the way follow_user does for a new one:
+    # the followee's most recent visible posts, labeled with the edge category.
+    Post = apps.get_model('user_system', 'Post')
+    TimelineEntry = apps.get_model('user_system', 'TimelineEntry')
+    UserFollow = apps.get_model('user_system', 'UserFollow')
+    pending = []
+    follows = UserFollow.objects.values_list('user_from_id', 'user_to_id', 'category')
+    for follower_id, followee_id, category in follows.iterator():
+        posts = Post.objects.filter(author_id=followee_id, hidden=False).order_by(
+            '-creation_time').values_list('pk', 'creation_time')[:TIMELINE_BACKFILL_LIMIT]
+        pending.extend(
+            TimelineEntry(owner_id=follower_id, post_id=post_id, author_id=followee_id,
+                          creation_time=creation_time, category=category)
+            for post_id, creation_time in posts
+        )
+        if len(pending) >= BATCH_SIZE:
+            TimelineEntry.objects.bulk_create(pending, ignore_conflicts=True)
+            pending = []
+    TimelineEntry.objects.bulk_create(pending, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_system', '0035_interest_masks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('creation_time', models.DateTimeField(null=True)),
+                ('category', models.CharField(choices=[('following', 'Following'), ('friend', 'Friend'), ('family', 'Family')], default='following', max_length=16)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='user_system.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', '-creation_time', '-post'], name='timeline_owner_time_idx'), models.Index(fields=['owner', 'category', '-creation_time', '-post'], name='timeline_owner_category_idx'), models.Index(fields=['owner', 'author'], name='timeline_owner_author_idx')],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'post'), name='unique_timeline_entry')],
+            },
+        ),
+        migrations.RunPython(backfill_timelines, migrations.RunPython.noop),
+    ]
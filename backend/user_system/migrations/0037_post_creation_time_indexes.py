@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_system', '0036_followed_timelines'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['hidden', '-creation_time'], name='post_hidden_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-creation_time'], name='post_author_created_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:40
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_token_hashes(apps, schema_editor):
+    # Session.save derives token_hash for new sessions; hash the live ones.
+    Session = apps.get_model('user_system', 'Session')
+    sessions = list(Session.objects.filter(management_token__isnull=False).only('pk', 'management_token'))
+    for session in sessions:
+        session.token_hash = hashlib.sha256(session.management_token.encode('utf-8')).hexdigest()
+    Session.objects.bulk_update(sessions, ['token_hash'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_system', '0037_post_creation_time_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='token_hash',
+            field=models.CharField(max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_token_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_system', '0038_session_token_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userfollow',
+            index=models.Index(fields=['user_from', 'user_to', 'category'], name='follow_audience_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:06
+
+from django.db import migrations, models
+
+
+def mark_existing_bios_approved(apps, schema_editor):
+    # Bios written before the async review were classified on write.
+    User = apps.get_model('user_system', 'PositiveOnlySocialUser')
+    User.objects.exclude(bio='').update(bio_status='approved')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_system', '0039_userfollow_audience_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='classification_alerted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='classification_attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='classification_reason_code',
+            field=models.TextField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='positiveonlysocialuser',
+            name='bio_classification_alerted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='positiveonlysocialuser',
+            name='bio_classification_attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='positiveonlysocialuser',
+            name='bio_classification_time',
+            field=models.DateTimeField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='positiveonlysocialuser',
+            name='bio_reason_code',
+            field=models.TextField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='positiveonlysocialuser',
+            name='bio_status',
+            field=models.TextField(default='none'),
+        ),
+        migrations.AddField(
+            model_name='positiveonlysocialuser',
+            name='pending_bio',
+            field=models.TextField(blank=True, default=None, null=True),
+        ),
+        migrations.RunPython(mark_existing_bios_approved, migrations.RunPython.noop),
+    ]
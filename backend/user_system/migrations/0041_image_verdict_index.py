@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_system', '0040_comment_and_bio_classification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageVerdict',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dhash', models.CharField(max_length=16, unique=True)),
+                ('band_0', models.IntegerField(db_index=True)),
+                ('band_1', models.IntegerField(db_index=True)),
+                ('band_2', models.IntegerField(db_index=True)),
+                ('band_3', models.IntegerField(db_index=True)),
+                ('allowed', models.BooleanField()),
+                ('appealable', models.BooleanField(default=False)),
+                ('reason_code', models.TextField(blank=True, default=None, null=True)),
+                ('creation_time', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='positiveonlysocialuser',
+            name='profile_image_dhash',
+            field=models.CharField(blank=True, default=None, max_length=16, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_dhash',
+            field=models.CharField(blank=True, default=None, max_length=16, null=True),
+        ),
+    ]
@@ -5,7 +5,7 @@ from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.core.mail import send_mail
 from django.db import models, transaction
-from django.db.models import Q
+from django.db.models import F, Q
 from django.utils import timezone
 from .constants import (
     NEVER_RUN, BAN_TYPE_OUTRIGHT, BAN_TYPE_SHADOW,
@@ -20,14 +20,38 @@ from .constants import (
     POST_AUDIENCE_CHOICES, POST_AUDIENCE_PUBLIC,
     MAX_TAG_LENGTH,
     MAX_FREEFORM_INTEREST_LENGTH,
-    PROFILE_IMAGE_STATUS_NONE,
+    PROFILE_IMAGE_STATUS_NONE, BIO_STATUS_NONE,
     DEFAULT_STYLE_KEY,
     DEVICE_PLATFORM_CHOICES, MAX_DEVICE_TOKEN_LENGTH,
+    FRESH_POST_HOT_SCORE,
+    INTEREST_CATEGORY_BITS,
 )
+from .utils import hash_string_sha256
 
 logger = logging.getLogger(__name__)
 
 
+def interest_mask(slugs):
+    """The interest_mask bitmask for a collection of InterestCategory slugs.
+    Slugs outside the curated vocabulary contribute nothing."""
+    mask = 0
+    for slug in slugs:
+        mask |= INTEREST_CATEGORY_BITS.get(slug, 0)
+    return mask
+
+
+def _set_interest_categories(instance, categories):
+    """Replace `instance`'s interest_categories M2M and its interest_mask
+    mirror together. The mask is written with a queryset update so it never
+    bumps an auto_now updated_time."""
+    categories = list(categories)
+    mask = interest_mask(category.slug for category in categories)
+    with transaction.atomic():
+        instance.interest_categories.set(categories)
+        type(instance).objects.filter(pk=instance.pk).update(interest_mask=mask)
+    instance.interest_mask = mask
+
+
 def notify_user_of_outright_ban(ban):
     """Email a user that their account has been suspended.
 
@@ -106,6 +130,12 @@ class UserFollow(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['user_from', 'user_to'], name='unique_followers')
         ]
+        indexes = [
+            # Covers the audience check in visibility._audience_q (does the
+            # author follow the viewer with one of these categories?) without
+            # reading the table.
+            models.Index(fields=['user_from', 'user_to', 'category'], name='follow_audience_idx'),
+        ]
 
 
 # The model to explicitly define the "block" relationship
@@ -180,14 +210,24 @@ class PositiveOnlySocialUser(AbstractUser):
     profile_image_classification_attempts = models.IntegerField(default=0)
     profile_image_classification_alerted = models.BooleanField(default=False)
     profile_image_classification_time = models.DateTimeField(null=True, blank=True, default=None)
+    # Perceptual hash of the live profile photo (see image_index.py), set when
+    # the worker approves it.
+    profile_image_dhash = models.CharField(max_length=16, null=True, blank=True, default=None)
 
     # Free-text profile bio (issue #380). A short blurb the user writes about
-    # themselves, shown on their profile. Unlike the photo it is plain text, so
-    # it is moderated synchronously by the text classifier on write (exactly like
-    # a username or a comment) rather than through the async image pipeline —
-    # there is no pending/approved lifecycle: a bio that fails the positivity
-    # check is simply rejected and never stored. Empty string means "no bio".
+    # themselves, shown on their profile. Empty string means "no bio". bio is
+    # only ever the approved text: a new bio waits in pending_bio while the
+    # async text classifier reviews it, then is promoted into bio or dropped,
+    # exactly like the profile photo above (bio_status/bio_reason_code tell the
+    # owner the outcome; the attempts/alerted/classification_time fields back
+    # sweep_classifications the same way). See constants BIO_STATUS_*.
     bio = models.TextField(default="", blank=True)
+    pending_bio = models.TextField(null=True, blank=True, default=None)
+    bio_status = models.TextField(default=BIO_STATUS_NONE)
+    bio_reason_code = models.TextField(null=True, blank=True, default=None)
+    bio_classification_attempts = models.IntegerField(default=0)
+    bio_classification_alerted = models.BooleanField(default=False)
+    bio_classification_time = models.DateTimeField(null=True, blank=True, default=None)
 
     creation_time = models.DateTimeField(auto_now_add=True, null=True, blank=True)
     updated_time = models.DateTimeField(auto_now=True, null=True, blank=True)
@@ -214,17 +254,32 @@ class PositiveOnlySocialUser(AbstractUser):
     # so it is stored denormalized here to keep ranking a single DB join with no
     # per-request classifier work. Rebuilt wholesale on every /interests/ write.
     interest_categories = models.ManyToManyField('InterestCategory', related_name='interested_users', blank=True)
+    # The same set as a bitmask (bits from INTEREST_CATEGORY_BITS), which is
+    # what the feed weighting actually reads. Always written together with the
+    # M2M through set_interest_categories.
+    interest_mask = models.BigIntegerField(default=0)
+
+    def set_interest_categories(self, categories):
+        _set_interest_categories(self, categories)
 
     def __str__(self):
         return self.username
 
 
-# The session information (no changes needed here)
+# The session information
 class Session(models.Model):
     management_token = models.TextField(null=True)
+    # SHA-256 of management_token: a fixed-width, uniquely indexed key the
+    # per-request authentication looks sessions up by (see auth_principals),
+    # instead of scanning the unindexed token text. Derived in save().
+    token_hash = models.CharField(max_length=64, null=True, unique=True)
     management_user = models.ForeignKey(PositiveOnlySocialUser, on_delete=models.CASCADE)
     ip = models.TextField(null=True)
 
+    def save(self, *args, **kwargs):
+        self.token_hash = hash_string_sha256(self.management_token) if self.management_token else None
+        super().save(*args, **kwargs)
+
 
 # The login cookie information (no changes needed here)
 class LoginCookie(models.Model):
@@ -383,17 +438,27 @@ class UserBan(models.Model):
                                        and previous.is_in_effect())
 
         super().save(*args, **kwargs)
+        from .ban_sets import invalidate_ban_sets
+        invalidate_ban_sets()
 
         # An outright ban must terminate the user's live sessions immediately.
         # Shadow bans leave sessions alone so the user stays unaware, and
         # already-expired bans (e.g. recording a historical ban) must not log
         # the user out.
         if self.ban_type == BAN_TYPE_OUTRIGHT and self.is_in_effect():
+            from .auth_principals import forget_user
+            forget_user(self.user)
             Session.objects.filter(management_user=self.user).delete()
             LoginCookie.objects.filter(cookie_user=self.user).delete()
             if not was_active_outright:
                 notify_user_of_outright_ban(self)
 
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        from .ban_sets import invalidate_ban_sets
+        invalidate_ban_sets()
+        return result
+
     def __str__(self):
         return f"{self.ban_type} ban on {self.user}"
 
@@ -411,6 +476,18 @@ HIDDEN_REASON_CHOICES = [
 ]
 
 
+def _classification_status(hidden_reason):
+    # The classification lifecycle state a post's or comment's hidden_reason
+    # stands for (POST_STATUS_*).
+    if hidden_reason == HIDDEN_REASON_PENDING_CLASSIFICATION:
+        return POST_STATUS_PENDING
+    if hidden_reason == HIDDEN_REASON_CLASSIFIER:
+        return POST_STATUS_REJECTED
+    if hidden_reason == HIDDEN_REASON_CLASSIFIER_FINAL:
+        return POST_STATUS_REJECTED_FINAL
+    return POST_STATUS_APPROVED
+
+
 # A post on the website
 class Post(models.Model):
     post_identifier = models.UUIDField(default=uuid.uuid4, primary_key=True, unique=True, editable=False)
@@ -422,6 +499,11 @@ class Post(models.Model):
     # decoded the image; stays null for text-only posts, or when encoding fails
     # (the clients then fall back to their existing plain placeholder).
     image_blurhash = models.TextField(null=True, blank=True, default=None)
+    # The image's perceptual hash (see image_index.py), recorded by the
+    # classification worker alongside its verdict; null for text-only posts or
+    # when the image could not be fingerprinted. Kept on final rejections too,
+    # after the image itself is deleted, as the record of what was blocked.
+    image_dhash = models.CharField(max_length=16, null=True, blank=True, default=None)
     caption = models.TextField(null=True)
     # Whole-caption font choice and whole-tile background color (issue #318),
     # stored as curated allow-list keys (see ALLOWED_CAPTION_FONTS /
@@ -453,6 +535,8 @@ class Post(models.Model):
     # Assigned asynchronously once a post is approved (tasks.categorize_post),
     # so a fresh post simply has none until the worker runs.
     interest_categories = models.ManyToManyField('InterestCategory', related_name='posts', blank=True)
+    # Bitmask mirror of interest_categories (see PositiveOnlySocialUser.interest_mask).
+    interest_mask = models.BigIntegerField(default=0)
 
     # Async classification bookkeeping (issue #282). classification_attempts
     # counts worker runs so retries stay bounded and the sweep can alert on a
@@ -467,18 +551,42 @@ class Post(models.Model):
     # instead of on every cron run.
     classification_alerted = models.BooleanField(default=False)
 
+    # Materialized base hot score for the home feed (see HOT_RANK_GRAVITY). Kept
+    # current by feed_algorithm.refresh_post_hot_scores — on every like/unlike
+    # and by the refresh_hot_scores decay tick — so the feed can take its
+    # candidates from an index instead of aggregating likes over every post.
+    # Written only with queryset .update(), so it never bumps updated_time
+    # (which sweep_classifications reads as "classification activity").
+    hot_score = models.FloatField(default=FRESH_POST_HOT_SCORE)
+
+    # Denormalized engagement counters, so ranking and listings read a column
+    # instead of aggregating PostLike / Comment rows per post. Both count every
+    # row regardless of visibility (listings still apply the viewer's comment
+    # visibility on top). Bumped with F() updates by PostLike.save/delete and
+    # Comment.save/delete; counters.reconcile_counters repairs any drift left
+    # by bulk deletes that bypass those hooks.
+    like_count = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # The feed's candidate scan: visible posts, highest score first.
+            models.Index(fields=['hidden', '-hot_score'], name='post_hidden_hot_score_idx'),
+            # The feed's recency window and newest-posts candidates.
+            models.Index(fields=['hidden', '-creation_time'], name='post_hidden_created_idx'),
+            # A profile's posts newest first, and the timeline backfill on follow.
+            models.Index(fields=['author', '-creation_time'], name='post_author_created_idx'),
+        ]
+
+    def set_interest_categories(self, categories):
+        _set_interest_categories(self, categories)
+
     @property
     def classification_status(self):
         """The author-facing classification lifecycle state, derived from
         hidden_reason. Report-hiding is orthogonal: a reported post already
         passed classification, so it reads as approved here."""
-        if self.hidden_reason == HIDDEN_REASON_PENDING_CLASSIFICATION:
-            return POST_STATUS_PENDING
-        if self.hidden_reason == HIDDEN_REASON_CLASSIFIER:
-            return POST_STATUS_REJECTED
-        if self.hidden_reason == HIDDEN_REASON_CLASSIFIER_FINAL:
-            return POST_STATUS_REJECTED_FINAL
-        return POST_STATUS_APPROVED
+        return _classification_status(self.hidden_reason)
 
     @property
     def appealable(self):
@@ -488,6 +596,55 @@ class Post(models.Model):
         return self.hidden and self.hidden_reason not in NON_APPEALABLE_HIDDEN_REASONS
 
 
+# The image classifier's verdict on one image, indexed by its perceptual hash
+# (see image_index.py) so a near-identical re-upload reuses it instead of
+# going through the cascade again. band_0..band_3 are the hash's four 16-bit
+# bands, each indexed, which is how near neighbors are found. Rows outlive the
+# posts and photos they were recorded for: a final rejection's row is the
+# blocklist entry that keeps the same image from coming back.
+class ImageVerdict(models.Model):
+    dhash = models.CharField(max_length=16, unique=True)
+    band_0 = models.IntegerField(db_index=True)
+    band_1 = models.IntegerField(db_index=True)
+    band_2 = models.IntegerField(db_index=True)
+    band_3 = models.IntegerField(db_index=True)
+    allowed = models.BooleanField()
+    appealable = models.BooleanField(default=False)
+    reason_code = models.TextField(null=True, blank=True, default=None)
+    creation_time = models.DateTimeField(auto_now_add=True)
+
+    @property
+    def final(self):
+        return not self.allowed and not self.appealable
+
+
+# One post in one follower's followed-users timeline (fan-out on write, see
+# timeline.py). creation_time and the follow category are copied from the post
+# and the follow edge, so reading a timeline page — optionally narrowed to one
+# category — is a range scan of one of the two indexes below, with no join
+# against the follow graph. Visibility is still checked when the page is
+# hydrated, so an entry for a post hidden later simply drops out.
+class TimelineEntry(models.Model):
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='timeline_entries', on_delete=models.CASCADE)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE)
+    creation_time = models.DateTimeField(null=True)
+    category = models.CharField(max_length=16, choices=FOLLOW_CATEGORY_CHOICES,
+                                default=FOLLOW_CATEGORY_FOLLOWING)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'post'], name='unique_timeline_entry')
+        ]
+        indexes = [
+            models.Index(fields=['owner', '-creation_time', '-post'], name='timeline_owner_time_idx'),
+            models.Index(fields=['owner', 'category', '-creation_time', '-post'],
+                         name='timeline_owner_category_idx'),
+            # Unfollow/block prune by (owner, author).
+            models.Index(fields=['owner', 'author'], name='timeline_owner_author_idx'),
+        ]
+
+
 # A report on a post
 class PostReport(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
@@ -509,6 +666,24 @@ class PostLike(models.Model):
             models.UniqueConstraint(fields=['user', 'post'], name='unique_post_like')
         ]
 
+    def save(self, *args, **kwargs):
+        # Keep Post.like_count in step with the like rows. Only inserts count;
+        # a like is never re-pointed at another post.
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                Post.objects.filter(pk=self.post_id).update(like_count=F('like_count') + 1)
+
+    def delete(self, *args, **kwargs):
+        # Only a delete that removed the row counts; a second delete of the
+        # same like (a concurrent or retried unlike) must not decrement again.
+        with transaction.atomic():
+            deleted, per_model = super().delete(*args, **kwargs)
+            if per_model.get(PostLike._meta.label):
+                Post.objects.filter(pk=self.post_id).update(like_count=F('like_count') - 1)
+        return deleted, per_model
+
 
 # A hashtag harvested from post captions (issue #379). `name` is the tag text
 # without the leading '#', stored lowercased so lookups are case-insensitive by
@@ -593,6 +768,10 @@ class CommentThread(models.Model):
     creation_time = models.DateTimeField(auto_now_add=True, null=True,
                                          blank=True)
     updated_time = models.DateTimeField(auto_now=True, null=True, blank=True)
+    # Sum of Comment.like_count over the thread's comments — the "likes" the
+    # thread ranking orders by. Maintained by CommentLike.save/delete and
+    # Comment.delete alongside the per-comment counter.
+    total_comment_likes = models.IntegerField(default=0)
 
 
 # A comment on a post
@@ -620,6 +799,42 @@ class Comment(models.Model):
                                 default=POST_AUDIENCE_PUBLIC)
     hidden = models.BooleanField(default=False)
     hidden_reason = models.TextField(choices=HIDDEN_REASON_CHOICES, default=HIDDEN_REASON_NONE, blank=True)
+    # Denormalized like count (see Post.like_count), kept by CommentLike.
+    like_count = models.IntegerField(default=0)
+    # Async classification bookkeeping, as on Post: comments are created
+    # hidden in pending_classification and resolved by tasks.classify_comment.
+    classification_attempts = models.IntegerField(default=0)
+    classification_reason_code = models.TextField(null=True, blank=True, default=None)
+    classification_alerted = models.BooleanField(default=False)
+
+    @property
+    def classification_status(self):
+        """The author-facing classification state (see Post.classification_status)."""
+        return _classification_status(self.hidden_reason)
+
+    def save(self, *args, **kwargs):
+        # Count the comment against its post (Post.comment_count) on insert.
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                Post.objects.filter(commentthread=self.comment_thread_id).update(
+                    comment_count=F('comment_count') + 1)
+
+    def delete(self, *args, **kwargs):
+        # The cascade removes this comment's likes without calling
+        # CommentLike.delete, so take them off the thread total here using the
+        # number of like rows the delete actually removed.
+        with transaction.atomic():
+            deleted, per_model = super().delete(*args, **kwargs)
+            if per_model.get(Comment._meta.label):
+                Post.objects.filter(commentthread=self.comment_thread_id).update(
+                    comment_count=F('comment_count') - 1)
+            removed_likes = per_model.get(CommentLike._meta.label, 0)
+            if removed_likes:
+                CommentThread.objects.filter(pk=self.comment_thread_id).update(
+                    total_comment_likes=F('total_comment_likes') - removed_likes)
+        return deleted, per_model
 
 
 # A report on a comment
@@ -643,6 +858,27 @@ class CommentLike(models.Model):
             models.UniqueConstraint(fields=['user', 'comment'], name='unique_comment_like')
         ]
 
+    def save(self, *args, **kwargs):
+        # Keep Comment.like_count and its thread's total_comment_likes current.
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                self._adjust_counters(1)
+
+    def delete(self, *args, **kwargs):
+        # As PostLike.delete: only decrement for a row this call removed.
+        with transaction.atomic():
+            deleted, per_model = super().delete(*args, **kwargs)
+            if per_model.get(CommentLike._meta.label):
+                self._adjust_counters(-1)
+        return deleted, per_model
+
+    def _adjust_counters(self, delta):
+        Comment.objects.filter(pk=self.comment_id).update(like_count=F('like_count') + delta)
+        CommentThread.objects.filter(comment=self.comment_id).update(
+            total_comment_likes=F('total_comment_likes') + delta)
+
 
 class AppealManager(models.Manager):
     def pending(self):
@@ -767,7 +1003,8 @@ class Appeal(models.Model):
         with transaction.atomic():
             if not self._claim_pending():
                 return
-            if self.post is not None and self.post.hidden:
+            restored_post = self.post is not None and self.post.hidden
+            if restored_post:
                 self.post.hidden = False
                 self.post.hidden_reason = HIDDEN_REASON_NONE
                 self.post.save(update_fields=['hidden', 'hidden_reason'])
@@ -780,6 +1017,11 @@ class Appeal(models.Model):
                 self.ban.expires = timezone.now()
                 self.ban.save(update_fields=['expires'])
             self._mark_resolved(APPEAL_STATUS_APPROVED, resolved_by, note)
+        # A post rejected by the classifier was never fanned out to its
+        # author's followers; now that it is visible, deliver it.
+        if restored_post:
+            from .timeline import fan_out_post
+            fan_out_post(self.post)
         # Outside the transaction: never hold the row lock during SMTP, and do
         # not email if the transaction rolled back.
         notify_user_of_appeal_resolution(self, "approved")
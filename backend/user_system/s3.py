@@ -1,10 +1,16 @@
+import asyncio
+import functools
 import logging
 import os
 from urllib.parse import urlparse
 
 import boto3
+import httpx
+from botocore.config import Config
 from django.conf import settings
 
+from . import client_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -113,21 +119,52 @@ def is_source_bucket_url(image_url):
     return bool(bucket) and image_url_bucket(image_url) == bucket
 
 
+@functools.lru_cache(maxsize=None)
+def _client_config(pool_size):
+    # Bounded so a slow or unreachable bucket can't hang the caller, with a
+    # keep-alive pool of `pool_size` connections. One Config per size, so the
+    # pooled client is found again under the same arguments.
+    return Config(connect_timeout=5, read_timeout=10, retries={'max_attempts': 2},
+                  max_pool_connections=pool_size)
+
+
+def pooled_s3_client(aws_access_key, aws_secret_key, region, factory=None):
+    """The process's shared S3 client for these credentials (see client_pool),
+    built with `factory` (boto3.client by default) on first use."""
+    return client_pool.get_client(
+        's3', factory or boto3.client, 's3',
+        aws_access_key_id=aws_access_key,
+        aws_secret_access_key=aws_secret_key,
+        region_name=region,
+        config=_client_config(client_pool.POOL_SIZE),
+    )
+
+
+def _build_async_http_client(pool_size, loop):
+    # The bounds of _client_config for httpx. `loop` only keys the pool: an
+    # async connection pool belongs to the event loop it was opened on.
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(10, connect=5),
+        transport=httpx.AsyncHTTPTransport(retries=1, limits=httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size)))
+
+
+def pooled_async_http_client():
+    """The running event loop's shared async HTTP client, for presigned S3
+    fetches (see client_pool)."""
+    return client_pool.get_client('s3_async', _build_async_http_client,
+                                  client_pool.POOL_SIZE, asyncio.get_running_loop())
+
+
 def _s3_client():
-    """A boto3 S3 client built from the backend's AWS credentials, or None if
-    they are not configured (callers treat a missing client as a soft failure)."""
+    """The shared S3 client for the backend's AWS credentials, or None if they
+    are not configured (callers treat a missing client as a soft failure)."""
     aws_access_key = os.environ.get("AWS_ACCESS_KEY_ID")
     aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
     if not aws_access_key or not aws_secret_key:
         logger.error("Missing AWS credentials — cannot build an S3 client.")
         return None
-    region = os.environ.get("AWS_REGION", "us-east-1")
-    return boto3.client(
-        's3',
-        aws_access_key_id=aws_access_key,
-        aws_secret_access_key=aws_secret_key,
-        region_name=region,
-    )
+    return pooled_s3_client(aws_access_key, aws_secret_key, os.environ.get("AWS_REGION", "us-east-1"))
 
 
 # Post images are always JPEG (both clients transcode before uploading), and the
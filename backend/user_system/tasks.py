@@ -13,11 +13,23 @@ transitioning, so a redelivered or duplicate job is a no-op. Provider failures
 RQ retries them with backoff; when retries are exhausted the post simply stays
 pending — fail closed, never publish unclassified content — and the
 `sweep_classifications` command re-enqueues or alerts.
+
+Comments and bios go through the same pipeline (classify_comment,
+classify_bio): created or stored pending after the inline pre-filter, reviewed
+by the text cascade here, and backstopped by the same sweep.
+
+Each job also has a coroutine counterpart (aclassify_post and so on, listed in
+ASYNC_JOBS) that the async worker (async_worker.py) runs on its event loop.
+Both share the claim, the attempt count and the transition, which are plain
+ORM functions the coroutines call through sync_to_async; only the provider
+work between them (the image fetch, the cascades, the categorizer) is awaited.
 """
+import asyncio
 import logging
 import os
 from concurrent.futures import ThreadPoolExecutor
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.mail import send_mail
 from django.db import transaction
@@ -26,18 +38,22 @@ from django.utils import timezone
 
 from .blurhash_utils import compute_blurhash_for_image_url
 from .classifiers import image_classifier, text_classifier, interest_classifier
+from . import image_index
 from .classifiers.classifier_utils import ClassificationResult
+from .classifiers.image_context import ImageContext
 from .constants import (
-    CLASSIFICATION_MAX_ATTEMPTS,
+    CLASSIFICATION_MAX_ATTEMPTS, CLASSIFICATION_THREADS,
     HIDDEN_REASON_NONE, HIDDEN_REASON_CLASSIFIER,
     HIDDEN_REASON_PENDING_CLASSIFICATION, HIDDEN_REASON_CLASSIFIER_FINAL,
     PROFILE_IMAGE_STATUS_PENDING, PROFILE_IMAGE_STATUS_APPROVED,
     PROFILE_IMAGE_STATUS_REJECTED,
+    BIO_STATUS_PENDING, BIO_STATUS_APPROVED, BIO_STATUS_REJECTED,
     MAX_INTEREST_TAGS_PER_POST, NON_CATEGORIZABLE_HIDDEN_REASONS,
 )
-from .models import Post, PositiveOnlySocialUser, InterestCategory
+from .models import Comment, Post, PositiveOnlySocialUser, InterestCategory
 from . import push
 from .s3 import delete_image
+from .timeline import fan_out_post
 
 # Module-level aliases so tests can patch the classifiers here, mirroring the
 # `user_system.views.text_classifier_class` pattern.
@@ -47,18 +63,21 @@ interest_classifier_class = interest_classifier
 # Aliased here for the same reason (patchable in tests) and so the (best-effort)
 # BlurHash computation lives behind one name at its single call site.
 compute_blurhash = compute_blurhash_for_image_url
+fingerprint_image = image_index.fingerprint_image_url
 
 logger = logging.getLogger(__name__)
 
 # Shared, bounded thread pool so a post's text and image cascades run
 # concurrently (latency is max(text, image), not their sum) without a traffic
 # spike spawning unbounded threads. The work is I/O-bound (external AI APIs).
-_CLASSIFICATION_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="classify")
+_CLASSIFICATION_EXECUTOR = ThreadPoolExecutor(max_workers=CLASSIFICATION_THREADS, thread_name_prefix="classify")
 
 # The job is enqueued by dotted path so the web process never needs to pickle
 # a callable, and RQ retries provider failures with growing backoff.
 CLASSIFY_JOB_PATH = 'user_system.tasks.classify_post'
 CLASSIFY_PROFILE_PHOTO_JOB_PATH = 'user_system.tasks.classify_profile_photo'
+CLASSIFY_COMMENT_JOB_PATH = 'user_system.tasks.classify_comment'
+CLASSIFY_BIO_JOB_PATH = 'user_system.tasks.classify_bio'
 # Offline interest categorization (issues #446/#35). Best-effort topic tagging
 # of an already-approved post, so — unlike classification — it carries no retry
 # budget: a miss is harmless and the `categorize_posts` command re-runs it.
@@ -66,8 +85,9 @@ POST_CATEGORIZE_JOB_PATH = 'user_system.tasks.categorize_post'
 RETRY_INTERVALS_SECONDS = [60, 300, 900]
 
 # RQ kills jobs that exceed this. Worst case is two sequential cascades of
-# three ~15s LLM calls plus an S3 fetch, so 5 minutes is comfortable headroom
-# without letting a wedged job occupy the worker forever.
+# three ~15s LLM calls plus an S3 fetch, and the image categorizer call an
+# approval runs in the same job, so 5 minutes is comfortable headroom without
+# letting a wedged job occupy the worker forever.
 JOB_TIMEOUT_SECONDS = 300
 
 
@@ -89,39 +109,47 @@ def _queue():
     )
 
 
-def enqueue_classification(post_identifier):
-    """Schedule async classification for a freshly created pending post.
-
-    In eager mode (no Redis) the job runs inline; a failure is swallowed
-    because the post is already safely hidden-pending and the sweep command
-    will pick it up. In queue mode the enqueue is deferred to on_commit so the
-    worker can never fetch the job before the Post row is visible to it.
-    """
-    post_identifier = str(post_identifier)
+def _run_or_enqueue(job, job_path, identifier, subject):
+    # Shared by the enqueue_* functions for the classification jobs: run `job`
+    # inline in eager mode, swallowing a failure (the content is already safely
+    # pending and the sweep picks it up), or enqueue `job_path` with the retry
+    # budget once the surrounding transaction commits, so the worker can never
+    # fetch the job before the pending row is visible to it.
     if settings.CLASSIFICATION_EAGER:
         try:
-            classify_post(post_identifier)
+            job(identifier)
         except Exception:
-            logger.exception("Eager classification failed for post %s; it stays pending.", post_identifier)
+            logger.exception("Eager classification failed for %s %s; it stays pending.", subject, identifier)
         return
 
     def _enqueue():
         from rq import Retry
         try:
             _queue().enqueue(
-                CLASSIFY_JOB_PATH,
-                post_identifier,
+                job_path,
+                identifier,
                 retry=Retry(max=len(RETRY_INTERVALS_SECONDS), interval=RETRY_INTERVALS_SECONDS),
                 job_timeout=JOB_TIMEOUT_SECONDS,
             )
         except Exception:
-            # The post is hidden-pending either way; the sweep re-enqueues it.
-            logger.exception("Failed to enqueue classification for post %s; the sweep will retry it.", post_identifier)
+            # Pending either way; the sweep re-enqueues it.
+            logger.exception("Failed to enqueue classification for %s %s; the sweep will retry it.", subject, identifier)
 
     transaction.on_commit(_enqueue)
 
 
-def enqueue_post_categorization(post_identifier):
+def enqueue_classification(post_identifier):
+    """Schedule async classification for a freshly created pending post.
+
+    In eager mode (no Redis) the job runs inline; a failure is swallowed
+    because the post is already safely hidden-pending and the sweep command
+    will pick it up. In queue mode the enqueue is deferred to on_commit so the
+    worker can never fetch the job before the Post row is visible to it.
+    """
+    _run_or_enqueue(classify_post, CLASSIFY_JOB_PATH, str(post_identifier), 'post')
+
+
+def enqueue_post_categorization(post_identifier, image=None):
     """Schedule offline interest categorization for an approved post.
 
     Mirrors enqueue_classification's eager/queue split, but best-effort: no
@@ -129,11 +157,16 @@ def enqueue_post_categorization(post_identifier):
     command is the backstop) and eager failures are swallowed. In queue mode the
     enqueue is deferred to on_commit so the worker can't run before the post's
     approval transition is visible.
+
+    `image` is the classification worker's ImageContext for the post's image.
+    When it is given the categorization runs right here, in the worker that
+    has already fetched and decoded the image, rather than as a separate job
+    that would fetch it all over again.
     """
     post_identifier = str(post_identifier)
-    if settings.CLASSIFICATION_EAGER:
+    if settings.CLASSIFICATION_EAGER or image is not None:
         try:
-            categorize_post(post_identifier)
+            categorize_post(post_identifier, image=image)
         except Exception:
             logger.exception("Eager categorization failed for post %s; a later sweep can retry it.", post_identifier)
         return
@@ -148,7 +181,7 @@ def enqueue_post_categorization(post_identifier):
     transaction.on_commit(_enqueue)
 
 
-def categorize_post(post_identifier):
+def categorize_post(post_identifier, image=None):
     """Assign interest buckets to one approved post (issues #446/#35).
 
     Best-effort and idempotent: runs the interest categorizer over the caption
@@ -158,23 +191,58 @@ def categorize_post(post_identifier):
     "could not run" (see below). A post that never passed classification
     (pending or rejected) is skipped — there is nothing to surface. The
     categorizer helpers never raise, so this only fails on a DB error, which
-    RQ/the command treats as a retryable miss.
+    RQ/the command treats as a retryable miss. `image` is an ImageContext for
+    the post's image already held by the caller; otherwise it is fetched here.
     """
     post_identifier = str(post_identifier)
+    post = _categorizable_post(post_identifier)
+    if post is None:
+        return
+    text_slugs = interest_classifier_class.categorize_text_interests(post.caption or "")
+    if image is None or image.image_url != post.image_url:
+        image = post.image_url
+    image_slugs = (interest_classifier_class.categorize_image_interests(image)
+                   if post.image_url else [])
+    _record_interest_buckets(post, text_slugs, image_slugs)
+
+
+async def acategorize_post(post_identifier, image=None):
+    """categorize_post on the async worker's event loop, with the caption and
+    the image categorized at once."""
+    post_identifier = str(post_identifier)
+    post = await sync_to_async(_categorizable_post)(post_identifier)
+    if post is None:
+        return
+    if image is None or image.image_url != post.image_url:
+        image = post.image_url
+    text_slugs, image_slugs = await asyncio.gather(
+        interest_classifier_class.acategorize_text_interests(post.caption or ""),
+        interest_classifier_class.acategorize_image_interests(image) if post.image_url else _ready([]))
+    await sync_to_async(_record_interest_buckets)(post, text_slugs, image_slugs)
+
+
+async def _ready(value):
+    # An already known result, where asyncio.gather wants an awaitable.
+    return value
+
+
+def _categorizable_post(post_identifier):
+    """The post to categorize, or None if it is gone or not approved."""
     try:
         post = Post.objects.get(post_identifier=post_identifier)
     except Post.DoesNotExist:
         logger.info("categorize_post: post %s no longer exists; nothing to do.", post_identifier)
-        return
+        return None
     if post.hidden_reason in NON_CATEGORIZABLE_HIDDEN_REASONS:
         logger.info("categorize_post: post %s is not approved (%s); skipping categorization.",
                     post_identifier, post.hidden_reason)
-        return
+        return None
+    return post
 
-    text_slugs = interest_classifier_class.categorize_text_interests(post.caption or "")
-    image_slugs = (interest_classifier_class.categorize_image_interests(post.image_url)
-                   if post.image_url else [])
 
+def _record_interest_buckets(post, text_slugs, image_slugs):
+    """Replace `post`'s interest buckets with the union of the categorizers'."""
+    post_identifier = post.post_identifier
     # Union in text-first order, capped — a post gets a handful of "what this is
     # about" buckets, not an exhaustive labeling. The order decides *which*
     # buckets survive the cap (caption beats image); it carries no meaning once
@@ -204,7 +272,7 @@ def categorize_post(post_identifier):
     # priority rather than alphabetically.
     by_slug = {c.slug: c for c in InterestCategory.objects.filter(slug__in=slugs)}
     categories = [by_slug[s] for s in slugs if s in by_slug]
-    post.interest_categories.set(categories)
+    post.set_interest_categories(categories)
     logger.info("categorize_post: post %s tagged with interests %s",
                 post_identifier, [c.slug for c in categories])
 
@@ -278,15 +346,92 @@ def classify_post(post_identifier):
     or deleted by its author while queued — is left alone, which is the whole
     idempotency story for at-least-once delivery.
     """
+    post = _claim_post(post_identifier)
+    if post is None:
+        return
+
+    # A near-identical image the classifier already judged (image_index.py)
+    # settles the image side without the image cascade, and a match against a
+    # final rejection settles the whole post without any provider call.
+    # Every consumer of the image below — the index, the moderation cascade,
+    # the BlurHash and the categorizer — shares this one fetch and decode.
+    image = ImageContext(post.image_url) if post.image_url else None
+    image_dhash = fingerprint_image(image) if image else None
+    known_image_result = image_index.find_known_verdict(image_dhash) if image_dhash else None
+    if _settled_by_known_image(post_identifier, known_image_result):
+        text_result = ClassificationResult(allowed=True)
+        image_result = known_image_result
+    else:
+        # The cascades run outside any DB transaction/lock: they can take
+        # minutes in the worst case and must never pin a row lock while they do.
+        text_future = _CLASSIFICATION_EXECUTOR.submit(text_classifier_class.is_text_positive, post.caption)
+        image_future = (_CLASSIFICATION_EXECUTOR.submit(image_classifier_class.is_image_positive, image)
+                        if image and known_image_result is None else None)
+        text_result = text_future.result()
+        if known_image_result is not None:
+            image_result = known_image_result
+        elif image_future:
+            image_result = image_future.result()
+        else:
+            # A text-only post has no image to classify; visibility depends
+            # solely on the text result.
+            image_result = ClassificationResult(allowed=True)
+
+    if _record_post_verdict(post_identifier, post, image, image_dhash, known_image_result, text_result, image_result):
+        # Now that the post is public, tag it with interest buckets for feed
+        # weighting (issues #446/#35). Best-effort and off the approval's
+        # critical path: enqueue_post_categorization swallows the failures of an
+        # inline run (eager, or here with the image already in hand) and carries
+        # no retry budget, so a categorization hiccup never disturbs the
+        # (already committed) approval.
+        enqueue_post_categorization(post_identifier, image=image)
+
+
+async def aclassify_post(post_identifier):
+    """classify_post on the async worker's event loop: the same claim and
+    transition, with the image fetched, the cascades run and the approved
+    post categorized without blocking the loop."""
+    post = await sync_to_async(_claim_post)(post_identifier)
+    if post is None:
+        return
+
+    image = ImageContext(post.image_url) if post.image_url else None
+    if image:
+        await image.aload()
+    image_dhash = await asyncio.to_thread(fingerprint_image, image) if image else None
+    known_image_result = (await sync_to_async(image_index.find_known_verdict)(image_dhash)
+                          if image_dhash else None)
+    if _settled_by_known_image(post_identifier, known_image_result):
+        text_result = ClassificationResult(allowed=True)
+        image_result = known_image_result
+    else:
+        image_results = (image_classifier_class.ais_image_positive(image)
+                         if image and known_image_result is None
+                         else _ready(known_image_result or ClassificationResult(allowed=True)))
+        text_result, image_result = await asyncio.gather(
+            text_classifier_class.ais_text_positive(post.caption), image_results)
+
+    if await sync_to_async(_record_post_verdict)(post_identifier, post, image, image_dhash, known_image_result,
+                                                 text_result, image_result):
+        try:
+            await acategorize_post(post_identifier, image=image)
+        except Exception:
+            logger.exception("Inline categorization failed for post %s; a later sweep can retry it.",
+                             post_identifier)
+
+
+def _claim_post(post_identifier):
+    """Count an attempt at classifying the post and return it, or None when
+    the job has nothing (more) to do."""
     try:
         post = Post.objects.get(post_identifier=post_identifier)
     except Post.DoesNotExist:
         logger.info("classify_post: post %s no longer exists; nothing to do.", post_identifier)
-        return
+        return None
     if post.hidden_reason != HIDDEN_REASON_PENDING_CLASSIFICATION:
         logger.info("classify_post: post %s already resolved (%s); nothing to do.",
                     post_identifier, post.hidden_reason)
-        return
+        return None
 
     # Hard cap on the retry budget: once it is spent, return successfully
     # (no raise) so RQ stops retrying, do no further (billable) provider
@@ -297,7 +442,7 @@ def classify_post(post_identifier):
             "classify_post: post %s has exhausted its %d classification attempts; "
             "leaving it pending (fail closed) and dropping the job.",
             post_identifier, post.classification_attempts)
-        return
+        return None
 
     # Count the attempt before doing the (fallible) external work, so the
     # sweep's alerting sees every try including ones that raised. The pending
@@ -312,18 +457,23 @@ def classify_post(post_identifier):
              updated_time=timezone.now())
     if not still_pending:
         logger.info("classify_post: post %s was resolved concurrently; nothing to do.", post_identifier)
-        return
+        return None
+    return post
+
+
+def _settled_by_known_image(post_identifier, known_image_result):
+    """Whether the post's image matches a final rejection, which settles the
+    post without the cascades."""
+    if known_image_result is not None and not known_image_result and not known_image_result.appealable:
+        logger.info("classify_post: post %s image matches a final rejection; skipping the cascades.",
+                    post_identifier)
+        return True
+    return False
 
-    # The cascades run outside any DB transaction/lock: they can take minutes
-    # in the worst case and must never pin a row lock while they do.
-    text_future = _CLASSIFICATION_EXECUTOR.submit(text_classifier_class.is_text_positive, post.caption)
-    image_future = (_CLASSIFICATION_EXECUTOR.submit(image_classifier_class.is_image_positive, post.image_url)
-                    if post.image_url else None)
-    text_result = text_future.result()
-    # A text-only post has no image to classify; visibility depends solely on
-    # the text result.
-    image_result = image_future.result() if image_future else ClassificationResult(allowed=True)
 
+def _record_post_verdict(post_identifier, post, image, image_dhash, known_image_result, text_result, image_result):
+    """Apply the cascades' verdict to the claimed `post` and fire its side
+    effects. True when the post was approved, for the caller to categorize."""
     if text_result.provider_failure or image_result.provider_failure:
         # Not a verdict on the content: fail closed (stay pending) and let RQ
         # retry with backoff.
@@ -331,6 +481,9 @@ def classify_post(post_identifier):
             f"Providers unavailable while classifying post {post_identifier} "
             f"(text failure={text_result.provider_failure}, image failure={image_result.provider_failure})")
 
+    if known_image_result is None:
+        image_index.remember_verdict(image_dhash, image_result)
+
     allowed = bool(text_result) and bool(image_result)
     text_final = not text_result and not text_result.appealable
     image_final = not image_result and not image_result.appealable
@@ -346,11 +499,12 @@ def classify_post(post_identifier):
         reason_result = text_result if not text_result else image_result
 
     # Best-effort BlurHash placeholder for the image (issue #387), computed off
-    # the request path here in the worker. Done before the transaction so the
-    # (slow) S3 fetch + encode never pins the row lock, and skipped for final
-    # rejections (their image is deleted below, so a placeholder is pointless).
-    image_blurhash = (compute_blurhash(post.image_url)
-                      if post.image_url and not final else None)
+    # the request path here in the worker from the already fetched image. Done
+    # before the transaction so the encode never pins the row lock, and skipped
+    # for final rejections (their image is deleted below, so a placeholder is
+    # pointless).
+    image_blurhash = (compute_blurhash(image)
+                      if image and not final else None)
 
     image_url_to_delete = None
     with transaction.atomic():
@@ -360,7 +514,7 @@ def classify_post(post_identifier):
             pk=post.pk, hidden_reason=HIDDEN_REASON_PENDING_CLASSIFICATION).first()
         if claimed is None:
             logger.info("classify_post: post %s was resolved concurrently; nothing to do.", post_identifier)
-            return
+            return False
         if allowed:
             claimed.hidden = False
             claimed.hidden_reason = HIDDEN_REASON_NONE
@@ -387,20 +541,17 @@ def classify_post(post_identifier):
             # (without re-running classification), and the placeholder should be
             # ready when it does.
             claimed.image_blurhash = image_blurhash
+        claimed.image_dhash = image_dhash
         claimed.save(update_fields=['hidden', 'hidden_reason', 'classification_reason_code',
-                                    'image_url', 'image_blurhash'])
+                                    'image_url', 'image_blurhash', 'image_dhash'])
 
     # Side effects only after the one-time transition has committed, so they
     # can neither fire twice nor fire for a rolled-back transition.
     if allowed:
         logger.info("classify_post: post %s approved and visible.", post_identifier)
-        # Now that the post is public, tag it with interest buckets for feed
-        # weighting (issues #446/#35). Best-effort and off the approval's
-        # critical path: enqueue_post_categorization swallows eager failures and
-        # carries no retry budget, so a categorization hiccup never disturbs the
-        # (already committed) approval.
-        enqueue_post_categorization(post_identifier)
-        return
+        # Deliver it to the followed-users timelines of the author's followers.
+        fan_out_post(claimed)
+        return True
     logger.info("classify_post: post %s rejected (final=%s, reason=%s).",
                 post_identifier, final, reason_result.public_reason_code())
     _notify_author_of_rejection(claimed, text_result, image_result, final)
@@ -410,6 +561,7 @@ def classify_post(post_identifier):
         # the backstop for a missed delete (the row no longer references the
         # key, so the sweeper reclaims it after its grace window).
         delete_image(image_url_to_delete)
+    return False
 
 
 def enqueue_profile_photo_classification(user_id):
@@ -421,27 +573,7 @@ def enqueue_profile_photo_classification(user_id):
     enqueue is deferred to on_commit so the worker cannot fetch the job before
     the pending photo is visible to it.
     """
-    user_id = str(user_id)
-    if settings.CLASSIFICATION_EAGER:
-        try:
-            classify_profile_photo(user_id)
-        except Exception:
-            logger.exception("Eager profile-photo classification failed for user %s; it stays pending.", user_id)
-        return
-
-    def _enqueue():
-        from rq import Retry
-        try:
-            _queue().enqueue(
-                CLASSIFY_PROFILE_PHOTO_JOB_PATH,
-                user_id,
-                retry=Retry(max=len(RETRY_INTERVALS_SECONDS), interval=RETRY_INTERVALS_SECONDS),
-                job_timeout=JOB_TIMEOUT_SECONDS,
-            )
-        except Exception:
-            logger.exception("Failed to enqueue profile-photo classification for user %s; the sweep will retry it.", user_id)
-
-    transaction.on_commit(_enqueue)
+    _run_or_enqueue(classify_profile_photo, CLASSIFY_PROFILE_PHOTO_JOB_PATH, str(user_id), 'profile photo of user')
 
 
 def classify_profile_photo(user_id):
@@ -457,15 +589,53 @@ def classify_profile_photo(user_id):
     classify_post). A provider failure raises so RQ retries with backoff; the
     photo stays pending (never shown) meanwhile.
     """
+    claim = _claim_profile_photo(user_id)
+    if claim is None:
+        return
+    user, pending_url = claim
+
+    # A near-identical photo the classifier already judged (image_index.py)
+    # reuses that verdict instead of the cascade.
+    image = ImageContext(pending_url)
+    image_dhash = fingerprint_image(image)
+    result = _known_profile_photo_verdict(user_id, image_dhash)
+    if result is None:
+        result = image_classifier_class.is_image_positive(image)
+        _remember_profile_photo_verdict(user_id, image_dhash, result)
+    _record_profile_photo_verdict(user_id, user, pending_url, image_dhash, result)
+
+
+async def aclassify_profile_photo(user_id):
+    """classify_profile_photo on the async worker's event loop: the same
+    claim and transition, with the photo fetched and classified without
+    blocking the loop."""
+    claim = await sync_to_async(_claim_profile_photo)(user_id)
+    if claim is None:
+        return
+    user, pending_url = claim
+
+    image = ImageContext(pending_url)
+    await image.aload()
+    image_dhash = await asyncio.to_thread(fingerprint_image, image)
+    result = await sync_to_async(_known_profile_photo_verdict)(user_id, image_dhash)
+    if result is None:
+        result = await image_classifier_class.ais_image_positive(image)
+        await sync_to_async(_remember_profile_photo_verdict)(user_id, image_dhash, result)
+    await sync_to_async(_record_profile_photo_verdict)(user_id, user, pending_url, image_dhash, result)
+
+
+def _claim_profile_photo(user_id):
+    """Count an attempt at classifying the user's pending photo and return
+    (user, pending photo URL), or None when the job has nothing (more) to do."""
     try:
         user = PositiveOnlySocialUser.objects.get(pk=user_id)
     except PositiveOnlySocialUser.DoesNotExist:
         logger.info("classify_profile_photo: user %s no longer exists; nothing to do.", user_id)
-        return
+        return None
     if user.profile_image_status != PROFILE_IMAGE_STATUS_PENDING or not user.pending_profile_image_url:
         logger.info("classify_profile_photo: user %s has no pending photo (status=%s); nothing to do.",
                     user_id, user.profile_image_status)
-        return
+        return None
 
     # Hard cap on the retry budget: once spent, return successfully (no raise)
     # so RQ stops retrying and no further billable provider work runs; the photo
@@ -475,7 +645,7 @@ def classify_profile_photo(user_id):
             "classify_profile_photo: user %s has exhausted its %d classification attempts; "
             "leaving the photo pending (fail closed) and dropping the job.",
             user_id, user.profile_image_classification_attempts)
-        return
+        return None
 
     # The exact upload this job is about. Both the increment-UPDATE and the
     # row-claim below filter on it, so if the user replaces their pending photo
@@ -495,15 +665,31 @@ def classify_profile_photo(user_id):
              profile_image_classification_time=timezone.now())
     if not still_pending:
         logger.info("classify_profile_photo: user %s pending photo changed or was resolved concurrently; nothing to do.", user_id)
-        return
+        return None
+    return user, pending_url
+
 
-    result = image_classifier_class.is_image_positive(pending_url)
+def _known_profile_photo_verdict(user_id, image_dhash):
+    """The indexed verdict for a near-identical photo, or None."""
+    result = image_index.find_known_verdict(image_dhash) if image_dhash else None
+    if result is not None:
+        logger.info("classify_profile_photo: user %s photo matches an indexed image; reusing its verdict.", user_id)
+    return result
+
+
+def _remember_profile_photo_verdict(user_id, image_dhash, result):
+    """Index the cascade's verdict, or raise for RQ to retry a provider failure."""
     if result.provider_failure:
-        # Not a verdict on the content: fail closed (stay pending) and let RQ
-        # retry with backoff.
+        # Not a verdict on the content: fail closed (stay pending) and let
+        # RQ retry with backoff.
         raise ClassificationProviderError(
             f"Provider unavailable while classifying profile photo for user {user_id}")
+    image_index.remember_verdict(image_dhash, result)
+
 
+def _record_profile_photo_verdict(user_id, user, pending_url, image_dhash, result):
+    """Apply `result` to the user's pending photo `pending_url`, if it is still
+    the one pending, and clean up the photo it replaces or rejects."""
     allowed = bool(result)
     old_live_url = None
     rejected_url = None
@@ -525,6 +711,7 @@ def classify_profile_photo(user_id):
             claimed.pending_profile_image_url = None
             claimed.profile_image_status = PROFILE_IMAGE_STATUS_APPROVED
             claimed.profile_image_reason_code = None
+            claimed.profile_image_dhash = image_dhash
         else:
             # Drop the rejected photo; keep any previously approved photo intact
             # so a bad new upload does not wipe out a good current avatar.
@@ -534,7 +721,7 @@ def classify_profile_photo(user_id):
             claimed.profile_image_reason_code = result.public_reason_code()
         claimed.save(update_fields=[
             'profile_image_url', 'pending_profile_image_url',
-            'profile_image_status', 'profile_image_reason_code',
+            'profile_image_status', 'profile_image_reason_code', 'profile_image_dhash',
         ])
 
     # Side effects only after the one-time transition has committed, so they can
@@ -548,3 +735,202 @@ def classify_profile_photo(user_id):
                 user_id, result.public_reason_code())
     if rejected_url:
         delete_image(rejected_url)
+
+
+def enqueue_comment_classification(comment_identifier):
+    """Schedule async classification for a freshly created pending comment
+    (or reply); the eager/queue split of enqueue_classification."""
+    _run_or_enqueue(classify_comment, CLASSIFY_COMMENT_JOB_PATH, str(comment_identifier), 'comment')
+
+
+def classify_comment(comment_identifier):
+    """RQ job: classify one pending comment and record the outcome.
+
+    The text-only counterpart of classify_post, with the same transitions
+    (pending_classification -> visible, -> classifier, or -> classifier_final
+    tombstone), the same attempt cap, and the same idempotency: only a comment
+    still pending is acted on, and the row is re-claimed under lock before the
+    transition. No email or push rides a comment rejection; the author sees the
+    outcome on the comment itself.
+    """
+    comment = _claim_comment(comment_identifier)
+    if comment is None:
+        return
+    _record_comment_verdict(comment_identifier, comment, text_classifier_class.is_text_positive(comment.body))
+
+
+async def aclassify_comment(comment_identifier):
+    """classify_comment on the async worker's event loop."""
+    comment = await sync_to_async(_claim_comment)(comment_identifier)
+    if comment is None:
+        return
+    result = await text_classifier_class.ais_text_positive(comment.body)
+    await sync_to_async(_record_comment_verdict)(comment_identifier, comment, result)
+
+
+def _claim_comment(comment_identifier):
+    """Count an attempt at classifying the comment and return it, or None
+    when the job has nothing (more) to do."""
+    try:
+        comment = Comment.objects.get(comment_identifier=comment_identifier)
+    except Comment.DoesNotExist:
+        logger.info("classify_comment: comment %s no longer exists; nothing to do.", comment_identifier)
+        return None
+    if comment.hidden_reason != HIDDEN_REASON_PENDING_CLASSIFICATION:
+        logger.info("classify_comment: comment %s already resolved (%s); nothing to do.",
+                    comment_identifier, comment.hidden_reason)
+        return None
+
+    # Same hard cap as classify_post: return without raising so RQ stops
+    # retrying, and leave the comment hidden-pending for the sweep to alert on.
+    if comment.classification_attempts >= CLASSIFICATION_MAX_ATTEMPTS:
+        logger.error(
+            "classify_comment: comment %s has exhausted its %d classification attempts; "
+            "leaving it pending (fail closed) and dropping the job.",
+            comment_identifier, comment.classification_attempts)
+        return None
+
+    # Count the attempt and bump updated_time in one UPDATE filtered on the
+    # pending state (see classify_post).
+    still_pending = Comment.objects.filter(
+        pk=comment.pk, hidden_reason=HIDDEN_REASON_PENDING_CLASSIFICATION,
+    ).update(classification_attempts=F('classification_attempts') + 1,
+             updated_time=timezone.now())
+    if not still_pending:
+        logger.info("classify_comment: comment %s was resolved concurrently; nothing to do.", comment_identifier)
+        return None
+    return comment
+
+
+def _record_comment_verdict(comment_identifier, comment, result):
+    """Apply `result` to the claimed `comment`, if it is still pending."""
+    if result.provider_failure:
+        raise ClassificationProviderError(
+            f"Provider unavailable while classifying comment {comment_identifier}")
+
+    final = not result and not result.appealable
+    with transaction.atomic():
+        claimed = Comment.objects.select_for_update().filter(
+            pk=comment.pk, hidden_reason=HIDDEN_REASON_PENDING_CLASSIFICATION).first()
+        if claimed is None:
+            logger.info("classify_comment: comment %s was resolved concurrently; nothing to do.", comment_identifier)
+            return
+        if result:
+            claimed.hidden = False
+            claimed.hidden_reason = HIDDEN_REASON_NONE
+            claimed.classification_reason_code = None
+        else:
+            # A final rejection stays as a tombstone, hidden even from its
+            # author, until the sweep purges it.
+            claimed.hidden = True
+            claimed.hidden_reason = HIDDEN_REASON_CLASSIFIER_FINAL if final else HIDDEN_REASON_CLASSIFIER
+            claimed.classification_reason_code = result.public_reason_code()
+        claimed.save(update_fields=['hidden', 'hidden_reason', 'classification_reason_code', 'updated_time'])
+
+    if result:
+        logger.info("classify_comment: comment %s approved and visible.", comment_identifier)
+    else:
+        logger.info("classify_comment: comment %s rejected (final=%s, reason=%s).",
+                    comment_identifier, final, result.public_reason_code())
+
+
+def enqueue_bio_classification(user_id):
+    """Schedule async classification for a user's freshly stored pending bio;
+    the eager/queue split of enqueue_classification."""
+    _run_or_enqueue(classify_bio, CLASSIFY_BIO_JOB_PATH, str(user_id), 'bio of user')
+
+
+def classify_bio(user_id):
+    """RQ job: classify one user's pending bio and record the outcome.
+
+    The text counterpart of classify_profile_photo: an approved pending_bio
+    becomes the live bio, a rejected one is dropped (the live bio is left
+    alone) with its reason code kept for the owner. The attempt increment and
+    the row claim both filter on the exact pending text, so a bio replaced
+    while this job ran is never resolved by this job's stale verdict.
+    """
+    claim = _claim_bio(user_id)
+    if claim is None:
+        return
+    user, pending_bio = claim
+    _record_bio_verdict(user_id, user, pending_bio, text_classifier_class.is_text_positive(pending_bio))
+
+
+async def aclassify_bio(user_id):
+    """classify_bio on the async worker's event loop."""
+    claim = await sync_to_async(_claim_bio)(user_id)
+    if claim is None:
+        return
+    user, pending_bio = claim
+    result = await text_classifier_class.ais_text_positive(pending_bio)
+    await sync_to_async(_record_bio_verdict)(user_id, user, pending_bio, result)
+
+
+def _claim_bio(user_id):
+    """Count an attempt at classifying the user's pending bio and return
+    (user, pending bio), or None when the job has nothing (more) to do."""
+    try:
+        user = PositiveOnlySocialUser.objects.get(pk=user_id)
+    except PositiveOnlySocialUser.DoesNotExist:
+        logger.info("classify_bio: user %s no longer exists; nothing to do.", user_id)
+        return None
+    if user.bio_status != BIO_STATUS_PENDING or user.pending_bio is None:
+        logger.info("classify_bio: user %s has no pending bio (status=%s); nothing to do.",
+                    user_id, user.bio_status)
+        return None
+
+    if user.bio_classification_attempts >= CLASSIFICATION_MAX_ATTEMPTS:
+        logger.error(
+            "classify_bio: user %s has exhausted its %d classification attempts; "
+            "leaving the bio pending (fail closed) and dropping the job.",
+            user_id, user.bio_classification_attempts)
+        return None
+
+    pending_bio = user.pending_bio
+    still_pending = PositiveOnlySocialUser.objects.filter(
+        pk=user.pk, bio_status=BIO_STATUS_PENDING, pending_bio=pending_bio,
+    ).update(bio_classification_attempts=F('bio_classification_attempts') + 1,
+             bio_classification_time=timezone.now())
+    if not still_pending:
+        logger.info("classify_bio: user %s pending bio changed or was resolved concurrently; nothing to do.", user_id)
+        return None
+    return user, pending_bio
+
+
+def _record_bio_verdict(user_id, user, pending_bio, result):
+    """Apply `result` to the user's pending bio, if it is still `pending_bio`."""
+    if result.provider_failure:
+        raise ClassificationProviderError(
+            f"Provider unavailable while classifying the bio of user {user_id}")
+
+    with transaction.atomic():
+        claimed = PositiveOnlySocialUser.objects.select_for_update().filter(
+            pk=user.pk, bio_status=BIO_STATUS_PENDING, pending_bio=pending_bio).first()
+        if claimed is None:
+            logger.info("classify_bio: user %s pending bio changed or was resolved concurrently; nothing to do.", user_id)
+            return
+        if result:
+            claimed.bio = pending_bio
+            claimed.bio_status = BIO_STATUS_APPROVED
+            claimed.bio_reason_code = None
+        else:
+            claimed.bio_status = BIO_STATUS_REJECTED
+            claimed.bio_reason_code = result.public_reason_code()
+        claimed.pending_bio = None
+        claimed.save(update_fields=['bio', 'pending_bio', 'bio_status', 'bio_reason_code'])
+
+    if result:
+        logger.info("classify_bio: user %s bio approved.", user_id)
+    else:
+        logger.info("classify_bio: user %s bio rejected (reason=%s).", user_id, result.public_reason_code())
+
+
+# The coroutine counterpart of each job, by the dotted path it is enqueued
+# under, for the async worker (async_worker.py).
+ASYNC_JOBS = {
+    CLASSIFY_JOB_PATH: aclassify_post,
+    CLASSIFY_PROFILE_PHOTO_JOB_PATH: aclassify_profile_photo,
+    CLASSIFY_COMMENT_JOB_PATH: aclassify_comment,
+    CLASSIFY_BIO_JOB_PATH: aclassify_bio,
+    POST_CATEGORIZE_JOB_PATH: acategorize_post,
+}
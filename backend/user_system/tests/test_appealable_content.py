@@ -13,6 +13,7 @@ from ..constants import Fields, HIDDEN_REASON_CLASSIFIER, HIDDEN_REASON_NONE, \
     POST_STATUS_PENDING
 from ..models import Comment, Post
 from ..views import get_user_with_username
+from ..visibility import visible_comments
 
 ALLOWED = ClassificationResult(allowed=True)
 APPEALABLE = ClassificationResult(allowed=False, appealable=True)
@@ -20,11 +21,10 @@ FINAL_REJECT = ClassificationResult(allowed=False, appealable=False)
 APPEALABLE_HATE = ClassificationResult(allowed=False, appealable=True, reason_code='hate_speech')
 FINAL_REJECT_GORE = ClassificationResult(allowed=False, appealable=False, reason_code='gore')
 
-# make_post no longer classifies in the request (issue #282); the worker in
-# user_system.tasks does. Patching through the tasks aliases sets the
-# attribute on the shared classifier module, so the comment endpoints (which
-# still classify inline in the views through their own aliases to the same
-# module) see the patch too.
+# make_post, comment_on_post and reply_to_comment_thread no longer classify in
+# the request (issue #282); the worker in user_system.tasks does, eagerly here.
+# Patching through the tasks aliases sets the attribute on the shared classifier
+# module, so every alias of it sees the patch too.
 TEXT = 'user_system.tasks.text_classifier_class.is_text_positive'
 IMAGE = 'user_system.tasks.image_classifier_class.is_image_positive'
 
@@ -284,7 +284,10 @@ class CommentAppealableTests(PositiveOnlySocialTestCase):
     def test_final_comment_rejection_is_blocked(self, _text):
         response = self._comment()
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(Comment.objects.count(), 0)
+        # Only a tombstone remains, which not even its author is shown.
+        comment = Comment.objects.get()
+        self.assertEqual(comment.hidden_reason, HIDDEN_REASON_CLASSIFIER_FINAL)
+        self.assertFalse(visible_comments(Comment.objects.all(), comment.author).exists())
 
     @patch(TEXT, return_value=FINAL_REJECT_GORE)
     def test_final_comment_rejection_includes_reason_and_no_appeal(self, _text):
@@ -0,0 +1,135 @@
+import asyncio
+import os
+import signal
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+from rq.job import JobStatus
+from rq.timeouts import JobTimeoutException
+
+from .. import async_worker, client_pool, tasks
+from ..constants import CLASSIFICATION_THREADS
+
+
+class AsyncWorkerCommandTests(SimpleTestCase):
+
+    @patch.dict(os.environ, {"REDIS_URL": "redis://localhost:6379/0"})
+    @patch('user_system.classifiers.image_prefilter.warm_models', return_value={})
+    @patch('user_system.async_worker.run')
+    @patch('redis.Redis.from_url')
+    def test_async_runs_the_slots_on_the_queue(self, mock_redis, mock_run, _warm):
+        call_command('classification_worker', '--async', '--concurrency', '4', '--burst', stdout=StringIO())
+        (queues, connection, concurrency), kwargs = mock_run.call_args
+        self.assertEqual([queue.name for queue in queues], ['classification'])
+        self.assertIs(connection, mock_redis.return_value)
+        self.assertEqual(concurrency, 4)
+        self.assertEqual(kwargs, {'burst': True})
+
+    @patch.dict(os.environ, {"REDIS_URL": "redis://localhost:6379/0"})
+    def test_concurrency_must_be_positive(self):
+        with self.assertRaises(CommandError):
+            call_command('classification_worker', '--async', '--concurrency', '0')
+
+
+def _job(func_name=tasks.CLASSIFY_JOB_PATH, timeout=180):
+    job = MagicMock(func_name=func_name, args=('post-1',), kwargs={}, timeout=timeout)
+    job.id = 'job-1'
+    return job
+
+
+class PerformTests(SimpleTestCase):
+    """_perform runs a job's coroutine with RQ's bookkeeping around it."""
+
+    def perform(self, job, job_coroutine):
+        worker, queue = MagicMock(queues=[MagicMock()]), MagicMock()
+        with patch.dict(tasks.ASYNC_JOBS, {tasks.CLASSIFY_JOB_PATH: job_coroutine}):
+            asyncio.run(async_worker._perform(worker, job, queue))
+        return worker
+
+    def test_a_finished_job_is_handled_as_a_success(self):
+        calls = []
+
+        async def classify(post_identifier):
+            calls.append(post_identifier)
+            return 'done'
+
+        job = _job()
+        worker = self.perform(job, classify)
+        self.assertEqual(calls, ['post-1'])
+        self.assertEqual(job._result, 'done')
+        self.assertEqual(job._status, JobStatus.FINISHED)
+        job.connection.persist.assert_called_once_with(job.key)
+        worker.prepare_job_execution.assert_called_once_with(job, True)
+        worker.handle_job_success.assert_called_once()
+        worker.handle_job_failure.assert_not_called()
+
+    def test_a_raising_job_is_handled_as_a_failure(self):
+        async def classify(post_identifier):
+            raise RuntimeError("provider failure")
+
+        job = _job()
+        worker = self.perform(job, classify)
+        self.assertEqual(job._status, JobStatus.FAILED)
+        worker.handle_job_success.assert_not_called()
+        self.assertIn("provider failure", worker.handle_job_failure.call_args.kwargs['exc_string'])
+
+    def test_a_job_over_its_timeout_is_cancelled_and_failed(self):
+        cancelled = []
+
+        async def classify(post_identifier):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(post_identifier)
+                raise
+
+        worker = self.perform(_job(timeout=0.05), classify)
+        self.assertEqual(cancelled, ['post-1'])
+        exc_type = worker.handle_exception.call_args.args[1]
+        self.assertIs(exc_type, JobTimeoutException)
+        worker.handle_job_failure.assert_called_once()
+
+    def test_a_job_without_a_coroutine_runs_on_a_thread(self):
+        job = _job(func_name='user_system.tasks.something_else')
+        job.perform.return_value = 'sync'
+        self.perform(job, None)
+        job.perform.assert_called_once_with()
+        self.assertEqual(job._result, 'sync')
+
+
+class AsyncJobsTests(SimpleTestCase):
+
+    def test_every_classification_job_has_a_coroutine(self):
+        paths = [tasks.CLASSIFY_JOB_PATH, tasks.CLASSIFY_PROFILE_PHOTO_JOB_PATH, tasks.CLASSIFY_COMMENT_JOB_PATH,
+                 tasks.CLASSIFY_BIO_JOB_PATH, tasks.POST_CATEGORIZE_JOB_PATH]
+        self.assertCountEqual(tasks.ASYNC_JOBS, paths)
+        for path, job_coroutine in tasks.ASYNC_JOBS.items():
+            self.assertTrue(asyncio.iscoroutinefunction(job_coroutine), path)
+            self.assertEqual(job_coroutine.__name__, 'a' + path.rsplit('.', 1)[1])
+
+
+class RunTests(SimpleTestCase):
+
+    def tearDown(self):
+        client_pool.set_pool_size(CLASSIFICATION_THREADS)
+        super().tearDown()
+
+    def test_pools_grow_with_the_slots(self):
+        self.assertEqual(async_worker.pool_size(1), CLASSIFICATION_THREADS)
+        self.assertEqual(async_worker.pool_size(32), 64)
+
+    @patch('user_system.async_worker.SlotWorker')
+    def test_run_works_every_slot_and_restores_the_signal_handlers(self, mock_worker):
+        worker = mock_worker.return_value
+        worker.dequeue_job_and_maintain_ttl.return_value = None
+        before = signal.getsignal(signal.SIGTERM)
+        async_worker.run([MagicMock()], MagicMock(), 3, burst=True)
+        self.assertEqual(mock_worker.call_count, 3)
+        self.assertEqual(worker.bootstrap.call_count, 3)
+        self.assertEqual(worker.teardown.call_count, 3)
+        worker.dequeue_job_and_maintain_ttl.assert_called_with(None, None)
+        self.assertEqual(client_pool.POOL_SIZE, async_worker.pool_size(3))
+        self.assertIs(signal.getsignal(signal.SIGTERM), before)
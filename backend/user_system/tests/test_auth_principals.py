@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import auth_principals, ban_sets, views
+from ..constants import BAN_TYPE_OUTRIGHT
+from ..models import Session, UserBan
+from ..utils import generate_management_token, hash_string_sha256
+from .test_parent_case import PositiveOnlySocialTestCase
+
+
+class AuthPrincipalTests(PositiveOnlySocialTestCase):
+    """Bearer tokens resolve through the indexed token hash and a short-lived
+    principal cache, which every session-ending path clears at once."""
+
+    def setUp(self):
+        super().setUp()
+        self.register_user_and_setup_local_fields()
+        self.header = {'HTTP_AUTHORIZATION': f'Bearer {self.session_management_token}'}
+        self.user = get_user_model().objects.get(username=self.local_username)
+
+    def _authenticated(self, header=None):
+        return self.client.get(reverse('get_posts_in_feed', kwargs={'batch': 0}), **(header or self.header))
+
+    def test_sessions_store_their_token_hash(self):
+        session = Session.objects.get(management_token=self.session_management_token)
+        self.assertEqual(session.token_hash, hash_string_sha256(self.session_management_token))
+
+    def test_cached_principal_authenticates_with_one_query(self):
+        self.assertIsNotNone(auth_principals.resolve(self.session_management_token))
+        ban_sets.is_banned(self.user.pk, BAN_TYPE_OUTRIGHT)
+        decorated = views.api_login_required(lambda request: request.user)
+        request = RequestFactory().get('/', **self.header)
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(decorated(request), self.user)
+        # The cache backend here is the database cache; only count app tables.
+        app_queries = [q['sql'] for q in context.captured_queries
+                       if q['sql'].startswith('SELECT') and 'rate_limit_cache' not in q['sql']]
+        self.assertEqual(len(app_queries), 1)
+        self.assertIn('positiveonlysocialuser', app_queries[0])
+
+    def test_logout_rejects_the_token_immediately(self):
+        self.assertEqual(self._authenticated().status_code, 200)
+        response = self.client.post(reverse('logout_user'), **self.header)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._authenticated().status_code, 401)
+
+    def test_password_change_evicts_other_devices_immediately(self):
+        other_token = generate_management_token()
+        self.user.session_set.create(management_token=other_token, ip='1.2.3.4')
+        other_header = {'HTTP_AUTHORIZATION': f'Bearer {other_token}'}
+        self.assertEqual(self._authenticated(other_header).status_code, 200)
+        response = self.client.post(
+            reverse('change_password'),
+            data={'password': self.local_password, 'new_password': 'BrandNewPass123-'},
+            content_type='application/json', **self.header)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._authenticated(other_header).status_code, 401)
+        self.assertEqual(self._authenticated().status_code, 200)
+
+    def test_outright_ban_applies_to_a_cached_principal(self):
+        self.assertEqual(self._authenticated().status_code, 200)
+        UserBan.objects.create(user=self.user, ban_type=BAN_TYPE_OUTRIGHT)
+        self.assertEqual(self._authenticated().status_code, 401)
+
+    def test_unverifying_email_applies_to_a_cached_principal(self):
+        self.assertEqual(self._authenticated().status_code, 200)
+        views._issue_email_verification_token(self.user)
+        self.assertEqual(self._authenticated().status_code, 403)
@@ -0,0 +1,78 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .. import ban_sets
+from ..constants import BAN_TYPE_OUTRIGHT, BAN_TYPE_SHADOW
+from ..models import UserBan
+
+
+class BanSetTests(TestCase):
+    """The cached active-ban sets the auth decorator and visibility filters
+    consult: rebuilt when bans change or one expires, and never trusted over
+    the database when the cache misbehaves."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_user_model().objects.create_user(username='banned', email='b@t.com')
+
+    def _ban_queries(self, fn):
+        with CaptureQueriesContext(connection) as context:
+            result = fn()
+        return result, [q['sql'] for q in context.captured_queries if 'user_system_userban' in q['sql']]
+
+    def test_ban_changes_apply_at_once(self):
+        self.assertFalse(ban_sets.is_banned(self.user.pk, BAN_TYPE_SHADOW))
+        ban = UserBan.objects.create(user=self.user, ban_type=BAN_TYPE_SHADOW)
+        self.assertTrue(ban_sets.is_banned(self.user.pk, BAN_TYPE_SHADOW))
+        self.assertFalse(ban_sets.is_banned(self.user.pk, BAN_TYPE_OUTRIGHT))
+        ban.delete()
+        self.assertFalse(ban_sets.is_banned(self.user.pk, BAN_TYPE_SHADOW))
+
+    def test_warm_lookups_do_not_query_bans(self):
+        UserBan.objects.create(user=self.user, ban_type=BAN_TYPE_OUTRIGHT)
+        ban_sets.is_banned(self.user.pk, BAN_TYPE_OUTRIGHT)
+        banned, queries = self._ban_queries(lambda: ban_sets.is_banned(self.user.pk, BAN_TYPE_OUTRIGHT))
+        self.assertTrue(banned)
+        self.assertEqual(queries, [])
+
+    def test_bulk_writes_need_an_explicit_invalidation(self):
+        UserBan.objects.create(user=self.user, ban_type=BAN_TYPE_SHADOW)
+        self.assertTrue(ban_sets.is_banned(self.user.pk, BAN_TYPE_SHADOW))
+        UserBan.objects.update(expires=timezone.now())
+        self.assertTrue(ban_sets.is_banned(self.user.pk, BAN_TYPE_SHADOW))
+        ban_sets.invalidate_ban_sets()
+        self.assertFalse(ban_sets.is_banned(self.user.pk, BAN_TYPE_SHADOW))
+
+    def test_rebuild_that_raced_a_ban_is_not_kept(self):
+        build = ban_sets._build
+
+        def ban_during_build():
+            payload = build()
+            if not UserBan.objects.exists():
+                with self.captureOnCommitCallbacks(execute=True):
+                    UserBan.objects.create(user=self.user, ban_type=BAN_TYPE_OUTRIGHT)
+            return payload
+
+        with patch.object(ban_sets, '_build', side_effect=ban_during_build):
+            self.assertFalse(ban_sets.is_banned(self.user.pk, BAN_TYPE_OUTRIGHT))
+        self.assertTrue(ban_sets.is_banned(self.user.pk, BAN_TYPE_OUTRIGHT))
+
+    def test_sets_are_rebuilt_when_a_ban_expires(self):
+        expires = timezone.now() + timedelta(hours=1)
+        UserBan.objects.create(user=self.user, ban_type=BAN_TYPE_SHADOW, expires=expires)
+        self.assertTrue(ban_sets.is_banned(self.user.pk, BAN_TYPE_SHADOW))
+        with patch('django.utils.timezone.now', return_value=expires + timedelta(seconds=1)):
+            self.assertFalse(ban_sets.is_banned(self.user.pk, BAN_TYPE_SHADOW))
+
+    def test_cache_failure_falls_back_to_the_database(self):
+        UserBan.objects.create(user=self.user, ban_type=BAN_TYPE_OUTRIGHT)
+        with patch.object(ban_sets.cache, 'get', side_effect=ConnectionError):
+            banned, queries = self._ban_queries(lambda: ban_sets.is_banned(self.user.pk, BAN_TYPE_OUTRIGHT))
+        self.assertTrue(banned)
+        self.assertEqual(len(queries), 1)
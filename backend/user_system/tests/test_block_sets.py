@@ -0,0 +1,64 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import block_sets
+from ..constants import Fields
+from ..models import Post
+from ..views import get_user_with_username
+from .test_parent_case import PositiveOnlySocialTestCase
+
+
+class BlockSetTests(PositiveOnlySocialTestCase):
+    """The cached per-user block sets the listing endpoints exclude by: read
+    once, skipped when empty, and dropped for both users by toggle_block."""
+
+    def setUp(self):
+        super().setUp()
+        viewer = self.register_and_login_user(prefix='viewer')
+        self.viewer = get_user_with_username(viewer[Fields.username])
+        self.header = {'HTTP_AUTHORIZATION': f"Bearer {viewer[Fields.session_management_token]}"}
+        author = self.make_user_with_posts(num_posts=2)
+        self.author_username = author[Fields.username]
+        self.author = get_user_with_username(self.author_username)
+        self.author_header = {'HTTP_AUTHORIZATION': f"Bearer {author[Fields.session_management_token]}"}
+
+    def _block_queries(self, fn):
+        with CaptureQueriesContext(connection) as context:
+            result = fn()
+        return result, [q['sql'] for q in context.captured_queries if 'user_system_userblock' in q['sql']]
+
+    def _author_post_count(self):
+        response = self.client.get(reverse('get_posts_for_user', kwargs={
+            'username': self.author_username, 'batch': 0}), **self.header)
+        self.assertEqual(response.status_code, 200)
+        return len(response.json())
+
+    def _toggle_block(self, blocker_header, username):
+        response = self.client.post(reverse('toggle_block', kwargs={'username_to_toggle_block': username}),
+                                    **blocker_header)
+        self.assertEqual(response.status_code, 200)
+
+    def test_no_blocks_leaves_the_query_untouched(self):
+        posts = Post.objects.all()
+        self.assertIs(block_sets.exclude_blocked(posts, self.viewer), posts)
+
+    def test_warm_lookups_do_not_query_blocks(self):
+        self.viewer.blocked.add(self.author)
+        block_sets.blocked_either_way_ids(self.viewer)
+        ids, queries = self._block_queries(lambda: block_sets.blocked_either_way_ids(self.viewer))
+        self.assertEqual(ids, {self.author.pk})
+        self.assertEqual(queries, [])
+        excluded = block_sets.exclude_blocked(Post.objects.all(), self.viewer)
+        self.assertFalse(excluded.filter(author=self.author).exists())
+
+    def test_toggle_block_applies_to_both_sides_at_once(self):
+        self.assertEqual(self._author_post_count(), 2)
+        self.assertEqual(block_sets.blocker_ids(self.viewer), frozenset())
+
+        self._toggle_block(self.author_header, self.viewer.username)
+        self.assertEqual(block_sets.blocker_ids(self.viewer), {self.author.pk})
+        self.assertEqual(self._author_post_count(), 0)
+
+        self._toggle_block(self.author_header, self.viewer.username)
+        self.assertEqual(self._author_post_count(), 2)
@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..constants import (
+    BAN_TYPE_SHADOW,
+    FOLLOW_CATEGORY_FOLLOWING,
+    FOLLOW_CATEGORY_FAMILY,
+    HIDDEN_REASON_CLASSIFIER,
+    HIDDEN_REASON_CLASSIFIER_FINAL,
+    HIDDEN_REASON_NONE,
+    POST_AUDIENCE_FAMILY,
+    POST_AUDIENCE_FRIENDS,
+    POST_AUDIENCE_PUBLIC,
+)
+from ..models import Post, UserBan, UserFollow
+from ..visibility import audience_admitted_ids, can_view_post, viewable_post_ids, visible_posts
+
+
+class BulkVisibilityTests(TestCase):
+    """viewable_post_ids / audience_admitted_ids decide a whole batch of
+    already-fetched rows in a fixed number of queries, and agree with the
+    visible_posts queryset filter row for row."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.viewer = User.objects.create_user(username='viewer', email='v@t.com')
+        self.author = User.objects.create_user(username='author', email='a@t.com')
+        self.cousin = User.objects.create_user(username='cousin', email='c@t.com')
+        self.banned = User.objects.create_user(username='banned', email='b@t.com')
+        self.minor = User.objects.create_user(username='minor', email='m@t.com',
+                                              identity_is_verified=True, is_adult=False)
+        UserBan.objects.create(user=self.banned, ban_type=BAN_TYPE_SHADOW)
+        UserFollow.objects.create(user_from=self.cousin, user_to=self.viewer, category=FOLLOW_CATEGORY_FAMILY)
+        UserFollow.objects.create(user_from=self.author, user_to=self.viewer, category=FOLLOW_CATEGORY_FOLLOWING)
+
+        self.visible = [
+            self._post(self.author),
+            self._post(self.cousin, audience=POST_AUDIENCE_FAMILY),
+            self._post(self.viewer, audience=POST_AUDIENCE_FAMILY),
+            self._post(self.viewer, hidden=True, hidden_reason=HIDDEN_REASON_CLASSIFIER),
+        ]
+        self.invisible = [
+            self._post(self.author, audience=POST_AUDIENCE_FRIENDS),
+            self._post(self.author, hidden=True, hidden_reason=HIDDEN_REASON_CLASSIFIER),
+            self._post(self.banned),
+            self._post(self.minor),
+            self._post(self.viewer, hidden=True, hidden_reason=HIDDEN_REASON_CLASSIFIER_FINAL),
+        ]
+
+    def _post(self, author, audience=POST_AUDIENCE_PUBLIC, hidden=False, hidden_reason=HIDDEN_REASON_NONE):
+        return Post.objects.create(author=author, caption='caption', audience=audience,
+                                   hidden=hidden, hidden_reason=hidden_reason)
+
+    def _queries(self, fn):
+        # Warm the ban sets first; only the visibility queries are under test.
+        viewable_post_ids([], self.viewer)
+        can_view_post(self.visible[0], self.viewer)
+        with CaptureQueriesContext(connection) as context:
+            result = fn()
+        return result, [q['sql'] for q in context.captured_queries if 'rate_limit_cache' not in q['sql']]
+
+    def test_batch_matches_the_queryset_filter(self):
+        posts = list(Post.objects.all())
+        expected = set(visible_posts(Post.objects.all(), self.viewer).values_list('pk', flat=True))
+        self.assertEqual(viewable_post_ids(posts, self.viewer), expected)
+        self.assertEqual(expected, {post.pk for post in self.visible})
+        for post in posts:
+            self.assertEqual(can_view_post(post, self.viewer), post.pk in expected)
+
+    def test_batch_costs_a_fixed_number_of_queries(self):
+        posts = list(Post.objects.select_related('author'))
+        ids, queries = self._queries(lambda: viewable_post_ids(posts, self.viewer))
+        self.assertEqual(ids, {post.pk for post in self.visible})
+        # Authors are already loaded, so only the follow edges are read.
+        self.assertEqual(len(queries), 1)
+
+        posts = list(Post.objects.all())
+        _, queries = self._queries(lambda: viewable_post_ids(posts, self.viewer))
+        self.assertEqual(len(queries), 2)
+
+    def test_public_and_own_content_needs_no_query(self):
+        contents = [self.visible[0], self.visible[2]]
+        ids, queries = self._queries(lambda: audience_admitted_ids(contents, self.viewer))
+        self.assertEqual(ids, {post.pk for post in contents})
+        self.assertEqual(queries, [])
@@ -10,7 +10,7 @@ from ..constants import (
     HIDDEN_REASON_CLASSIFIER, HIDDEN_REASON_CLASSIFIER_FINAL, HIDDEN_REASON_REPORTS,
     MAX_INTEREST_TAGS_PER_POST,
 )
-from ..models import Post, InterestCategory
+from ..models import Post, InterestCategory, interest_mask
 from .. import tasks
 
 
@@ -38,6 +38,12 @@ class CategorizePostTaskTests(TestCase):
         tasks.categorize_post(post.post_identifier)
         self.assertEqual(self._slugs(post), ['music', 'nature'])
 
+    def test_mirrors_buckets_into_interest_mask(self):
+        post = self._post("A walk in nature with some music")
+        tasks.categorize_post(post.post_identifier)
+        post.refresh_from_db()
+        self.assertEqual(post.interest_mask, interest_mask(['music', 'nature']))
+
     def test_caps_at_max_tags(self):
         post = self._post("nature music art food travel science")
         tasks.categorize_post(post.post_identifier)
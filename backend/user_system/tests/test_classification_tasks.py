@@ -70,7 +70,8 @@ class ClassifyPostTaskTests(TestCase):
         clients can render a blurred placeholder while the image loads."""
         self._run()
         self.assertFalse(self.post.hidden)
-        mock_blur.assert_called_once_with(IMAGE_URL)
+        mock_blur.assert_called_once()
+        self.assertEqual(mock_blur.call_args.args[0].image_url, IMAGE_URL)
         self.assertEqual(self.post.image_blurhash, FAKE_BLURHASH)
 
     @patch(BLURHASH, return_value=None)
@@ -223,3 +224,68 @@ class ClassifyPostTaskTests(TestCase):
     def test_email_failure_does_not_undo_the_transition(self, _text, _image, _mail):
         self._run()
         self.assertEqual(self.post.hidden_reason, HIDDEN_REASON_CLASSIFIER)
+
+
+ATEXT = 'user_system.tasks.text_classifier_class.ais_text_positive'
+AIMAGE = 'user_system.tasks.image_classifier_class.ais_image_positive'
+ACATEGORIZE = 'user_system.tasks.acategorize_post'
+
+
+class AsyncClassifyPostTaskTests(TestCase):
+    """aclassify_post, the job as the async worker runs it, keeps the claim
+    and transition of classify_post."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = PositiveOnlySocialUser.objects.create_user(
+            username='async_worker_user', email='async_worker@test.com', password='x')
+        self.post = self.user.post_set.create(
+            caption='a caption', hidden=True, hidden_reason=HIDDEN_REASON_PENDING_CLASSIFICATION)
+
+    async def _run(self):
+        await tasks.aclassify_post(str(self.post.post_identifier))
+        await self.post.arefresh_from_db()
+
+    @patch(ACATEGORIZE)
+    @patch(ATEXT, return_value=ALLOWED)
+    async def test_approval_makes_post_visible_and_categorizes_it(self, _text, mock_categorize):
+        await self._run()
+        self.assertFalse(self.post.hidden)
+        self.assertEqual(self.post.hidden_reason, HIDDEN_REASON_NONE)
+        self.assertEqual(self.post.classification_attempts, 1)
+        mock_categorize.assert_awaited_once_with(str(self.post.post_identifier), image=None)
+
+    @patch(ACATEGORIZE)
+    @patch(ATEXT, return_value=APPEALABLE)
+    async def test_redelivered_job_is_a_no_op(self, mock_text, mock_categorize):
+        await self._run()
+        await self._run()
+        self.assertEqual(self.post.hidden_reason, HIDDEN_REASON_CLASSIFIER)
+        self.assertEqual(self.post.classification_attempts, 1)
+        self.assertEqual(mock_text.await_count, 1)
+        self.assertEqual(len(mail.outbox), 1)
+        mock_categorize.assert_not_awaited()
+
+    @patch(ATEXT, return_value=PROVIDER_FAILURE)
+    async def test_provider_failure_raises_and_stays_pending(self, _text):
+        with self.assertRaises(tasks.ClassificationProviderError):
+            await tasks.aclassify_post(str(self.post.post_identifier))
+        await self.post.arefresh_from_db()
+        self.assertEqual(self.post.hidden_reason, HIDDEN_REASON_PENDING_CLASSIFICATION)
+        self.assertEqual(self.post.classification_attempts, 1)
+
+    @patch(BLURHASH, return_value=None)
+    @patch('user_system.tasks.fingerprint_image', return_value=None)
+    @patch('user_system.tasks.ImageContext.aload')
+    @patch(AIMAGE, return_value=FINAL_REJECT_GORE)
+    @patch(ATEXT, return_value=ALLOWED)
+    async def test_image_is_fetched_and_classified_alongside_the_text(self, _text, mock_image, mock_load,
+                                                                       _fingerprint, _blur):
+        self.post.image_url = IMAGE_URL
+        await self.post.asave(update_fields=['image_url'])
+        with patch('user_system.tasks.delete_image'):
+            await self._run()
+        mock_load.assert_awaited_once_with()
+        mock_image.assert_awaited_once()
+        self.assertEqual(self.post.hidden_reason, HIDDEN_REASON_CLASSIFIER_FINAL)
+        self.assertEqual(self.post.classification_reason_code, 'gore')
@@ -0,0 +1,48 @@
+import os
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+_COMMAND = 'user_system.management.commands.classification_worker'
+
+
+@patch.dict(os.environ, {"REDIS_URL": "redis://localhost:6379/0"})
+@patch('redis.Redis.from_url')
+class PreforkWorkerCommandTests(SimpleTestCase):
+    """--processes warms the pre-filter models in the parent, then forks."""
+
+    @patch(f'{_COMMAND}.gc')
+    @patch(f'{_COMMAND}.connections')
+    @patch('rq.worker_pool.WorkerPool')
+    @patch('user_system.classifiers.image_prefilter.warm_models', return_value={'nudity': True, 'gore': False})
+    def test_models_are_warmed_before_the_children_fork(self, mock_warm, mock_pool, mock_connections,
+                                                        mock_gc, _redis):
+        calls = MagicMock()
+        calls.attach_mock(mock_warm, 'warm')
+        calls.attach_mock(mock_connections.close_all, 'close_db')
+        calls.attach_mock(mock_pool.return_value.start, 'start')
+
+        call_command('classification_worker', '--processes', '3', '--burst', stdout=StringIO())
+
+        self.assertEqual([name for name, *_ in calls.mock_calls], ['warm', 'close_db', 'start'])
+        self.assertEqual(mock_pool.call_args.kwargs['num_workers'], 3)
+        mock_pool.return_value.start.assert_called_once_with(burst=True)
+        mock_gc.freeze.assert_called_once_with()
+
+    @patch('user_system.classifiers.image_prefilter.warm_models', return_value={})
+    @patch('rq.Worker')
+    def test_single_worker_also_warms_the_models(self, mock_worker, mock_warm, _redis):
+        call_command('classification_worker', '--burst', stdout=StringIO())
+        mock_warm.assert_called_once_with()
+        mock_worker.return_value.work.assert_called_once_with(burst=True)
+
+    def test_processes_must_be_positive(self, _redis):
+        with self.assertRaises(CommandError):
+            call_command('classification_worker', '--processes', '0')
+
+    def test_processes_and_async_are_exclusive(self, _redis):
+        with self.assertRaises(CommandError):
+            call_command('classification_worker', '--processes', '2', '--async')
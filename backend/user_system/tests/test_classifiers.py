@@ -195,18 +195,20 @@ class TestClassifiers(PositiveOnlySocialTestCase):
     @patch.dict(os.environ, {}, clear=True)
     @patch(_TEXT_AVAILABLE, return_value=[API_GEMMA])
     def test_text_classifier_boundary_scores(self, _avail):
+        # Each score is asked about different text, so no call is answered from
+        # the verdict cache.
         # Exactly 0.3 is the reject zone (not appealable).
         with patch.dict(_TEXT_DISPATCH, {API_GEMMA: MagicMock(return_value=0.3)}):
-            result = is_text_positive("some text")
+            result = is_text_positive("some text at 0.3")
             self.assertFalse(result)
             self.assertFalse(result.appealable)
         # Exactly 0.7 is the allow zone.
         with patch.dict(_TEXT_DISPATCH, {API_GEMMA: MagicMock(return_value=0.7)}):
-            self.assertTrue(is_text_positive("some text"))
+            self.assertTrue(is_text_positive("some text at 0.7"))
         # Just inside the middle zone on either side: rejected but appealable.
         for score in (0.35, 0.65):
             with patch.dict(_TEXT_DISPATCH, {API_GEMMA: MagicMock(return_value=score)}):
-                result = is_text_positive("some text")
+                result = is_text_positive(f"some text at {score}")
                 self.assertFalse(result)
                 self.assertTrue(result.appealable)
 
@@ -0,0 +1,168 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import tasks
+from ..classifiers.classifier_constants import POSITIVE_TEXT
+from ..classifiers.classifier_utils import ClassificationResult
+from ..constants import (
+    BIO_STATUS_APPROVED, BIO_STATUS_PENDING, BIO_STATUS_REJECTED,
+    CLASSIFICATION_MAX_ATTEMPTS, Fields,
+    HIDDEN_REASON_CLASSIFIER, HIDDEN_REASON_CLASSIFIER_FINAL,
+    HIDDEN_REASON_NONE, HIDDEN_REASON_PENDING_CLASSIFICATION,
+)
+from ..models import Comment, PositiveOnlySocialUser
+from .test_parent_case import PositiveOnlySocialTestCase
+
+ALLOWED = ClassificationResult(allowed=True)
+APPEALABLE_HATE = ClassificationResult(allowed=False, appealable=True, reason_code='hate_speech')
+FINAL_REJECT_GORE = ClassificationResult(allowed=False, appealable=False, reason_code='gore')
+PROVIDER_FAILURE = ClassificationResult(allowed=False, provider_failure=True)
+
+TEXT = 'user_system.tasks.text_classifier_class.is_text_positive'
+
+
+class ClassifyCommentTaskTests(TestCase):
+    """The async comment classification worker, driven directly."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = PositiveOnlySocialUser.objects.create_user(
+            username='comment_worker_user', email='comment_worker@test.com', password='x')
+        post = self.user.post_set.create(caption='a caption')
+        self.comment = post.commentthread_set.create().comment_set.create(
+            author=self.user, body='a comment', hidden=True,
+            hidden_reason=HIDDEN_REASON_PENDING_CLASSIFICATION)
+
+    def _run(self):
+        tasks.classify_comment(str(self.comment.comment_identifier))
+        self.comment.refresh_from_db()
+
+    @patch(TEXT, return_value=ALLOWED)
+    def test_approval_makes_comment_visible(self, _text):
+        self._run()
+        self.assertFalse(self.comment.hidden)
+        self.assertEqual(self.comment.hidden_reason, HIDDEN_REASON_NONE)
+        self.assertEqual(self.comment.classification_attempts, 1)
+
+    @patch(TEXT, return_value=APPEALABLE_HATE)
+    def test_appealable_rejection_hides_with_reason(self, _text):
+        self._run()
+        self.assertTrue(self.comment.hidden)
+        self.assertEqual(self.comment.hidden_reason, HIDDEN_REASON_CLASSIFIER)
+        self.assertEqual(self.comment.classification_reason_code, 'hate_speech')
+
+    @patch(TEXT, return_value=FINAL_REJECT_GORE)
+    def test_final_rejection_leaves_a_tombstone(self, _text):
+        self._run()
+        self.assertEqual(self.comment.hidden_reason, HIDDEN_REASON_CLASSIFIER_FINAL)
+        self.assertEqual(self.comment.classification_reason_code, 'gore')
+
+    @patch(TEXT, return_value=PROVIDER_FAILURE)
+    def test_provider_failure_raises_and_stays_pending(self, _text):
+        with self.assertRaises(tasks.ClassificationProviderError):
+            self._run()
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.hidden_reason, HIDDEN_REASON_PENDING_CLASSIFICATION)
+        self.assertEqual(self.comment.classification_attempts, 1)
+
+    @patch(TEXT, return_value=ALLOWED)
+    def test_resolved_comment_is_left_alone(self, mock_text):
+        Comment.objects.filter(pk=self.comment.pk).update(hidden_reason=HIDDEN_REASON_CLASSIFIER)
+        self._run()
+        mock_text.assert_not_called()
+        self.assertEqual(self.comment.classification_attempts, 0)
+
+    @patch(TEXT, return_value=ALLOWED)
+    def test_exhausted_comment_stays_pending_without_provider_calls(self, mock_text):
+        Comment.objects.filter(pk=self.comment.pk).update(classification_attempts=CLASSIFICATION_MAX_ATTEMPTS)
+        with self.assertLogs('user_system.tasks', level='ERROR'):
+            self._run()
+        mock_text.assert_not_called()
+        self.assertEqual(self.comment.hidden_reason, HIDDEN_REASON_PENDING_CLASSIFICATION)
+
+
+class ClassifyBioTaskTests(TestCase):
+    """The async bio classification worker, driven directly."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = PositiveOnlySocialUser.objects.create_user(
+            username='bio_worker_user', email='bio_worker@test.com', password='x')
+        PositiveOnlySocialUser.objects.filter(pk=self.user.pk).update(
+            bio='the old bio', pending_bio='the new bio', bio_status=BIO_STATUS_PENDING)
+
+    def _run(self):
+        tasks.classify_bio(str(self.user.id))
+        self.user.refresh_from_db()
+
+    @patch(TEXT, return_value=ALLOWED)
+    def test_approval_promotes_the_pending_bio(self, _text):
+        self._run()
+        self.assertEqual(self.user.bio, 'the new bio')
+        self.assertIsNone(self.user.pending_bio)
+        self.assertEqual(self.user.bio_status, BIO_STATUS_APPROVED)
+        self.assertEqual(self.user.bio_classification_attempts, 1)
+
+    @patch(TEXT, return_value=APPEALABLE_HATE)
+    def test_rejection_keeps_the_live_bio(self, _text):
+        self._run()
+        self.assertEqual(self.user.bio, 'the old bio')
+        self.assertIsNone(self.user.pending_bio)
+        self.assertEqual(self.user.bio_status, BIO_STATUS_REJECTED)
+        self.assertEqual(self.user.bio_reason_code, 'hate_speech')
+
+    def test_replaced_bio_is_not_resolved_by_a_stale_verdict(self):
+        def replace_then_reject(text):
+            PositiveOnlySocialUser.objects.filter(pk=self.user.pk).update(pending_bio='a newer bio')
+            return APPEALABLE_HATE
+
+        with patch(TEXT, side_effect=replace_then_reject):
+            self._run()
+        self.assertEqual(self.user.pending_bio, 'a newer bio')
+        self.assertEqual(self.user.bio_status, BIO_STATUS_PENDING)
+
+
+@override_settings(CLASSIFICATION_EAGER=False)
+class QueuedCommentAndBioTests(PositiveOnlySocialTestCase):
+    """With a queue the endpoints answer before the worker runs, so a new
+    comment or bio comes back pending and its job is enqueued on commit."""
+
+    def setUp(self):
+        super().setUp()
+        self.register_user_and_setup_local_fields()
+        self.header = {'HTTP_AUTHORIZATION': f'Bearer {self.session_management_token}'}
+        self.user = PositiveOnlySocialUser.objects.get(username=self.local_username)
+        self.post = self.user.post_set.create(caption='a caption')
+
+    def _post(self, name, data, **kwargs):
+        return self.client.post(reverse(name, kwargs=kwargs), data=data,
+                                content_type='application/json', **self.header)
+
+    @patch('user_system.tasks._queue')
+    def test_comment_is_created_pending(self, mock_queue):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._post('comment_on_post', {Fields.comment_text: POSITIVE_TEXT},
+                                  post_identifier=str(self.post.post_identifier))
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual(body[Fields.hidden_reason], HIDDEN_REASON_PENDING_CLASSIFICATION)
+        self.assertFalse(body[Fields.appealable])
+        comment = Comment.objects.get(comment_identifier=body[Fields.comment_identifier])
+        self.assertEqual(comment.hidden_reason, HIDDEN_REASON_PENDING_CLASSIFICATION)
+        mock_queue.return_value.enqueue.assert_called_once()
+        self.assertEqual(mock_queue.return_value.enqueue.call_args.args,
+                         (tasks.CLASSIFY_COMMENT_JOB_PATH, str(comment.comment_identifier)))
+
+    @patch('user_system.tasks._queue')
+    def test_bio_is_stored_pending(self, mock_queue):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._post('set_bio', {Fields.bio: 'Kindness matters.'})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()[Fields.bio_status], BIO_STATUS_PENDING)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.bio, '')
+        self.assertEqual(self.user.pending_bio, 'Kindness matters.')
+        self.assertEqual(mock_queue.return_value.enqueue.call_args.args,
+                         (tasks.CLASSIFY_BIO_JOB_PATH, str(self.user.id)))
@@ -0,0 +1,62 @@
+import os
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from .. import client_pool, s3
+from ..classifiers import classifier_utils
+
+_AWS_CREDS = {
+    "AWS_ACCESS_KEY_ID": "fake_aws_key",
+    "AWS_SECRET_ACCESS_KEY": "fake_aws_secret",
+}
+
+
+class ClientPoolTests(SimpleTestCase):
+
+    def setUp(self):
+        client_pool.reset()
+        self.addCleanup(client_pool.reset)
+
+    def test_client_is_built_once_and_reused(self):
+        factory = MagicMock(side_effect=lambda *a, **kw: object())
+        first = client_pool.get_client('demo', factory, 'key')
+        self.assertIs(client_pool.get_client('demo', factory, 'key'), first)
+        factory.assert_called_once_with('key')
+        self.assertEqual(client_pool.stats()['demo']['clients_built'], 1)
+
+    def test_new_credentials_build_a_new_client(self):
+        factory = MagicMock(side_effect=lambda *a, **kw: object())
+        first = client_pool.get_client('demo', factory, api_key='old')
+        self.assertIsNot(client_pool.get_client('demo', factory, api_key='new'), first)
+        self.assertEqual(client_pool.stats()['demo']['clients_built'], 2)
+
+    def test_reset_forgets_clients_and_counters(self):
+        factory = MagicMock(side_effect=lambda *a, **kw: object())
+        first = client_pool.get_client('demo', factory)
+        with client_pool.timed('demo'):
+            pass
+        client_pool.reset()
+        self.assertEqual(client_pool.stats(), {})
+        self.assertIsNot(client_pool.get_client('demo', factory), first)
+
+    def test_timed_calls_are_counted(self):
+        for _ in range(3):
+            with client_pool.timed('demo'):
+                pass
+        stats = client_pool.stats()['demo']
+        self.assertEqual(stats['calls'], 3)
+        self.assertEqual(stats['clients_built'], 0)
+        self.assertIsNotNone(stats['mean_latency_ms'])
+
+    @patch.dict(os.environ, {"OPENROUTER_API_KEY": "fake_openrouter"}, clear=True)
+    def test_openrouter_client_is_shared(self):
+        self.assertIs(classifier_utils._openrouter_client(), classifier_utils._openrouter_client())
+
+    @patch.dict(os.environ, _AWS_CREDS, clear=True)
+    @patch("user_system.s3.boto3")
+    def test_s3_client_is_shared_and_pooled(self, mock_boto3):
+        self.assertIs(s3._s3_client(), s3._s3_client())
+        mock_boto3.client.assert_called_once()
+        config = mock_boto3.client.call_args.kwargs['config']
+        self.assertEqual(config.max_pool_connections, client_pool.POOL_SIZE)
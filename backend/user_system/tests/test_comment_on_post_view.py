@@ -117,6 +117,7 @@ class CommentOnPostTests(PositiveOnlySocialTestCase):
 
     # The reason this test isn't "negative" in title is because the classifier looks for "negative" in tests
     # in the username and will fail this test
+    @patch.dict(os.environ, {"TESTING": "True"}, clear=True)
     def test_not_positive_text_returns_bad_response(self):
         """
         Tests that text classified as negative by the (fake) classifier
@@ -0,0 +1,110 @@
+import os
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from ..constants import HIDDEN_REASON_NONE
+from ..counters import reconcile_counters
+from ..models import Comment, CommentLike, CommentThread, Post, PostLike
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+@patch.dict(os.environ, {"TESTING": "True"}, clear=True)
+class EngagementCounterTests(TestCase):
+    """Post.like_count / comment_count, Comment.like_count and
+    CommentThread.total_comment_likes follow the like and comment rows, and
+    reconcile_counters repairs them when something bypasses the hooks."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.author = User.objects.create_user(username='author', email='a@t.com')
+        self.fan = User.objects.create_user(username='fan', email='f@t.com')
+        self.other_fan = User.objects.create_user(username='otherfan', email='o@t.com')
+        self.post = Post.objects.create(author=self.author, caption="a post", hidden=False,
+                                        hidden_reason=HIDDEN_REASON_NONE)
+        self.thread = self.post.commentthread_set.create()
+        self.comment = self.thread.comment_set.create(author=self.fan, body="nice")
+
+    def _reload(self):
+        self.post.refresh_from_db()
+        self.thread.refresh_from_db()
+        self.comment.refresh_from_db()
+
+    def test_post_like_and_unlike_move_the_counter(self):
+        like = PostLike.objects.create(user=self.fan, post=self.post)
+        PostLike.objects.create(user=self.other_fan, post=self.post)
+        self._reload()
+        self.assertEqual(self.post.like_count, 2)
+        like.delete()
+        self._reload()
+        self.assertEqual(self.post.like_count, 1)
+
+    def test_repeated_unlike_decrements_once(self):
+        PostLike.objects.create(user=self.fan, post=self.post)
+        comment_like = CommentLike.objects.create(user=self.author, comment=self.comment)
+        # Two requests that each loaded the like before either deleted it.
+        for like in (PostLike.objects.get(), PostLike.objects.get(),
+                     CommentLike.objects.get(pk=comment_like.pk), CommentLike.objects.get(pk=comment_like.pk)):
+            like.delete()
+        stale_comment = Comment.objects.get(pk=self.comment.pk)
+        self.comment.delete()
+        stale_comment.delete()
+        self.post.refresh_from_db()
+        self.thread.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (0, 0))
+        self.assertEqual(self.thread.total_comment_likes, 0)
+
+    def test_comment_likes_count_on_comment_and_thread(self):
+        like = CommentLike.objects.create(user=self.author, comment=self.comment)
+        CommentLike.objects.create(user=self.other_fan, comment=self.comment)
+        self._reload()
+        self.assertEqual(self.comment.like_count, 2)
+        self.assertEqual(self.thread.total_comment_likes, 2)
+        like.delete()
+        self._reload()
+        self.assertEqual(self.comment.like_count, 1)
+        self.assertEqual(self.thread.total_comment_likes, 1)
+
+    def test_comment_create_and_delete_move_post_comment_count(self):
+        reply = self.thread.comment_set.create(author=self.other_fan, body="agreed")
+        CommentLike.objects.create(user=self.author, comment=reply)
+        self._reload()
+        self.assertEqual(self.post.comment_count, 2)
+        self.assertEqual(self.thread.total_comment_likes, 1)
+        reply.delete()
+        self._reload()
+        self.assertEqual(self.post.comment_count, 1)
+        # The reply's cascaded likes come off the thread total too.
+        self.assertEqual(self.thread.total_comment_likes, 0)
+
+    def test_reconcile_repairs_drift_from_bulk_deletes(self):
+        PostLike.objects.create(user=self.fan, post=self.post)
+        CommentLike.objects.create(user=self.author, comment=self.comment)
+        # Queryset deletes skip the per-instance hooks.
+        PostLike.objects.all().delete()
+        CommentLike.objects.all().delete()
+        Post.objects.filter(pk=self.post.pk).update(comment_count=7)
+
+        repaired = reconcile_counters()
+
+        self._reload()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (0, 1))
+        self.assertEqual(self.comment.like_count, 0)
+        self.assertEqual(self.thread.total_comment_likes, 0)
+        self.assertEqual(repaired, {'post_like_count': 1, 'post_comment_count': 1,
+                                    'comment_like_count': 1, 'thread_total_comment_likes': 1})
+
+    def test_reconcile_leaves_correct_counters_alone(self):
+        PostLike.objects.create(user=self.fan, post=self.post)
+        self.assertEqual(sum(reconcile_counters().values()), 0)
+
+    def test_management_command_reports_repairs(self):
+        Comment.objects.filter(pk=self.comment.pk).update(like_count=3)
+        out = StringIO()
+        call_command('reconcile_counters', stdout=out)
+        self.assertIn('repaired 1 counter(s)', out.getvalue())
+        self.assertEqual(CommentThread.objects.get(pk=self.thread.pk).total_comment_likes, 0)
+        self.assertEqual(Comment.objects.get(pk=self.comment.pk).like_count, 0)
@@ -0,0 +1,147 @@
+import os
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..constants import FRESH_POST_HOT_SCORE, HIDDEN_REASON_NONE, HIDDEN_REASON_REPORTS
+from ..feed_algorithm import feed_algorithm
+from ..models import Post, PostLike
+from .test_constants import UserFields
+from .test_parent_case import PositiveOnlySocialTestCase
+
+
+def _backdate(post, **delta):
+    """Move a post's creation_time into the past (it is auto_now_add, which
+    ignores direct assignment)."""
+    Post.objects.filter(pk=post.pk).update(creation_time=timezone.now() - timedelta(**delta))
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+@patch.dict(os.environ, {"TESTING": "True"}, clear=True)
+class PostHotScoreTests(TestCase):
+    """The materialized Post.hot_score the feed draws its candidates from:
+    rescored on demand, re-aged by the decay tick, and used to bound how many
+    posts get the full per-viewer ranking."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.viewer = User.objects.create_user(username='viewer', email='v@t.com')
+        self.author = User.objects.create_user(username='author', email='a@t.com')
+
+    def _post(self, caption="a post", hidden=False, hidden_reason=HIDDEN_REASON_NONE):
+        return Post.objects.create(author=self.author, caption=caption,
+                                   hidden=hidden, hidden_reason=hidden_reason)
+
+    def _score(self, post):
+        return Post.objects.values_list('hot_score', flat=True).get(pk=post.pk)
+
+    def _ranked(self):
+        candidates = feed_algorithm.get_feed_candidates(self.viewer, Post)
+        return [pk for pk, _ in feed_algorithm.score_candidates(candidates, self.viewer)]
+
+    def test_new_post_starts_at_fresh_score(self):
+        self.assertAlmostEqual(self._score(self._post()), FRESH_POST_HOT_SCORE)
+
+    def test_refresh_counts_likes(self):
+        post = self._post()
+        PostLike.objects.create(user=self.viewer, post=post)
+        feed_algorithm.refresh_post_hot_scores(Post.objects.filter(pk=post.pk))
+        # Two "likes" worth of numerator (likes + 1) on a post a moment old.
+        self.assertAlmostEqual(self._score(post), 2 * FRESH_POST_HOT_SCORE, places=3)
+
+    def test_refresh_does_not_touch_updated_time(self):
+        # sweep_classifications reads updated_time as classification activity.
+        post = self._post()
+        before = Post.objects.values_list('updated_time', flat=True).get(pk=post.pk)
+        feed_algorithm.refresh_post_hot_scores(Post.objects.filter(pk=post.pk))
+        after = Post.objects.values_list('updated_time', flat=True).get(pk=post.pk)
+        self.assertEqual(before, after)
+
+    def test_decay_tick_reages_old_posts(self):
+        old = self._post("old")
+        _backdate(old, days=2)
+        out = StringIO()
+        call_command('refresh_hot_scores', stdout=out)
+        self.assertIn("rescored", out.getvalue())
+        self.assertLess(self._score(old), FRESH_POST_HOT_SCORE / 10)
+
+    def test_decay_tick_skips_posts_below_floor(self):
+        post = self._post()
+        Post.objects.filter(pk=post.pk).update(hot_score=0.0)
+        call_command('refresh_hot_scores', '--floor', '0.5', stdout=StringIO())
+        self.assertEqual(self._score(post), 0.0)
+
+    def test_feed_only_scores_top_candidates(self):
+        top = self._post("top")
+        low = self._post("low")
+        Post.objects.filter(pk=low.pk).update(hot_score=0.0)
+        with patch.object(feed_algorithm, 'FEED_CANDIDATE_LIMIT', 1), \
+                patch.object(feed_algorithm, 'FEED_RECENT_CANDIDATE_LIMIT', 0):
+            ranked = self._ranked()
+        self.assertEqual(ranked, [top.pk])
+
+    def test_hidden_posts_do_not_take_candidate_slots(self):
+        self._post("hidden", hidden=True, hidden_reason=HIDDEN_REASON_REPORTS)
+        shown = self._post("shown")
+        Post.objects.filter(pk=shown.pk).update(hot_score=0.0)
+        with patch.object(feed_algorithm, 'FEED_CANDIDATE_LIMIT', 1), \
+                patch.object(feed_algorithm, 'FEED_RECENT_CANDIDATE_LIMIT', 0):
+            ranked = self._ranked()
+        self.assertEqual(ranked, [shown.pk])
+
+    def test_recent_window_admits_posts_not_yet_rescored(self):
+        top = self._post("top")
+        fresh = self._post("fresh")
+        Post.objects.filter(pk=fresh.pk).update(hot_score=0.0)
+        with patch.object(feed_algorithm, 'FEED_CANDIDATE_LIMIT', 1), \
+                patch.object(feed_algorithm, 'FEED_RECENT_CANDIDATE_LIMIT', 1):
+            ranked = self._ranked()
+        self.assertEqual(set(ranked), {top.pk, fresh.pk})
+
+    def test_posts_outside_the_recency_window_are_not_candidates(self):
+        old = self._post("old")
+        _backdate(old, days=30)
+        fresh = self._post("fresh")
+        with patch.object(feed_algorithm, 'FEED_RECENCY_WINDOW_HOURS', 24), \
+                patch.object(feed_algorithm, 'FEED_MIN_WINDOW_CANDIDATES', 1):
+            ranked = self._ranked()
+        self.assertEqual(ranked, [fresh.pk])
+
+    def test_sparse_window_widens_to_fill_the_feed(self):
+        old = self._post("old")
+        _backdate(old, days=30)
+        fresh = self._post("fresh")
+        with patch.object(feed_algorithm, 'FEED_RECENCY_WINDOW_HOURS', 24), \
+                patch.object(feed_algorithm, 'FEED_MIN_WINDOW_CANDIDATES', 2):
+            ranked = self._ranked()
+        self.assertEqual(ranked, [fresh.pk, old.pk])
+
+
+class LikeRescoresPostTests(PositiveOnlySocialTestCase):
+    """like_post / unlike_post rescore the post straight away instead of
+    waiting for the decay tick."""
+
+    def setUp(self):
+        super().setUp()
+        super().make_post_with_users(2)
+        self.liker_header = {'HTTP_AUTHORIZATION': f'Bearer {self.users[UserFields.TOKEN][1]}'}
+        kwargs = {'post_identifier': str(self.post_identifier)}
+        self.like_url = reverse('like_post', kwargs=kwargs)
+        self.unlike_url = reverse('unlike_post', kwargs=kwargs)
+
+    def _score(self):
+        return Post.objects.values_list('hot_score', flat=True).get(pk=self.post_identifier)
+
+    def test_like_and_unlike_rescore(self):
+        fresh = self._score()
+        self.assertEqual(self.client.post(self.like_url, **self.liker_header).status_code, 200)
+        liked = self._score()
+        self.assertGreater(liked, fresh)
+        self.assertEqual(self.client.post(self.unlike_url, **self.liker_header).status_code, 200)
+        self.assertLess(self._score(), liked)
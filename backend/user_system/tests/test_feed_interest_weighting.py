@@ -1,18 +1,20 @@
 import os
+from datetime import timedelta
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase, override_settings
+from django.utils import timezone
 
-from ..constants import HIDDEN_REASON_NONE
-from ..models import Post, InterestCategory
+from ..constants import FRESH_POST_HOT_SCORE, HIDDEN_REASON_NONE, INTEREST_BOOST
+from ..models import Post, InterestCategory, interest_mask
 from ..feed_algorithm import feed_algorithm
 
 
 @override_settings(RATELIMIT_ENABLE=False)
 @patch.dict(os.environ, {"TESTING": "True"}, clear=True)
 class FeedInterestWeightingTests(TestCase):
-    """calculate_weights boosts posts whose interest buckets overlap the
+    """score_candidates boosts posts whose interest buckets overlap the
     viewer's interests (issues #446/#35), and is a no-op when the viewer has
     none."""
 
@@ -25,45 +27,48 @@ class FeedInterestWeightingTests(TestCase):
     def _post(self, caption, categories=()):
         post = Post.objects.create(author=self.author, caption=caption,
                                    hidden=False, hidden_reason=HIDDEN_REASON_NONE)
-        for slug in categories:
-            post.interest_categories.add(InterestCategory.objects.get(slug=slug))
+        post.set_interest_categories(InterestCategory.objects.filter(slug__in=categories))
         return post
 
-    def _ordered(self):
-        return list(feed_algorithm.get_posts_weighted(self.viewer, Post))
+    def _ordered(self, candidates=None):
+        if candidates is None:
+            candidates = feed_algorithm.get_feed_candidates(self.viewer, Post)
+        return feed_algorithm.score_candidates(candidates, self.viewer)
 
     def test_matching_post_outranks_equivalent_nonmatching(self):
         # Two posts, same age and likes; only the matching one shares a bucket.
         plain = self._post("off topic")
         match = self._post("on topic", categories=['nature'])
-        self.viewer.interest_categories.add(self.nature)
+        self.viewer.set_interest_categories([self.nature])
 
         ordered = self._ordered()
-        self.assertEqual(ordered[0].pk, match.pk)
-        self.assertGreater(ordered[0].score, ordered[1].score)
-        self.assertEqual(ordered[1].pk, plain.pk)
+        self.assertEqual(ordered[0][0], match.pk)
+        self.assertGreater(ordered[0][1], ordered[1][1])
+        self.assertEqual(ordered[1][0], plain.pk)
 
     def test_no_interests_is_plain_hot_rank(self):
         # With no viewer interests no boost is applied, so an on-topic post and
         # an off-topic one of the same age and likes score identically.
         self._post("off topic")
         self._post("on topic", categories=['nature'])
-        scores = [round(p.score, 6) for p in self._ordered()]
+        Post.objects.update(creation_time=timezone.now() - timedelta(hours=1))
+        scores = [score for _, score in self._ordered()]
         self.assertEqual(scores[0], scores[1])
 
     def test_more_overlap_scores_higher(self):
         one = self._post("one", categories=['nature'])
         two = self._post("two", categories=['nature', 'music'])
-        self.viewer.interest_categories.add(
-            self.nature, InterestCategory.objects.get(slug='music'))
-        by_pk = {p.pk: p.score for p in self._ordered()}
+        self.viewer.set_interest_categories(
+            [self.nature, InterestCategory.objects.get(slug='music')])
+        by_pk = dict(self._ordered())
         self.assertGreater(by_pk[two.pk], by_pk[one.pk])
 
     def test_like_count_unaffected_by_audience_join_fanout(self):
-        # visible_posts' audience filter LEFT JOINs the author's following_set,
-        # which fans out (see visibility._audience_q). A non-distinct COUNT
-        # counted each like once per follow edge, so an author who follows many
-        # people had their posts scored as if they had many times the likes.
+        # visible_posts' audience filter once LEFT JOINed the author's
+        # following_set, which fanned out. A non-distinct COUNT counted each
+        # like once per follow edge, so an author who follows many people had
+        # their posts scored as if they had many times the likes; repeated rows
+        # must not repeat the post in the ranking either.
         from ..models import PostLike, UserFollow
         from ..visibility import visible_posts
         from ..constants import FOLLOW_CATEGORY_FRIEND, POST_AUDIENCE_PUBLIC
@@ -83,18 +88,44 @@ class FeedInterestWeightingTests(TestCase):
         liker = User.objects.create_user(username='onlyliker', email='ol@t.com')
         PostLike.objects.create(user=liker, post=post)
 
-        ranked = visible_posts(feed_algorithm.get_posts_weighted(self.viewer, Post), self.viewer)
-        by_pk = {p.pk: p for p in ranked}
-        self.assertEqual(by_pk[post.pk].like_count, 1)
+        ranked = self._ordered(visible_posts(feed_algorithm.get_feed_candidates(self.viewer, Post), self.viewer))
+        self.assertEqual([pk for pk, _ in ranked], [post.pk])
+        # (1 like + 1) on a post a moment old.
+        self.assertAlmostEqual(ranked[0][1], 2 * FRESH_POST_HOT_SCORE, places=3)
 
     def test_like_count_unaffected_by_interest_join(self):
-        # The interest subquery must not multiply the like_count aggregate.
+        # The interest overlap must not multiply the like count.
         from ..models import PostLike
         liker = get_user_model().objects.create_user(username='liker', email='l@t.com')
         liker2 = get_user_model().objects.create_user(username='liker2', email='l2@t.com')
         post = self._post("nature post", categories=['nature'])
         PostLike.objects.create(user=liker, post=post)
         PostLike.objects.create(user=liker2, post=post)
-        self.viewer.interest_categories.add(self.nature)
-        ranked = {p.pk: p for p in self._ordered()}
-        self.assertEqual(ranked[post.pk].like_count, 2)
+        self.viewer.set_interest_categories([self.nature])
+        ranked = dict(self._ordered())
+        self.assertAlmostEqual(ranked[post.pk], 3 * FRESH_POST_HOT_SCORE * (1 + INTEREST_BOOST), places=3)
+
+    def test_interest_mask_mirrors_categories(self):
+        post = self._post("two buckets", categories=['nature', 'music'])
+        post.refresh_from_db()
+        self.assertEqual(post.interest_mask, interest_mask(['nature', 'music']))
+        post.set_interest_categories([])
+        post.refresh_from_db()
+        self.assertEqual(post.interest_mask, 0)
+
+    def test_overlap_counts_only_shared_buckets(self):
+        self._post("three", categories=['nature', 'music', 'art'])
+        self.viewer.set_interest_categories(
+            InterestCategory.objects.filter(slug__in=['music', 'art', 'food']))
+        self.assertAlmostEqual(self._ordered()[0][1], FRESH_POST_HOT_SCORE * (1 + 2 * INTEREST_BOOST), places=3)
+
+    def test_experiment_parameters_override_the_defaults(self):
+        old = self._post("old", categories=['nature'])
+        new = self._post("new")
+        Post.objects.filter(pk=old.pk).update(creation_time=timezone.now() - timedelta(hours=3))
+        self.viewer.set_interest_categories([self.nature])
+        candidates = feed_algorithm.get_feed_candidates(self.viewer, Post)
+        self.assertEqual(feed_algorithm.score_candidates(candidates, self.viewer)[0][0], new.pk)
+        # A gentler gravity and a bigger boost let the older on-topic post win.
+        boosted = feed_algorithm.score_candidates(candidates, self.viewer, gravity=0.5, interest_boost=2.0)
+        self.assertEqual(boosted[0][0], old.pk)
@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from .. import feed_snapshot, views
+from ..constants import Fields, HIDDEN_REASON_NONE, HIDDEN_REASON_REPORTS, POST_BATCH_SIZE
+from ..feed_algorithm import feed_algorithm
+from ..models import Post, Session
+from .test_parent_case import PositiveOnlySocialTestCase
+
+
+class FeedSnapshotTests(PositiveOnlySocialTestCase):
+    """The first page of a feed scroll ranks once and caches the ordered ids;
+    later pages slice that snapshot instead of re-ranking."""
+
+    def setUp(self):
+        super().setUp()
+        self.register_user_and_setup_local_fields()
+        self.header = {'HTTP_AUTHORIZATION': f'Bearer {self.session_management_token}'}
+        author = get_user_model().objects.create_user(
+            username='snapshotauthor', email='sa@t.com', email_verified=True)
+        self.posts = [
+            Post.objects.create(author=author, caption=f"post {i}", hidden=False,
+                                hidden_reason=HIDDEN_REASON_NONE)
+            for i in range(POST_BATCH_SIZE + 5)
+        ]
+
+    def _feed(self, batch, **params):
+        return self.client.get(reverse('get_posts_in_feed', kwargs={'batch': batch}), params, **self.header)
+
+    def _ranking_spy(self):
+        return patch.object(views, 'feed_algorithm_class', wraps=feed_algorithm)
+
+    def test_later_batches_do_not_rerank(self):
+        with self._ranking_spy() as spy:
+            first = self._feed(0).json()
+            second = self._feed(1).json()
+        self.assertEqual(spy.score_candidates.call_count, 1)
+        self.assertEqual(len(first), POST_BATCH_SIZE)
+        self.assertEqual(len(second), 5)
+        served = [p[Fields.post_identifier] for p in first + second]
+        self.assertEqual(set(served), {str(p.pk) for p in self.posts})
+
+    def test_batch_zero_always_reranks(self):
+        with self._ranking_spy() as spy:
+            self._feed(0)
+            self._feed(0)
+        self.assertEqual(spy.score_candidates.call_count, 2)
+
+    def test_cursor_pages_are_served_from_snapshot(self):
+        with self._ranking_spy() as spy:
+            first = self._feed(0, **{Fields.cursor: ''}).json()
+            second = self._feed(0, **{Fields.cursor: first[Fields.next_cursor]}).json()
+        self.assertEqual(spy.score_candidates.call_count, 1)
+        self.assertEqual(len(second[Fields.posts]), 5)
+        self.assertIsNone(second[Fields.next_cursor])
+
+    def test_post_hidden_after_snapshot_is_dropped(self):
+        first = self._feed(0).json()
+        served = {p[Fields.post_identifier] for p in first}
+        later = next(p for p in self.posts if str(p.pk) not in served)
+        Post.objects.filter(pk=later.pk).update(hidden=True, hidden_reason=HIDDEN_REASON_REPORTS)
+        second = self._feed(1).json()
+        self.assertNotIn(str(later.pk), {p[Fields.post_identifier] for p in second})
+        self.assertEqual(len(second), 4)
+
+    def test_cache_failure_falls_back_to_live_ranking(self):
+        with patch.object(feed_snapshot.cache, 'get', side_effect=ConnectionError), \
+                patch.object(feed_snapshot.cache, 'set', side_effect=ConnectionError):
+            self.assertEqual(self._feed(0).status_code, 200)
+            response = self._feed(1)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 5)
+
+    def test_cursor_resumes_live_when_snapshot_expired(self):
+        first = self._feed(0, **{Fields.cursor: ''}).json()
+        feed_snapshot.cache.delete(feed_snapshot._snapshot_key(Session.objects.get(management_token=self.session_management_token).management_user))
+        with self._ranking_spy() as spy:
+            second = self._feed(0, **{Fields.cursor: first[Fields.next_cursor]}).json()
+        self.assertEqual(spy.score_candidates.call_count, 1)
+        served = [p[Fields.post_identifier] for p in first[Fields.posts] + second[Fields.posts]]
+        self.assertEqual(sorted(served), sorted(str(p.pk) for p in self.posts))
+        self.assertIsNone(second[Fields.next_cursor])
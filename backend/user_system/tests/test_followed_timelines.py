@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from .. import tasks, timeline
+from ..classifiers.classifier_utils import ClassificationResult
+from ..constants import (
+    FOLLOW_CATEGORY_FAMILY, FOLLOW_CATEGORY_FOLLOWING, HIDDEN_REASON_CLASSIFIER,
+    HIDDEN_REASON_NONE, HIDDEN_REASON_PENDING_CLASSIFICATION,
+)
+from ..models import Appeal, PositiveOnlySocialUser, Post, TimelineEntry, UserFollow
+
+ALLOWED = ClassificationResult(allowed=True)
+TEXT = 'user_system.tasks.text_classifier_class.is_text_positive'
+
+
+class FollowedTimelineTests(TestCase):
+    """The fan-out-on-write timelines behind the followed-users feed: filled
+    when a post is approved or an account is followed, pruned on unfollow and
+    block, relabeled with the follow category."""
+
+    def setUp(self):
+        super().setUp()
+        self.author = PositiveOnlySocialUser.objects.create_user(username='timelineauthor', email='a@t.com')
+        self.follower = PositiveOnlySocialUser.objects.create_user(username='timelinefollower', email='f@t.com')
+        self.follow = UserFollow.objects.create(user_from=self.follower, user_to=self.author,
+                                                category=FOLLOW_CATEGORY_FOLLOWING)
+
+    def _post(self, hidden_reason=HIDDEN_REASON_NONE):
+        return Post.objects.create(author=self.author, caption='a caption',
+                                   hidden=hidden_reason != HIDDEN_REASON_NONE, hidden_reason=hidden_reason)
+
+    def _timeline(self, user=None, category=None):
+        return list(timeline.timeline_entries(user or self.follower, category).values_list('post_id', flat=True))
+
+    @patch(TEXT, return_value=ALLOWED)
+    def test_approval_fans_out_to_followers(self, _text):
+        post = self._post(HIDDEN_REASON_PENDING_CLASSIFICATION)
+        self.assertEqual(self._timeline(), [])
+        tasks.classify_post(str(post.pk))
+        self.assertEqual(self._timeline(), [post.pk])
+
+    def test_fan_out_is_idempotent(self):
+        post = self._post()
+        timeline.fan_out_post(post)
+        timeline.fan_out_post(post)
+        self.assertEqual(self._timeline(), [post.pk])
+
+    def test_follow_backfills_recent_visible_posts_only(self):
+        visible = self._post()
+        self._post(HIDDEN_REASON_CLASSIFIER)
+        newcomer = PositiveOnlySocialUser.objects.create_user(username='newcomer', email='n@t.com')
+        follow = UserFollow.objects.create(user_from=newcomer, user_to=self.author)
+        self.assertEqual(timeline.backfill_follow(follow), 1)
+        self.assertEqual(self._timeline(newcomer), [visible.pk])
+
+    def test_backfill_is_capped(self):
+        with patch.object(timeline, 'TIMELINE_BACKFILL_LIMIT', 2):
+            for _ in range(3):
+                self._post()
+            self.assertEqual(timeline.backfill_follow(self.follow), 2)
+
+    def test_unfollow_and_block_prune(self):
+        timeline.fan_out_post(self._post())
+        timeline.prune_follow(self.follower, self.author)
+        self.assertEqual(self._timeline(), [])
+
+        timeline.fan_out_post(self._post())
+        # A block cuts both directions, whoever initiated it.
+        timeline.prune_block(self.author, self.follower)
+        self.assertEqual(self._timeline(), [])
+
+    def test_relabel_moves_entries_to_new_category(self):
+        post = self._post()
+        timeline.fan_out_post(post)
+        self.follow.category = FOLLOW_CATEGORY_FAMILY
+        self.follow.save(update_fields=['category'])
+        timeline.relabel_follow(self.follow)
+        self.assertEqual(self._timeline(category=FOLLOW_CATEGORY_FAMILY), [post.pk])
+        self.assertEqual(self._timeline(category=FOLLOW_CATEGORY_FOLLOWING), [])
+
+    def test_approved_appeal_delivers_the_post(self):
+        post = self._post(HIDDEN_REASON_CLASSIFIER)
+        appeal = Appeal.objects.create(appellant=self.author, post=post, reason='please')
+        appeal.approve()
+        self.assertEqual(self._timeline(), [post.pk])
+
+    def test_entries_follow_the_post_when_deleted(self):
+        post = self._post()
+        timeline.fan_out_post(post)
+        post.delete()
+        self.assertFalse(TimelineEntry.objects.exists())
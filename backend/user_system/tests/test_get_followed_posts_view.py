@@ -1,6 +1,10 @@
+from datetime import timedelta
+
 from django.urls import reverse
 from .test_parent_case import PositiveOnlySocialTestCase
-from ..constants import Fields
+from .. import timeline
+from ..constants import Fields, HIDDEN_REASON_REPORTS, POST_AUDIENCE_FRIENDS
+from ..models import Post
 from ..views import get_user_with_username  # Kept for assertion
 
 invalid_session_management_token = '?'
@@ -151,3 +155,34 @@ class GetFollowedPostsTests(PositiveOnlySocialTestCase):
         self.assertEqual(response.status_code, 200)
         responses = response.json()
         self.assertEqual(len(responses), 0)
+
+    def test_entries_the_viewer_cannot_see_do_not_shorten_pages(self):
+        """
+        Tests that timeline entries for posts the viewer may not see (hidden
+        by reports, or for an audience they are not in), interleaved with the
+        visible ones, leave every page full.
+        """
+        user_b = get_user_with_username(self.user_b_username)
+        for i, post in enumerate(Post.objects.filter(author=user_b)):
+            unseen = Post.objects.create(author=user_b, caption="not for you", hidden=i % 2 == 0,
+                                         hidden_reason=HIDDEN_REASON_REPORTS if i % 2 == 0 else '',
+                                         audience=POST_AUDIENCE_FRIENDS)
+            Post.objects.filter(pk=unseen.pk).update(creation_time=post.creation_time + timedelta(microseconds=1))
+            unseen.refresh_from_db()
+            timeline.fan_out_post(unseen)
+
+        counts = []
+        for batch in range(3):
+            url = reverse('get_posts_for_followed_users', kwargs={'batch': batch})
+            response = self.client.get(url, **self.user_a_header)
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(response.json()))
+        self.assertEqual(counts, [10, 5, 0])
+
+        url = reverse('get_posts_for_followed_users', kwargs={'batch': 0})
+        cursor, counts = '', []
+        while cursor is not None:
+            body = self.client.get(url, {Fields.cursor: cursor}, **self.user_a_header).json()
+            counts.append(len(body[Fields.posts]))
+            cursor = body[Fields.next_cursor]
+        self.assertEqual(counts[:2], [10, 5])
@@ -1,8 +1,10 @@
 from django.urls import reverse
 
 from ..constants import Fields
+from ..models import Comment, Post
 from .test_parent_case import PositiveOnlySocialTestCase
 from ..views import get_user_with_username
+from ..visibility import visible_comments, visible_posts
 
 invalid_session_management_token = '?'
 invalid_batch = -1
@@ -150,11 +152,11 @@ class GetPostsForUserTests(PositiveOnlySocialTestCase):
         """Regression for #397: a viewer's own posts must not fan out by the
         number of accounts they follow.
 
-        The per-post audience filter joins the author's outgoing follow edges;
-        on your own profile (viewer == author) that join was unrestricted, so
-        each post was returned once per account you follow. Following two
-        accounts reproduced the reported 2x duplication. .distinct() collapses
-        it.
+        The per-post audience filter used to join the author's outgoing follow
+        edges; on your own profile (viewer == author) that join was
+        unrestricted, so each post was returned once per account you follow.
+        Following two accounts reproduced the reported 2x duplication. The
+        audience rule is now an EXISTS probe, which cannot repeat a row.
         """
         me = get_user_with_username(self.username)
         for prefix in ('followed_one', 'followed_two'):
@@ -177,6 +179,20 @@ class GetPostsForUserTests(PositiveOnlySocialTestCase):
         self.assertEqual(len(ids), len(set(ids)), "own posts were duplicated")
         self.assertEqual(len(set(ids)), 10)
 
+    def test_visibility_filters_need_no_distinct(self):
+        """The audience rule adds no rows, so neither visibility filter has to
+        pay for a DISTINCT over the wide post and comment rows."""
+        me = get_user_with_username(self.username)
+        for prefix in ('followed_one', 'followed_two'):
+            me.following.add(get_user_with_username(
+                self.make_user_with_prefix(prefix)[Fields.username]))
+
+        posts = visible_posts(Post.objects.filter(author=me), me)
+        comments = visible_comments(Comment.objects.all(), me)
+        for queryset in (posts, comments):
+            self.assertNotIn('DISTINCT', str(queryset.query))
+        self.assertEqual(posts.count(), 10)
+
     def test_posts_include_original_image_url_fallback(self):
         """
         Each post carries an `original_image_url` (the full-resolution original)
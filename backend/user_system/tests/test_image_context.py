@@ -0,0 +1,173 @@
+import asyncio
+import base64
+import os
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import httpx
+from django.test import TestCase, override_settings
+from PIL import Image, ImageDraw
+
+from .. import tasks
+from ..classifiers import classifier_utils
+from ..classifiers.classifier_utils import API_GEMINI, API_GEMMA, ClassificationResult, encode_vision_image
+from ..classifiers.image_classifier import is_image_positive
+from ..classifiers.image_context import ImageContext
+from ..constants import HIDDEN_REASON_NONE, HIDDEN_REASON_PENDING_CLASSIFICATION
+from ..models import PositiveOnlySocialUser
+
+IMAGE_URL = 'https://test-bucket.s3.amazonaws.com/user/img.png'
+_ENV = {
+    "AWS_ACCESS_KEY_ID": "fake_aws_key",
+    "AWS_SECRET_ACCESS_KEY": "fake_aws_secret",
+    "AWS_STORAGE_BUCKET_NAME": "test-bucket",
+    "OPENROUTER_API_KEY": "fake_openrouter",
+}
+
+
+def _image_bytes():
+    image = Image.new('RGB', (64, 48), 'white')
+    ImageDraw.Draw(image).rectangle([10, 5, 40, 30], fill=(200, 40, 90))
+    buf = BytesIO()
+    image.save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def _decode(data_url):
+    header, encoded = data_url.split(',', 1)
+    return header, Image.open(BytesIO(base64.standard_b64decode(encoded)))
+
+
+class ImageContextTests(TestCase):
+
+    def test_fetches_and_decodes_once(self):
+        fetch = MagicMock(return_value=_image_bytes())
+        context = ImageContext(IMAGE_URL, fetch=fetch)
+        self.assertEqual(context.image.size, (64, 48))
+        self.assertEqual(len(context.digest), 64)
+        thumbnail = context.thumbnail(16)
+        self.assertLessEqual(max(thumbnail.size), 16)
+        self.assertIs(context.thumbnail(16), thumbnail)
+        fetch.assert_called_once_with(IMAGE_URL)
+
+    def test_failed_fetch_is_not_retried(self):
+        fetch = MagicMock(side_effect=RuntimeError("S3 down"))
+        context = ImageContext(IMAGE_URL, fetch=fetch)
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                context.data
+        fetch.assert_called_once()
+
+    def test_of_passes_a_context_through(self):
+        context = ImageContext(IMAGE_URL)
+        self.assertIs(ImageContext.of(context), context)
+        self.assertEqual(ImageContext.of(IMAGE_URL).image_url, IMAGE_URL)
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME='test-bucket')
+@patch.dict(os.environ, _ENV, clear=True)
+class AsyncImageContextTests(TestCase):
+    """aload fetches the object with a presigned GET on the event loop."""
+
+    def _load(self, handler):
+        requests = []
+
+        def record(request):
+            requests.append(request)
+            return handler(request)
+
+        async def load():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+            with patch('user_system.classifiers.image_classifier.pooled_async_http_client', return_value=client):
+                context = ImageContext(IMAGE_URL)
+                await context.aload()
+            await client.aclose()
+            return context
+
+        return asyncio.run(load()), requests
+
+    def test_presigned_fetch_fills_the_context(self):
+        data = _image_bytes()
+        context, requests = self._load(lambda request: httpx.Response(200, content=data))
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0].url.path, '/user/img.png')
+        self.assertIn('Signature', str(requests[0].url.query))
+        self.assertEqual(context.data, data)
+        self.assertEqual(context.image.size, (64, 48))
+
+    def test_error_status_is_remembered(self):
+        context, _ = self._load(lambda request: httpx.Response(403))
+        with self.assertRaises(httpx.HTTPStatusError):
+            context.data
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME='test-bucket')
+@patch.dict(os.environ, _ENV, clear=True)
+class ClassifyPostSingleFetchTests(TestCase):
+    """Approving an image post fetches the image from S3 once, for the
+    moderation cascade, the BlurHash and the categorizer together."""
+
+    @patch('user_system.classifiers.interest_classifier.call_text_openrouter_raw', return_value='')
+    @patch('user_system.classifiers.interest_classifier.call_image_openrouter_raw', return_value='nature')
+    @patch('user_system.classifiers.interest_classifier.get_available_apis', return_value=[API_GEMMA])
+    @patch('user_system.classifiers.image_classifier.get_available_apis', return_value=[API_GEMMA])
+    @patch('user_system.tasks.text_classifier_class.is_text_positive', return_value=ClassificationResult(allowed=True))
+    @patch('user_system.classifiers.image_classifier.load_image_bytes_from_url')
+    def test_approval_fetches_the_image_once(self, mock_fetch, *_mocks):
+        mock_fetch.return_value = _image_bytes()
+        user = PositiveOnlySocialUser.objects.create_user(
+            username='single_fetch_user', email='single_fetch@test.com', password='x')
+        post = user.post_set.create(image_url=IMAGE_URL, caption='a caption', hidden=True,
+                                    hidden_reason=HIDDEN_REASON_PENDING_CLASSIFICATION)
+        with patch.dict('user_system.classifiers.classifier_utils.IMAGE_API_DISPATCH',
+                        {API_GEMMA: MagicMock(return_value=0.9)}):
+            tasks.classify_post(str(post.post_identifier))
+
+        post.refresh_from_db()
+        self.assertEqual(post.hidden_reason, HIDDEN_REASON_NONE)
+        self.assertIsNotNone(post.image_blurhash)
+        self.assertIsNotNone(post.image_dhash)
+        self.assertEqual([c.slug for c in post.interest_categories.all()], ['nature'])
+        mock_fetch.assert_called_once_with(IMAGE_URL)
+
+
+class VisionPayloadTests(TestCase):
+    """Images go to the vision models downscaled and lossy-encoded, once."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_large_upload_is_downscaled_to_jpeg(self):
+        header, sent = _decode(encode_vision_image(Image.new('RGB', (3000, 2000), 'blue')))
+        self.assertEqual(header, 'data:image/jpeg;base64')
+        self.assertEqual(sent.format, 'JPEG')
+        self.assertEqual(sent.size, (1024, 683))
+
+    @patch.dict(os.environ, {"VISION_IMAGE_FORMAT": "webp", "VISION_IMAGE_MAX_DIMENSION": "256"}, clear=True)
+    def test_env_overrides_format_and_size(self):
+        header, sent = _decode(encode_vision_image(Image.new('RGBA', (512, 512), (0, 0, 0, 0))))
+        self.assertEqual(header, 'data:image/webp;base64')
+        self.assertEqual(sent.size, (256, 256))
+        # Transparency is flattened onto white, not black.
+        self.assertEqual(sent.convert('RGB').getpixel((128, 128)), (255, 255, 255))
+
+    @patch.dict(os.environ, _ENV, clear=True)
+    @patch('user_system.classifiers.image_classifier.get_available_apis', return_value=[API_GEMMA, API_GEMINI])
+    def test_every_tier_gets_the_same_encoding(self, _avail):
+        context = ImageContext(IMAGE_URL, fetch=lambda url: _image_bytes())
+        gemma, gemini = MagicMock(return_value=0.5), MagicMock(return_value=0.9)
+        with patch.dict('user_system.classifiers.classifier_utils.IMAGE_API_DISPATCH',
+                        {API_GEMMA: gemma, API_GEMINI: gemini}), \
+                patch('user_system.classifiers.image_context.encode_vision_image',
+                      wraps=encode_vision_image) as encode:
+            self.assertTrue(is_image_positive(context))
+        encode.assert_called_once()
+        self.assertIs(gemma.call_args.args[0], gemini.call_args.args[0])
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch('user_system.classifiers.classifier_utils._openrouter_client')
+    def test_provider_call_sends_the_data_url(self, mock_client):
+        create = mock_client.return_value.chat.completions.create
+        create.return_value.choices = [MagicMock(message=MagicMock(content='0.9'))]
+        payload = encode_vision_image(Image.new('RGB', (20, 20), 'red'))
+        classifier_utils.call_image_openrouter(payload, 'prompt', 'a/model')
+        content = create.call_args.kwargs['messages'][0]['content']
+        self.assertEqual(content[0]['image_url']['url'], payload)
@@ -0,0 +1,142 @@
+from io import BytesIO
+from unittest.mock import patch
+
+from django.test import TestCase
+from PIL import Image, ImageDraw
+
+from .. import image_index, tasks
+from ..classifiers.classifier_utils import ClassificationResult
+from ..constants import (
+    HIDDEN_REASON_CLASSIFIER_FINAL, HIDDEN_REASON_NONE,
+    HIDDEN_REASON_PENDING_CLASSIFICATION,
+    PROFILE_IMAGE_STATUS_PENDING, PROFILE_IMAGE_STATUS_REJECTED,
+)
+from ..models import ImageVerdict, PositiveOnlySocialUser
+
+ALLOWED = ClassificationResult(allowed=True)
+APPEALABLE = ClassificationResult(allowed=False, appealable=True, reason_code='hate_speech')
+FINAL_REJECT_GORE = ClassificationResult(allowed=False, appealable=False, reason_code='gore')
+
+TEXT = 'user_system.tasks.text_classifier_class.is_text_positive'
+IMAGE = 'user_system.tasks.image_classifier_class.is_image_positive'
+FINGERPRINT = 'user_system.tasks.fingerprint_image'
+
+IMAGE_URL = 'https://test-bucket.s3.amazonaws.com/user/img.jpeg'
+DHASH = '0f0f33335555ff00'
+# Two bits away from DHASH.
+NEAR_DHASH = '0f0f33335555ff03'
+
+
+def _pattern(shift=0):
+    image = Image.new('RGB', (120, 90), 'white')
+    draw = ImageDraw.Draw(image)
+    for i in range(6):
+        draw.rectangle([i * 20 + shift, (i * 13) % 60, i * 20 + 12 + shift, (i * 13) % 60 + 30],
+                       fill=(40 * i, 200 - 30 * i, 90))
+    return image
+
+
+class DhashTests(TestCase):
+
+    def test_reencoded_and_resized_copy_is_near(self):
+        original = _pattern()
+        buf = BytesIO()
+        original.resize((60, 45)).save(buf, format='JPEG', quality=60)
+        copy = Image.open(BytesIO(buf.getvalue()))
+        distance = image_index.hamming_distance(
+            image_index.compute_dhash(original), image_index.compute_dhash(copy))
+        self.assertLessEqual(distance, image_index.IMAGE_HASH_MAX_DISTANCE)
+
+    def test_different_image_is_far(self):
+        distance = image_index.hamming_distance(
+            image_index.compute_dhash(_pattern()), image_index.compute_dhash(_pattern(shift=7)))
+        self.assertGreater(distance, image_index.IMAGE_HASH_MAX_DISTANCE)
+
+    def test_flat_image_has_no_fingerprint(self):
+        self.assertIsNone(image_index.compute_dhash(Image.new('RGB', (20, 20), 'red')))
+
+
+class ImageIndexLookupTests(TestCase):
+
+    def test_near_match_reuses_the_verdict(self):
+        image_index.remember_verdict(DHASH, APPEALABLE)
+        known = image_index.find_known_verdict(NEAR_DHASH)
+        self.assertFalse(known)
+        self.assertTrue(known.appealable)
+        self.assertEqual(known.reason_code, 'hate_speech')
+
+    def test_far_hash_misses(self):
+        image_index.remember_verdict(DHASH, ALLOWED)
+        self.assertIsNone(image_index.find_known_verdict('f0f0cccc5555ff00'))
+
+    def test_blocklisted_match_wins_over_a_closer_approval(self):
+        image_index.remember_verdict(DHASH, ALLOWED)
+        image_index.remember_verdict('0f0f33335555f803', FINAL_REJECT_GORE)
+        known = image_index.find_known_verdict(NEAR_DHASH)
+        self.assertFalse(known)
+        self.assertFalse(known.appealable)
+
+    def test_provider_failure_is_not_indexed(self):
+        image_index.remember_verdict(DHASH, ClassificationResult(allowed=False, provider_failure=True))
+        self.assertFalse(ImageVerdict.objects.exists())
+
+
+@patch(FINGERPRINT, return_value=NEAR_DHASH)
+class ClassifyWithImageIndexTests(TestCase):
+    """classify_post and classify_profile_photo consult the index before the
+    image cascade."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = PositiveOnlySocialUser.objects.create_user(
+            username='index_worker_user', email='index@test.com', password='x')
+        self.post = self.user.post_set.create(
+            image_url=IMAGE_URL, caption='a caption', hidden=True,
+            hidden_reason=HIDDEN_REASON_PENDING_CLASSIFICATION)
+
+    def _run(self):
+        tasks.classify_post(str(self.post.post_identifier))
+        self.post.refresh_from_db()
+
+    @patch(IMAGE, return_value=ALLOWED)
+    @patch(TEXT, return_value=ALLOWED)
+    def test_unknown_image_is_classified_and_indexed(self, _text, mock_image, _fingerprint):
+        self._run()
+        mock_image.assert_called_once()
+        self.assertEqual(mock_image.call_args.args[0].image_url, IMAGE_URL)
+        self.assertEqual(self.post.image_dhash, NEAR_DHASH)
+        self.assertTrue(ImageVerdict.objects.get(dhash=NEAR_DHASH).allowed)
+
+    @patch(IMAGE, return_value=ALLOWED)
+    @patch(TEXT, return_value=ALLOWED)
+    def test_known_image_skips_the_image_cascade(self, mock_text, mock_image, _fingerprint):
+        image_index.remember_verdict(DHASH, ALLOWED)
+        self._run()
+        mock_image.assert_not_called()
+        mock_text.assert_called_once()
+        self.assertEqual(self.post.hidden_reason, HIDDEN_REASON_NONE)
+
+    @patch('user_system.tasks.delete_image')
+    @patch(IMAGE, return_value=ALLOWED)
+    @patch(TEXT, return_value=ALLOWED)
+    def test_blocklisted_image_is_final_rejected_without_providers(
+            self, mock_text, mock_image, mock_delete, _fingerprint):
+        image_index.remember_verdict(DHASH, FINAL_REJECT_GORE)
+        self._run()
+        mock_text.assert_not_called()
+        mock_image.assert_not_called()
+        self.assertEqual(self.post.hidden_reason, HIDDEN_REASON_CLASSIFIER_FINAL)
+        self.assertEqual(self.post.classification_reason_code, 'gore')
+        mock_delete.assert_called_once_with(IMAGE_URL)
+
+    @patch('user_system.tasks.delete_image')
+    @patch(IMAGE, return_value=ALLOWED)
+    def test_profile_photo_reuses_a_known_verdict(self, mock_image, _delete, _fingerprint):
+        image_index.remember_verdict(DHASH, FINAL_REJECT_GORE)
+        PositiveOnlySocialUser.objects.filter(pk=self.user.pk).update(
+            pending_profile_image_url=IMAGE_URL, profile_image_status=PROFILE_IMAGE_STATUS_PENDING)
+        tasks.classify_profile_photo(str(self.user.id))
+        self.user.refresh_from_db()
+        mock_image.assert_not_called()
+        self.assertEqual(self.user.profile_image_status, PROFILE_IMAGE_STATUS_REJECTED)
+        self.assertEqual(self.user.profile_image_reason_code, 'gore')
@@ -94,6 +94,12 @@ class ImagePrefilterTests(SimpleTestCase):
              patch.object(image_prefilter, '_gore_unavailable', True):
             self.assertTrue(image_prefilter.prefilter_image(_image()))
 
+    def test_warm_models_loads_both_detectors(self):
+        with patch.object(image_prefilter, '_get_nudenet', return_value=MagicMock()) as nudenet, \
+             patch.object(image_prefilter, '_get_gore_session', return_value=None) as gore:
+            self.assertEqual(image_prefilter.warm_models(), {'nudity': True, 'gore': False})
+        nudenet.assert_called_once_with()
+        gore.assert_called_once_with()
 
     def test_pil_to_temp_file_cleans_up_on_save_error(self):
         # If save() fails the caller never receives the path, so the helper
@@ -4,7 +4,8 @@ from django.urls import reverse
 
 from .test_parent_case import PositiveOnlySocialTestCase
 from ..constants import Fields
-from ..models import Comment, Post, PostLike, PostReport
+from ..models import Comment, Post, PostLike, PostReport, UserFollow
+from ..timeline import backfill_follow
 from ..views import get_user_with_username
 
 report_reason = 'This is a negative post'
@@ -153,7 +154,7 @@ class PostListingInteractionStateTests(PositiveOnlySocialTestCase):
 
     def test_followed_posts_include_interaction_fields(self):
         """The Following feed carries the same state as the profile grid."""
-        self.viewer_user.following.add(self.poster_user)
+        backfill_follow(UserFollow.objects.create(user_from=self.viewer_user, user_to=self.poster_user))
         liked = self.posts[0]
         PostLike.objects.create(user=self.viewer_user, post=liked)
 
@@ -271,6 +272,7 @@ class PostListingInteractionStateTests(PositiveOnlySocialTestCase):
             'batch': 0
         })
 
+        self._warm_auth_caches()
         with CaptureQueriesContext(connection) as context:
             response = self.client.get(empty_batch_url, **self.viewer_header)
             self.assertEqual(response.status_code, 200)
@@ -281,7 +283,16 @@ class PostListingInteractionStateTests(PositiveOnlySocialTestCase):
         # must not.
         self.assertLess(empty_queries, self._count_queries(first_batch_url))
 
+    def _warm_auth_caches(self):
+        # The first authenticated request also fills the session-principal and
+        # ban-set caches; count steady-state requests only.
+        self.client.get(reverse('get_posts_for_user', kwargs={
+            'username': self.poster_username,
+            'batch': 0
+        }), **self.viewer_header)
+
     def _count_queries(self, url):
+        self._warm_auth_caches()
         with CaptureQueriesContext(connection) as context:
             response = self.client.get(url, **self.viewer_header)
             self.assertEqual(response.status_code, 200)
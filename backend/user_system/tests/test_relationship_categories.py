@@ -15,6 +15,7 @@ from ..constants import (
     POST_AUDIENCE_FAMILY,
 )
 from ..models import Post, PositiveOnlySocialUser, UserFollow
+from ..timeline import fan_out_post
 
 POSITIVE_CAPTION = "what a lovely and positive day this is"
 
@@ -38,10 +39,13 @@ class RelationshipCategoryTestBase(PositiveOnlySocialTestCase):
 
     def _make_visible_post(self, author, audience=POST_AUDIENCE_PUBLIC):
         """A live (already-classified, visible) post, created directly so the
-        async classifier is not involved."""
-        return Post.objects.create(
+        async classifier is not involved — and delivered to the author's
+        followers' timelines, as the classifier's approval would."""
+        post = Post.objects.create(
             author=author, caption=POSITIVE_CAPTION, image_url=None,
             hidden=False, audience=audience)
+        fan_out_post(post)
+        return post
 
     def _label(self, follower, followee, category):
         return UserFollow.objects.create(
@@ -7,12 +7,13 @@ from django.test import TestCase
 from django.utils import timezone
 
 from ..constants import (
+    BIO_STATUS_PENDING,
     CLASSIFICATION_MAX_ATTEMPTS,
     HIDDEN_REASON_CLASSIFIER, HIDDEN_REASON_CLASSIFIER_FINAL,
     HIDDEN_REASON_PENDING_CLASSIFICATION,
     PROFILE_IMAGE_STATUS_PENDING,
 )
-from ..models import PositiveOnlySocialUser, Post
+from ..models import Comment, PositiveOnlySocialUser, Post
 
 
 def _backdate(post, **delta):
@@ -177,3 +178,51 @@ class SweepClassificationsTests(TestCase):
         # Fail closed: the photo stays pending, never shown, alert recorded.
         self.assertEqual(self.user.profile_image_status, PROFILE_IMAGE_STATUS_PENDING)
         self.assertTrue(self.user.profile_image_classification_alerted)
+
+    # --- Comments and bios ---
+
+    def _comment(self, hidden_reason, attempts=0, minutes_ago=30):
+        post = self.user.post_set.create(caption='a caption')
+        comment = post.commentthread_set.create().comment_set.create(
+            author=self.user, body='a comment', hidden=True, hidden_reason=hidden_reason,
+            classification_attempts=attempts)
+        then = timezone.now() - timedelta(minutes=minutes_ago)
+        Comment.objects.filter(pk=comment.pk).update(creation_time=then, updated_time=then)
+        return comment
+
+    @patch('user_system.tasks.enqueue_comment_classification')
+    def test_stuck_pending_comment_is_reenqueued(self, mock_enqueue):
+        comment = self._comment(HIDDEN_REASON_PENDING_CLASSIFICATION)
+        out = self._run()
+        mock_enqueue.assert_called_once_with(comment.comment_identifier)
+        self.assertIn('1 stuck pending comment', out)
+
+    @patch('user_system.tasks.enqueue_comment_classification')
+    def test_exhausted_pending_comment_alerts_once(self, mock_enqueue):
+        comment = self._comment(HIDDEN_REASON_PENDING_CLASSIFICATION, attempts=CLASSIFICATION_MAX_ATTEMPTS)
+        with self.assertLogs('user_system.management.commands.sweep_classifications', level='ERROR'):
+            out = self._run()
+        mock_enqueue.assert_not_called()
+        self.assertIn('1 comment(s) exhausted (fail-closed, 1 newly alerted)', out)
+        comment.refresh_from_db()
+        self.assertTrue(comment.classification_alerted)
+        self.assertIn('1 comment(s) exhausted (fail-closed, 0 newly alerted)', self._run())
+
+    def test_old_comment_tombstone_is_purged_with_its_empty_thread(self):
+        comment = self._comment(HIDDEN_REASON_CLASSIFIER_FINAL, minutes_ago=8 * 24 * 60)
+        post = comment.comment_thread.post
+        out = self._run()
+        self.assertIn('1 comment tombstone', out)
+        self.assertFalse(Comment.objects.filter(pk=comment.pk).exists())
+        self.assertFalse(post.commentthread_set.exists())
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 0)
+
+    @patch('user_system.tasks.enqueue_bio_classification')
+    def test_stuck_pending_bio_is_reenqueued(self, mock_enqueue):
+        PositiveOnlySocialUser.objects.filter(pk=self.user.pk).update(
+            bio_status=BIO_STATUS_PENDING, pending_bio='a bio',
+            bio_classification_time=timezone.now() - timedelta(minutes=30))
+        out = self._run()
+        mock_enqueue.assert_called_once_with(self.user.id)
+        self.assertIn('1 stuck pending bio', out)
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from ..counters import reconcile_counters
+from ..models import Comment, PositiveOnlySocialUser, Post, PostLike, TimelineEntry, UserFollow
+
+
+class SyntheticBenchmarkTests(TestCase):
+    """seed_synthetic_data builds a consistent population and
+    benchmark_listings times the listing endpoints against it."""
+
+    def _seed(self, **options):
+        defaults = dict(users=12, posts=30, follows_per_user=3, likes_per_post=2, comments_per_post=1,
+                        likes_per_comment=1, tags=5, batch_size=7, seed=3, stdout=StringIO())
+        defaults.update(options)
+        call_command('seed_synthetic_data', **defaults)
+
+    def test_seed_creates_a_consistent_population(self):
+        self._seed()
+        self.assertEqual(PositiveOnlySocialUser.objects.filter(username__startswith='synth').count(), 12)
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(UserFollow.objects.count(), 36)
+        # The counters the save() hooks would have kept are rebuilt at the end.
+        self.assertEqual(sum(reconcile_counters().values()), 0)
+        self.assertEqual(sum(Post.objects.values_list('like_count', flat=True)), PostLike.objects.count())
+        self.assertEqual(sum(Post.objects.values_list('comment_count', flat=True)), Comment.objects.count())
+        self.assertTrue(TimelineEntry.objects.exists())
+
+    def test_seed_is_deterministic_and_rejects_a_reused_prefix(self):
+        self._seed()
+        first = sorted(Post.objects.values_list('author__username', 'caption'))
+        Post.objects.all().delete()
+        PositiveOnlySocialUser.objects.all().delete()
+        self._seed()
+        self.assertEqual(sorted(Post.objects.values_list('author__username', 'caption')), first)
+        with self.assertRaises(CommandError):
+            self._seed()
+
+    def test_benchmark_writes_a_json_report(self):
+        self._seed()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'report.json')
+            out = StringIO()
+            call_command('benchmark_listings', iterations=2, warmup=0, output=path, stdout=out)
+            with open(path) as f:
+                report = json.load(f)
+            call_command('benchmark_listings', iterations=2, warmup=0, compare=path, stdout=out)
+
+        self.assertEqual(report['metadata']['posts'], 30)
+        self.assertEqual(set(report['endpoints']), {'feed', 'followed_feed', 'comment_thread', 'profile'})
+        for result in report['endpoints'].values():
+            self.assertEqual(result['status'], 200)
+            self.assertGreater(result['queries'], 0)
+        self.assertIn('vs baseline', out.getvalue())
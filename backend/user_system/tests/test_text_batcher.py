@@ -0,0 +1,103 @@
+import asyncio
+import os
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, TestCase
+
+from ..classifiers.classifier_utils import API_GEMINI, API_GEMMA, parse_probability_and_rule_batch
+from ..classifiers.text_batcher import AsyncTextBatcher, TextBatcher
+from ..classifiers.text_classifier import is_text_positive
+
+
+def _in_threads(fn, *args_list):
+    results = [None] * len(args_list)
+
+    def run(i, args):
+        results[i] = fn(*args)
+
+    threads = [threading.Thread(target=run, args=(i, args)) for i, args in enumerate(args_list)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+class ParseBatchTests(SimpleTestCase):
+
+    def test_one_answer_per_line(self):
+        self.assertEqual(parse_probability_and_rule_batch("1: 0.95,0\n2: 0.10,5\n3) .5, 7", 3),
+                         [(0.95, None), (0.1, 5), (0.5, 7)])
+
+    def test_missing_and_out_of_range_items_are_none(self):
+        self.assertEqual(parse_probability_and_rule_batch("1: 0.9,0\n3: 7,0\n4: 0.2,1", 3),
+                         [(0.9, None), None, None])
+
+    def test_last_answer_per_item_wins(self):
+        reply = "For example: 1: 0.95,0\n1: 0.20,6\n2: 0.80,0"
+        self.assertEqual(parse_probability_and_rule_batch(reply, 2), [(0.2, 6), (0.8, None)])
+
+
+class TextBatcherTests(SimpleTestCase):
+
+    def test_full_batch_is_sent_with_one_call(self):
+        call_batch = MagicMock(side_effect=lambda texts, api: [(0.9, None) if t == 'a' else (0.1, 5) for t in texts])
+        batcher = TextBatcher(call_batch)
+        results = _in_threads(batcher.score, ('a', API_GEMMA, 2, 5), ('b', API_GEMMA, 2, 5))
+        call_batch.assert_called_once()
+        self.assertCountEqual(call_batch.call_args.args[0], ['a', 'b'])
+        self.assertEqual(results, [(0.9, None), (0.1, 5)])
+
+    def test_lone_text_gets_its_own_call(self):
+        call_batch = MagicMock()
+        self.assertIsNone(TextBatcher(call_batch).score('a', API_GEMMA, 5, 0.01))
+        call_batch.assert_not_called()
+
+    def test_failed_batch_falls_back_to_single_calls(self):
+        batcher = TextBatcher(MagicMock(side_effect=RuntimeError("provider down")))
+        results = _in_threads(batcher.score, ('a', API_GEMMA, 2, 5), ('b', API_GEMMA, 2, 5))
+        self.assertEqual(results, [None, None])
+
+
+class AsyncTextBatcherTests(SimpleTestCase):
+
+    def test_concurrent_texts_share_one_call(self):
+        acall_batch = AsyncMock(side_effect=lambda texts, api: [(0.9, None) if t == 'a' else (0.1, 5) for t in texts])
+        batcher = AsyncTextBatcher(acall_batch)
+
+        async def score_both():
+            return await asyncio.gather(batcher.score('a', API_GEMMA, 2, 5), batcher.score('b', API_GEMMA, 2, 5))
+
+        self.assertEqual(asyncio.run(score_both()), [(0.9, None), (0.1, 5)])
+        acall_batch.assert_awaited_once()
+        self.assertEqual(acall_batch.call_args.args[0], ['a', 'b'])
+
+    def test_lone_text_gets_its_own_call(self):
+        acall_batch = AsyncMock()
+        self.assertIsNone(asyncio.run(AsyncTextBatcher(acall_batch).score('a', API_GEMMA, 5, 0.01)))
+        acall_batch.assert_not_awaited()
+
+
+@patch.dict(os.environ, {"OPENROUTER_API_KEY": "fake_openrouter", "CLASSIFICATION_TEXT_BATCH_SIZE": "2",
+                         "CLASSIFICATION_TEXT_BATCH_WAIT_MS": "5000"}, clear=True)
+@patch('user_system.classifiers.text_classifier.get_available_apis', return_value=[API_GEMMA, API_GEMINI])
+@patch('user_system.classifiers.verdict_cache.lookup_result', return_value=None)
+@patch('user_system.classifiers.verdict_cache.store_result')
+class BatchedTextCascadeTests(TestCase):
+    """Texts classified together share one first-tier call; only ambiguous
+    ones escalate."""
+
+    def test_only_the_ambiguous_text_escalates(self, *_mocks):
+        single = {API_GEMMA: MagicMock(return_value=(0.9, None)), API_GEMINI: MagicMock(return_value=(0.95, None))}
+        with patch('user_system.classifiers.text_batcher.call_text_openrouter_batch',
+                   side_effect=lambda texts, *_: [(0.9, None) if t == 'clear' else (0.5, None) for t in texts]), \
+                patch.dict('user_system.classifiers.classifier_utils.TEXT_API_DISPATCH', single), \
+                patch('user_system.classifiers.tier_health._cache', return_value=LocMemCache(self.id(), {})):
+            clear, ambiguous = _in_threads(is_text_positive, ('clear',), ('ambiguous',))
+        self.assertEqual(clear.scores, [0.9])
+        self.assertEqual(ambiguous.scores, [0.5, 0.95])
+        single[API_GEMMA].assert_not_called()
+        single[API_GEMINI].assert_called_once()
+        self.assertEqual(single[API_GEMINI].call_args.args[0], 'ambiguous')
@@ -0,0 +1,230 @@
+import asyncio
+import os
+import threading
+import time
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..classifiers import classifier_utils, tier_health
+from ..classifiers.classifier_constants import (
+    HEDGE_DEFAULT_DELAY_SECONDS, TIER_BREAKER_COOLDOWN_SECONDS, TIER_BREAKER_MIN_CALLS, TIER_BREAKER_SLOW_SECONDS,
+)
+from ..classifiers.classifier_utils import (
+    API_GEMINI, API_GEMMA, API_OPENAI, aclassify_with_thresholds, classify_with_thresholds,
+)
+
+NOW = 1_800_000_000.0
+
+
+class TierHealthTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        clock = patch('user_system.classifiers.tier_health.time.time', return_value=NOW)
+        self.clock = clock.start()
+        self.addCleanup(clock.stop)
+
+    def _fail(self, api_name, times=TIER_BREAKER_MIN_CALLS):
+        for _ in range(times):
+            tier_health.record(api_name, False, 0.1)
+
+    def _state(self, api_name):
+        return tier_health.snapshot([api_name])[api_name]['state']
+
+    def test_failing_tier_opens_and_is_skipped(self):
+        self._fail(API_GEMMA)
+        self.assertEqual(self._state(API_GEMMA), tier_health.STATE_OPEN)
+        call_fn = MagicMock(return_value=0.9)
+        result = classify_with_thresholds([API_GEMMA, API_GEMINI], call_fn)
+        self.assertTrue(result)
+        call_fn.assert_called_once_with(API_GEMINI)
+
+    def test_few_failures_keep_the_breaker_closed(self):
+        self._fail(API_GEMMA, times=TIER_BREAKER_MIN_CALLS - 1)
+        self.assertTrue(tier_health.allow_call(API_GEMMA))
+
+    def test_slow_tier_opens(self):
+        for _ in range(TIER_BREAKER_MIN_CALLS):
+            tier_health.record(API_GEMMA, True, TIER_BREAKER_SLOW_SECONDS + 1)
+        self.assertFalse(tier_health.allow_call(API_GEMMA))
+
+    def test_half_open_lets_one_probe_through(self):
+        self._fail(API_GEMMA)
+        self.clock.return_value = NOW + TIER_BREAKER_COOLDOWN_SECONDS
+        self.assertEqual(self._state(API_GEMMA), tier_health.STATE_HALF_OPEN)
+        probe = tier_health.allow_call(API_GEMMA)
+        self.assertTrue(probe)
+        self.assertFalse(tier_health.allow_call(API_GEMMA))
+
+        tier_health.record(API_GEMMA, True, 0.1, probe)
+        self.assertEqual(self._state(API_GEMMA), tier_health.STATE_CLOSED)
+        # The failures that tripped it are forgotten with it.
+        self.assertEqual(tier_health.snapshot([API_GEMMA])[API_GEMMA]['calls'], 0)
+
+    def test_failed_probe_reopens(self):
+        self._fail(API_GEMMA)
+        self.clock.return_value = NOW + TIER_BREAKER_COOLDOWN_SECONDS
+        probe = tier_health.allow_call(API_GEMMA)
+        tier_health.record(API_GEMMA, False, 0.1, probe)
+        self.assertEqual(self._state(API_GEMMA), tier_health.STATE_OPEN)
+        self.assertFalse(tier_health.allow_call(API_GEMMA))
+
+    def test_only_the_probe_ends_half_open(self):
+        # A call admitted before the breaker opened finishes during the probe.
+        stale_permit = tier_health.allow_call(API_GEMMA)
+        self._fail(API_GEMMA)
+        self.clock.return_value = NOW + TIER_BREAKER_COOLDOWN_SECONDS
+        probe = tier_health.allow_call(API_GEMMA)
+        tier_health.record(API_GEMMA, True, 0.1, stale_permit)
+        tier_health.record(API_GEMMA, False, 0.1)
+        self.assertEqual(self._state(API_GEMMA), tier_health.STATE_HALF_OPEN)
+        self.assertFalse(tier_health.allow_call(API_GEMMA))
+
+        tier_health.record(API_GEMMA, True, 0.1, probe)
+        self.assertEqual(self._state(API_GEMMA), tier_health.STATE_CLOSED)
+
+    def test_all_tiers_open_is_a_provider_failure(self):
+        self._fail(API_GEMMA)
+        self._fail(API_GEMINI)
+        call_fn = MagicMock(return_value=0.9)
+        result = classify_with_thresholds([API_GEMMA, API_GEMINI], call_fn)
+        self.assertTrue(result.provider_failure)
+        call_fn.assert_not_called()
+
+    @patch('user_system.classifiers.tier_health._cache', side_effect=RuntimeError("cache down"))
+    def test_cache_error_fails_open(self, _cache):
+        self.assertTrue(tier_health.allow_call(API_GEMMA))
+        tier_health.record(API_GEMMA, False, 0.1)
+
+    def test_p90_comes_from_the_latency_histogram(self):
+        self.assertEqual(tier_health.latency_p90(API_GEMMA), HEDGE_DEFAULT_DELAY_SECONDS)
+        for latency in [0.4] * 18 + [6.0] * 2:
+            tier_health.record(API_GEMMA, True, latency)
+        self.assertEqual(tier_health.latency_p90(API_GEMMA), 0.5)
+
+    def test_command_reports_the_state(self):
+        self._fail(API_GEMMA)
+        out = StringIO()
+        call_command('classifier_health', stdout=out)
+        self.assertIn('gemma    open', out.getvalue())
+
+
+class HedgedCascadeTests(TestCase):
+    """With a hedge budget, a tier slower than its p90 is raced against the
+    next one."""
+
+    def setUp(self):
+        super().setUp()
+        # The hedged calls run on other threads; keep their health bookkeeping
+        # off the test database.
+        cache = LocMemCache(self.id(), {})
+        for target, value in (('_cache', MagicMock(return_value=cache)),
+                              ('latency_p90', MagicMock(return_value=0.05))):
+            patcher = patch(f'user_system.classifiers.tier_health.{target}', value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def _slow(self, score, fast):
+        def call_fn(api_name):
+            if api_name == API_GEMMA:
+                self.release.wait(5)
+                return score
+            return fast
+        return MagicMock(side_effect=call_fn)
+
+    @patch.dict(os.environ, {"CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE": "10"})
+    def test_slow_tier_is_hedged_and_first_usable_answer_wins(self):
+        call_fn = self._slow(0.1, fast=0.9)
+        result = classify_with_thresholds([API_GEMMA, API_GEMINI], call_fn)
+        self.assertTrue(result)
+        self.assertEqual(result.scores, [0.9])
+        self.assertFalse(self.release.is_set())
+
+    @patch.dict(os.environ, {"CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE": "10"})
+    def test_hedged_scores_keep_the_zone_semantics(self):
+        call_fn = self._slow(0.5, fast=0.5)
+        threading.Timer(0.3, self.release.set).start()
+        result = classify_with_thresholds([API_GEMMA, API_GEMINI, API_OPENAI], call_fn)
+        self.assertFalse(result)
+        self.assertTrue(result.appealable)
+        self.assertEqual(result.scores, [0.5, 0.5, 0.5])
+
+    @patch.dict(os.environ, {"CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE": "1"})
+    def test_spent_budget_waits_on_the_slow_tier(self):
+        self.assertTrue(tier_health.try_hedge(1))
+        call_fn = self._slow(0.9, fast=0.9)
+        threading.Timer(0.2, self.release.set).start()
+        result = classify_with_thresholds([API_GEMMA, API_GEMINI], call_fn)
+        self.assertTrue(result)
+        call_fn.assert_called_once_with(API_GEMMA)
+
+    @patch.dict(os.environ, {"CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE": "1"})
+    def test_escalation_past_a_hedge_does_not_wait_or_spend_budget(self):
+        scores = {API_GEMINI: 0.5, API_OPENAI: 0.9}
+
+        def call_fn(api_name):
+            if api_name == API_GEMMA:
+                self.release.wait(5)
+                return 0.1
+            return scores[api_name]
+
+        started = time.monotonic()
+        result = classify_with_thresholds([API_GEMMA, API_GEMINI, API_OPENAI], MagicMock(side_effect=call_fn))
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertTrue(result)
+        self.assertEqual(result.scores, [0.5, 0.9])
+
+
+class AsyncHedgedCascadeTests(TestCase):
+    """aclassify_with_thresholds races a slow tier as a task on the loop."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch('user_system.classifiers.tier_health.latency_p90', return_value=0.05)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _slow(self, score, fast, delay=0.3):
+        async def acall_fn(api_name):
+            if api_name == API_GEMMA:
+                await asyncio.sleep(delay)
+                return score
+            return fast
+        return acall_fn
+
+    async def _drain_stragglers(self):
+        await asyncio.gather(*classifier_utils._STRAGGLERS)
+
+    async def test_tiers_run_in_order_without_a_budget(self):
+        calls = []
+
+        async def acall_fn(api_name):
+            calls.append(api_name)
+            return {API_GEMMA: 0.5, API_GEMINI: 0.95}[api_name]
+
+        result = await aclassify_with_thresholds([API_GEMMA, API_GEMINI, API_OPENAI], acall_fn)
+        self.assertTrue(result)
+        self.assertEqual(calls, [API_GEMMA, API_GEMINI])
+
+    @patch.dict(os.environ, {"CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE": "10"})
+    async def test_slow_tier_is_hedged_and_first_usable_answer_wins(self):
+        started = time.monotonic()
+        result = await aclassify_with_thresholds([API_GEMMA, API_GEMINI], self._slow(0.1, fast=0.9, delay=2))
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertTrue(result)
+        self.assertEqual(result.scores, [0.9])
+        await self._drain_stragglers()
+
+    @patch.dict(os.environ, {"CLASSIFICATION_HEDGE_BUDGET_PER_MINUTE": "10"})
+    async def test_hedged_scores_keep_the_zone_semantics(self):
+        result = await aclassify_with_thresholds([API_GEMMA, API_GEMINI, API_OPENAI], self._slow(0.5, fast=0.5))
+        self.assertFalse(result)
+        self.assertTrue(result.appealable)
+        self.assertEqual(result.scores, [0.5, 0.5, 0.5])
+        await self._drain_stragglers()
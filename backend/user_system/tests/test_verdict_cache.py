@@ -0,0 +1,81 @@
+import os
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+from PIL import Image
+
+from ..classifiers import interest_classifier, verdict_cache
+from ..classifiers.classifier_constants import TEXT_CLASSIFIER_PROMPT
+from ..classifiers.classifier_utils import API_GEMMA
+from ..classifiers.image_classifier import is_image_positive
+from ..classifiers.text_classifier import is_text_positive
+
+_TEXT_DISPATCH = "user_system.classifiers.classifier_utils.TEXT_API_DISPATCH"
+_IMAGE_DISPATCH = "user_system.classifiers.classifier_utils.IMAGE_API_DISPATCH"
+_TEXT_AVAILABLE = "user_system.classifiers.text_classifier.get_available_apis"
+_IMAGE_AVAILABLE = "user_system.classifiers.image_classifier.get_available_apis"
+_AWS_KEYS = {
+    "AWS_ACCESS_KEY_ID": "fake_aws_key",
+    "AWS_SECRET_ACCESS_KEY": "fake_aws_secret",
+    "AWS_STORAGE_BUCKET_NAME": "fake_bucket",
+    "OPENROUTER_API_KEY": "fake_openrouter",
+}
+
+
+def _image_bytes(color):
+    buf = BytesIO()
+    Image.new('RGB', (10, 10), color=color).save(buf, format='PNG')
+    return buf.getvalue()
+
+
+@patch.dict(os.environ, _AWS_KEYS, clear=True)
+class VerdictCacheTests(TestCase):
+    """Repeated text and re-uploaded images are answered from the verdict
+    cache instead of the paid cascade."""
+
+    @patch(_TEXT_AVAILABLE, return_value=[API_GEMMA])
+    def test_repeated_text_skips_the_cascade(self, _avail):
+        gemma = MagicMock(return_value=0.1)
+        with patch.dict(_TEXT_DISPATCH, {API_GEMMA: gemma}):
+            first = is_text_positive("Congrats!!")
+            second = is_text_positive("  congrats!!\n")
+        gemma.assert_called_once()
+        self.assertFalse(second)
+        self.assertEqual(second, first)
+
+    @patch(_TEXT_AVAILABLE, return_value=[API_GEMMA])
+    def test_provider_failure_is_not_cached(self, _avail):
+        failing = MagicMock(side_effect=RuntimeError("provider down"))
+        with patch.dict(_TEXT_DISPATCH, {API_GEMMA: failing}):
+            self.assertTrue(is_text_positive("well done").provider_failure)
+        with patch.dict(_TEXT_DISPATCH, {API_GEMMA: MagicMock(return_value=0.9)}):
+            self.assertTrue(is_text_positive("well done"))
+
+    def test_model_override_changes_the_key(self):
+        digest = verdict_cache.text_digest("well done")
+        before = verdict_cache.verdict_key('text', digest, TEXT_CLASSIFIER_PROMPT, [API_GEMMA])
+        with patch.dict(os.environ, {"OPENROUTER_MODEL_GEMMA": "another/model"}):
+            after = verdict_cache.verdict_key('text', digest, TEXT_CLASSIFIER_PROMPT, [API_GEMMA])
+        self.assertNotEqual(before, after)
+
+    @patch(_IMAGE_AVAILABLE, return_value=[API_GEMMA])
+    @patch("user_system.classifiers.image_classifier.boto3")
+    def test_reuploaded_image_skips_the_cascade(self, mock_boto3, _avail):
+        bodies = [_image_bytes('red'), _image_bytes('red'), _image_bytes('blue')]
+        mock_boto3.client.return_value.get_object.side_effect = [
+            {'Body': MagicMock(read=MagicMock(return_value=data))} for data in bodies]
+        gemma = MagicMock(return_value=0.9)
+        with patch.dict(_IMAGE_DISPATCH, {API_GEMMA: gemma}):
+            self.assertTrue(is_image_positive("first.png"))
+            self.assertTrue(is_image_positive("reupload.png"))
+            self.assertEqual(gemma.call_count, 1)
+            self.assertTrue(is_image_positive("different.png"))
+        self.assertEqual(gemma.call_count, 2)
+
+    @patch("user_system.classifiers.interest_classifier.get_available_apis", return_value=[API_GEMMA])
+    def test_repeated_interest_term_skips_the_provider(self, _avail):
+        with patch.object(interest_classifier, 'call_text_openrouter_raw', return_value="nature") as call:
+            self.assertEqual(interest_classifier.categorize_text_interests("Hiking"), ["nature"])
+            self.assertEqual(interest_classifier.categorize_text_interests("hiking"), ["nature"])
+        call.assert_called_once()
@@ -0,0 +1,96 @@
+"""Fan-out-on-write timelines for the followed-users feed.
+
+Every user has a timeline: a TimelineEntry row per post by someone they follow,
+carrying the post's creation_time and the follow's category. Reading the
+followed feed is then a range read of the owner's (optionally one category's)
+entries plus a single hydrate query, instead of joining every followed
+author's posts through the follow and block graphs on each request.
+
+The timeline is maintained at the points the inputs change:
+
+- tasks.classify_post (and an approved appeal) fans a newly visible post out
+  to its author's current followers;
+- follow_user backfills the followee's most recent visible posts
+  (TIMELINE_BACKFILL_LIMIT);
+- unfollow_user and toggle_block prune the entries between the two users;
+- set_follow_category relabels the entries so the category index stays true.
+
+Entries are never removed when a post is later hidden (reports), its author
+banned or its audience narrowed: timeline_entries applies visible_posts and
+the block exclusions to the entries themselves, before a page is cut, so the
+timeline only has to be a superset of what can be shown and a page is never
+short of posts that later ones could have filled. Deleting a post or an
+account cascades its entries away.
+"""
+import logging
+
+from django.db.models import Exists, OuterRef
+
+from . import block_sets
+from .constants import TIMELINE_BACKFILL_LIMIT, TIMELINE_FANOUT_BATCH_SIZE
+from .models import Post, TimelineEntry, UserFollow
+from .visibility import visible_posts
+
+logger = logging.getLogger(__name__)
+
+# The timeline's order, ending in a unique key for keyset paging. Matches the
+# ('-creation_time', '-post_identifier') order the followed feed always had, so
+# cursors issued before timelines existed still resume correctly.
+TIMELINE_ORDERING = ('-creation_time', '-post_id')
+
+
+def fan_out_post(post):
+    """Add `post` to the timeline of everyone currently following its author.
+    Idempotent: re-delivering an already fanned-out post inserts nothing."""
+    followers = UserFollow.objects.filter(user_to_id=post.author_id).values_list('user_from_id', 'category')
+    entries = [
+        TimelineEntry(owner_id=follower_id, post_id=post.pk, author_id=post.author_id,
+                      creation_time=post.creation_time, category=category)
+        for follower_id, category in followers.iterator()
+    ]
+    TimelineEntry.objects.bulk_create(entries, batch_size=TIMELINE_FANOUT_BATCH_SIZE, ignore_conflicts=True)
+    logger.info("fan_out_post: post %s delivered to %d follower timeline(s).", post.pk, len(entries))
+    return len(entries)
+
+
+def backfill_follow(follow):
+    """Seed the follower's timeline with the followee's most recent visible
+    posts when the UserFollow edge `follow` is created."""
+    posts = Post.objects.filter(author_id=follow.user_to_id, hidden=False).order_by(
+        '-creation_time').values_list('pk', 'creation_time')[:TIMELINE_BACKFILL_LIMIT]
+    entries = [
+        TimelineEntry(owner_id=follow.user_from_id, post_id=post_id, author_id=follow.user_to_id,
+                      creation_time=creation_time, category=follow.category)
+        for post_id, creation_time in posts
+    ]
+    TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+    return len(entries)
+
+
+def prune_follow(follower, followee):
+    """Drop `followee`'s posts from `follower`'s timeline (an unfollow)."""
+    deleted, _ = TimelineEntry.objects.filter(owner=follower, author=followee).delete()
+    return deleted
+
+
+def prune_block(user, other):
+    """Drop each user's posts from the other's timeline (a block cuts both
+    directions, like the follow edges it removes)."""
+    return prune_follow(user, other) + prune_follow(other, user)
+
+
+def relabel_follow(follow):
+    """Carry a follow edge's new category onto its timeline entries."""
+    return TimelineEntry.objects.filter(owner_id=follow.user_from_id, author_id=follow.user_to_id).update(
+        category=follow.category)
+
+
+def timeline_entries(user, category=None):
+    """`user`'s timeline, newest first, optionally narrowed to the authors
+    they labeled with `category`, and limited to the posts `user` may see now."""
+    entries = TimelineEntry.objects.filter(owner=user)
+    if category:
+        entries = entries.filter(category=category)
+    entries = block_sets.exclude_blocked(entries, user)
+    visible = visible_posts(Post.objects.filter(pk=OuterRef('post_id')), user)
+    return entries.filter(Exists(visible)).order_by(*TIMELINE_ORDERING)
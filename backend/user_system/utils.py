@@ -1,8 +1,11 @@
+import datetime
 import string
 import hashlib
 import uuid
 import secrets
 from django.conf import settings
+from django.core import signing
+from django.db.models import Q
 
 from .constants import LEN_LOGIN_COOKIE_TOKEN, LEN_SESSION_MANAGEMENT_TOKEN
 
@@ -92,3 +95,71 @@ def get_queryset_batch(queryset, batch_num, batch_size):
     """
     starting_index = batch_num * batch_size
     return list(queryset[starting_index:starting_index + batch_size])
+
+
+# Salt for listing cursors, so a cursor can't be replayed as (or forged from)
+# any other value this project signs with SECRET_KEY.
+CURSOR_SALT = 'user_system.listing-cursor'
+
+
+def _cursor_value(value):
+    """JSON-safe form of one keyset value (datetimes and UUIDs as strings; the
+    ORM parses them back when the value is used in a lookup)."""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values):
+    """Opaque, tamper-evident cursor for a listing page boundary.
+
+    Signed rather than merely encoded so a client can only hand back a cursor
+    the server issued: the values are interpolated into keyset filters, and a
+    crafted one should be rejected, not executed.
+    """
+    return signing.dumps([_cursor_value(v) for v in values], salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor):
+    """The value list an encode_cursor token carries, or None when it is
+    malformed or was not issued by this server."""
+    try:
+        values = signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+    return values if isinstance(values, list) else None
+
+
+def get_keyset_batch(queryset, ordering, after, batch_size):
+    """One batch of a QuerySet by keyset ("seek") pagination.
+
+    `ordering` is an order_by() spec ending in a unique field (e.g.
+    ('-creation_time', '-post_identifier')); `after` is the ordering values of
+    the last row of the previous batch, or None for the first batch. Instead of
+    OFFSET, the batch resumes strictly after that row, so batch N costs the
+    same as batch 1 and a row inserted or removed ahead of the boundary can't
+    shift the next batch into duplicates or gaps.
+
+    Returns (rows, next_after): next_after is the value list to resume from, or
+    None when this batch came back short (there is nothing after it).
+    """
+    queryset = queryset.order_by(*ordering)
+    if after is not None:
+        # Lexicographic "after": strictly past the first key, or tied on it and
+        # strictly past the second, and so on.
+        seek = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            term = Q(**{f'{name}__{lookup}': after[i]})
+            for tied_field, tied_value in zip(ordering[:i], after[:i]):
+                term &= Q(**{tied_field.lstrip('-'): tied_value})
+            seek |= term
+        queryset = queryset.filter(seek)
+    rows = list(queryset[:batch_size])
+    next_after = None
+    if len(rows) == batch_size:
+        next_after = [getattr(rows[-1], field.lstrip('-')) for field in ordering]
+    return rows, next_after
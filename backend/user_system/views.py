@@ -15,7 +15,7 @@ from django.contrib.auth import login, logout, get_user_model
 from django.contrib.auth.hashers import check_password, make_password
 from django.core.mail import send_mail
 from django.db import transaction, IntegrityError
-from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models import Count, Max, OuterRef, Q, Subquery
 from django.http import JsonResponse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
@@ -23,7 +23,7 @@ from django.views.decorators.http import require_POST, require_GET, require_http
 from django_ratelimit.decorators import ratelimit
 from django_ratelimit.exceptions import Ratelimited
 
-from . import tasks
+from . import auth_principals, ban_sets, block_sets, feed_snapshot, tasks, timeline
 from .classifiers import image_classifier, text_classifier, interest_classifier
 from .classifiers.classifier_constants import REASON_PHRASES, GENERIC_REASON_CODE
 from .classifiers.prefilter import prefilter_text
@@ -41,6 +41,7 @@ from .constants import Patterns, Params, POST_BATCH_SIZE, MAX_BEFORE_HIDING_POST
     LEN_RECOVERY_CODE_HEX, TOTP_ISSUER, INVALID_TWO_FACTOR_CHALLENGE, \
     FOLLOW_CATEGORIES, FOLLOW_CATEGORY_FOLLOWING, POST_AUDIENCES, POST_AUDIENCE_PUBLIC, \
     PROFILE_IMAGE_STATUS_NONE, PROFILE_IMAGE_STATUS_PENDING, \
+    BIO_STATUS_NONE, BIO_STATUS_PENDING, BIO_STATUS_REJECTED, \
     DEFAULT_STYLE_KEY, ALLOWED_CAPTION_FONTS, ALLOWED_BACKGROUND_COLORS, \
     ALLOWED_TEXT_SIZES, MAX_COMMENT_FORMAT_SPANS, \
     MINIMUM_AGE, ADULT_AGE, AGE_RESTRICTED, \
@@ -48,13 +49,14 @@ from .constants import Patterns, Params, POST_BATCH_SIZE, MAX_BEFORE_HIDING_POST
     MAX_FREEFORM_INTERESTS, MAX_FREEFORM_INTEREST_LENGTH, REJECTED_TEXT_ECHO_LIMIT, \
     DEVICE_PLATFORMS, MAX_DEVICE_TOKEN_LENGTH, \
     PUSH_TYPE_CHOICES, PUSH_TYPES
+from .counters import reconcile_counters
 from .feed_algorithm import feed_algorithm
 from .input_validator import is_valid_pattern
-from .models import LoginCookie, Session, Post, CommentThread, PositiveOnlySocialUser, Comment, CommentLike, \
-    PostLike, SavedPost, UserBlock, UserBan, UserFollow, KnownDevice, Appeal, TwoFactorChallenge, RecoveryCode, \
+from .models import LoginCookie, Session, Post, CommentThread, PositiveOnlySocialUser, Comment, SavedPost, \
+    UserBlock, UserFollow, KnownDevice, Appeal, TwoFactorChallenge, RecoveryCode, \
     InterestCategory, UserFreeformInterest, DeviceToken, NotificationPreference
 from .utils import convert_to_bool, generate_login_cookie_token, generate_management_token, generate_series_identifier, \
-    get_batch, get_queryset_batch
+    get_batch, get_queryset_batch, get_keyset_batch, encode_cursor, decode_cursor, hash_string_sha256
 from .cloudfront import sign_compressed_url, sign_original_url
 from .s3 import delete_image, generate_presigned_upload, image_url_to_key, is_source_bucket_url, \
     strip_query_and_fragment
@@ -159,20 +161,18 @@ def get_user_with_series_identifier(series_identifier):
 
 
 def get_user_with_session_management_token(token):
-    try:
-        existing_session = Session.objects.get(management_token=token)
-        return existing_session.management_user
-    except Session.DoesNotExist:
-        return None
+    existing_session = Session.objects.select_related('management_user').filter(
+        token_hash=hash_string_sha256(token)).first()
+    return existing_session.management_user if existing_session else None
 
 
 def has_active_outright_ban(user):
-    return UserBan.objects.active().filter(user=user, ban_type=BAN_TYPE_OUTRIGHT).exists()
+    return ban_sets.is_banned(user.pk, BAN_TYPE_OUTRIGHT)
 
 
 def get_post_with_identifier(identifier):
     try:
-        existing_post = Post.objects.get(post_identifier=identifier)
+        existing_post = Post.objects.select_related('author').get(post_identifier=identifier)
         return existing_post
     except Post.DoesNotExist:
         return None
@@ -180,7 +180,8 @@ def get_post_with_identifier(identifier):
 
 def get_comment_thread_with_identifier(identifier):
     try:
-        existing_comment_thread = CommentThread.objects.get(comment_thread_identifier=identifier)
+        existing_comment_thread = CommentThread.objects.select_related('post__author').get(
+            comment_thread_identifier=identifier)
         return existing_comment_thread
     except CommentThread.DoesNotExist:
         return None
@@ -348,21 +349,28 @@ def api_login_required(view_func):
         if not is_valid_pattern(token, Patterns.alphanumeric):
             return JsonResponse({'error': 'Invalid token format'}, status=401)
 
-        user = get_user_with_session_management_token(token)
+        # The cached principal answers the ban and verification gates without
+        # loading the user; see auth_principals.
+        principal = auth_principals.resolve(token)
 
-        if user is None:
+        if principal is None:
             return JsonResponse({'error': 'Invalid session token'}, status=401)
 
-        if has_active_outright_ban(user):
-            logger.warning(f"Request rejected: Account banned for user_id: {user.id}")
+        user_id = principal['user_id']
+        if ban_sets.is_banned(user_id, BAN_TYPE_OUTRIGHT):
+            logger.warning(f"Request rejected: Account banned for user_id: {user_id}")
             return JsonResponse({'error': ACCOUNT_BANNED}, status=403)
 
         # Registration issues a session before the email is verified, so the
         # verification gate must sit here too, not just on the login views.
-        if not user.email_verified:
-            logger.warning(f"Request rejected: Email not verified for user_id: {user.id}")
+        if not principal['email_verified']:
+            logger.warning(f"Request rejected: Email not verified for user_id: {user_id}")
             return JsonResponse({'error': EMAIL_NOT_VERIFIED}, status=403)
 
+        user = principal.get('user') or get_user_model().objects.filter(pk=user_id).first()
+        if user is None:
+            return JsonResponse({'error': 'Invalid session token'}, status=401)
+
         # Attach user and token to the request for the view to use
         request.user = user
         request.token = token
@@ -529,6 +537,7 @@ def _issue_email_verification_token(user):
         hours=EMAIL_VERIFICATION_TOKEN_HOURS
     )
     user.save()
+    auth_principals.forget_user(user)
     return token
 def _email_verification_link(token):
     return f"{settings.FRONTEND_BASE_URL}/verify-email?token={token}"
@@ -728,8 +737,14 @@ def register(request):
         logger.warning("Registration failed: User already exists")
         return log_and_return_json("register", {'error': "User already exists"}, status=400)
 
-    # Classify text fields for positivity
-    username_result = text_classifier_class.is_text_positive(username)
+    # Classify text fields for positivity. A username cannot be held pending
+    # like a comment or bio (the account is created with it, and there is no
+    # later point to tell the registrant it was refused), so it is still checked
+    # on the request path — but the local pre-filter goes first, so a blatant
+    # hit never pays for the AI cascade.
+    username_result = prefilter_text(username)
+    if username_result:
+        username_result = text_classifier_class.is_text_positive(username)
     if not username_result:
         logger.warning(f"Registration failed: Username not positive")
         return log_and_return_json("register", {
@@ -1047,7 +1062,8 @@ def logout_user(request):
     # request.user and request.token are added by the decorator
     try:
         # Find the specific session object and delete it to invalidate the token
-        session = request.user.session_set.get(management_token=request.token)
+        session = request.user.session_set.get(token_hash=hash_string_sha256(request.token))
+        auth_principals.forget_sessions(Session.objects.filter(pk=session.pk))
         session.delete()
     except Session.DoesNotExist:
         # This could happen if the token is valid but the session was already deleted
@@ -1070,7 +1086,22 @@ def delete_user(request):
         user_to_delete = request.user
         user_id = user_to_delete.id
         logout(request)  # Log out of Django session first
+        # The cascade deletes the user's likes and comments in bulk, bypassing
+        # the hooks that keep the engagement counters current, so note what
+        # they touched and reconcile just those rows once the user is gone.
+        touched_posts = list(Post.objects.filter(
+            Q(postlike__user=user_to_delete) | Q(commentthread__comment__author=user_to_delete)
+        ).exclude(author=user_to_delete).values_list('pk', flat=True).distinct())
+        touched_comments = list(Comment.objects.filter(
+            commentlike__user=user_to_delete).exclude(author=user_to_delete).values_list('pk', flat=True))
+        touched_threads = list(CommentThread.objects.filter(
+            Q(comment__commentlike__user=user_to_delete) | Q(comment__author=user_to_delete)
+        ).exclude(post__author=user_to_delete).values_list('pk', flat=True).distinct())
+        auth_principals.forget_user(user_to_delete)
         user_to_delete.delete()  # This will cascade and delete sessions, posts, etc.
+        reconcile_counters(posts=Post.objects.filter(pk__in=touched_posts),
+                           comments=Comment.objects.filter(pk__in=touched_comments),
+                           comment_threads=CommentThread.objects.filter(pk__in=touched_threads))
         logger.info(f"User deleted successfully: user_id: {user_id}")
         return log_and_return_json("delete_user", {'message': 'User deleted successfully'})
     except Exception as e:
@@ -1399,6 +1430,7 @@ def verify_email(request):
         user.email_verification_token = None
         user.email_verification_token_expires = None
         user.save()
+        auth_principals.forget_user(user)
 
     logger.info(f"Email verification successful for user_id: {user.id}")
     return log_and_return_json("verify_email", {'message': 'Email verified'})
@@ -1631,6 +1663,7 @@ def reset_password(request):
             user.reset_token = None
             user.reset_token_expires = None
             user.save()
+            auth_principals.forget_user(user)
             Session.objects.filter(management_user=user).delete()
             LoginCookie.objects.filter(cookie_user=user).delete()
     except get_user_model().DoesNotExist:
@@ -1696,7 +1729,10 @@ def change_password(request):
         user.save()
         # Evict other devices but keep the session that made this request, so the
         # caller isn't logged out of the device they just changed the password on.
-        Session.objects.filter(management_user=user).exclude(management_token=request.token).delete()
+        other_sessions = Session.objects.filter(management_user=user).exclude(
+            token_hash=hash_string_sha256(request.token))
+        auth_principals.forget_sessions(other_sessions)
+        other_sessions.delete()
         LoginCookie.objects.filter(cookie_user=user).delete()
 
     logger.info(f"Password change successful for user_id: {user.id}, username: {user.username}")
@@ -2006,6 +2042,10 @@ def like_post(request, post_identifier):
             logger.warning(f"Like post failed: Already liked for user_id: {request.user.id} on post: {post_identifier}")
             return log_and_return_json("like_post", {'error': "Already liked post"}, status=400)
 
+        # Rescore just this post so the feed's materialized hot rank reflects
+        # the like now rather than at the next decay tick.
+        feed_algorithm_class.refresh_post_hot_scores(Post.objects.filter(pk=post.pk))
+
         logger.info(f"Post liked successful: post_id: {post_identifier} by user_id: {request.user.id}")
         return log_and_return_json("like_post", {'message': 'Post liked'})
     else:
@@ -2035,9 +2075,13 @@ def unlike_post(request, post_identifier):
             logger.warning(f"Unlike post failed: Cannot unlike own post for user_id: {request.user.id}")
             return log_and_return_json("unlike_post", {'error': "Cannot unlike own post"}, status=400)
 
-        deleted_count, _ = post.postlike_set.filter(user=request.user).delete()
+        # Delete through the instance (not the queryset) so PostLike.delete
+        # takes the like off the post's denormalized like_count.
+        like = post.postlike_set.filter(user=request.user).first()
 
-        if deleted_count > 0:
+        if like is not None:
+            like.delete()
+            feed_algorithm_class.refresh_post_hot_scores(Post.objects.filter(pk=post.pk))
             logger.info(f"Post unliked successful: post_id: {post_identifier} by user_id: {request.user.id}")
             return log_and_return_json("unlike_post", {'message': 'Post unliked'})
         else:
@@ -2066,8 +2110,7 @@ def save_post(request, post_identifier):
         # shadow-banned post would just be an empty row on the saved screen.
         # A block on either side hides the author's posts too, matching the feed
         # and the saved-posts listing filter, so saving across a block is refused.
-        blocked = (request.user.blocked.filter(pk=post.author_id).exists()
-                   or request.user.blocked_by.filter(pk=post.author_id).exists())
+        blocked = post.author_id in block_sets.blocked_either_way_ids(request.user)
         if blocked or not can_view_post(post, request.user):
             logger.warning(f"Save post failed: Post {post_identifier} not visible to user_id: {request.user.id}")
             return log_and_return_json("save_post", {'error': "No post with that identifier"}, status=400)
@@ -2121,6 +2164,9 @@ def get_saved_posts(request, batch):
     logger.info("Endpoint get_saved_posts invoked by IP or User")
     if batch < 0:
         return log_and_return_json("get_saved_posts", {'error': "Invalid batch parameter"}, status=400)
+    after = _requested_cursor(request)
+    if after is _INVALID_CURSOR:
+        return _invalid_cursor_response("get_saved_posts")
 
     # Order by when the post was saved, not when it was created, so the most
     # recently bookmarked post is first. The save time is pulled onto each Post
@@ -2142,13 +2188,16 @@ def get_saved_posts(request, batch):
         saved_time=Subquery(saved_time), saved_id=Subquery(saved_id))
     # Drop posts by users on either side of a block, mirroring the feed, so a
     # post saved before a block doesn't keep surfacing afterward.
-    saved_posts = saved_posts.exclude(author__in=request.user.blocked.all()).exclude(
-        author__in=request.user.blocked_by.all())
+    saved_posts = block_sets.exclude_blocked(saved_posts, request.user)
     saved_posts = visible_posts(saved_posts, request.user).order_by(
         '-saved_time', '-saved_id').select_related('author').prefetch_related('tags')
 
     if saved_posts.exists():
-        batched_posts = get_queryset_batch(saved_posts, batch, POST_BATCH_SIZE)
+        # saved_id is unique per (user, post), so it alone settles the keyset
+        # boundary once saved_time ties.
+        batched_posts, next_cursor = _post_batch(saved_posts, batch, after, ('-saved_time', '-saved_id'))
+        if batched_posts is None:
+            return _invalid_cursor_response("get_saved_posts")
         interaction_state = build_post_interaction_state(request.user, batched_posts)
         posts_data = [
             {
@@ -2168,9 +2217,9 @@ def get_saved_posts(request, batch):
             }
             for post in batched_posts
         ]
-        return log_and_return_json("get_saved_posts", posts_data, safe=False)
+        return _post_listing_response("get_saved_posts", posts_data, after, next_cursor)
     else:
-        return log_and_return_json("get_saved_posts", [], safe=False)
+        return _post_listing_response("get_saved_posts", [], after)
 
 
 def _classification_message(post):
@@ -2275,6 +2324,77 @@ def get_post_status(request, post_identifier):
 # FEED / POST RETRIEVAL VIEWS
 # =============================================================================
 
+# Sentinel _requested_cursor returns for a cursor that fails to decode.
+_INVALID_CURSOR = object()
+
+
+def _requested_cursor(request):
+    """The keyset position a post-listing request asks to resume from.
+
+    Every post listing still takes the integer batch in its URL; sending a
+    ?cursor= query parameter (empty for the first page) switches it to keyset
+    pagination instead, and the batch number is then ignored. Returns None for
+    batch-number paging, [] for the first cursor page, the decoded values of
+    the previous page's next_cursor after that, or _INVALID_CURSOR.
+    """
+    cursor = request.GET.get(Fields.cursor)
+    if cursor is None:
+        return None
+    if cursor == '':
+        return []
+    values = decode_cursor(cursor)
+    return _INVALID_CURSOR if values is None else values
+
+
+def _post_batch(posts, batch, after, ordering, cursor_prefix=()):
+    """One page of a post listing and the cursor for the page after it.
+
+    Batch-number paging (after is None) is the original LIMIT/OFFSET slice and
+    never has a next cursor. Cursor paging seeks past the previous page's last
+    row on `ordering`, which must end in a unique key so the boundary is exact.
+    `cursor_prefix` is carried verbatim at the front of the issued cursor (the
+    feed pins its ranking instant there). Returns (posts, next_cursor), or
+    (None, None) when `after` does not fit `ordering` (a cursor issued by a
+    different listing).
+    """
+    if after is None:
+        return get_queryset_batch(posts, batch, POST_BATCH_SIZE), None
+    if after and len(after) != len(ordering):
+        return None, None
+    rows, next_after = get_keyset_batch(posts, ordering, after or None, POST_BATCH_SIZE)
+    next_cursor = encode_cursor([*cursor_prefix, *next_after]) if next_after is not None else None
+    return rows, next_cursor
+
+
+def _post_listing_response(view_name, posts_data, after, next_cursor=None):
+    """A post listing's payload: the bare list for batch-number paging (the
+    shape every existing client parses), or {posts, next_cursor} when the
+    client opted into cursor paging."""
+    if after is None:
+        return log_and_return_json(view_name, posts_data, safe=False)
+    return log_and_return_json(view_name, {Fields.posts: posts_data, Fields.next_cursor: next_cursor})
+
+
+def _invalid_cursor_response(view_name):
+    return log_and_return_json(view_name, {'error': "Invalid cursor"}, status=400)
+
+
+def _hydrate_feed_page(user, post_identifiers):
+    """Load one feed page's posts from a list of ids (a home-feed snapshot
+    slice, or a page of followed-feed timeline entries), in that order.
+
+    The visibility and block rules are re-applied to just these ids (cheap —
+    it is a primary-key lookup), so a post hidden or an author blocked since
+    the ids were stored drops out of the page rather than leaking through.
+    """
+    if not post_identifiers:
+        return []
+    posts = block_sets.exclude_blocked(Post.objects.filter(pk__in=post_identifiers), user)
+    posts = visible_posts(posts, user).select_related('author').prefetch_related('tags')
+    by_identifier = {str(post.post_identifier): post for post in posts}
+    return [by_identifier[identifier] for identifier in post_identifiers if identifier in by_identifier]
+
+
 def build_post_interaction_state(user, posts):
     """Bulk-load the per-post detail a client needs to render and act on a batch.
 
@@ -2291,7 +2411,6 @@ def build_post_interaction_state(user, posts):
     liked_post_ids = set()
     saved_post_ids = set()
     my_report_reasons = {}
-    like_counts = {}
     comment_counts = {}
 
     # Paginating past the end is ordinary client behaviour, and the batch is
@@ -2317,28 +2436,23 @@ def build_post_interaction_state(user, posts):
             .filter(post__in=posts)
             .values_list('post_id', 'reason')
         )
-        like_counts = dict(
-            PostLike.objects
-            .filter(post__in=posts)
-            .values('post_id')
-            .annotate(count=Count('post_id'))
-            .values_list('post_id', 'count')
-        )
         # Comment counts respect the same visibility rule as the thread listing,
         # so a row never advertises comments the viewer would not be shown (#249).
-        # count is distinct because visible_comments carries the audience-join
-        # fan-out (issue #445): a viewer's own comment is emitted once per account
-        # they follow, so a plain Count would over-report the total.
-        comment_counts = dict(
-            visible_comments(Comment.objects.filter(comment_thread__post__in=posts), user)
-            .values('comment_thread__post_id')
-            .annotate(count=Count('comment_identifier', distinct=True))
-            .values_list('comment_thread__post_id', 'count')
-        )
+        # Posts whose denormalized comment_count is zero have nothing to count,
+        # so only the rest go into the grouped query, which is skipped when
+        # none are left.
+        commented_posts = [post for post in posts if post.comment_count]
+        if commented_posts:
+            comment_counts = dict(
+                visible_comments(Comment.objects.filter(comment_thread__post__in=commented_posts), user)
+                .values('comment_thread__post_id')
+                .annotate(count=Count('comment_identifier'))
+                .values_list('comment_thread__post_id', 'count')
+            )
 
     def state_for(post):
         return {
-            Fields.post_likes: like_counts.get(post.post_identifier, 0),
+            Fields.post_likes: post.like_count,
             Fields.is_liked: post.post_identifier in liked_post_ids,
             Fields.is_saved: post.post_identifier in saved_post_ids,
             Fields.is_reported: post.post_identifier in my_report_reasons,
@@ -2359,46 +2473,94 @@ def get_posts_in_feed(request, batch):
     # user is on request.user
     if batch < 0:
         return log_and_return_json("get_posts_in_feed", {'error': "Invalid batch parameter"}, status=400)
-
-    relevant_posts = feed_algorithm_class.get_posts_weighted(request.user, Post)
-
-    # Filter out posts from users the current user has blocked or who have blocked the current user
-    blocked_users = request.user.blocked.all()
-    blocking_users = request.user.blocked_by.all()
-    relevant_posts = relevant_posts.exclude(author__in=blocked_users).exclude(author__in=blocking_users)
-
-    relevant_posts = visible_posts(relevant_posts, request.user).select_related('author').prefetch_related('tags')
-
-    # .exists() rather than .count() > 0 to skip the extra COUNT(*) before the
-    # batch query, consistent with get_saved_posts / get_posts_for_tag.
-    if relevant_posts.exists():
-        batched_posts = get_queryset_batch(relevant_posts, batch, POST_BATCH_SIZE)
-        interaction_state = build_post_interaction_state(request.user, batched_posts)
-        posts_data = [
-            {
-                Fields.post_identifier: post.post_identifier,
-                Fields.image_url: sign_compressed_url(post.image_url),
-                # Full-res original, used as a client fallback while the async
-                # Lambda-generated compressed copy is still missing (#252/#254).
-                Fields.original_image_url: sign_original_url(post.image_url),
-                Fields.image_blurhash: post.image_blurhash,
-                Fields.author_username: post.author.username,
-                **_author_avatar_fields(post.author),
-                Fields.caption: post.caption,
-                Fields.audience: post.audience,
-                **_caption_style_fields(post),
-                **_post_tags(post),
-                **interaction_state(post),
-                # Authors see their own pending/hidden posts in feeds, so their
-                # payloads carry the classification state for the client to
-                # render (review-in-progress placeholder, appeal CTA, ...).
-                **_author_status_fields(post, request.user),
-            }
-            for post in batched_posts
-        ]
-        return log_and_return_json("get_posts_in_feed", posts_data, safe=False)
+    after = _requested_cursor(request)
+    if after is _INVALID_CURSOR:
+        return _invalid_cursor_response("get_posts_in_feed")
+
+    # A feed is ranked as of the instant its first page was served: that
+    # instant leads every cursor the scroll hands back and identifies the
+    # viewer's cached snapshot, so later pages score posts exactly as page one
+    # did and the (score, id) boundary can't drift into duplicates or gaps as
+    # posts age between requests.
+    as_of = timezone.now()
+    as_of_token = None
+    if after:
+        as_of_token = after[0]
+        try:
+            as_of = datetime.fromisoformat(as_of_token)
+        except (TypeError, ValueError):
+            return _invalid_cursor_response("get_posts_in_feed")
+        after = after[1:]
+
+    def live_ranking():
+        # Filter out posts from users the current user has blocked or who have blocked the current user
+        candidates = block_sets.exclude_blocked(feed_algorithm_class.get_feed_candidates(request.user, Post),
+                                                request.user)
+        ranked = feed_algorithm_class.score_candidates(visible_posts(candidates, request.user), request.user, as_of)
+        return [[str(post_identifier), score] for post_identifier, score in ranked]
+
+    # Serve the page from the viewer's feed snapshot when possible: the first
+    # page of a scroll (batch 0 or an empty cursor) ranks once and caches the
+    # ordered ids, and later pages only hydrate their slice of them.
+    snapshot = None
+    start = None
+    if after is None:
+        start = batch * POST_BATCH_SIZE
+        if batch > 0:
+            snapshot = feed_snapshot.load_snapshot(request.user)
+        if snapshot is None:
+            snapshot = feed_snapshot.take_snapshot(request.user, live_ranking(), as_of)
+    elif not after:
+        start = 0
+        snapshot = feed_snapshot.take_snapshot(request.user, live_ranking(), as_of)
+    elif len(after) == 2 and isinstance(after[0], (int, float)):
+        snapshot = feed_snapshot.load_snapshot(request.user, as_of=as_of_token)
+        if snapshot is not None:
+            start = feed_snapshot.position_after(snapshot, after[1])
+            if start is None:
+                snapshot = None
     else:
-        return log_and_return_json("get_posts_in_feed", [], safe=False)
+        return _invalid_cursor_response("get_posts_in_feed")
+
+    if snapshot is None or not feed_snapshot.covers(snapshot, start):
+        # Past the end of a truncated snapshot, or resuming a cursor whose
+        # snapshot expired: rank live, with the same pinned scores, and seek
+        # past the cursor's (score, id) in the full ranking.
+        snapshot = {'entries': live_ranking(), 'complete': True}
+        if after:
+            start = feed_snapshot.position_after_key(snapshot['entries'], after[0], after[1])
+
+    entries = snapshot['entries'][start:start + POST_BATCH_SIZE]
+    batched_posts = _hydrate_feed_page(request.user, [entry_id for entry_id, _ in entries])
+    next_cursor = None
+    if entries and (start + POST_BATCH_SIZE < len(snapshot['entries']) or not snapshot['complete']):
+        last_id, last_score = entries[-1]
+        next_cursor = encode_cursor([as_of, last_score, last_id])
+
+    interaction_state = build_post_interaction_state(request.user, batched_posts)
+    posts_data = [
+        {
+            Fields.post_identifier: post.post_identifier,
+            Fields.image_url: sign_compressed_url(post.image_url),
+            # Full-res original, used as a client fallback while the async
+            # Lambda-generated compressed copy is still missing (#252/#254).
+            Fields.original_image_url: sign_original_url(post.image_url),
+            Fields.image_blurhash: post.image_blurhash,
+            Fields.author_username: post.author.username,
+            **_author_avatar_fields(post.author),
+            Fields.caption: post.caption,
+            Fields.audience: post.audience,
+            **_caption_style_fields(post),
+            **_post_tags(post),
+            **interaction_state(post),
+            # Authors see their own pending/hidden posts in feeds, so their
+            # payloads carry the classification state for the client to
+            # render (review-in-progress placeholder, appeal CTA, ...).
+            **_author_status_fields(post, request.user),
+        }
+        for post in batched_posts
+    ]
+    return _post_listing_response("get_posts_in_feed", posts_data, after, next_cursor)
 
 
 @api_login_required
@@ -2409,6 +2571,9 @@ def get_posts_for_followed_users(request, batch):
     # user is on request.user
     if batch < 0:
         return log_and_return_json("get_posts_for_followed_users", {'error': "Invalid batch parameter"}, status=400)
+    after = _requested_cursor(request)
+    if after is _INVALID_CURSOR:
+        return _invalid_cursor_response("get_posts_for_followed_users")
 
     # Optional group filter (issue #392): ?category=friend|family|following
     # narrows the feed to people the viewer labeled with exactly that category.
@@ -2419,26 +2584,16 @@ def get_posts_for_followed_users(request, batch):
     if category_filter is not None and category_filter not in FOLLOW_CATEGORIES:
         return log_and_return_json("get_posts_for_followed_users", {'error': "Invalid category"}, status=400)
 
-    followed_users = request.user.following.all()
-
-    if category_filter:
-        categorized_ids = UserFollow.objects.filter(
-            user_from=request.user, category=category_filter
-        ).values_list('user_to_id', flat=True)
-        followed_users = followed_users.filter(pk__in=categorized_ids)
-
-    # Filter out users who are blocked or blocking
-    blocked_users = request.user.blocked.all()
-    blocking_users = request.user.blocked_by.all()
-    followed_users = followed_users.exclude(pk__in=blocked_users).exclude(pk__in=blocking_users)
-
-    if not followed_users.exists():
-        return log_and_return_json("get_posts_for_followed_users", [], safe=False)
-
-    posts_queryset = visible_posts(
-        Post.objects.filter(author__in=followed_users), request.user
-    ).order_by('-creation_time').select_related('author').prefetch_related('tags')
-    posts_batch = get_queryset_batch(posts_queryset, batch, POST_BATCH_SIZE)
+    # The followed feed is the viewer's fan-out timeline (see timeline.py): a
+    # range read of entry ids on the (owner[, category], -creation_time) index,
+    # then one query to hydrate them. The entries are narrowed to the posts the
+    # viewer may see before the page is cut, so a post hidden, an author banned
+    # or blocked since delivery never leaves a page short.
+    entries = timeline.timeline_entries(request.user, category_filter)
+    entry_batch, next_cursor = _post_batch(entries, batch, after, timeline.TIMELINE_ORDERING)
+    if entry_batch is None:
+        return _invalid_cursor_response("get_posts_for_followed_users")
+    posts_batch = _hydrate_feed_page(request.user, [str(entry.post_id) for entry in entry_batch])
     interaction_state = build_post_interaction_state(request.user, posts_batch)
 
     posts_data = [
@@ -2461,7 +2616,7 @@ def get_posts_for_followed_users(request, batch):
         for post in posts_batch
     ]
     logger.info(f"Get followed posts successful for user_id: {request.user.id}, batch: {batch}, count: {len(posts_data)}")
-    return log_and_return_json("get_posts_for_followed_users", posts_data, safe=False)
+    return _post_listing_response("get_posts_for_followed_users", posts_data, after, next_cursor)
 
 
 @api_login_required
@@ -2475,6 +2630,9 @@ def get_posts_for_user(request, username, batch):
         return log_and_return_json("get_posts_for_user", {'error': "Invalid username"}, status=400)
     if batch < 0:
         return log_and_return_json("get_posts_for_user", {'error': "Invalid batch parameter"}, status=400)
+    after = _requested_cursor(request)
+    if after is _INVALID_CURSOR:
+        return _invalid_cursor_response("get_posts_for_user")
 
     target_user = get_user_with_username(username)
     if not target_user:
@@ -2487,9 +2645,9 @@ def get_posts_for_user(request, username, batch):
         return log_and_return_json("get_posts_for_user", {'error': "User not found"}, status=400)
 
     # Check if blocking relationship exists
-    if request.user.blocked.filter(pk=target_user.pk).exists() or target_user.blocked.filter(pk=request.user.pk).exists():
+    if target_user.pk in block_sets.blocked_either_way_ids(request.user):
         logger.info(f"Get posts for user: Blocking relationship exists for user_id: {request.user.id} and target_user_id: {target_user.id}")
-        return log_and_return_json("get_posts_for_user", [], safe=False)
+        return _post_listing_response("get_posts_for_user", [], after)
 
     relevant_posts = visible_posts(
         feed_algorithm_class.get_posts_weighted_for_user(target_user, Post), request.user
@@ -2498,7 +2656,10 @@ def get_posts_for_user(request, username, batch):
     # .exists() rather than .count() > 0 to skip the extra COUNT(*) before the
     # batch query, consistent with get_saved_posts / get_posts_for_tag.
     if relevant_posts.exists():
-        batched_posts = get_queryset_batch(relevant_posts, batch, POST_BATCH_SIZE)
+        batched_posts, next_cursor = _post_batch(
+            relevant_posts, batch, after, ('-creation_time', '-post_identifier'))
+        if batched_posts is None:
+            return _invalid_cursor_response("get_posts_for_user")
         interaction_state = build_post_interaction_state(request.user, batched_posts)
         posts_data = [
             {
@@ -2525,9 +2686,9 @@ def get_posts_for_user(request, username, batch):
             }
             for post in batched_posts
         ]
-        return log_and_return_json("get_posts_for_user", posts_data, safe=False)
+        return _post_listing_response("get_posts_for_user", posts_data, after, next_cursor)
     else:
-        return log_and_return_json("get_posts_for_user", [], safe=False)
+        return _post_listing_response("get_posts_for_user", [], after)
 
 
 @api_login_required
@@ -2540,7 +2701,6 @@ def get_post_details(request, post_identifier):
 
     post = get_post_with_identifier(post_identifier)
     if post is not None and can_view_post(post, request.user):
-        total_likes = post.postlike_set.count()
         # The caller's own report (if any), so clients can offer "retract
         # report" with the original reason pre-filled instead of "report".
         my_report = post.postreport_set.filter(user=request.user).first()
@@ -2554,7 +2714,7 @@ def get_post_details(request, post_identifier):
             Fields.caption: post.caption,
             **_caption_style_fields(post),
             Fields.creation_time: post.creation_time,
-            Fields.post_likes: total_likes,
+            Fields.post_likes: post.like_count,
             Fields.is_liked: post.postlike_set.filter(user=request.user).exists(),
             Fields.is_saved: post.savedpost_set.filter(user=request.user).exists(),
             Fields.is_reported: my_report is not None,
@@ -2586,18 +2746,15 @@ def get_posts_for_tag(request, tag, batch):
         return log_and_return_json("get_posts_for_tag", {'error': "Invalid tag"}, status=400)
     if batch < 0:
         return log_and_return_json("get_posts_for_tag", {'error': "Invalid batch parameter"}, status=400)
+    after = _requested_cursor(request)
+    if after is _INVALID_CURSOR:
+        return _invalid_cursor_response("get_posts_for_tag")
 
     # Tags are stored lowercased, so match case-insensitively by normalizing the
     # request the same way extract_tag_names does.
     normalized_tag = tag.lower()
 
-    blocked_users = request.user.blocked.all()
-    blocking_users = request.user.blocked_by.all()
-    tagged_posts = (
-        Post.objects.filter(tags__name=normalized_tag)
-        .exclude(author__in=blocked_users)
-        .exclude(author__in=blocking_users)
-    )
+    tagged_posts = block_sets.exclude_blocked(Post.objects.filter(tags__name=normalized_tag), request.user)
     relevant_posts = (
         visible_posts(tagged_posts, request.user)
         .order_by('-creation_time')
@@ -2610,7 +2767,10 @@ def get_posts_for_tag(request, tag, batch):
     # .exists() rather than .count() > 0: it avoids the extra COUNT(*) before the
     # batch query, matching get_saved_posts.
     if relevant_posts.exists():
-        batched_posts = get_queryset_batch(relevant_posts, batch, POST_BATCH_SIZE)
+        batched_posts, next_cursor = _post_batch(
+            relevant_posts, batch, after, ('-creation_time', '-post_identifier'))
+        if batched_posts is None:
+            return _invalid_cursor_response("get_posts_for_tag")
         interaction_state = build_post_interaction_state(request.user, batched_posts)
         posts_data = [
             {
@@ -2630,15 +2790,53 @@ def get_posts_for_tag(request, tag, batch):
             }
             for post in batched_posts
         ]
-        return log_and_return_json("get_posts_for_tag", posts_data, safe=False)
+        return _post_listing_response("get_posts_for_tag", posts_data, after, next_cursor)
     else:
-        return log_and_return_json("get_posts_for_tag", [], safe=False)
+        return _post_listing_response("get_posts_for_tag", [], after)
 
 
 # =============================================================================
 # COMMENT VIEWS
 # =============================================================================
 
+def _comment_rejected_final(view_name, noun, reason_code):
+    """The 400 for a comment or reply rejected with no appeal, as the inline
+    pre-filter or (in eager mode) the worker decided."""
+    phrase = REASON_PHRASES.get(reason_code, REASON_PHRASES[GENERIC_REASON_CODE])
+    return log_and_return_json(view_name, {
+        'error': f"Text is not positive because your {noun} {phrase}. "
+                 "This decision is final and cannot be appealed.",
+        Fields.reason_code: reason_code,
+        Fields.appealable: False,
+    }, status=400)
+
+
+def _comment_created_response(view_name, noun, comment, response_data):
+    """Respond to a freshly created comment or reply from its classification
+    state. Queued classification leaves it pending; eager mode has already
+    resolved it, so the response is the same one the inline check used to give."""
+    comment.refresh_from_db(fields=['hidden', 'hidden_reason', 'classification_reason_code'])
+    status = comment.classification_status
+    if status == POST_STATUS_REJECTED_FINAL:
+        return _comment_rejected_final(view_name, noun, comment.classification_reason_code)
+    if status == POST_STATUS_PENDING:
+        response_data[Fields.hidden] = True
+        response_data[Fields.hidden_reason] = HIDDEN_REASON_PENDING_CLASSIFICATION
+        response_data[Fields.appealable] = False
+        response_data['message'] = (f"Your {noun} is being reviewed and will be visible "
+                                    "to others once it is approved.")
+    elif status == POST_STATUS_REJECTED:
+        phrase = REASON_PHRASES.get(comment.classification_reason_code, REASON_PHRASES[GENERIC_REASON_CODE])
+        response_data[Fields.hidden] = True
+        response_data[Fields.hidden_reason] = HIDDEN_REASON_CLASSIFIER
+        response_data[Fields.reason_code] = comment.classification_reason_code
+        response_data[Fields.appealable] = True
+        response_data['message'] = (f"Your {noun} did not pass automated review because it "
+                                    f"{phrase}. It is hidden for now "
+                                    "but you can appeal the decision.")
+    return log_and_return_json(view_name, response_data, status=201)
+
+
 @csrf_exempt
 @api_login_required
 @ratelimit(key='user', rate='20/h', block=True)
@@ -2683,43 +2881,27 @@ def comment_on_post(request, post_identifier):
         logger.warning(f"Comment on post failed: Post {post_identifier} not found or not visible")
         return log_and_return_json("comment_on_post", {'error': "No post with that identifier"}, status=400)
 
-    # A final (non-appealable) rejection blocks the comment; an appealable one
-    # creates it hidden pending appeal.
-    text_result = text_classifier_class.is_text_positive(comment_text)
-    if not text_result and not text_result.appealable:
-        return log_and_return_json("comment_on_post", {
-            'error': f"Text is not positive because your comment {text_result.public_reason()}. "
-                     "This decision is final and cannot be appealed.",
-            Fields.reason_code: text_result.public_reason_code(),
-            Fields.appealable: False,
-        }, status=400)
-
-    hidden = not text_result
+    # Only the cheap local pre-filter runs on the request path, as in make_post:
+    # a blatant hit is rejected immediately, final, and never created.
+    prefilter_result = prefilter_text(comment_text)
+    if not prefilter_result:
+        return _comment_rejected_final("comment_on_post", "comment", prefilter_result.public_reason_code())
 
-    # Create a new thread for this top-level comment
+    # Create a new thread for this top-level comment, holding the comment
+    # hidden pending classification (visible only to its author) until the
+    # worker resolves it.
     comment_thread = post.commentthread_set.create()
     new_comment = comment_thread.comment_set.create(
         author=request.user, body=comment_text, body_formatting=body_formatting,
         audience=audience,
-        hidden=hidden,
-        hidden_reason=HIDDEN_REASON_CLASSIFIER if hidden else HIDDEN_REASON_NONE)
+        hidden=True, hidden_reason=HIDDEN_REASON_PENDING_CLASSIFICATION)
+    tasks.enqueue_comment_classification(new_comment.comment_identifier)
 
-    response_data = {
+    logger.info(f"Comment on post created: post_id: {post_identifier}, comment_id: {new_comment.comment_identifier} for user_id: {request.user.id}")
+    return _comment_created_response("comment_on_post", "comment", new_comment, {
         Fields.comment_thread_identifier: comment_thread.comment_thread_identifier,
         Fields.comment_identifier: new_comment.comment_identifier
-    }
-    if hidden:
-        logger.info(f"Comment on post created hidden pending appeal: comment_id: {new_comment.comment_identifier} for user_id: {request.user.id}")
-        response_data[Fields.hidden] = True
-        response_data[Fields.hidden_reason] = HIDDEN_REASON_CLASSIFIER
-        response_data[Fields.reason_code] = text_result.public_reason_code()
-        response_data[Fields.appealable] = True
-        response_data['message'] = (f"Your comment did not pass automated review because it "
-                                    f"{text_result.public_reason()}. It is hidden for now "
-                                    "but you can appeal the decision.")
-    else:
-        logger.info(f"Comment on post successful: post_id: {post_identifier}, comment_id: {new_comment.comment_identifier} for user_id: {request.user.id}")
-    return log_and_return_json("comment_on_post", response_data, status=201)
+    })
 
 
 @csrf_exempt
@@ -2776,37 +2958,19 @@ def reply_to_comment_thread(request, post_identifier, comment_thread_identifier)
     if not can_view_post(comment_thread.post, request.user):
         return log_and_return_json("reply_to_comment_thread", {'error': "Comment thread not found for the given post"}, status=400)
 
-    # A final (non-appealable) rejection blocks the reply; an appealable one
-    # creates it hidden pending appeal.
-    text_result = text_classifier_class.is_text_positive(comment_text)
-    if not text_result and not text_result.appealable:
-        return log_and_return_json("reply_to_comment_thread", {
-            'error': f"Text is not positive because your reply {text_result.public_reason()}. "
-                     "This decision is final and cannot be appealed.",
-            Fields.reason_code: text_result.public_reason_code(),
-            Fields.appealable: False,
-        }, status=400)
+    prefilter_result = prefilter_text(comment_text)
+    if not prefilter_result:
+        return _comment_rejected_final("reply_to_comment_thread", "reply", prefilter_result.public_reason_code())
 
-    hidden = not text_result
     new_comment = comment_thread.comment_set.create(
         author=request.user, body=comment_text, body_formatting=body_formatting,
         audience=audience,
-        hidden=hidden,
-        hidden_reason=HIDDEN_REASON_CLASSIFIER if hidden else HIDDEN_REASON_NONE)
+        hidden=True, hidden_reason=HIDDEN_REASON_PENDING_CLASSIFICATION)
+    tasks.enqueue_comment_classification(new_comment.comment_identifier)
 
-    response_data = {Fields.comment_identifier: new_comment.comment_identifier}
-    if hidden:
-        logger.info(f"Reply created hidden pending appeal: comment_id: {new_comment.comment_identifier} for user_id: {request.user.id}")
-        response_data[Fields.hidden] = True
-        response_data[Fields.hidden_reason] = HIDDEN_REASON_CLASSIFIER
-        response_data[Fields.reason_code] = text_result.public_reason_code()
-        response_data[Fields.appealable] = True
-        response_data['message'] = (f"Your reply did not pass automated review because it "
-                                    f"{text_result.public_reason()}. It is hidden for now "
-                                    "but you can appeal the decision.")
-    else:
-        logger.info(f"Reply to comment successful: comment_thread_id: {comment_thread_identifier}, comment_id: {new_comment.comment_identifier} for user_id: {request.user.id}")
-    return log_and_return_json("reply_to_comment_thread", response_data, status=201)
+    logger.info(f"Reply to comment created: comment_thread_id: {comment_thread_identifier}, comment_id: {new_comment.comment_identifier} for user_id: {request.user.id}")
+    return _comment_created_response("reply_to_comment_thread", "reply", new_comment, {
+        Fields.comment_identifier: new_comment.comment_identifier})
 
 
 @csrf_exempt
@@ -2827,7 +2991,7 @@ def like_comment(request, post_identifier, comment_thread_identifier, comment_id
         return log_and_return_json("like_comment", {'error': f"Invalid fields {invalid_fields}"}, status=400)
 
     try:
-        comment = Comment.objects.get(
+        comment = Comment.objects.select_related('author', 'comment_thread__post__author').get(
             comment_identifier=comment_identifier,
             comment_thread__comment_thread_identifier=comment_thread_identifier,
             comment_thread__post__post_identifier=post_identifier
@@ -2878,7 +3042,7 @@ def unlike_comment(request, post_identifier, comment_thread_identifier, comment_
         return log_and_return_json("unlike_comment", {'error': f"Invalid fields {invalid_fields}"}, status=400)
 
     try:
-        comment = Comment.objects.get(
+        comment = Comment.objects.select_related('author', 'comment_thread__post__author').get(
             comment_identifier=comment_identifier,
             comment_thread__comment_thread_identifier=comment_thread_identifier,
             comment_thread__post__post_identifier=post_identifier
@@ -2899,10 +3063,13 @@ def unlike_comment(request, post_identifier, comment_thread_identifier, comment_
         logger.warning(f"Unlike comment failed: Cannot unlike own comment for user_id: {request.user.id}")
         return log_and_return_json("unlike_comment", {'error': "Cannot unlike own comment"}, status=400)
 
-    deleted_count, _ = comment.commentlike_set.filter(user=request.user).delete()
-    if deleted_count == 0:
+    # Through the instance so CommentLike.delete updates the comment's and the
+    # thread's like counters.
+    like = comment.commentlike_set.filter(user=request.user).first()
+    if like is None:
         logger.warning(f"Unlike comment failed: Comment not liked yet for user_id: {request.user.id} on comment: {comment_identifier}")
         return log_and_return_json("unlike_comment", {'error': "Comment not liked yet"}, status=400)
+    like.delete()
 
     logger.info(f"Unlike comment successful: comment_id: {comment_identifier} for user_id: {request.user.id}")
     return log_and_return_json("unlike_comment", {'message': 'Comment unliked'})
@@ -2970,7 +3137,7 @@ def report_comment(request, post_identifier, comment_thread_identifier, comment_
         return log_and_return_json("report_comment", {'error': f"Invalid fields {invalid_fields}"}, status=400)
 
     try:
-        comment = Comment.objects.get(
+        comment = Comment.objects.select_related('author', 'comment_thread__post__author').get(
             comment_identifier=comment_identifier,
             comment_thread__comment_thread_identifier=comment_thread_identifier,
             comment_thread__post__post_identifier=post_identifier
@@ -3030,7 +3197,7 @@ def retract_report_comment(request, post_identifier, comment_thread_identifier,
         return log_and_return_json("retract_report_comment", {'error': f"Invalid fields {invalid_fields}"}, status=400)
 
     try:
-        comment = Comment.objects.get(
+        comment = Comment.objects.select_related('author', 'comment_thread__post__author').get(
             comment_identifier=comment_identifier,
             comment_thread__comment_thread_identifier=comment_thread_identifier,
             comment_thread__post__post_identifier=post_identifier
@@ -3124,19 +3291,12 @@ def get_comments_for_thread(request, comment_thread_identifier, batch):
         logger.warning(f"Get comments for thread failed: Thread {comment_thread_identifier} not found or not visible")
         return log_and_return_json("get_comments_for_thread", {'error': "No comment thread with that identifier"}, status=400)
 
-    # Resolve the ids the viewer may see first, then rank a clean queryset built
-    # from those ids. Feeding the visible_comments queryset (which carries the
-    # audience-join fan-out) straight into the like-count weighting would inflate
-    # the counts, so we go through ids exactly like visible_comment_threads does.
-    # The values_list is passed straight into __in as a subquery (not
-    # materialized), so the ids never round-trip through Python.
-    visible_comment_ids = visible_comments(
-        comment_thread.comment_set.all(), request.user, category_filter
-    ).values_list('comment_identifier', flat=True)
+    # visible_comments adds no duplicate rows (its audience rule is an EXISTS
+    # probe), so the like-count weighting can rank it directly.
     # select_related('author') so serializing author_username and the author's
     # profile photo per comment does not fan out into a query per row.
-    comments = Comment.objects.filter(
-        comment_identifier__in=visible_comment_ids
+    comments = visible_comments(
+        comment_thread.comment_set.all(), request.user, category_filter
     ).select_related('author')
     relevant_comments = feed_algorithm_class.get_comments_weighted_for_thread(comments)
 
@@ -3159,15 +3319,6 @@ def get_comments_for_thread(request, comment_thread_identifier, batch):
         .filter(comment__in=batched_comments)
         .values_list('comment_id', 'reason')
     )
-    # Like counts for the whole batch in one grouped query, so we avoid a
-    # per-comment COUNT (N+1) inside the comprehension below.
-    like_counts = dict(
-        CommentLike.objects
-        .filter(comment__in=batched_comments)
-        .values('comment_id')
-        .annotate(count=Count('comment_id'))
-        .values_list('comment_id', 'count')
-    )
     comments_data = [
         {
             Fields.comment_identifier: comment.comment_identifier,
@@ -3178,7 +3329,7 @@ def get_comments_for_thread(request, comment_thread_identifier, batch):
             **_author_avatar_fields(comment.author),
             Fields.creation_time: comment.creation_time,
             Fields.updated_time: comment.updated_time,
-            Fields.comment_likes: like_counts.get(comment.comment_identifier, 0),
+            Fields.comment_likes: comment.like_count,
             Fields.is_liked: comment.comment_identifier in liked_comment_ids,
             Fields.is_reported: comment.comment_identifier in my_report_reasons,
             Fields.report_reason: my_report_reasons.get(comment.comment_identifier)
@@ -3212,8 +3363,10 @@ def get_users_matching_fragment(request, username_fragment):
     # We must also exclude users that B has blocked? Spec says: "If user A blocks user B then user A can search for user B"
     # So if I blocked someone, I can still search them.
     # But if someone blocked me, I cannot search them.
-    users_who_blocked_me = request.user.blocked_by.all()
-    users = searchable_users(users.exclude(pk__in=users_who_blocked_me), request.user)[:10]
+    users_who_blocked_me = block_sets.blocker_ids(request.user)
+    if users_who_blocked_me:
+        users = users.exclude(pk__in=users_who_blocked_me)
+    users = searchable_users(users, request.user)[:10]
 
     users_data = [
         {
@@ -3270,9 +3423,10 @@ def follow_user(request, username_to_follow):
     # IntegrityError into the same clean "Already following" 400 rather than a 500.
     try:
         with transaction.atomic():
-            UserFollow.objects.create(user_from=request.user, user_to=user_to_follow_obj, category=category)
+            follow = UserFollow.objects.create(user_from=request.user, user_to=user_to_follow_obj, category=category)
     except IntegrityError:
         return log_and_return_json("follow_user", {'error': "Already following user"}, status=400)
+    timeline.backfill_follow(follow)
     logger.info(f"Follow user successful: target_user_id: {user_to_follow_obj.id} by user_id: {request.user.id}")
     return log_and_return_json("follow_user", {'message': 'User followed', Fields.follow_category: category})
 
@@ -3298,6 +3452,7 @@ def unfollow_user(request, username_to_unfollow):
         return log_and_return_json("unfollow_user", {'error': "Not following user"}, status=400)
 
     request.user.following.remove(user_to_unfollow_obj)
+    timeline.prune_follow(request.user, user_to_unfollow_obj)
     logger.info(f"Unfollow user successful: target_user_id: {user_to_unfollow_obj.id} by user_id: {request.user.id}")
     return log_and_return_json("unfollow_user", {'message': 'User unfollowed'})
 
@@ -3339,6 +3494,7 @@ def set_follow_category(request, username):
 
     edge.category = category
     edge.save(update_fields=['category'])
+    timeline.relabel_follow(edge)
     logger.info(f"Set follow category successful: target_user_id: {target_user.id} by user_id: {request.user.id} to {category}")
     return log_and_return_json("set_follow_category", {'message': 'Category updated', Fields.follow_category: category})
 
@@ -3366,15 +3522,18 @@ def toggle_block(request, username_to_toggle_block):
     if request.user.blocked.filter(pk=user_to_toggle_obj.pk).exists():
         # Unblock
         request.user.blocked.remove(user_to_toggle_obj)
+        block_sets.forget_blocks(request.user, user_to_toggle_obj)
         return log_and_return_json("toggle_block", {'message': 'User unblocked'})
     else:
         # Block
         request.user.blocked.add(user_to_toggle_obj)
+        block_sets.forget_blocks(request.user, user_to_toggle_obj)
         # Also force unfollow? Typically blocking unfollows.
         if request.user.following.filter(pk=user_to_toggle_obj.pk).exists():
             request.user.following.remove(user_to_toggle_obj)
         if user_to_toggle_obj.following.filter(pk=request.user.pk).exists():
             user_to_toggle_obj.following.remove(request.user)
+        timeline.prune_block(request.user, user_to_toggle_obj)
 
         logger.info(f"User blocked successful: target_user_id: {user_to_toggle_obj.id} by user_id: {request.user.id}")
         return log_and_return_json("toggle_block", {'message': 'User blocked'})
@@ -3504,6 +3663,15 @@ def remove_profile_photo(request):
     })
 
 
+def _bio_rejected(view_name, reason_code):
+    phrase = REASON_PHRASES.get(reason_code, REASON_PHRASES[GENERIC_REASON_CODE])
+    return log_and_return_json(view_name, {
+        'error': f"Text is not positive because your bio {phrase}.",
+        Fields.reason_code: reason_code,
+        Fields.appealable: False,
+    }, status=400)
+
+
 @csrf_exempt
 @api_login_required
 @ratelimit(key='user', rate='20/h', block=True)
@@ -3511,13 +3679,14 @@ def remove_profile_photo(request):
 def set_bio(request):
     """Set (or clear) the caller's profile bio (issue #380).
 
-    A bio is short free text shown on the user's profile. Because it is plain
-    text it is moderated synchronously by the text classifier, exactly like a
-    username or a comment — a bio that is not positive is rejected outright and
-    never stored, so there is no pending/approved lifecycle. The user simply
-    edits it and tries again, so a rejection is not appealable. A blank (or
-    whitespace-only) bio clears any existing one and skips the classifier. Rate
-    limited per user since each non-empty save runs a billable classification.
+    A bio is short free text shown on the user's profile. Only the cheap local
+    pre-filter runs here; the new bio is stored pending and reviewed by the
+    async text classifier (tasks.classify_bio), which promotes it into the live
+    bio or drops it, like a profile photo. The current bio stays live meanwhile.
+    A rejection is not appealable — the user simply edits it and tries again.
+    A blank (or whitespace-only) bio clears any existing one (and any pending
+    one) and skips the classifier. Rate limited per user since each non-empty
+    save enqueues a billable classification.
     """
     logger.info("Endpoint set_bio invoked by IP or User")
     data = _get_json_body(request)
@@ -3533,7 +3702,10 @@ def set_bio(request):
     # A blank bio just clears it — nothing to classify.
     if not bio.strip():
         user.bio = ""
-        user.save(update_fields=['bio'])
+        user.pending_bio = None
+        user.bio_status = BIO_STATUS_NONE
+        user.bio_reason_code = None
+        user.save(update_fields=['bio', 'pending_bio', 'bio_status', 'bio_reason_code'])
         logger.info(f"Bio cleared for user_id: {user.id}")
         return log_and_return_json("set_bio", {
             Fields.bio: "",
@@ -3553,19 +3725,37 @@ def set_bio(request):
         return log_and_return_json("set_bio", {
             'error': "Your bio cannot contain a semicolon (;)."}, status=400)
 
-    # Synchronous positivity check, like a username. A bio that is not positive is
-    # never stored; the user can simply edit it, so the rejection is not appealable.
-    text_result = text_classifier_class.is_text_positive(bio)
-    if not text_result:
+    # A blatant pre-filter hit is rejected immediately and never stored; the
+    # user can simply edit it, so the rejection is not appealable.
+    prefilter_result = prefilter_text(bio)
+    if not prefilter_result:
+        logger.warning(f"Set bio failed: bio failed the pre-filter for user_id: {user.id}")
+        return _bio_rejected("set_bio", prefilter_result.public_reason_code())
+
+    user.pending_bio = bio
+    user.bio_status = BIO_STATUS_PENDING
+    user.bio_reason_code = None
+    user.bio_classification_attempts = 0
+    user.bio_classification_alerted = False
+    user.bio_classification_time = timezone.now()
+    user.save(update_fields=[
+        'pending_bio', 'bio_status', 'bio_reason_code', 'bio_classification_attempts',
+        'bio_classification_alerted', 'bio_classification_time',
+    ])
+    tasks.enqueue_bio_classification(user.id)
+
+    # Eager mode has already resolved the bio, so answer as the synchronous
+    # check used to; queued, it is still pending.
+    user.refresh_from_db(fields=['bio', 'pending_bio', 'bio_status', 'bio_reason_code'])
+    if user.bio_status == BIO_STATUS_REJECTED:
         logger.warning(f"Set bio failed: bio not positive for user_id: {user.id}")
+        return _bio_rejected("set_bio", user.bio_reason_code)
+    if user.bio_status == BIO_STATUS_PENDING:
+        logger.info(f"Bio set pending classification for user_id: {user.id}")
         return log_and_return_json("set_bio", {
-            'error': f"Text is not positive because your bio {text_result.public_reason()}.",
-            Fields.reason_code: text_result.public_reason_code(),
-            Fields.appealable: False,
-        }, status=400)
-
-    user.bio = bio
-    user.save(update_fields=['bio'])
+            Fields.bio_status: BIO_STATUS_PENDING,
+            'message': "Your bio is being reviewed and will be shown once it is approved.",
+        }, status=202)
     logger.info(f"Bio updated for user_id: {user.id}")
     return log_and_return_json("set_bio", {
         Fields.bio: user.bio,
@@ -3756,7 +3946,7 @@ def apply_user_interests(user, category_slugs, freeform_terms):
             # nothing. set([]) clears, which is what last-writer-wins means here.
             new_row.categories.set(mapped_cats)
 
-        user.interest_categories.set(
+        user.set_interest_categories(
             [cats_by_slug[s] for s in union_slugs if s in cats_by_slug])
 
     return {
@@ -4077,14 +4267,14 @@ def get_profile_details(request, username):
     follow_edge = UserFollow.objects.filter(user_from=request.user, user_to=profile_user).first()
     is_following = follow_edge is not None
     follow_category = follow_edge.category if follow_edge else None
-    is_blocked = request.user.blocked.filter(pk=profile_user.pk).exists()
+    is_blocked = profile_user.pk in block_sets.blocked_ids(request.user)
 
     # If I am blocked by them, should I see details?
     # Spec: "user B cannot search for user A".
     # Typically profiles are also hidden or return 404.
     # But `get_posts_for_user` will return empty.
     # Let's hide stats if blocked by them.
-    is_blocked_by = request.user.blocked_by.filter(pk=profile_user.pk).exists()
+    is_blocked_by = profile_user.pk in block_sets.blocker_ids(request.user)
 
     if is_blocked_by:
         # Return limited info or error?
@@ -4101,7 +4291,7 @@ def get_profile_details(request, username):
     # requester, so a blocked user cannot even see their avatar.
     live_avatar = None if is_blocked_by else profile_user.profile_image_url
 
-    # The bio (issue #380), moderated on write so safe to show to everyone —
+    # The bio (issue #380), only ever the approved text so safe to show to everyone —
     # except a requester the profile has blocked, who is redacted the same way as
     # the stats and avatar above so they cannot read the blocker's bio by name.
     visible_bio = "" if is_blocked_by else profile_user.bio
@@ -4138,6 +4328,10 @@ def get_profile_details(request, username):
         # async), so the owner's immediate preview must point at the full-res
         # original or it would 404 to the placeholder.
         data[Fields.pending_profile_image_url] = sign_original_url(pending_avatar)
+        # Likewise a bio still under review, or why the last one was rejected.
+        data[Fields.pending_bio] = profile_user.pending_bio
+        data[Fields.bio_status] = profile_user.bio_status
+        data[Fields.bio_reason_code] = profile_user.bio_reason_code
 
     return log_and_return_json("get_profile_details", data, status=200)
 
@@ -4211,7 +4405,10 @@ def get_hidden_comments(request, batch):
     if batch < 0:
         return log_and_return_json("get_hidden_comments", {'error': "Invalid batch parameter"}, status=400)
 
-    hidden = Comment.objects.filter(author=request.user, hidden=True).order_by('-creation_time')
+    # As for posts, pending comments and final-rejection tombstones have
+    # nothing to appeal.
+    hidden = Comment.objects.filter(author=request.user, hidden=True).exclude(
+        hidden_reason__in=NON_APPEALABLE_HIDDEN_REASONS).order_by('-creation_time')
     batched = get_queryset_batch(hidden, batch, COMMENT_BATCH_SIZE)
     appealed_ids = set(
         Appeal.objects.filter(comment__in=batched).values_list('comment_id', flat=True)
@@ -4282,7 +4479,7 @@ def _resolve_appeal_target(request, target_type, target_identifier):
             return None
         comment = Comment.objects.filter(
             author=request.user, comment_identifier=target_identifier, hidden=True
-        ).first()
+        ).exclude(hidden_reason__in=NON_APPEALABLE_HIDDEN_REASONS).first()
         if comment is None:
             return None
         return APPEAL_TARGET_COMMENT, comment, comment.body
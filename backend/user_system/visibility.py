@@ -1,4 +1,4 @@
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 
 from .constants import (
     AUDIENCE_ALLOWED_CATEGORIES,
@@ -6,12 +6,14 @@ from .constants import (
     HIDDEN_REASON_CLASSIFIER_FINAL,
     POST_AUDIENCE_PUBLIC,
 )
-from .models import Comment, UserBan, UserFollow
+from .ban_sets import banned_user_ids
+from .models import Comment, PositiveOnlySocialUser, UserFollow
 
 
 def _shadow_banned_user_ids():
-    """User ids with a shadow ban currently in effect, usable as a subquery."""
-    return UserBan.objects.active().filter(ban_type=BAN_TYPE_SHADOW).values_list('user_id', flat=True)
+    """User ids with a shadow ban currently in effect (from the cached ban
+    sets, see ban_sets.py), usable in an __in filter."""
+    return banned_user_ids(BAN_TYPE_SHADOW)
 
 
 def _audience_q(viewer):
@@ -27,19 +29,14 @@ def _audience_q(viewer):
     admits = Q(audience=POST_AUDIENCE_PUBLIC)
     if viewer is not None and getattr(viewer, 'is_authenticated', False):
         for audience, categories in AUDIENCE_ALLOWED_CATEGORIES.items():
-            # Join the author's outgoing follow edges (following_set) and keep
-            # rows whose edge points at this viewer. A plain Q join keeps the
-            # whole filter combinable with the other Q terms in visible_posts.
-            #
-            # NOTE: this DOES fan out. `following_set` is multi-valued, and the
-            # OR with the author-owns-it branch in visible_posts leaves the join
-            # unrestricted for the author's own posts (viewer == author), so a
-            # post is emitted once per follow edge its author has. visible_posts
-            # must therefore .distinct() to collapse the duplicates (issue #397).
+            # An EXISTS probe for the author's edge to this viewer, answered
+            # from the follow_audience_idx index. Unlike a join over the
+            # author's following_set it never repeats a row, so callers need
+            # no .distinct() (issue #397).
             admits |= Q(
+                Exists(UserFollow.objects.filter(
+                    user_from=OuterRef('author'), user_to=viewer, category__in=categories)),
                 audience=audience,
-                author__following_set__user_to=viewer,
-                author__following_set__category__in=categories,
             )
     return admits
 
@@ -97,17 +94,7 @@ def visible_posts(posts, viewer):
             & _audience_q(viewer)
             & _same_age_band_q(viewer, 'author')
         )
-    # .distinct() collapses the audience-join fan-out from _audience_q: on the
-    # author-owns-it branch the join over the author's outgoing follow edges is
-    # unrestricted, so a viewer's own posts come back once per account they
-    # follow — N copies on your own profile where N = accounts you follow
-    # (issue #397). Plain row-level distinct is correct for every caller: the
-    # duplicated rows are identical across all selected columns (the audience
-    # edge is unique per (author, viewer)), and the callers' own orderings and
-    # annotations (feed weight, -creation_time, saved posts' -saved_time) are
-    # single-valued per post, so none of them split a post back into rows that
-    # distinct would keep.
-    ).distinct()
+    )
 
 
 def _labeled_author_ids(viewer, category):
@@ -122,7 +109,8 @@ def visible_comments(comments, viewer, category=None):
     """Same visibility rule as visible_posts, for comments (issue #392/#445): a
     viewer always sees their own comments, and otherwise only comments that are
     not hidden, whose author is not shadow banned, whose audience admits them,
-    and whose author is in the viewer's age band.
+    and whose author is in the viewer's age band. Final-rejection tombstones are
+    excluded even for the author, as for posts.
 
     An optional `category` narrows the result to comments whose author the viewer
     labeled with exactly that relationship category — the followed-feed toggle
@@ -130,18 +118,14 @@ def visible_comments(comments, viewer, category=None):
     so naturally drops the viewer's own comments, since you do not follow
     yourself), independent of how the comments' own audiences nest.
     """
-    visible = comments.filter(
+    visible = comments.exclude(hidden_reason=HIDDEN_REASON_CLASSIFIER_FINAL).filter(
         Q(author=viewer) | (
             Q(hidden=False)
             & ~Q(author__in=_shadow_banned_user_ids())
             & _audience_q(viewer)
             & _same_age_band_q(viewer, 'author')
         )
-    # .distinct() collapses the audience-join fan-out from _audience_q exactly as
-    # in visible_posts: the author-owns-it branch leaves the follow-edge join
-    # unrestricted, so a viewer's own comments would otherwise come back once per
-    # account they follow.
-    ).distinct()
+    )
     if category:
         visible = visible.filter(author__in=_labeled_author_ids(viewer, category))
     return visible
@@ -159,20 +143,55 @@ def visible_comment_threads(threads, viewer, category=None):
     """
     visible_thread_ids = visible_comments(
         Comment.objects.filter(comment_thread__in=threads), viewer, category
-    ).values_list('comment_thread_id', flat=True).distinct()
+    ).values_list('comment_thread_id', flat=True)
     return threads.filter(pk__in=visible_thread_ids)
 
 
-def _audience_allows(content, viewer):
-    """Single-object mirror of _audience_q: whether this post's or comment's
-    audience admits the viewer (the author-owns-it rule is checked separately)."""
-    if content.audience == POST_AUDIENCE_PUBLIC:
-        return True
-    categories = AUDIENCE_ALLOWED_CATEGORIES.get(content.audience, [])
-    if not categories or viewer is None or not getattr(viewer, 'is_authenticated', False):
-        return False
-    return UserFollow.objects.filter(
-        user_from=content.author, user_to=viewer, category__in=categories).exists()
+def _viewer_id(viewer):
+    if viewer is None or not getattr(viewer, 'is_authenticated', False):
+        return None
+    return viewer.pk
+
+
+def _minor_author_ids(contents):
+    """Ids of the verified minors among the authors of `contents` (see
+    is_minor). Read off the loaded authors when every item has its author
+    cached (select_related), otherwise one query over the distinct authors."""
+    if all(type(content).author.is_cached(content) for content in contents):
+        return {content.author_id for content in contents if is_minor(content.author)}
+    return set(PositiveOnlySocialUser.objects.filter(
+        pk__in={content.author_id for content in contents},
+        identity_is_verified=True, is_adult=False,
+    ).values_list('pk', flat=True))
+
+
+def audience_admitted_ids(contents, viewer):
+    """Primary keys of the already-fetched posts or comments in `contents`
+    whose audience tier admits the viewer (issue #392/#445), ignoring
+    hidden/ban/age. Authors are always admitted to their own content.
+
+    The batch form of audience_admits, and the in-Python mirror of
+    _audience_q: one query fetches the viewer's incoming follow edges from
+    every author with restricted content in the batch, and none is run when
+    everything is public or the viewer's own."""
+    contents = list(contents)
+    viewer_id = _viewer_id(viewer)
+    restricted_author_ids = {
+        content.author_id for content in contents
+        if content.audience != POST_AUDIENCE_PUBLIC and content.author_id != viewer_id
+    }
+    edge_categories = {}
+    if restricted_author_ids and viewer_id is not None:
+        # (user_from, user_to) is unique, so each author has at most one edge.
+        edge_categories = dict(UserFollow.objects.filter(
+            user_from__in=restricted_author_ids, user_to=viewer_id,
+        ).values_list('user_from_id', 'category'))
+    return {
+        content.pk for content in contents
+        if content.audience == POST_AUDIENCE_PUBLIC
+        or (viewer_id is not None and content.author_id == viewer_id)
+        or edge_categories.get(content.author_id) in AUDIENCE_ALLOWED_CATEGORIES.get(content.audience, ())
+    }
 
 
 def audience_admits(content, viewer):
@@ -186,28 +205,38 @@ def audience_admits(content, viewer):
     audience-only on purpose — report retraction legitimately targets an
     already-hidden comment, so a full visibility check (which rejects hidden
     content) would break that flow."""
-    if content.author == viewer:
-        return True
-    return _audience_allows(content, viewer)
+    return content.pk in audience_admitted_ids([content], viewer)
 
 
-def can_view_post(post, viewer):
-    """Visibility check for a single already-fetched post."""
+def viewable_post_ids(posts, viewer):
+    """Primary keys of the already-fetched `posts` the viewer may see — the
+    in-Python mirror of visible_posts for a batch of rows. Shadow bans come
+    from the cached ban sets, age bands from the authors (loaded or fetched in
+    one query), and audiences from audience_admitted_ids, so a batch costs at
+    most two queries however many posts it holds."""
+    viewer_id = _viewer_id(viewer)
     # A final-rejection tombstone is viewable by nobody, its author included
     # (matching visible_posts): the content is removed, and only the status
     # endpoint reports what happened to it.
-    if post.hidden_reason == HIDDEN_REASON_CLASSIFIER_FINAL:
-        return False
-    if post.author == viewer:
-        return True
-    if post.hidden:
-        return False
-    if UserBan.objects.active().filter(user=post.author, ban_type=BAN_TYPE_SHADOW).exists():
-        return False
+    posts = [post for post in posts if post.hidden_reason != HIDDEN_REASON_CLASSIFIER_FINAL]
+    own = {post.pk for post in posts if viewer_id is not None and post.author_id == viewer_id}
+    shadow_banned = _shadow_banned_user_ids()
+    candidates = [
+        post for post in posts
+        if post.pk not in own and not post.hidden and post.author_id not in shadow_banned
+    ]
+    if not candidates:
+        return own
     # Adults and underage accounts never see each other's posts (issue #329).
-    if not in_same_age_band(post.author, viewer):
-        return False
-    return _audience_allows(post, viewer)
+    viewer_is_minor = is_minor(viewer)
+    minor_author_ids = _minor_author_ids(candidates)
+    candidates = [post for post in candidates if (post.author_id in minor_author_ids) == viewer_is_minor]
+    return own | audience_admitted_ids(candidates, viewer)
+
+
+def can_view_post(post, viewer):
+    """Visibility check for a single already-fetched post."""
+    return post.pk in viewable_post_ids([post], viewer)
 
 
 def searchable_users(users, viewer):